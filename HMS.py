@@ -1,12 +1,171 @@
+import os
 import re
+import sys
 import random
-import difflib
-from collections import defaultdict
+import time
+import threading
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from types import MappingProxyType
+
+from regex_utils import lint_patterns, generate_examples
+from sessions import SessionManager
+from appointments import AppointmentStore, parse_legacy
+from scheduling import Scheduler, BookingConflict
+from pharmacy import PharmacyInventory
+from pricing import PriceCatalog
+from directory import PhysicianDirectory, article
+from stays import StayStatistics
+from patients import PatientIndex
+from triage import LEVEL_NAMES, TRIAGE_PHRASES, TriageQueue, assess
+from census import BedCensus
+from eligibility import EligibilityClient, EligibilityError, PayerNetwork
+from templates import ResponseTemplate, compile_response
+from nlp_utils import (
+    TfidfIntentClassifier, BigramLanguageModel, SpellingCorrector, PhraseNormalizer,
+    extract_entities, MEDICATIONS, DEPARTMENT_LOOKUP
+)
+
+# An MRN typed into a query ("MRN100037", "mrn 100037"), which confirms who the user is
+MRN_RE = re.compile(r"\bMRN\s*#?\s*(\d{4,})\b", re.IGNORECASE)
+
+# Words around the drug name in "do you have any amox in stock"
+MEDICATION_FILLER_WORDS = frozenset("a an the any some of in stock available right now please".split())
+
+# Queries that continue the previous question ("and what about Saturday?")
+FOLLOW_UP_RE = re.compile(r"^(?:and|also|what about|how about|and what about|and how about|what if)\b", re.IGNORECASE)
+
+# Where one question of a compound query ends and the next begins ("what are visiting hours and where do I park")
+# A period ends a question unless it ends a title ("Dr. Smith")
+CLAUSE_BREAK_RE = re.compile(
+    r"[?!;]+\s*|(?<!\bDr)(?<!\bMr)(?<!\bMs)(?<!\bMrs)\.+(?:\s+|$)"
+    r"|,?\s+(?:and also|and then|and|also|plus|then)\s+",
+    re.IGNORECASE,
+)
+
+class PatternEntry:
+    """One compiled pattern with its response function and category id"""
+
+    __slots__ = ("pattern", "response", "category_id")
+
+    def __init__(self, pattern, response, category_id):
+        self.pattern = pattern
+        self.response = response
+        self.category_id = category_id  # Index into MatcherState.category_names
+
+
+# Everything the query path reads, built once and never mutated. A reload builds
+# a new state and swaps it in with a single attribute assignment.
+class MatcherState(namedtuple(
+    "MatcherState",
+    "compiled_patterns category_names fallback_classifier spelling_corrections "
+    "spelling_corrector vocabulary_normalizer pattern_warnings"
+)):
+    __slots__ = ()
+
+    def category(self, index):
+        """Category name of the pattern at `index`"""
+        return self.category_names[self.compiled_patterns[index].category_id]
+
 
 class HospitalChatbot:
+    """Regex and NLP driven hospital assistant.
+
+    One instance can be shared by many threads. The matcher (patterns,
+    classifier, spelling and vocabulary models) lives in an immutable
+    MatcherState snapshot that each query reads once without locking;
+    reload() swaps in a new snapshot. Patient data is read-only, and the
+    only mutable state, the sessions, is guarded by per-session locks.
+    """
+
+    # Queries longer than this are truncated before matching
+    MAX_QUERY_LENGTH = 500
+    # CPU time budget (seconds) for the regex stage of one query before falling back; measured per
+    # thread so answers do not change when other threads compete for the interpreter
+    MATCH_TIME_BUDGET = 0.05
+    # Minimum cosine similarity for the TF-IDF fallback to answer an unmatched query
+    FALLBACK_THRESHOLD = 0.4
+    # Bigram model file for spelling correction; trained from the patterns (and saved here) if missing
+    SPELLING_MODEL_PATH = None
+    # Optional schedule CSV (patient, doctor, start, duration, department) loaded into the appointment store
+    APPOINTMENTS_PATH = None
+    # Pharmacy catalog and stock levels
+    PHARMACY_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "pharmacy_catalog.csv")
+    # Chargemaster with procedure and lab test prices and preparation instructions
+    CHARGEMASTER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "chargemaster.csv")
+    # Specialties with the conditions and symptoms they treat
+    SPECIALTIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "specialties.csv")
+    # Discharge records; new records appended to it are picked up by refresh_stays()
+    ADMISSIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "admissions.csv")
+    # Patient registry (MRN, name, date of birth) used to match typed names to patients
+    PATIENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "patients.csv")
+    # Inpatient units with their bed counts and visiting rules
+    UNITS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "units.csv")
+    # Admit, transfer and discharge events; new events appended to it are picked up by refresh_census()
+    BED_EVENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "bed_events.csv")
+    # Optional bed census checkpoint; restored at startup and written by checkpoint_census()
+    CENSUS_SNAPSHOT_PATH = None
+    # Payer plans and the doctors in each plan's network
+    PAYER_NETWORK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "payer_network.csv")
+    # Insurance plan and member id of each registered patient, by MRN
+    COVERAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "coverage.csv")
+    # Optional payer eligibility service (e.g. `python mock_payer.py` at http://127.0.0.1:8750); without it,
+    # coverage questions are answered from the coverage file and live benefit checks are skipped
+    ELIGIBILITY_URL = None
+
     def __init__(self):
-        # Initialize response categories and regex patterns
-        self.categories = {
+        # Payer and plan names are part of the spelling corpus, so the network loads before the matcher
+        self.network = PayerNetwork.load(self.PAYER_NETWORK_PATH, self.COVERAGE_PATH)
+        self.eligibility = EligibilityClient(self.ELIGIBILITY_URL) if self.ELIGIBILITY_URL else None
+
+        # Build the matcher snapshot; reload() replaces it
+        self.reload_lock = threading.Lock()
+        self.state = self.build_state()
+
+        # Sample patient data for personalization (in a real system, this would come from a database).
+        # Frozen so threads can share it without locking.
+        # Registered patients, searchable by misspelled or differently cased names
+        self.patients = PatientIndex.load(self.PATIENTS_PATH)
+
+        self.patient_data = self.freeze_patient_data({
+            "John Doe": {"appointments": ["03/15/2025, 10:00 AM, Dr. Smith"], "medications": ["Lisinopril 10mg"]},
+            "Jane Smith": {"appointments": ["03/10/2025, 2:30 PM, Dr. Johnson"], "medications": ["Metformin 500mg"]}
+        })
+
+        # Appointments indexed by patient, doctor and start time
+        self.appointments = self.load_appointments()
+
+        # Free and booked slots of every doctor, for self-service booking
+        self.scheduler = self.load_scheduler()
+
+        # Drug catalog and stock, indexed by name, brand and condition
+        self.pharmacy = PharmacyInventory.load(self.PHARMACY_CATALOG_PATH)
+
+        # Procedure and lab test prices, indexed by name and synonym
+        self.prices = PriceCatalog.load(self.CHARGEMASTER_PATH)
+
+        # Physicians by specialty and specialties by condition
+        self.directory = PhysicianDirectory.load(self.SPECIALTIES_PATH, self.get_doctor_roster().items())
+
+        # Length-of-stay statistics per condition
+        self.stays = StayStatistics.load(self.ADMISSIONS_PATH)
+
+        # Patients who checked in at the ER kiosk, most urgent first
+        self.triage = TriageQueue()
+
+        # Occupied and available beds per unit, from the bed event log
+        self.census = BedCensus.load(self.UNITS_PATH, self.BED_EVENTS_PATH, self.CENSUS_SNAPSHOT_PATH)
+
+        # Per-conversation state, keyed by session id
+        self.sessions = SessionManager(resolve_name=self.resolve_patient_name)
+
+    def get_pattern_definitions(self):
+        """Response categories and their regex patterns, as {category: [{"regex", "response"}]}.
+
+        Only needed while building the matcher; the compiled state keeps what
+        it needs and the definitions are dropped afterwards.
+        """
+        return {
             "appointment": self.get_appointment_patterns(),
             "billing": self.get_billing_patterns(),
             "pharmacy": self.get_pharmacy_patterns(),
@@ -33,57 +192,944 @@ class HospitalChatbot:
             "general": self.get_general_patterns()
         }
 
-        # Compile all regex patterns
-        self.compiled_patterns = self.compile_patterns()
+    def build_state(self):
+        """Build a new MatcherState from the pattern definitions and vocabularies"""
+        definitions = self.get_pattern_definitions()
+
+        # Warn about patterns that can backtrack catastrophically
+        pattern_warnings = lint_patterns(
+            (f"{category}[{i}]", pattern_dict["regex"])
+            for category, patterns in definitions.items()
+            for i, pattern_dict in enumerate(patterns)
+        )
+
+        # Compile all regex patterns; categories are referred to by their index
+        category_names = tuple(sys.intern(category) for category in definitions)
+        compiled_patterns = self.compile_patterns(definitions)
+
+        # Example utterances generated from every pattern
+        pattern_examples = [generate_examples(entry.pattern.pattern, re.IGNORECASE) for entry in compiled_patterns]
 
         # Common misspellings dictionary for basic spelling correction
-        self.spelling_corrections = self.get_spelling_corrections()
+        spelling_corrections = MappingProxyType(self.get_spelling_corrections())
 
-        # Sample patient data for personalization (in a real system, this would come from a database)
-        self.patient_data = {
-            "John Doe": {"appointments": ["03/15/2025, 10:00 AM, Dr. Smith"], "medications": ["Lisinopril 10mg"]},
-            "Jane Smith": {"appointments": ["03/10/2025, 2:30 PM, Dr. Johnson"], "medications": ["Metformin 500mg"]}
-        }
+        return MatcherState(
+            compiled_patterns=compiled_patterns,
+            category_names=category_names,
+            # TF-IDF classifier over example utterances, for queries no pattern matches
+            fallback_classifier=self.build_fallback_classifier(compiled_patterns, pattern_examples),
+            spelling_corrections=spelling_corrections,
+            # Context-aware spelling correction ranked by a bigram model of the intent corpus
+            spelling_corrector=SpellingCorrector(
+                self.load_language_model(compiled_patterns, pattern_examples), spelling_corrections
+            ),
+            # Multi-word terms and abbreviations mapped to the wording the patterns use
+            vocabulary_normalizer=PhraseNormalizer(self.get_medical_vocabulary()),
+            pattern_warnings=MappingProxyType(pattern_warnings),
+        )
 
-    def compile_patterns(self):
+    def reload(self):
+        """Rebuild the matcher and publish it; queries already running finish on the old snapshot"""
+        with self.reload_lock:
+            state = self.build_state()
+            self.state = state
+        return state
+
+    # Read-only views of the current snapshot
+    compiled_patterns = property(lambda self: self.state.compiled_patterns)
+    fallback_classifier = property(lambda self: self.state.fallback_classifier)
+    spelling_corrections = property(lambda self: self.state.spelling_corrections)
+    spelling_corrector = property(lambda self: self.state.spelling_corrector)
+    vocabulary_normalizer = property(lambda self: self.state.vocabulary_normalizer)
+    pattern_warnings = property(lambda self: self.state.pattern_warnings)
+
+    @staticmethod
+    def freeze_patient_data(patient_data):
+        return MappingProxyType({
+            name: MappingProxyType({key: tuple(values) for key, values in record.items()})
+            for name, record in patient_data.items()
+        })
+
+    def compile_patterns(self, definitions):
+        # Responses are template strings (see templates.ResponseTemplate) or functions of (match, user)
+        fragments = self.get_response_fragments()
         compiled = []
-        for category, patterns in self.categories.items():
+        for category_id, patterns in enumerate(definitions.values()):
             for pattern_dict in patterns:
                 regex = pattern_dict["regex"]
-                response_fn = pattern_dict["response"]
-                compiled.append((re.compile(regex, re.IGNORECASE), response_fn, category))
-        return compiled
+                response_fn = compile_response(pattern_dict["response"], fragments)
+                compiled.append(PatternEntry(re.compile(regex, re.IGNORECASE), response_fn, category_id))
+        return tuple(compiled)
+
+    def build_fallback_classifier(self, compiled_patterns, pattern_examples):
+        # One document per pattern, made of example utterances generated from its regex.
+        # Patterns with capture groups need a real match for their response, so they are left out.
+        documents = []
+        labels = []
+        for index, entry in enumerate(compiled_patterns):
+            if entry.pattern.groups:
+                continue
+            documents.append("\n".join(pattern_examples[index]))
+            labels.append(index)
+        return TfidfIntentClassifier().fit(documents, labels)
+
+    def load_language_model(self, compiled_patterns, pattern_examples, extra_lines=()):
+        """Load the spelling model from SPELLING_MODEL_PATH, or train it from the intent corpus.
+
+        The corpus is the pattern examples, the fixed response texts, known
+        medication, department, symptom, payer and plan names and any extra
+        lines (e.g. query logs).
+        """
+        if self.SPELLING_MODEL_PATH and os.path.exists(self.SPELLING_MODEL_PATH):
+            return BigramLanguageModel.load(self.SPELLING_MODEL_PATH)
+
+        corpus = [example for examples in pattern_examples for example in examples]
+        for entry in compiled_patterns:
+            # Constant responses can be rendered without a match or helper calls
+            if isinstance(entry.response, ResponseTemplate) and entry.response.text is not None:
+                corpus.append(entry.response.text)
+        corpus.extend(MEDICATIONS)
+        corpus.extend(DEPARTMENT_LOOKUP)
+        corpus.extend(TRIAGE_PHRASES)
+        corpus.extend(self.network.aliases)
+        corpus.extend(plan for plans in self.network.payers.values() for plan in plans)
+        corpus.extend(extra_lines)
+
+        model = BigramLanguageModel.train(corpus)
+        if self.SPELLING_MODEL_PATH:
+            model.save(self.SPELLING_MODEL_PATH)
+        return model
 
     def correct_spelling(self, text):
-        words = text.split()
-        corrected_words = []
+        return " ".join(word for word, changed in self.state.spelling_corrector.correct_words(text.split()))
 
-        for word in words:
-            if word.lower() in self.spelling_corrections:
-                corrected_words.append(self.spelling_corrections[word.lower()])
-            else:
-                # Check for close matches
-                close_matches = difflib.get_close_matches(word.lower(), self.spelling_corrections.keys(), n=1, cutoff=0.8)
-                if close_matches:
-                    corrected_words.append(self.spelling_corrections[close_matches[0]])
-                else:
-                    corrected_words.append(word)
-
-        return " ".join(corrected_words)
-
-    def process_query(self, query, user_name=None):
-        # Step 1: Apply spelling correction
-        corrected_query = self.correct_spelling(query)
-
-        # Step 2: Try to match against regex patterns
-        for pattern, response_fn, category in self.compiled_patterns:
-            match = pattern.search(corrected_query)
+    def normalize_query(self, query, state=None):
+        """Prepare a query for matching; returns (text, spans of rewritten words).
+
+        The query is capped at MAX_QUERY_LENGTH, misspelled words are
+        corrected and known phrases and abbreviations are mapped to their
+        canonical wording.
+        """
+        state = state or self.state
+        words = state.spelling_corrector.correct_words(query[:self.MAX_QUERY_LENGTH].split())
+        words = state.vocabulary_normalizer.normalize_words(words)
+
+        rewritten_spans = []
+        position = 0
+        for word, changed in words:
+            if changed:
+                rewritten_spans.append((position, position + len(word)))
+            position += len(word) + 1
+
+        return " ".join(word for word, changed in words), rewritten_spans
+
+    def process_query(self, query, user_name=None, multi_intent=False, session_id=None):
+        if multi_intent:
+            response, categories = self.answer_multi_query(query, user_name, session_id)
+        else:
+            response, category = self.answer_query(query, user_name, session_id)
+        return response
+
+    def answer_query(self, query, user_name=None, session_id=None):
+        """Return (response, category); category is None for the catch-all response.
+
+        With a session_id the conversation state is kept in self.sessions, so
+        a follow-up that changes one detail ("and what about ibuprofen?") is
+        answered by the previous intent.
+        """
+        state = self.state
+        session = None
+        if session_id is not None:
+            session = self.sessions.get_or_create(session_id, user_name)
+            user_name = session.patient_name
+        else:
+            user_name = self.resolve_patient_name(user_name)
+
+        # Step 1: Cap the input length, correct spelling and normalize terms
+        corrected_query, rewritten_spans = self.normalize_query(query, state)
+
+        # Steps 2-4: regex patterns, the TF-IDF fallback and follow-ups
+        index, match, matched_query = self.match_query(corrected_query, session, state)
+
+        if session is not None:
+            category = state.category(index) if index is not None else None
+            session.record_turn(index, category, matched_query, self.extract_entities(matched_query or corrected_query))
+            self.sessions.update_size(session)
+
+        if index is None:
+            # Step 5: If nothing is close enough, provide a catch-all response
+            return self.catch_all_response(corrected_query), None
+
+        # Call the response function with the match object and user name
+        return state.compiled_patterns[index].response(match, user_name), state.category(index)
+
+    def match_query(self, corrected_query, session=None, state=None):
+        """Return (pattern_index, match, matched_query); all None when nothing applies"""
+        state = state or self.state
+
+        # Step 2: Try to match against regex patterns within the time budget
+        deadline = time.thread_time() + self.MATCH_TIME_BUDGET
+        for index, entry in enumerate(state.compiled_patterns):
+            match = entry.pattern.search(corrected_query)
             if match:
-                # If we have a match, call the response function with the match object and user name
-                return response_fn(match, user_name)
+                return index, match, corrected_query
+            # Checked after every pattern, so one slow pattern cannot run far past the budget
+            if time.thread_time() > deadline:
+                # Matching is taking too long; give up on the regex path
+                break
+
+        # Step 3: Route to the closest pattern by TF-IDF similarity
+        index, score = state.fallback_classifier.predict(corrected_query)
+        if index is not None and score >= self.FALLBACK_THRESHOLD:
+            return index, None, corrected_query
+
+        # Step 4: Nothing matched; a follow-up may change one detail of the previous question
+        if session is not None and FOLLOW_UP_RE.match(corrected_query):
+            follow_up = self.resolve_follow_up(corrected_query, session, state)
+            if follow_up is not None:
+                return follow_up
+
+        return None, None, None
+
+    def resolve_follow_up(self, query, session, state):
+        """(pattern_index, match, rewritten_query) for a follow-up, or None.
+
+        Each entity of the follow-up ("and what about ibuprofen?") replaces
+        the entity of the same type in the session's previous query ("do you
+        have aspirin"). The previous pattern must match the rewritten query
+        with the new entity inside one of its groups, so its handler answers
+        for the new value; follow-ups whose entities the handler does not
+        read ("and what about the weather in paris?") are not resolved.
+        """
+        with session.lock:
+            last_pattern, last_query, last_entities = session.last_pattern, session.last_query, session.entities
+        # Indices from before a reload may point past the current patterns
+        if last_pattern is None or last_pattern >= len(state.compiled_patterns):
+            return None
+        pattern = state.compiled_patterns[last_pattern].pattern
+        for entity in self.extract_entities(query):
+            for previous in last_entities:
+                if previous.type != entity.type or previous.text.lower() == entity.text.lower():
+                    continue
+                rewritten = last_query[:previous.start] + entity.text + last_query[previous.end:]
+                match = pattern.search(rewritten)
+                if match is None:
+                    continue
+                start, end = previous.start, previous.start + len(entity.text)
+                if any(match.group(group) is not None and match.start(group) <= start and end <= match.end(group)
+                       for group in range(1, pattern.groups + 1)):
+                    return last_pattern, match, rewritten
+        return None
+
+    def analyze_query(self, query, user_name=None, top_k=3):
+        """Answer a query and return the ranked candidate intents behind the answer.
+
+        Returns a dict with the response, its category (None for the catch-all
+        response), the corrected query, the entities found in it (see
+        extract_entities) and up to top_k candidates. Each
+        candidate has a category, a score between 0 and 1, the matched span in
+        the corrected query (None for fallback candidates) and the stage that
+        produced it: "exact", "spelling_corrected" (the matched text was
+        rewritten by spelling correction or term normalization) or "fallback".
+        """
+        state = self.state
+        user_name = self.resolve_patient_name(user_name)
+        corrected_query, rewritten_spans = self.normalize_query(query, state)
+
+        # Regex candidates; longer matches explain more of the query
+        candidates = []
+        for index, match in self.find_all_matches(corrected_query, state):
+            start, end = match.span()
+            spelling_corrected = any(s < end and start < e for s, e in rewritten_spans)
+            coverage = (end - start) / max(len(corrected_query), 1)
+            candidates.append({
+                "category": state.category(index),
+                "score": round((0.6 + 0.4 * coverage) * (0.9 if spelling_corrected else 1.0), 4),
+                "span": (start, end),
+                "stage": "spelling_corrected" if spelling_corrected else "exact",
+                "index": index,
+                "match": match,
+            })
+
+        # Fallback candidates scored by TF-IDF similarity
+        seen = {candidate["index"] for candidate in candidates}
+        for index, score in state.fallback_classifier.top(corrected_query, top_k):
+            if index not in seen and score > 0:
+                candidates.append({
+                    "category": state.category(index),
+                    "score": round(score, 4),
+                    "span": None,
+                    "stage": "fallback",
+                    "index": index,
+                    "match": None,
+                })
+
+        candidates.sort(key=lambda candidate: candidate["score"], reverse=True)
+        candidates = candidates[:top_k]
+
+        best = candidates[0] if candidates else None
+        if best and (best["stage"] != "fallback" or best["score"] >= self.FALLBACK_THRESHOLD):
+            response_fn = state.compiled_patterns[best["index"]].response
+            response = response_fn(best["match"], user_name)
+            category = best["category"]
+        else:
+            response = self.catch_all_response(corrected_query)
+            category = None
+
+        for candidate in candidates:
+            del candidate["index"], candidate["match"]
+
+        return {
+            "response": response,
+            "category": category,
+            "corrected_query": corrected_query,
+            "entities": self.extract_entities(corrected_query),
+            "candidates": candidates,
+        }
+
+    def extract_entities(self, query):
+        """Dates, times, phone numbers, doctors, departments and medications in the query.
+
+        Returns a list of nlp_utils.Entity(type, text, start, end, value) tuples
+        from a single scan with the combined extractor pattern.
+        """
+        return extract_entities(query[:self.MAX_QUERY_LENGTH])
+
+    def find_all_matches(self, corrected_query, state=None, deadline=None):
+        """Return (pattern_index, match) for all non-overlapping matches, left to right.
+
+        The leftmost match wins and earlier patterns win at the same position.
+        Each pattern is searched on its own and the time budget is checked
+        after every search; one scan with all patterns as a single alternation
+        cannot be interrupted and is several times slower on long adversarial
+        input.
+        """
+        state = state or self.state
+        patterns = state.compiled_patterns
+        if deadline is None:
+            deadline = time.thread_time() + self.MATCH_TIME_BUDGET
+        upcoming = [False] * len(patterns)  # Next match of each pattern; False until searched
+        matches = []
+        seen = set()
+        position = 0
+        while position <= len(corrected_query):
+            best = None
+            for index, entry in enumerate(patterns):
+                match = upcoming[index]
+                if match is False or (match is not None and match.start() < position):
+                    match = upcoming[index] = entry.pattern.search(corrected_query, position)
+                    if time.thread_time() > deadline:
+                        return matches
+                if match is not None and (best is None or match.start() < best[1].start()):
+                    best = (index, match)
+            if best is None:
+                break
+            index, match = best
+            if index not in seen:
+                seen.add(index)
+                matches.append(best)
+            position = match.end() if match.end() > match.start() else match.end() + 1
+        return matches
+
+    def find_all_intents(self, corrected_query, state=None):
+        """Return (pattern_index, match, span) for every intent in the query, left to right.
+
+        The query is split into clauses on conjunctions and punctuation first,
+        so the greedy group of one pattern cannot swallow the next question
+        ("do you have aspirin and what are the pharmacy hours"). Each clause
+        is matched on its own; a clause no pattern matches is routed by the
+        TF-IDF fallback like a query of its own, and that intent has no
+        match. Match objects refer to their clause; spans to the query.
+
+        Matching per clause means one pattern scan per clause rather than one
+        over the whole query. The clauses together are no longer than the
+        query, so the text scanned is the same, but the per-search overhead
+        is paid once per clause. All clauses share one time budget. A single
+        scan would let a greedy group run across clause breaks, and clipping
+        or re-matching those spans would cost the same searches again.
+        """
+        state = state or self.state
+        deadline = time.thread_time() + self.MATCH_TIME_BUDGET
+        intents = []
+        seen = set()
+        start = 0
+        for clause_break in [*CLAUSE_BREAK_RE.finditer(corrected_query), None]:
+            end = clause_break.start() if clause_break else len(corrected_query)
+            clause = corrected_query[start:end]
+            if clause.strip():
+                found = [(index, match, match.span()) for index, match in self.find_all_matches(clause, state, deadline)]
+                if not found:
+                    index, score = state.fallback_classifier.predict(clause)
+                    if index is not None and score >= self.FALLBACK_THRESHOLD:
+                        offset = len(clause) - len(clause.lstrip())
+                        found = [(index, None, (offset, len(clause.rstrip())))]
+                for index, match, (span_start, span_end) in found:
+                    if index not in seen:
+                        seen.add(index)
+                        intents.append((index, match, (start + span_start, start + span_end)))
+            if time.thread_time() > deadline:
+                break
+            start = clause_break.end() if clause_break else end
+        return intents
+
+    def detect_intents(self, query):
+        """Return every intent found in the query with its category and span.
+
+        Spans refer to the spelling-corrected query, which is returned as well.
+        """
+        state = self.state
+        corrected_query, rewritten_spans = self.normalize_query(query, state)
+        intents = [
+            {"category": state.category(index), "span": span, "text": corrected_query[span[0]:span[1]]}
+            for index, match, span in self.find_all_intents(corrected_query, state)
+        ]
+        return intents, corrected_query
+
+    def answer_multi_query(self, query, user_name=None, session_id=None):
+        """Answer every intent in the query; returns (combined response, categories).
+
+        With a session_id the intent of the last answered clause becomes the
+        session's previous intent, as in answer_query, and a query with no
+        intent of its own may be a follow-up to it.
+        """
+        state = self.state
+        session = None
+        if session_id is not None:
+            session = self.sessions.get_or_create(session_id, user_name)
+            user_name = session.patient_name
+        else:
+            user_name = self.resolve_patient_name(user_name)
+        corrected_query, rewritten_spans = self.normalize_query(query, state)
+        intents = self.find_all_intents(corrected_query, state)
+
+        if not intents and session is not None and FOLLOW_UP_RE.match(corrected_query):
+            follow_up = self.resolve_follow_up(corrected_query, session, state)
+            if follow_up is not None:
+                index, match, matched_query = follow_up
+                intents = [(index, match, (0, len(matched_query)))]
+
+        if session is not None:
+            if intents:
+                index, match, (start, end) = intents[-1]
+                # Regex matches refer to their clause (or rewritten follow-up); fallback intents to their span
+                matched_query = match.string if match is not None else corrected_query[start:end]
+                session.record_turn(index, state.category(index), matched_query, self.extract_entities(matched_query))
+            else:
+                session.record_turn(None, None, None, [])
+            self.sessions.update_size(session)
+
+        if not intents:
+            return self.catch_all_response(corrected_query), []
+
+        responses = []
+        categories = []
+        for index, match, span in intents:
+            responses.append(state.compiled_patterns[index].response(match, user_name))
+            categories.append(state.category(index))
+        return "\n\n".join(responses), categories
+
+    def resolve_patient_name(self, user_name, dob=None, mrn=None):
+        """The registered name of the patient a typed name refers to, or the name as typed.
+
+        "john doe" becomes "John Doe". A misspelled name ("Jhon Doe") only
+        resolves with a date of birth or MRN to confirm it; otherwise, and
+        when several patients match, the name is left alone, so nobody sees
+        another patient's records.
+        """
+        if not user_name or (user_name in self.patient_data and dob is None and mrn is None):
+            return user_name
+        patient = self.patients.find(user_name, dob, mrn)
+        return patient.name if patient else user_name
+
+    def load_appointments(self):
+        store = AppointmentStore()
+        store.import_rows(
+            (name, doctor, start, 30, None)
+            for name, record in self.patient_data.items()
+            for start, doctor in map(parse_legacy, record.get("appointments", ()))
+        )
+        if self.APPOINTMENTS_PATH and os.path.exists(self.APPOINTMENTS_PATH):
+            store.import_csv(self.APPOINTMENTS_PATH)
+        return store
 
-        # Step 3: If no match found, provide a catch-all response
-        return self.catch_all_response(corrected_query)
+    def load_scheduler(self):
+        scheduler = Scheduler()
+        for doctor, specialty in self.get_doctor_roster().items():
+            scheduler.add_doctor(doctor, specialty)
+
+        # Block out the slots of appointments that are already scheduled
+        for appointment in self.appointments.between(datetime.now(), datetime.max):
+            try:
+                scheduler.book(appointment.doctor, appointment.start, appointment.duration)
+            except (KeyError, ValueError, BookingConflict):
+                # Doctors outside the roster or times off the booking grid
+                pass
+        return scheduler
+
+    def get_booking_response(self, title, doctor, now=None):
+        appointment_line = self.get_response_fragments()["appointment_line"]
+        try:
+            slots = self.scheduler.next_free_slots(doctor=doctor, after=now, count=3)
+        except KeyError:
+            # Not a doctor we schedule for; the appointment desk can still help
+            return (
+                f"Yes, you can schedule an appointment with {title} {doctor}. Please call our appointment desk at "
+                f"{appointment_line} or use our online patient portal. When would you prefer to see {title} {doctor}?"
+            )
+
+        name = self.scheduler.calendar(doctor).name
+        if not slots:
+            return (
+                f"{name} has no open appointments in the next 90 days. Please call {appointment_line} "
+                "to join the waiting list or to see another doctor in the same specialty."
+            )
+        lines = [f"• {slot.start:%A, %B %d at %I:%M %p}" for slot in slots]
+        return (
+            f"Yes, you can schedule an appointment with {name}. The next available times are:\n"
+            + "\n".join(lines)
+            + f"\n\nTo book one of these, use our online patient portal or call {appointment_line}."
+        )
+
+    def book_appointment(self, user_name, doctor, start, duration=30, expected_version=None):
+        """Book a slot and add it to the appointment store.
+
+        Raises scheduling.BookingConflict (or StaleBooking when expected_version
+        no longer matches) if the slot was taken, and ValueError for times off
+        the booking grid.
+        """
+        calendar = self.scheduler.calendar(doctor)
+        self.scheduler.book(doctor, start, duration, expected_version)
+        return self.appointments.add(user_name, calendar.name, start, duration, calendar.specialty)
+
+    def check_medication_availability(self, medication):
+        pharmacy_line = self.get_response_fragments()["pharmacy_line"]
+        generic, how = self.pharmacy.find_in(medication)
+        if generic is None:
+            # Without its filler words the slot is the drug name itself, so it may be completed or corrected
+            # ("any amox", "famotadine"); whole sentences are never matched this loosely
+            name = " ".join(word for word in medication.split() if word.lower() not in MEDICATION_FILLER_WORDS)
+            if name:
+                generic, how = self.pharmacy.find(name)
+        if generic is None:
+            return (
+                f"I couldn't find \"{medication.strip()}\" in our pharmacy catalog. Please check the spelling, "
+                f"or call our pharmacy team at {pharmacy_line} and they can check for you or order it."
+            )
+
+        brands = ", ".join(sorted(self.pharmacy.brands[generic]))
+        name = generic.title() + (f" ({brands})" if brands else "")
+        available = [f"{sku.strength} {sku.form}" for sku, quantity in self.pharmacy.availability(generic) if quantity > 0]
+        if available:
+            return (
+                f"Yes, our pharmacy has {name} in stock: {', '.join(available)}. "
+                f"A valid prescription is required for prescription medications. For questions, call {pharmacy_line}."
+            )
+        return (
+            f"{name} is in our catalog but currently out of stock. Our pharmacy team can order it for you "
+            f"(usually within 1-2 business days) or suggest an alternative. Please call {pharmacy_line}."
+        )
+
+    def get_medications_for_condition(self, condition):
+        pharmacy_line = self.get_response_fragments()["pharmacy_line"]
+        generics = self.pharmacy.for_condition(condition)
+        if not generics:
+            return (
+                f"I don't have medication information for \"{condition.strip()}\". Your doctor or our pharmacists "
+                f"can advise you on treatment options; call our pharmacy team at {pharmacy_line}."
+            )
+
+        lines = [
+            f"• {generic.title()}" + ("" if self.pharmacy.in_stock(generic) else " (currently out of stock)")
+            for generic in generics
+        ]
+        return (
+            f"Our pharmacy carries these medications used for {condition.strip()}:\n" + "\n".join(lines)
+            + "\n\nWhich medication is right for you depends on your health and other medications, "
+            "so please talk to your doctor or pharmacist before starting any of them."
+        )
+
+    def recommend_specialist(self, condition):
+        referral_line = self.get_response_fragments()["referral_line"]
+        recommendations = self.directory.recommend(condition)
+        if not recommendations:
+            return (
+                f"I'm not sure which specialist treats \"{condition.strip()}\". A primary care physician is a good "
+                "place to start: they can evaluate your symptoms and refer you to the right specialist. Our physician "
+                f"referral line at {referral_line} can also help you find the right doctor."
+            )
+
+        best = recommendations[0]
+        lines = [f"For {best.term}, we recommend seeing {article(best.specialist)} {best.specialist} ({best.specialty})."]
+        doctors = self.directory.doctors(best.specialty)
+        if doctors:
+            lines.append(f"Our {best.specialty} physicians: {', '.join(doctor.name for doctor in doctors)}.")
+        else:
+            lines.append(f"Call our physician referral line at {referral_line} to be matched with {article(best.specialist)} {best.specialist}.")
+        if len(recommendations) > 1:
+            others = " or ".join(f"{article(other.specialist)} {other.specialist}" for other in recommendations[1:])
+            lines.append(f"Depending on your symptoms, {others} may also be appropriate.")
+        lines.append("If your symptoms are severe or came on suddenly, call 911 or go to the nearest emergency room.")
+        return " ".join(lines)
+
+    def get_specialists_response(self, condition, now=None):
+        referral_line = self.get_response_fragments()["referral_line"]
+        specialty = self.directory.specialty(condition)
+        if specialty is None:
+            return (
+                f"I couldn't match \"{condition.strip()}\" to one of our specialties. Please call our physician "
+                f"referral line at {referral_line} and we'll help you find the right specialist."
+            )
+        doctors = self.directory.doctors(specialty)
+        if not doctors:
+            return (
+                f"Our {specialty} physicians don't take online bookings yet. Please call our physician referral "
+                f"line at {referral_line} to see who is available."
+            )
+
+        lines = []
+        for doctor in doctors:
+            slots = self.scheduler.next_free_slots(doctor=doctor.name, after=now, count=1)
+            availability = f"next available {slots[0].start:%A, %B %d at %I:%M %p}" if slots else "no openings in the next 90 days"
+            if not doctor.accepting_new:
+                availability += " (not accepting new patients)"
+            lines.append(f"• {doctor.name}: {availability}")
+        return (
+            f"These {specialty} physicians are available:\n" + "\n".join(lines)
+            + f"\n\nTo book, ask me to schedule an appointment with one of them or call {referral_line}."
+        )
+
+    def refresh_stays(self):
+        """Pick up discharge records appended to the admissions file; returns the number added"""
+        return self.stays.refresh()
+
+    def get_average_stay_duration(self, condition):
+        condition, stats = self.stays.find(condition)
+        if stats is None:
+            return (
+                "Length of stay depends on your condition, any procedures, your overall health and how quickly you "
+                "recover. Your doctor can give you the best estimate before admission, and the care team will update "
+                "it during your stay as discharge planning begins."
+            )
+        return (
+            f"Based on {stats.count:,} recent stays at our hospital, patients admitted for {condition} stay "
+            f"{stats.mean:.1f} days on average (median {stats.median:.1f} days), and 9 in 10 go home within "
+            f"{stats.p90:.1f} days. Your own stay depends on your health, any complications and how quickly you "
+            "recover; your care team will start discharge planning early and keep you updated."
+        )
+
+    def patient_coverage(self, user_name, text):
+        """Coverage of the patient a user is, or None.
+
+        A name alone is not enough to share someone's insurance: the query
+        text must confirm the patient with a date of birth or an MRN.
+        """
+        mrn = MRN_RE.search(text or "")
+        mrn = f"MRN{mrn.group(1)}" if mrn else None
+        dob = next((entity.value for entity in extract_entities(text or "") if entity.type == "date" and entity.value), None)
+        if (mrn is None and dob is None) or not (user_name or mrn):
+            return None
+        patient = self.patients.find(user_name or None, dob, mrn)
+        return self.network.coverage.get(patient.mrn) if patient else None
+
+    def identity_request(self):
+        return (
+            "To protect your privacy, I can only share your insurance details once you confirm who you are. Please "
+            "include your date of birth or MRN, e.g. \"is my insurance active? My date of birth is 02/14/1985\"."
+        )
+
+    def benefits_text(self, coverage):
+        """Live benefits from the eligibility service, or "" when it is not configured"""
+        if self.eligibility is None:
+            return ""
+        try:
+            benefits = self.eligibility.check(coverage.payer, coverage.member_id)
+        except EligibilityError:
+            return " I couldn't reach your insurer to confirm your current benefits; please try again later."
+        if not benefits.active:
+            insurance_line = self.get_response_fragments()["insurance_line"]
+            return (
+                " However, your insurer reports this coverage as not active. Please contact your insurer or our "
+                f"insurance verification team at {insurance_line} before your visit."
+            )
+        return (
+            f" Your insurer confirms the coverage is active: your visit copay is ${benefits.copay} and "
+            f"${benefits.deductible_remaining:,} of your deductible remains."
+        )
+
+    def get_accepted_insurance_response(self):
+        insurance_line = self.get_response_fragments()["insurance_line"]
+        lines = [f"• {payer} ({', '.join(plans)})" for payer, plans in self.network.payers.items()]
+        return (
+            "We accept these insurance plans:\n" + "\n".join(lines)
+            + "\n\nNetwork participation varies by physician; ask me, for example, \"is Dr. Smith in network with "
+            "Aetna?\" For verification of your specific plan coverage, please contact our insurance verification "
+            f"department at {insurance_line} with your policy information before your visit."
+        )
+
+    def get_doctor_insurance_response(self):
+        doctors = self.network.doctors
+        lines = []
+        for payer, plans in self.network.payers.items():
+            in_network = set().union(*(self.network.plans[(payer, plan)] for plan in plans))
+            lines.append(f"• {payer}: {len(in_network)} of {len(doctors)} physicians in network")
+        return (
+            "Our physicians participate in these insurance networks:\n" + "\n".join(lines)
+            + "\n\nParticipation varies by physician and plan. Ask me \"is Dr. Smith in network with my insurance?\" "
+            "to check a specific doctor, and verify with your insurance company before scheduling."
+        )
+
+    def get_network_response(self, doctor_text, payer_text, user_name=None, text=""):
+        doctor = self.network.doctor(doctor_text)
+        if doctor is None:
+            return (
+                f"I don't have network information for {doctor_text.strip()}. I can check these physicians: "
+                f"{', '.join(self.network.doctors.values())}."
+            )
+        payer, plan = self.network.find_payer(payer_text)
+        # "my insurance", no insurer, or the insurer on file without a plan: use the patient's plan
+        coverage = self.patient_coverage(user_name, text) if plan is None else None
+        if coverage is not None and payer not in (None, coverage.payer):
+            coverage = None
+        if coverage is not None:
+            payer, plan = coverage.payer, coverage.plan
+        elif payer is None:
+            payers = ", ".join(dict.fromkeys(payer for payer, plan in self.network.networks(doctor)))
+            return (
+                f"Which insurance do you have? {doctor} is in network with plans from "
+                f"{payers or 'none of the payers we list'}. If you're a registered patient, include your date of "
+                "birth or MRN and I can check your own plan."
+            )
+
+        plans = self.network.in_network(doctor, payer, plan)
+        if plan:
+            yours = "your" if coverage else "the"
+            if plans:
+                response = f"Yes, {doctor} is in network with {yours} {payer} {plan} plan."
+            else:
+                response = f"No, {doctor} is not in network with {yours} {payer} {plan} plan."
+                others = self.network.in_network(doctor, payer)
+                if others:
+                    response += f" {doctor} is in network with {payer} {', '.join(others)}."
+                response += " Out-of-network visits usually cost more; ask me about out-of-network coverage."
+        elif plans:
+            response = f"Yes, {doctor} is in network with these {payer} plans: {', '.join(plans)}."
+        else:
+            response = f"No, {doctor} is not in network with any {payer} plan we list."
+        if coverage and plans:
+            response += self.benefits_text(coverage)
+        return response
+
+    def get_eligibility_response(self, user_name=None, text=""):
+        insurance_line = self.get_response_fragments()["insurance_line"]
+        if MRN_RE.search(text or "") is None and not any(entity.type == "date" for entity in extract_entities(text or "")):
+            return self.identity_request()
+        coverage = self.patient_coverage(user_name, text)
+        if coverage is None:
+            return (
+                "I don't have insurance on file for you. Please bring your insurance card to registration, or "
+                f"call our insurance verification team at {insurance_line} to add or check your coverage."
+            )
+        return (
+            f"You're covered by {coverage.payer} {coverage.plan} (member ID ending {coverage.member_id[-4:]})."
+            + self.benefits_text(coverage)
+        )
+
+    def refresh_census(self):
+        """Apply bed events appended to the event log; returns the number read"""
+        return self.census.refresh()
+
+    def checkpoint_census(self):
+        """Save the bed census to CENSUS_SNAPSHOT_PATH so a restart replays only newer events"""
+        if self.CENSUS_SNAPSHOT_PATH:
+            self.census.checkpoint(self.CENSUS_SNAPSHOT_PATH)
+
+    def find_census_unit(self, text):
+        """Return (unit name, Occupancy) for a unit named in free text; (None, hospital Occupancy) when
+        the text names no unit or the hospital, or (None, None) for a place that is not an inpatient unit"""
+        unit = self.census.find_unit(text or "")
+        if unit is not None:
+            return unit, self.census.occupancy(unit)
+        words = set(re.findall(r"[a-z]+", (text or "").lower())) - {"the", "your", "this", "right", "now", "today"}
+        if not words or words & {"hospital", "inpatient", "whole", "all", "units", "floors"}:
+            return None, self.census.occupancy()
+        return None, None
+
+    def unit_list_text(self):
+        return ", ".join(self.census.units)
+
+    @staticmethod
+    def unit_text(unit, article="the"):
+        # "the ICU", "the Oncology unit"
+        return f"{article} {unit}" if unit.isupper() else f"{article} {unit} unit"
+
+    def get_bed_availability(self, text):
+        unit, occupancy = self.find_census_unit(text)
+        if occupancy is None:
+            return (
+                f"I track inpatient beds for these units: {self.unit_list_text()}. Which one would you like to know "
+                "about? For the Emergency Department, ask me about the ER wait time."
+            )
+        place = self.unit_text(unit, "The") if unit else "Our hospital"
+        if occupancy.available == 0:
+            status = f"{place} is full right now: all {occupancy.beds} beds are occupied."
+        else:
+            status = (
+                f"{place} has {occupancy.available} of {occupancy.beds} "
+                f"{'bed' if occupancy.beds == 1 else 'beds'} available right now ({occupancy.occupied} occupied)."
+            )
+        return (
+            f"{status} Availability changes throughout the day with admissions and discharges. Admissions are "
+            "arranged by your physician or the Emergency Department, and our bed management team assigns rooms by "
+            "medical need."
+        )
+
+    def get_occupancy_response(self, text):
+        unit, occupancy = self.find_census_unit(text)
+        if occupancy is None:
+            return f"I track occupancy for these inpatient units: {self.unit_list_text()}."
+        if unit:
+            return (
+                f"{self.unit_text(unit, 'The')} is at {occupancy.occupied / occupancy.beds:.0%} occupancy: {occupancy.occupied} of "
+                f"{occupancy.beds} beds occupied, {occupancy.available} available."
+            )
+        lines = [
+            f"• {unit.name}: {unit.occupied}/{unit.beds} occupied, {unit.beds - unit.occupied} available"
+            for unit in self.census.units.values()
+        ]
+        return (
+            f"Our hospital is at {occupancy.occupied / occupancy.beds:.0%} occupancy: {occupancy.occupied} of "
+            f"{occupancy.beds} inpatient beds are occupied and {occupancy.available} are available.\n" + "\n".join(lines)
+        )
+
+    def get_unit_visit_response(self, text):
+        unit, occupancy = self.find_census_unit(text)
+        if occupancy is None:
+            return (
+                f"I can tell you how busy these inpatient units are: {self.unit_list_text()}. For the Emergency "
+                "Department, ask me about the ER wait time."
+            )
+        share = occupancy.occupied / occupancy.beds
+        busy = "very busy" if share >= 0.9 else "busy" if share >= 0.7 else "not very busy"
+        place = self.unit_text(unit, "The") if unit else "The hospital"
+        response = f"{place} is {busy} right now: {occupancy.occupied} of {occupancy.beds} beds are occupied."
+        if unit:
+            response += f" Visiting in {self.unit_text(unit)}: {self.census.units[unit].visiting}."
+        else:
+            response += " General visiting hours are 8:00 AM to 8:00 PM; some units have their own rules."
+        if share >= 0.9:
+            response += " Please keep visits short and limit the number of visitors so staff can care for patients."
+        return response
+
+    def triage_check_in(self, symptoms, user_name=None):
+        """Place a kiosk user in the ER queue from their self-reported symptoms"""
+        emergency_line = self.get_response_fragments()["emergency_line"]
+        if not symptoms or not symptoms.strip():
+            return (
+                "I can check you in for the Emergency Department. Please tell me your symptoms, for example "
+                "\"check me in to the ER with chest pain\". If this is life-threatening, call 911 or alert the nearest "
+                "staff member now."
+            )
+        acuity = assess(symptoms)
+        entry = self.triage.check_in(user_name, acuity)
+        if entry.level == 1:
+            return (
+                "⚠️ Your symptoms need immediate care. Alert the nearest staff member or the front desk right now; "
+                "you have been placed at the front of the queue. If you are not at the hospital, call 911."
+            )
+
+        ahead, wait = self.triage.position(entry.ticket)
+        reasons = f" (reported: {', '.join(entry.reasons)})" if entry.reasons else ""
+        return (
+            f"You're checked in{', ' + user_name if user_name else ''}, ticket #{entry.ticket}. Your preliminary "
+            f"triage level is {entry.level} ({LEVEL_NAMES[entry.level]}){reasons}. "
+            f"{ahead} {'patient is' if ahead == 1 else 'patients are'} ahead of you, with an estimated wait of "
+            f"{wait_text(wait)}. A triage nurse will confirm your level shortly. If your symptoms get worse, tell "
+            f"staff immediately or call {emergency_line}."
+        )
+
+    def get_er_wait_response(self):
+        snapshot = self.triage.snapshot()
+        waiting = sum(count for count, wait in snapshot.values())
+        lines = [
+            f"• Level {level} ({LEVEL_NAMES[level]}): {wait_text(wait)}"
+            for level, (count, wait) in snapshot.items() if level > 1
+        ]
+        return (
+            f"{waiting} {'patient is' if waiting == 1 else 'patients are'} waiting in our Emergency Department. "
+            "Patients are seen by medical urgency, not arrival time; life-threatening conditions are seen "
+            "immediately. Estimated wait for someone arriving now:\n" + "\n".join(lines)
+            + "\n\nYou can check in at the kiosk by describing your symptoms, e.g. \"check me in to the ER with a "
+            "sprained ankle\". For emergencies, call 911."
+        )
+
+    def get_procedure_cost_estimate(self, procedure):
+        counseling_line = self.get_response_fragments()["financial_services_line"]
+        item = self.prices.find(procedure)
+        if item is None:
+            return (
+                f"I don't have a price listed for \"{procedure.strip()}\". Our financial counselors can give you "
+                f"a personalized estimate; please call {counseling_line}."
+            )
+        return (
+            f"The standard charge for {item.description} is ${item.price:,.2f} before insurance. "
+            "What you pay depends on your insurance plan, deductible and any additional services. "
+            f"For a personalized estimate, contact our financial counselors at {counseling_line}."
+        )
+
+    def get_lab_test_cost(self, test):
+        lab_line = self.get_response_fragments()["lab_line"]
+        item = self.prices.find(test, "lab")
+        if item is None:
+            return (
+                f"I don't have a price listed for a {test.strip()} test. Please call our laboratory at {lab_line} "
+                "for pricing, or ask your insurance provider about lab coverage."
+            )
+        return (
+            f"The standard charge for a {item.description} test is ${item.price:,.2f} before insurance. "
+            "Most insurance plans cover medically necessary lab tests ordered by your doctor. "
+            f"For questions about lab pricing, call our laboratory at {lab_line}."
+        )
+
+    def get_lab_test_preparation(self, test):
+        lab_line = self.get_response_fragments()["lab_line"]
+        item = self.prices.find(test)
+        if item is None:
+            return (
+                f"I don't have preparation instructions for a {test.strip()} test. Please follow your doctor's "
+                f"instructions or call our laboratory at {lab_line}."
+            )
+        return (
+            f"To prepare for your {item.description}: {item.preparation}\n\n"
+            f"If you have questions or take medications that may affect the results, call our laboratory at {lab_line}."
+        )
+
+    def get_user_appointments(self, user_name, now=None):
+        appointment_line = self.get_response_fragments()["appointment_line"]
+        if not user_name:
+            return "I'd be happy to look up your appointments. Could you please tell me your name first?"
+
+        upcoming = self.appointments.upcoming_for_patient(user_name, now, limit=5)
+        if upcoming:
+            lines = [
+                f"• {appointment.start:%A, %B %d, %Y at %I:%M %p} with {appointment.doctor}"
+                + (f" ({appointment.department})" if appointment.department else "")
+                for appointment in upcoming
+            ]
+            return (
+                f"Here are your upcoming appointments, {user_name}:\n" + "\n".join(lines)
+                + f"\n\nTo cancel or reschedule, please call {appointment_line} at least 24 hours in advance."
+            )
+
+        last = self.appointments.last_for_patient(user_name, now)
+        if last:
+            return (
+                f"You don't have any upcoming appointments, {user_name}. Your last appointment was on "
+                f"{last.start:%B %d, %Y} with {last.doctor}. To schedule a new one, please call {appointment_line}."
+            )
+        return (
+            f"I couldn't find any appointments under the name {user_name}. "
+            f"To schedule an appointment, please call {appointment_line} or use our patient portal."
+        )
 
     def catch_all_response(self, query):
         responses = [
@@ -101,11 +1147,11 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:how|what)(?:'s| is| are) (?:the|your) (?:process|steps|procedure) (?:to|for) (?:book|schedule|make) (?:an |a )?appointment",
-                "response": lambda match, user: "To schedule an appointment at our hospital, you can:\n1. Call our appointment line at (555) 123-4567\n2. Use our patient portal at hospital.example.com\n3. Visit the front desk in person\n\nYou'll need your insurance information and patient ID if you're a returning patient."
+                "response": "To schedule an appointment at our hospital, you can:\n1. Call our appointment line at {appointment_line}\n2. Use our patient portal at {website}\n3. Visit the front desk in person\n\nYou'll need your insurance information and patient ID if you're a returning patient."
             },
             {
                 "regex": r"(?:can|could) (?:I|you) (?:book|schedule|make) (?:an |a )?appointment (?:with|for) (Dr\.|Doctor) ([A-Za-z]+)",
-                "response": lambda match, user: f"Yes, you can schedule an appointment with {match.group(1)} {match.group(2)}. Please call our appointment desk at (555) 123-4567 or use our online patient portal. When would you prefer to see {match.group(1)} {match.group(2)}?"
+                "response": lambda match, user: self.get_booking_response(match.group(1), match.group(2))
             },
             {
                 "regex": r"(?:show|tell|list|what are) my (?:upcoming |scheduled |future )?appointments",
@@ -113,7 +1159,7 @@ class HospitalChatbot:
             },
             {
                 "regex": r"(?:I want to|I need to|I would like to|I'd like to) (?:cancel|reschedule) (?:my|an) appointment",
-                "response": lambda match, user: "To cancel or reschedule an appointment, please call (555) 123-4567 at least 24 hours in advance. Alternatively, you can log into your patient portal and modify your appointment there. Is there a specific appointment you need to change?"
+                "response": "To cancel or reschedule an appointment, please call {appointment_line} at least 24 hours in advance. Alternatively, you can log into your patient portal and modify your appointment there. Is there a specific appointment you need to change?"
             },
             {
                 "regex": r"(?:what|which) (?:doctors|specialists|physicians) (?:are|do you have) (?:available|specialized) (?:for|in) ([\w\s]+)",
@@ -121,23 +1167,23 @@ class HospitalChatbot:
             },
             {
                 "regex": r"(?:how far|how long) in advance (?:should|do I need to|can I|must I) (?:book|schedule|make) (?:an |a )?appointment",
-                "response": lambda match, user: "For routine check-ups and non-urgent care, we recommend scheduling 2-3 weeks in advance. Specialist appointments may require 4-6 weeks advance booking. Urgent care visits can often be accommodated same-day or next-day depending on availability."
+                "response": "For routine check-ups and non-urgent care, we recommend scheduling 2-3 weeks in advance. Specialist appointments may require 4-6 weeks advance booking. Urgent care visits can often be accommodated same-day or next-day depending on availability."
             },
             {
                 "regex": r"(?:what|which) (?:documents|things|paperwork|items) (?:do I need|should I bring|are required) (?:for|to) (?:my|an) appointment",
-                "response": lambda match, user: "Please bring the following to your appointment:\n1. Photo ID\n2. Insurance card\n3. List of current medications\n4. Medical history forms (if new patient)\n5. Any relevant medical records or test results\n6. Payment method for copays\n\nArriving 15 minutes early helps with the check-in process."
+                "response": "Please bring the following to your appointment:\n1. Photo ID\n2. Insurance card\n3. List of current medications\n4. Medical history forms (if new patient)\n5. Any relevant medical records or test results\n6. Payment method for copays\n\nArriving 15 minutes early helps with the check-in process."
             },
             {
                 "regex": r"(?:how long|what duration|how much time) (?:does|will|is) (?:an|a typical|the average) appointment (?:take|last|require)",
-                "response": lambda match, user: "Most routine appointments last 15-30 minutes. Initial consultations and specialist appointments typically take 30-60 minutes. Complex procedures may require more time. We'll do our best to respect your schedule, though occasional delays can occur if emergencies arise."
+                "response": "Most routine appointments last 15-30 minutes. Initial consultations and specialist appointments typically take 30-60 minutes. Complex procedures may require more time. We'll do our best to respect your schedule, though occasional delays can occur if emergencies arise."
             },
             {
                 "regex": r"(?:what happens|what should I expect|what's the process) (?:if|when) (?:I|someone) miss(?:es)? (?:an|my|their) appointment",
-                "response": lambda match, user: "If you miss an appointment without prior notification, our policy includes:\n1. A missed appointment fee of $25-$50 may apply (varies by department)\n2. Documentation in your medical record\n3. After three missed appointments, we may require prepayment for future visits\n\nWe understand emergencies happen, so please call us as soon as possible if you can't make your appointment."
+                "response": "If you miss an appointment without prior notification, our policy includes:\n1. A missed appointment fee of $25-$50 may apply (varies by department)\n2. Documentation in your medical record\n3. After three missed appointments, we may require prepayment for future visits\n\nWe understand emergencies happen, so please call us as soon as possible if you can't make your appointment."
             },
             {
                 "regex": r"(?:can|do) (?:I|you|we) (?:book|schedule|make) (?:an |a )?appointment (?:online|through the website|through the portal|through the app)",
-                "response": lambda match, user: "Yes, you can schedule appointments online through our patient portal at hospital.example.com/portal. After logging in, select 'Schedule Appointment,' choose your provider and preferred time slots. The system will show available options and allow you to confirm your selection. You'll receive an email confirmation afterward."
+                "response": "Yes, you can schedule appointments online through our patient portal at {website}/portal. After logging in, select 'Schedule Appointment,' choose your provider and preferred time slots. The system will show available options and allow you to confirm your selection. You'll receive an email confirmation afterward."
             },
             # Add 90+ more appointment patterns here
         ]
@@ -146,43 +1192,43 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:how|what)(?:'s| is) (?:the|your) (?:process|procedure) (?:for|to) (?:pay|settle|clear) (?:my|a|the) (?:bill|invoice|payment)",
-                "response": lambda match, user: "You can pay your hospital bill through several methods:\n1. Online through our patient portal\n2. By phone at (555) 987-6543\n3. By mail to Hospital Billing Dept, 123 Main St\n4. In person at our billing office\n\nWe accept credit cards, checks, and payment plans for balances over $200."
+                "response": "You can pay your hospital bill through several methods:\n1. Online through our patient portal\n2. By phone at {billing_line}\n3. By mail to Hospital Billing Dept, 123 Main St\n4. In person at our billing office\n\nWe accept credit cards, checks, and payment plans for balances over $200."
             },
             {
                 "regex": r"(?:I have|there is|there's) (?:a|an) (?:issue|problem|error|mistake|discrepancy) (?:with|in|on) my bill",
-                "response": lambda match, user: "I'm sorry to hear about the issue with your bill. Please contact our billing department at (555) 987-6543 Monday-Friday, 8am-5pm. Have your account number and the specific concerns ready. Our billing specialists can review charges, explain any confusing items, and correct errors if needed."
+                "response": "I'm sorry to hear about the issue with your bill. Please contact our billing department at {billing_line} Monday-Friday, 8am-5pm. Have your account number and the specific concerns ready. Our billing specialists can review charges, explain any confusing items, and correct errors if needed."
             },
             {
                 "regex": r"(?:do you|does the hospital) (?:offer|provide|have) (?:payment plans|installment plans|payment options)",
-                "response": lambda match, user: "Yes, we offer flexible payment plans for medical bills. For balances over $200, you can spread payments over 3-24 months, depending on the total amount. There's no interest for plans completed within 12 months. To set up a payment plan, contact our financial counselors at (555) 987-6543 or visit the billing office."
+                "response": "Yes, we offer flexible payment plans for medical bills. For balances over $200, you can spread payments over 3-24 months, depending on the total amount. There's no interest for plans completed within 12 months. To set up a payment plan, contact our financial counselors at {billing_line} or visit the billing office."
             },
             {
                 "regex": r"(?:what|which) (?:insurance|insurance plans|insurance providers) (?:do you|does the hospital) (?:accept|take|work with)",
-                "response": lambda match, user: "We accept most major insurance plans including:\n- Blue Cross Blue Shield\n- Aetna\n- Cigna\n- UnitedHealthcare\n- Medicare and Medicaid\n- Humana\n- Kaiser Permanente\n\nFor specific questions about your insurance coverage, please contact our insurance verification department at (555) 456-7890."
+                "response": lambda match, user: self.get_accepted_insurance_response()
             },
             {
                 "regex": r"(?:how|where|what) (?:can|do) (?:I|you) (?:view|see|access|get|obtain) (?:my|the) (?:bill|invoice|statement) (?:online|electronically|digitally)",
-                "response": lambda match, user: "You can view and pay your bill online through our secure patient portal at hospital.example.com/portal. After logging in with your credentials, select 'Billing' from the menu. There, you'll see all current and past statements, payment history, and options to make payments. If you need help accessing your online account, call (555) 987-6543."
+                "response": "You can view and pay your bill online through our secure patient portal at {website}/portal. After logging in with your credentials, select 'Billing' from the menu. There, you'll see all current and past statements, payment history, and options to make payments. If you need help accessing your online account, call {billing_line}."
             },
             {
-                "regex": r"(?:how much|what) (?:does|is the cost of|will it cost for) (?:a|an) ([a-zA-Z\s]+)(?:\?)?",
+                "regex": r"(?:how much|what) (?:does|is the cost of|will it cost for) (?:a|an) ([a-zA-Z\s-]+)(?:\?)?",
                 "response": lambda match, user: self.get_procedure_cost_estimate(match.group(1))
             },
             {
                 "regex": r"(?:what|which) (?:financial assistance|financial aid|charity care|help paying) (?:options|programs|resources) (?:are available|do you offer|does the hospital provide)",
-                "response": lambda match, user: "We offer several financial assistance programs:\n1. Charity Care for patients below 300% of federal poverty level\n2. Sliding scale discounts based on income\n3. Catastrophic care assistance for large bills\n4. Payment plans without interest\n5. Help applying for Medicaid\n\nTo apply, request a Financial Assistance Application from our Financial Counseling office at (555) 123-7890."
+                "response": "We offer several financial assistance programs:\n1. Charity Care for patients below 300% of federal poverty level\n2. Sliding scale discounts based on income\n3. Catastrophic care assistance for large bills\n4. Payment plans without interest\n5. Help applying for Medicaid\n\nTo apply, request a Financial Assistance Application from our Financial Counseling office at (555) 123-7890."
             },
             {
                 "regex": r"(?:when|how often|how frequently) (?:will I|do you|does the hospital) (?:receive|send|issue) (?:bills|invoices|statements)",
-                "response": lambda match, user: "Hospital bills are typically issued within 30 days after services are rendered or after insurance processing. Monthly statements are sent if you have an outstanding balance. You can choose paper statements by mail or electronic statements through our patient portal. If you have a payment plan, statements will show your monthly payment amount and remaining balance."
+                "response": "Hospital bills are typically issued within 30 days after services are rendered or after insurance processing. Monthly statements are sent if you have an outstanding balance. You can choose paper statements by mail or electronic statements through our patient portal. If you have a payment plan, statements will show your monthly payment amount and remaining balance."
             },
             {
                 "regex": r"(?:what|which) (?:information|details|data) (?:is|are) (?:included|shown|present) (?:on|in) (?:my|the) (?:bill|invoice|statement)",
-                "response": lambda match, user: "Your hospital bill includes:\n1. Patient and guarantor information\n2. Service dates and descriptions\n3. Procedure and diagnosis codes\n4. Itemized charges for services\n5. Insurance payments and adjustments\n6. Patient responsibility amount\n7. Payment due date\n8. Payment options\n\nIf you need a more detailed explanation of any charges, our billing specialists can help at (555) 987-6543."
+                "response": "Your hospital bill includes:\n1. Patient and guarantor information\n2. Service dates and descriptions\n3. Procedure and diagnosis codes\n4. Itemized charges for services\n5. Insurance payments and adjustments\n6. Patient responsibility amount\n7. Payment due date\n8. Payment options\n\nIf you need a more detailed explanation of any charges, our billing specialists can help at {billing_line}."
             },
             {
                 "regex": r"(?:how|what) (?:is|about) (?:the|your) (?:self-pay|uninsured|no insurance|cash) (?:discount|rate|pricing)",
-                "response": lambda match, user: "We offer a self-pay discount of 30-40% for patients without insurance who pay at the time of service or establish a payment plan. Additional financial assistance may be available based on income. Our financial counselors can provide a cost estimate before your procedure and help determine your eligibility for discounts. Contact them at (555) 234-5678."
+                "response": "We offer a self-pay discount of 30-40% for patients without insurance who pay at the time of service or establish a payment plan. Additional financial assistance may be available based on income. Our financial counselors can provide a cost estimate before your procedure and help determine your eligibility for discounts. Contact them at (555) 234-5678."
             },
             # Add 90+ more billing patterns here
         ]
@@ -191,39 +1237,39 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:pharmacy|hospital pharmacy) (?:hours|timing|schedule)",
-                "response": lambda match, user: "Our hospital pharmacy is open:\n- Monday-Friday: 8:00 AM to 9:00 PM\n- Saturday: 9:00 AM to 6:00 PM\n- Sunday: 10:00 AM to 5:00 PM\n\nThe inpatient pharmacy for admitted patients operates 24/7. The outpatient pharmacy in the main lobby serves all visitors and discharged patients."
+                "response": "Our hospital pharmacy is open:\n- Monday-Friday: 8:00 AM to 9:00 PM\n- Saturday: 9:00 AM to 6:00 PM\n- Sunday: 10:00 AM to 5:00 PM\n\nThe inpatient pharmacy for admitted patients operates 24/7. The outpatient pharmacy in the main lobby serves all visitors and discharged patients."
             },
             {
                 "regex": r"(?:can|do) (?:I|you) (?:get|refill|fill) (?:my|a) prescription (?:at|from|through) (?:the|your) (?:hospital|hospital's) pharmacy",
-                "response": lambda match, user: "Yes, you can fill or refill prescriptions at our hospital pharmacy. We accept prescriptions from any provider, not just our hospital doctors. For refills, you can call (555) 234-6789, use our mobile app, or visit in person. Please allow 20-30 minutes for your prescription to be filled unless it's a specialty medication."
+                "response": "Yes, you can fill or refill prescriptions at our hospital pharmacy. We accept prescriptions from any provider, not just our hospital doctors. For refills, you can call {pharmacy_line}, use our mobile app, or visit in person. Please allow 20-30 minutes for your prescription to be filled unless it's a specialty medication."
             },
             {
                 "regex": r"(?:how|what)(?:'s| is) (?:the|your) (?:process|procedure) (?:for|to) (?:refill|renew) (?:my|a) prescription",
-                "response": lambda match, user: "To refill a prescription at our pharmacy:\n1. Call our automated refill line at (555) 234-6789 and enter your prescription number\n2. Use our hospital app and select 'Prescription Refill'\n3. Visit the pharmacy in person with your prescription bottle\n4. Ask your doctor to send a new refill authorization electronically\n\nPlease request refills 2-3 days before you run out of medication."
+                "response": "To refill a prescription at our pharmacy:\n1. Call our automated refill line at {pharmacy_line} and enter your prescription number\n2. Use our hospital app and select 'Prescription Refill'\n3. Visit the pharmacy in person with your prescription bottle\n4. Ask your doctor to send a new refill authorization electronically\n\nPlease request refills 2-3 days before you run out of medication."
             },
             {
                 "regex": r"(?:do you|does the pharmacy) (?:deliver|ship|mail|send) (?:medications|prescriptions|medicine)",
-                "response": lambda match, user: "Yes, our pharmacy offers medication delivery services through several options:\n1. Free home delivery within a 10-mile radius for orders over $25\n2. Mail order service for maintenance medications (usually 90-day supplies)\n3. Bedside delivery for patients being discharged\n\nFor delivery, call (555) 234-6789. Please allow 1-2 business days for local delivery and 3-5 days for mail orders."
+                "response": "Yes, our pharmacy offers medication delivery services through several options:\n1. Free home delivery within a 10-mile radius for orders over $25\n2. Mail order service for maintenance medications (usually 90-day supplies)\n3. Bedside delivery for patients being discharged\n\nFor delivery, call {pharmacy_line}. Please allow 1-2 business days for local delivery and 3-5 days for mail orders."
             },
             {
                 "regex": r"(?:what|which) (?:insurance|insurance plans|insurance providers) (?:do you|does the pharmacy) (?:accept|take|work with)",
-                "response": lambda match, user: "Our pharmacy accepts most major prescription insurance plans including:\n- Express Scripts\n- CVS Caremark\n- OptumRx\n- Blue Cross Blue Shield\n- Medicare Part D\n- Medicaid\n- Tricare\n\nWe also work with most major medical insurance providers. If you have questions about your specific coverage, please call our pharmacy team at (555) 234-6789."
+                "response": "Our pharmacy accepts most major prescription insurance plans including:\n- Express Scripts\n- CVS Caremark\n- OptumRx\n- Blue Cross Blue Shield\n- Medicare Part D\n- Medicaid\n- Tricare\n\nWe also work with most major medical insurance providers. If you have questions about your specific coverage, please call our pharmacy team at {pharmacy_line}."
             },
             {
-                "regex": r"(?:do you|does the pharmacy) (?:have|carry|stock) ([a-zA-Z\s]+)(?:\?)?",
+                "regex": r"(?:do you|does the pharmacy) (?:have|carry|stock) (?!for |to treat |(?:any )?(?:free |open |available |empty )?(?:beds?|rooms?)\b)([a-zA-Z\s]+)(?:\?)?",
                 "response": lambda match, user: self.check_medication_availability(match.group(1))
             },
             {
                 "regex": r"(?:how long|how much time) (?:does it take|will it take) (?:to|for) (?:fill|prepare|get) (?:a|my) prescription",
-                "response": lambda match, user: "For most standard medications, our pharmacy can fill your prescription in 20-30 minutes. During peak hours (11am-1pm and 4pm-6pm), wait times may extend to 45-60 minutes. Specialty medications or compounded prescriptions may take 24-48 hours. We offer a text notification service to alert you when your prescription is ready."
+                "response": "For most standard medications, our pharmacy can fill your prescription in 20-30 minutes. During peak hours (11am-1pm and 4pm-6pm), wait times may extend to 45-60 minutes. Specialty medications or compounded prescriptions may take 24-48 hours. We offer a text notification service to alert you when your prescription is ready."
             },
             {
                 "regex": r"(?:can|do) (?:I|you) (?:transfer|move) (?:my|a) prescription (?:from|to) (?:another|different|outside) pharmacy",
-                "response": lambda match, user: "Yes, we can transfer prescriptions to or from other pharmacies. To transfer a prescription to our pharmacy, simply provide us with:\n1. Your name, DOB, and contact information\n2. The name and phone number of your current pharmacy\n3. The name of the medication and prescription number if available\n\nCall our pharmacy team at (555) 234-6789 to initiate the transfer."
+                "response": "Yes, we can transfer prescriptions to or from other pharmacies. To transfer a prescription to our pharmacy, simply provide us with:\n1. Your name, DOB, and contact information\n2. The name and phone number of your current pharmacy\n3. The name of the medication and prescription number if available\n\nCall our pharmacy team at {pharmacy_line} to initiate the transfer."
             },
             {
                 "regex": r"(?:do you|does the pharmacy) (?:offer|provide|have) (?:generic|cheaper|less expensive|affordable) (?:alternatives|options|substitutes)",
-                "response": lambda match, user: "Yes, our pharmacy provides generic alternatives when available. Our pharmacists automatically check for FDA-approved generic substitutions that can save you money unless your doctor has specified 'dispense as written.' We also offer a prescription savings program for uninsured patients that provides many generics at reduced prices, starting at $4 for a 30-day supply."
+                "response": "Yes, our pharmacy provides generic alternatives when available. Our pharmacists automatically check for FDA-approved generic substitutions that can save you money unless your doctor has specified 'dispense as written.' We also offer a prescription savings program for uninsured patients that provides many generics at reduced prices, starting at $4 for a 30-day supply."
             },
             {
                 "regex": r"(?:what|which) (?:medications|medicines|drugs) (?:are|does|do you) (?:carry|stock|have) (?:for|to treat) ([a-zA-Z\s]+)",
@@ -235,44 +1281,44 @@ class HospitalChatbot:
     def get_lab_test_patterns(self):
         return [
             {
-                "regex": r"(?:how|what)(?:'s| is) (?:the|your) (?:process|procedure) (?:for|to) (?:get|schedule|book) (?:a|an) (?:lab test|labwork|laboratory test|blood test)",
-                "response": lambda match, user: "To schedule a lab test at our hospital:\n1. Get a test order from your doctor (electronic or paper)\n2. Call our lab scheduling line at (555) 345-6789\n3. Schedule an appointment time (or walk in for routine tests)\n4. Arrive 15 minutes early with your ID and insurance card\n5. Check in at the laboratory reception desk (Building B, 1st floor)\n\nSome tests require special preparation like fasting - we'll inform you of any requirements when scheduling."
+                "regex": r"(?:how|what)(?:'s| is) (?:the|your) (?:process|procedure) (?:for|to) (?:get|schedule|book) (?:a|an) (?:laboratory test|laboratory work|blood test)",
+                "response": "To schedule a lab test at our hospital:\n1. Get a test order from your doctor (electronic or paper)\n2. Call our lab scheduling line at {lab_line}\n3. Schedule an appointment time (or walk in for routine tests)\n4. Arrive 15 minutes early with your ID and insurance card\n5. Check in at the laboratory reception desk (Building B, 1st floor)\n\nSome tests require special preparation like fasting - we'll inform you of any requirements when scheduling."
             },
             {
-                "regex": r"(?:do I need|is it necessary to have|should I get) (?:a|an) (?:doctor's order|prescription|referral) (?:for|to get) (?:lab|laboratory|blood) (?:work|test|testing)",
-                "response": lambda match, user: "Yes, most lab tests require a doctor's order. This ensures that appropriate tests are ordered and results are properly interpreted. Some basic wellness tests like cholesterol screening may be available without a prescription during our monthly health fairs. If you need testing but don't have a primary care provider, our urgent care clinic can evaluate you and order appropriate tests."
+                "regex": r"(?:do I need|is it necessary to have|should I get) (?:a|an) (?:doctor's order|prescription|referral) (?:for|to get) (?:laboratory|blood) (?:work|test|testing)",
+                "response": "Yes, most lab tests require a doctor's order. This ensures that appropriate tests are ordered and results are properly interpreted. Some basic wellness tests like cholesterol screening may be available without a prescription during our monthly health fairs. If you need testing but don't have a primary care provider, our urgent care clinic can evaluate you and order appropriate tests."
             },
             {
-                "regex": r"(?:how long|how much time|when) (?:does it take|will it take) (?:to get|to receive|for) (?:lab|laboratory|test) results",
-                "response": lambda match, user: "Lab result timeframes vary by test type:\n- Routine blood tests (CBC, metabolic panels): 24-48 hours\n- Basic urinalysis: Same day to 24 hours\n- Lipid panels: 24-48 hours\n- Thyroid function tests: 1-3 days\n- Cultures (bacterial, fungal): 3-5 days\n- Specialty or send-out tests: 5-10 business days\n\nResults are automatically posted to your patient portal once finalized and reviewed."
+                "regex": r"(?:how long|how much time|when) (?:does it take|will it take) (?:to get|to receive|for) (?:laboratory|test) results",
+                "response": "Lab result timeframes vary by test type:\n- Routine blood tests (CBC, metabolic panels): 24-48 hours\n- Basic urinalysis: Same day to 24 hours\n- Lipid panels: 24-48 hours\n- Thyroid function tests: 1-3 days\n- Cultures (bacterial, fungal): 3-5 days\n- Specialty or send-out tests: 5-10 business days\n\nResults are automatically posted to your patient portal once finalized and reviewed."
             },
             {
-                "regex": r"(?:do I need to|should I|is it necessary to) (?:fast|avoid eating|stop eating) (?:before|prior to) (?:a|my|the) (?:lab|laboratory|blood) (?:work|test|testing)",
-                "response": lambda match, user: "Fasting requirements depend on the specific tests ordered. Common tests requiring 8-12 hours of fasting include:\n- Lipid/cholesterol panels\n- Glucose tests\n- Comprehensive metabolic panels\n- Iron studies\n\nWater is permitted and usually encouraged during fasting. Morning appointments are recommended for fasting tests. If you're unsure about fasting requirements for your specific test, call our lab at (555) 345-6789."
+                "regex": r"(?:do I need to|should I|is it necessary to) (?:fast|avoid eating|stop eating) (?:before|prior to) (?:a|my|the) (?:laboratory|blood) (?:work|test|testing)",
+                "response": "Fasting requirements depend on the specific tests ordered. Common tests requiring 8-12 hours of fasting include:\n- Lipid/cholesterol panels\n- Glucose tests\n- Comprehensive metabolic panels\n- Iron studies\n\nWater is permitted and usually encouraged during fasting. Morning appointments are recommended for fasting tests. If you're unsure about fasting requirements for your specific test, call our lab at {lab_line}."
             },
             {
-                "regex": r"(?:how|where) (?:can|do) (?:I|you) (?:access|view|get|check|see) (?:my|the) (?:lab|laboratory|test) results",
-                "response": lambda match, user: "You can access your lab results through several methods:\n1. Our patient portal (hospital.example.com/portal) - results post automatically once reviewed\n2. Call your ordering physician's office\n3. Request printed copies from our medical records department\n4. During your follow-up appointment with your doctor\n\nFor portal access issues, contact our helpdesk at (555) 444-3333. Please note that some sensitive test results may be released only after your doctor reviews them with you."
+                "regex": r"(?:how|where) (?:can|do) (?:I|you) (?:access|view|get|check|see) (?:my|the) (?:laboratory|test) results",
+                "response": "You can access your lab results through several methods:\n1. Our patient portal ({website}/portal) - results post automatically once reviewed\n2. Call your ordering physician's office\n3. Request printed copies from our medical records department\n4. During your follow-up appointment with your doctor\n\nFor portal access issues, contact our helpdesk at (555) 444-3333. Please note that some sensitive test results may be released only after your doctor reviews them with you."
             },
             {
-                "regex": r"(?:what|which) (?:lab|laboratory|blood) tests (?:do you|does the hospital|are) (?:offer|provide|perform|available)",
-                "response": lambda match, user: "Our hospital laboratory offers comprehensive testing services including:\n\n• Hematology (complete blood counts, coagulation)\n• Chemistry (metabolic panels, lipids, cardiac markers)\n• Microbiology (cultures, sensitivity testing)\n• Immunology (antibody testing)\n• Urinalysis and toxicology\n• Endocrinology (hormone testing)\n• Molecular diagnostics and genetic testing\n• Pathology services\n\nFor specific test availability, please call our laboratory at (555) 345-6789."
+                "regex": r"(?:what|which) (?:laboratory|blood) tests (?:do you|does the hospital|are) (?:offer|provide|perform|available)",
+                "response": "Our hospital laboratory offers comprehensive testing services including:\n\n• Hematology (complete blood counts, coagulation)\n• Chemistry (metabolic panels, lipids, cardiac markers)\n• Microbiology (cultures, sensitivity testing)\n• Immunology (antibody testing)\n• Urinalysis and toxicology\n• Endocrinology (hormone testing)\n• Molecular diagnostics and genetic testing\n• Pathology services\n\nFor specific test availability, please call our laboratory at {lab_line}."
             },
             {
-                "regex": r"(?:how much|what) (?:does|is the cost of|will it cost for) (?:a|an) ([a-zA-Z\s]+) (?:test|lab|laboratory test)(?:\?)?",
+                "regex": r"(?:how much|what) (?:does|is the cost of|will it cost for) (?:a|an) ([a-zA-Z\s]+) (?:test|laboratory|laboratory test)(?:\?)?",
                 "response": lambda match, user: self.get_lab_test_cost(match.group(1))
             },
             {
-                "regex": r"(?:do you|does the lab|does the hospital) (?:have|offer|provide) (?:walk-in|same day|immediate|no appointment) (?:lab|laboratory|blood) (?:testing|service)",
-                "response": lambda match, user: "Yes, we offer walk-in laboratory services for patients with a doctor's order. Walk-in hours are:\n- Monday-Friday: 7:00 AM to 7:00 PM\n- Saturday: 8:00 AM to 3:00 PM\n- Sunday: Closed (except for inpatient and emergency services)\n\nWhile appointments aren't required, scheduled patients receive priority during busy periods. Wait times for walk-ins are typically 15-45 minutes depending on the time of day and test complexity."
+                "regex": r"(?:do you|does the laboratory|does the hospital) (?:have|offer|provide) (?:walk-in|same day|immediate|no appointment) (?:laboratory|blood) (?:testing|service)",
+                "response": "Yes, we offer walk-in laboratory services for patients with a doctor's order. Walk-in hours are:\n- Monday-Friday: 7:00 AM to 7:00 PM\n- Saturday: 8:00 AM to 3:00 PM\n- Sunday: Closed (except for inpatient and emergency services)\n\nWhile appointments aren't required, scheduled patients receive priority during busy periods. Wait times for walk-ins are typically 15-45 minutes depending on the time of day and test complexity."
             },
             {
-                "regex": r"(?:how|what) (?:should I|do I need to) prepare (?:for|before) (?:a|my|the) ([a-zA-Z\s]+) (?:test|lab test)",
+                "regex": r"(?:how|what) (?:should I|do I need to) prepare (?:for|before) (?:a|my|the) ([a-zA-Z\s]+) (?:test|laboratory test)",
                 "response": lambda match, user: self.get_lab_test_preparation(match.group(1))
             },
             {
-                "regex": r"(?:can|will) (?:my|the) (?:primary care|referring|outside) doctor (?:receive|get|access) (?:my|the) (?:lab|laboratory|test) results",
-                "response": lambda match, user: "Yes, your primary care or referring physician will receive your lab results if they ordered the tests or were listed as a copy recipient. Results are typically sent via secure electronic transmission, fax, or mail depending on the provider's preference. If you see providers outside our hospital system, you may need to complete a release form to have results sent to them. This can be done at our medical records department or through your patient portal."
+                "regex": r"(?:can|will) (?:my|the) (?:primary care|referring|outside) doctor (?:receive|get|access) (?:my|the) (?:laboratory|test) results",
+                "response": "Yes, your primary care or referring physician will receive your lab results if they ordered the tests or were listed as a copy recipient. Results are typically sent via secure electronic transmission, fax, or mail depending on the provider's preference. If you see providers outside our hospital system, you may need to complete a release form to have results sent to them. This can be done at our medical records department or through your patient portal."
             },
             # Add 90+ more lab test patterns here
         ]
@@ -280,44 +1326,52 @@ class HospitalChatbot:
     def get_emergency_patterns(self):
         return [
             {
-                "regex": r"(?:what|which) (?:symptoms|conditions|situations) (?:should|would) (?:I|someone) (?:go|come|visit) (?:to|the) (?:ER|emergency room|emergency department) (?:for)",
-                "response": lambda match, user: "You should go to the ER for potentially life-threatening conditions including:\n• Chest pain or pressure\n• Difficulty breathing\n• Severe bleeding or trauma\n• Sudden numbness/weakness (stroke symptoms)\n• Severe abdominal pain\n• Serious burns\n• Head injuries with loss of consciousness\n• Seizures\n• High fever with headache and stiff neck\n• Poisoning or overdose\n\nFor less severe issues, urgent care may be more appropriate and have shorter wait times."
+                "regex": r"(?:what|which) (?:symptoms|conditions|situations) (?:should|would) (?:I|someone) (?:go|come|visit) (?:to|the) emergency room (?:for)",
+                "response": "You should go to the ER for potentially life-threatening conditions including:\n• Chest pain or pressure\n• Difficulty breathing\n• Severe bleeding or trauma\n• Sudden numbness/weakness (stroke symptoms)\n• Severe abdominal pain\n• Serious burns\n• Head injuries with loss of consciousness\n• Seizures\n• High fever with headache and stiff neck\n• Poisoning or overdose\n\nFor less severe issues, urgent care may be more appropriate and have shorter wait times."
             },
             {
-                "regex": r"(?:what|where) is (?:the|your) (?:ER|emergency room|emergency department) (?:location|situated|address)",
-                "response": lambda match, user: "Our Emergency Department is located at the south entrance of the main hospital campus at 123 Medical Center Drive. It's accessible via Emergency Drive with dedicated parking directly outside the entrance. The ER entrance is clearly marked with red 'EMERGENCY' signs and is separate from the main hospital entrance. Ambulances arrive at a dedicated ambulance bay adjacent to the walk-in entrance."
+                "regex": r"(?:what|where) is (?:the|your) emergency room (?:location|situated|address)",
+                "response": "Our Emergency Department is located at the south entrance of the main hospital campus at 123 Medical Center Drive. It's accessible via Emergency Drive with dedicated parking directly outside the entrance. The ER entrance is clearly marked with red 'EMERGENCY' signs and is separate from the main hospital entrance. Ambulances arrive at a dedicated ambulance bay adjacent to the walk-in entrance."
             },
             {
-                "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:ER|emergency room|emergency department) (?:hours|timing|times)",
-                "response": lambda match, user: "Our Emergency Department is open 24 hours a day, 7 days a week, 365 days a year, including all holidays. We never close and are always staffed with emergency medicine physicians, nurses, and support personnel ready to handle any medical emergency."
+                "regex": r"(?:what|which) (?:are|is) (?:the|your) emergency room (?:hours|timing|times)",
+                "response": "Our Emergency Department is open 24 hours a day, 7 days a week, 365 days a year, including all holidays. We never close and are always staffed with emergency medicine physicians, nurses, and support personnel ready to handle any medical emergency."
             },
             {
-                "regex": r"(?:how long|what) (?:is|are) (?:the|typical|average|current) (?:ER|emergency room|emergency department) (?:wait times|waiting period)",
-                "response": lambda match, user: "Current ER wait times vary based on patient volume and the severity of cases. Patients are seen based on medical urgency, not arrival time. Life-threatening conditions receive immediate attention, while less severe issues may wait longer. Our current estimated wait time for non-critical cases is typically 30-120 minutes. You can check our real-time ER wait times on our website or by calling (555) 911-7000."
+                "regex": r"(?:how long|what) (?:is|are) (?:the|typical|average|current) (?:ER|emergency room) (?:wait times?|waiting period|waiting time|wait)",
+                "response": lambda match, user: self.get_er_wait_response()
             },
             {
-                "regex": r"(?:what|which) (?:documents|items|things) (?:should|do) (?:I|you) (?:bring|take|have) (?:to|for) (?:the|an) (?:ER|emergency room|emergency) (?:visit)",
-                "response": lambda match, user: "If possible, bring these items to the ER:\n1. Photo ID\n2. Insurance card\n3. List of current medications (or the medication bottles)\n4. List of allergies\n5. Medical history summary\n6. Contact information for your primary doctor\n7. Advanced directives if applicable\n\nIn a life-threatening emergency, don't delay coming to the ER if you don't have these items - your health comes first, and we can collect this information later."
+                "regex": r"(?:check|sign) me in (?:to|at|for) (?:the )?(?:ER|emergency room|emergency department|triage)(?: (?:for|with|because(?: of)?) (.+))?",
+                "response": lambda match, user: self.triage_check_in(match.group(1), user)
             },
             {
-                "regex": r"(?:what|how) (?:is|happens|works) (?:the|your) (?:ER|emergency room|emergency department) (?:triage|sorting|prioritization) (?:process|system|procedure)",
-                "response": lambda match, user: "Our ER triage process works as follows:\n1. Initial assessment by a triage nurse upon arrival\n2. Vital signs and chief complaint recorded\n3. Assignment of a triage level (1-5) based on medical urgency\n4. Level 1 (most critical) patients seen immediately\n5. Other patients seen in order of medical necessity, not arrival time\n\nThis ensures that life-threatening conditions receive immediate attention while providing care to all patients as efficiently as possible."
+                "regex": r"(?:I'm|I am|we're|we are) (?:at|in) the (?:ER|emergency room|emergency department)(?: (?:with|for|because(?: of)?) (.+))?",
+                "response": lambda match, user: self.triage_check_in(match.group(1), user)
             },
             {
-                "regex": r"(?:can|will) (?:family members|relatives|visitors) (?:stay|remain|be) (?:with|alongside) (?:me|patients|a patient) (?:in|during) (?:the|an) (?:ER|emergency room|emergency) (?:visit)",
-                "response": lambda match, user: "Generally, one family member or support person may accompany a patient in the ER treatment area, with some limitations:\n- For pediatric patients, one or both parents/guardians are welcome\n- During certain procedures or in critical situations, visitors may be asked to step out temporarily\n- In trauma or resuscitation cases, family may be directed to a dedicated waiting area\n- During high census or pandemic restrictions, visitor policies may be modified\n\nOur goal is to support patients while maintaining a safe care environment."
+                "regex": r"(?:what|which) (?:documents|items|things) (?:should|do) (?:I|you) (?:bring|take|have) (?:to|for) (?:the|an) emergency(?: room)? (?:visit)",
+                "response": "If possible, bring these items to the ER:\n1. Photo ID\n2. Insurance card\n3. List of current medications (or the medication bottles)\n4. List of allergies\n5. Medical history summary\n6. Contact information for your primary doctor\n7. Advanced directives if applicable\n\nIn a life-threatening emergency, don't delay coming to the ER if you don't have these items - your health comes first, and we can collect this information later."
             },
             {
-                "regex": r"(?:what is|how much is|how much does) (?:the|an) (?:ER|emergency room|emergency department) (?:visit|trip) (?:cost|charge)",
-                "response": lambda match, user: "Emergency room costs vary widely depending on the level of care required, tests performed, and treatments provided. Base ER visit charges typically range from $500-$3,000 before insurance. Additional costs may include:\n- Imaging (X-rays, CT scans, MRIs)\n- Laboratory tests\n- Medications\n- Specialist consultations\n- Procedures\n\nYour actual out-of-pocket cost depends on your insurance coverage. Our financial counselors can help discuss payment options and financial assistance programs."
+                "regex": r"(?:what|how) (?:is|happens|works) (?:the|your) emergency room (?:triage|sorting|prioritization) (?:process|system|procedure)",
+                "response": "Our ER triage process works as follows:\n1. Initial assessment by a triage nurse upon arrival\n2. Vital signs and chief complaint recorded\n3. Assignment of a triage level (1-5) based on medical urgency\n4. Level 1 (most critical) patients seen immediately\n5. Other patients seen in order of medical necessity, not arrival time\n\nThis ensures that life-threatening conditions receive immediate attention while providing care to all patients as efficiently as possible."
             },
             {
-                "regex": r"(?:does|is) (?:the|your) (?:ER|emergency room|emergency department) (?:treat|handle|manage) (?:children|pediatric|kids) (?:emergencies|cases|patients)",
-                "response": lambda match, user: "Yes, our Emergency Department is equipped to handle pediatric emergencies. We have dedicated pediatric emergency physicians on staff 24/7, specialized pediatric nurses, child-sized equipment, and child-friendly treatment rooms. For extremely critical pediatric cases, we have transfer protocols in place with the regional children's hospital if specialized inpatient care is needed. Our goal is to make emergency care as comfortable and non-threatening as possible for our youngest patients."
+                "regex": r"(?:can|will) (?:family members|relatives|visitors) (?:stay|remain|be) (?:with|alongside) (?:me|patients|a patient) (?:in|during) (?:the|an) emergency(?: room)? (?:visit)",
+                "response": "Generally, one family member or support person may accompany a patient in the ER treatment area, with some limitations:\n- For pediatric patients, one or both parents/guardians are welcome\n- During certain procedures or in critical situations, visitors may be asked to step out temporarily\n- In trauma or resuscitation cases, family may be directed to a dedicated waiting area\n- During high census or pandemic restrictions, visitor policies may be modified\n\nOur goal is to support patients while maintaining a safe care environment."
             },
             {
-                "regex": r"(?:what|how) (?:happens|occurs|is the process) (?:after|following) (?:an|the) (?:ER|emergency room|emergency department) (?:visit|treatment)",
-                "response": lambda match, user: "After ER treatment, several things may happen:\n1. Discharge home with follow-up instructions and possibly prescriptions\n2. Admission to the hospital if ongoing care is needed\n3. Transfer to another facility for specialized care\n4. Scheduling of follow-up appointments\n\nYou'll receive discharge instructions explaining your diagnosis, treatment, medication instructions, and when to seek further care. A summary will be sent to your primary care provider, and you can access your visit details through our patient portal."
+                "regex": r"(?:what is|how much is|how much does) (?:the|an) emergency room (?:visit|trip) (?:cost|charge)",
+                "response": "Emergency room costs vary widely depending on the level of care required, tests performed, and treatments provided. Base ER visit charges typically range from $500-$3,000 before insurance. Additional costs may include:\n- Imaging (X-rays, CT scans, MRIs)\n- Laboratory tests\n- Medications\n- Specialist consultations\n- Procedures\n\nYour actual out-of-pocket cost depends on your insurance coverage. Our financial counselors can help discuss payment options and financial assistance programs."
+            },
+            {
+                "regex": r"(?:does|is) (?:the|your) emergency room (?:treat|handle|manage) (?:children|pediatric|kids) (?:emergencies|cases|patients)",
+                "response": "Yes, our Emergency Department is equipped to handle pediatric emergencies. We have dedicated pediatric emergency physicians on staff 24/7, specialized pediatric nurses, child-sized equipment, and child-friendly treatment rooms. For extremely critical pediatric cases, we have transfer protocols in place with the regional children's hospital if specialized inpatient care is needed. Our goal is to make emergency care as comfortable and non-threatening as possible for our youngest patients."
+            },
+            {
+                "regex": r"(?:what|how) (?:happens|occurs|is the process) (?:after|following) (?:an|the) emergency room (?:visit|treatment)",
+                "response": "After ER treatment, several things may happen:\n1. Discharge home with follow-up instructions and possibly prescriptions\n2. Admission to the hospital if ongoing care is needed\n3. Transfer to another facility for specialized care\n4. Scheduling of follow-up appointments\n\nYou'll receive discharge instructions explaining your diagnosis, treatment, medication instructions, and when to seek further care. A summary will be sent to your primary care provider, and you can access your visit details through our patient portal."
             },
             # Add 90+ more emergency patterns here
         ]
@@ -326,43 +1380,51 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which|how) (?:is|are) (?:the|your) (?:process|procedure|steps) (?:for|to) (?:patient|hospital) admission",
-                "response": lambda match, user: "Our hospital admission process includes:\n1. Admission order from your doctor (planned) or ER physician (emergency)\n2. Registration with patient information and insurance verification\n3. Consent forms and HIPAA acknowledgment\n4. Financial counseling if needed\n5. Medical history and medication reconciliation\n6. Vital signs and initial nursing assessment\n7. Assignment to appropriate unit based on medical needs\n8. Transport to hospital room\n\nFor planned admissions, we recommend pre-registration by calling (555) 789-0123 at least 48 hours in advance."
+                "response": "Our hospital admission process includes:\n1. Admission order from your doctor (planned) or ER physician (emergency)\n2. Registration with patient information and insurance verification\n3. Consent forms and HIPAA acknowledgment\n4. Financial counseling if needed\n5. Medical history and medication reconciliation\n6. Vital signs and initial nursing assessment\n7. Assignment to appropriate unit based on medical needs\n8. Transport to hospital room\n\nFor planned admissions, we recommend pre-registration by calling (555) 789-0123 at least 48 hours in advance."
             },
             {
                 "regex": r"(?:what|which) (?:documents|items|paperwork|things) (?:do I need|should I bring|are required) (?:for|during) (?:hospital|patient) admission",
-                "response": lambda match, user: "Please bring these items for hospital admission:\n• Photo ID\n• All insurance cards\n• List of current medications and dosages\n• Advance directives (living will, healthcare power of attorney)\n• Contact information for your primary doctor\n• Medical history information\n• Any relevant medical records or test results\n• Payment method for potential copays/deductibles\n• Personal items for your stay (limited clothing, toiletries)\n• CPAP or other home medical devices you use regularly"
+                "response": "Please bring these items for hospital admission:\n• Photo ID\n• All insurance cards\n• List of current medications and dosages\n• Advance directives (living will, healthcare power of attorney)\n• Contact information for your primary doctor\n• Medical history information\n• Any relevant medical records or test results\n• Payment method for potential copays/deductibles\n• Personal items for your stay (limited clothing, toiletries)\n• CPAP or other home medical devices you use regularly"
             },
             {
                 "regex": r"(?:can|do) (?:I|you|patients) (?:request|choose|select) (?:a|my|the) (?:room|room type|accommodation) (?:during|for) (?:admission|hospital stay)",
-                "response": lambda match, user: "We offer several room types subject to availability and medical necessity:\n1. Standard semi-private rooms (two patients)\n2. Private rooms (available with physician order for isolation or medical necessity)\n3. Deluxe private rooms (additional daily fee applies)\n\nRoom assignments prioritize medical needs first. While we try to accommodate preferences, availability varies by department and hospital census. You can request a specific room type during pre-registration, but cannot guarantee fulfillment of all requests."
+                "response": "We offer several room types subject to availability and medical necessity:\n1. Standard semi-private rooms (two patients)\n2. Private rooms (available with physician order for isolation or medical necessity)\n3. Deluxe private rooms (additional daily fee applies)\n\nRoom assignments prioritize medical needs first. While we try to accommodate preferences, availability varies by department and hospital census. You can request a specific room type during pre-registration, but cannot guarantee fulfillment of all requests."
             },
             {
                 "regex": r"(?:how|what time|when) (?:early|soon|in advance) (?:should|do) (?:I|patients) (?:arrive|come|check in) (?:for|before) (?:a|my|planned|scheduled) admission",
-                "response": lambda match, user: "For planned hospital admissions, please arrive 2 hours before your scheduled admission time to complete necessary paperwork and pre-admission testing. For surgical admissions, arrival times are typically 2-3 hours before your scheduled procedure and will be specified in your pre-surgical instructions. For maternity admissions in active labor, come directly to the Labor & Delivery department entrance."
+                "response": "For planned hospital admissions, please arrive 2 hours before your scheduled admission time to complete necessary paperwork and pre-admission testing. For surgical admissions, arrival times are typically 2-3 hours before your scheduled procedure and will be specified in your pre-surgical instructions. For maternity admissions in active labor, come directly to the Labor & Delivery department entrance."
             },
             {
                 "regex": r"(?:what|which) (?:personal|private) (?:items|belongings|things) (?:can|should|may) (?:I|patients) (?:bring|pack|have) (?:for|during) (?:a|my|the) (?:hospital|inpatient) stay",
-                "response": lambda match, user: "Recommended personal items for your hospital stay:\n• Comfortable pajamas or loose clothing\n• Non-slip slippers or footwear\n• Basic toiletries (toothbrush, toothpaste, etc.)\n• Eyeglasses, hearing aids, dentures if used\n• Cell phone and charger\n• Small amount of cash for incidentals\n• Book or tablet for entertainment\n\nPlease leave valuables, jewelry, and large sums of money at home. The hospital provides basic toiletries if needed, but personal items often improve comfort during your stay."
+                "response": "Recommended personal items for your hospital stay:\n• Comfortable pajamas or loose clothing\n• Non-slip slippers or footwear\n• Basic toiletries (toothbrush, toothpaste, etc.)\n• Eyeglasses, hearing aids, dentures if used\n• Cell phone and charger\n• Small amount of cash for incidentals\n• Book or tablet for entertainment\n\nPlease leave valuables, jewelry, and large sums of money at home. The hospital provides basic toiletries if needed, but personal items often improve comfort during your stay."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:hospital|facility) (?:visiting|visitor) (?:hours|policy|rules)",
-                "response": lambda match, user: "Our general visiting hours are 8:00 AM to 8:00 PM daily. Specialized units have modified policies:\n• ICU: Limited to 15-minute visits at specific times (10 AM, 2 PM, 6 PM)\n• Maternity: Father/partner can visit 24/7; others during regular hours\n• Pediatrics: Parents/guardians can stay 24/7; others during regular hours\n• Behavioral Health: 6:00-8:00 PM weekdays, 2:00-4:00 PM weekends\n\nAll visitors must check in at the information desk for a visitor badge. Children under 12 must be accompanied by an adult."
+                "response": "Our general visiting hours are 8:00 AM to 8:00 PM daily. Specialized units have modified policies:\n• ICU: Limited to 15-minute visits at specific times (10 AM, 2 PM, 6 PM)\n• Maternity: Father/partner can visit 24/7; others during regular hours\n• Pediatrics: Parents/guardians can stay 24/7; others during regular hours\n• Behavioral Health: 6:00-8:00 PM weekdays, 2:00-4:00 PM weekends\n\nAll visitors must check in at the information desk for a visitor badge. Children under 12 must be accompanied by an adult."
             },
             {
                 "regex": r"(?:can|are|is it allowed for) (?:family members|relatives|someone) (?:stay|sleep|remain) (?:overnight|during the night|after hours) (?:with|alongside) (?:patients|me)",
-                "response": lambda match, user: "Overnight stays for family members are allowed in these situations:\n1. Parents/guardians of pediatric patients (under 18)\n2. Partners of maternity patients\n3. Family of end-of-life patients\n4. Caregivers of patients with special needs (dementia, disability)\n\nOne adult family member can stay overnight in these cases. A reclining chair or sleeper sofa is provided. Please inform the nursing staff if someone will be staying so they can provide linens and make accommodations."
+                "response": "Overnight stays for family members are allowed in these situations:\n1. Parents/guardians of pediatric patients (under 18)\n2. Partners of maternity patients\n3. Family of end-of-life patients\n4. Caregivers of patients with special needs (dementia, disability)\n\nOne adult family member can stay overnight in these cases. A reclining chair or sleeper sofa is provided. Please inform the nursing staff if someone will be staying so they can provide linens and make accommodations."
             },
             {
-                "regex": r"(?:how long|what) (?:is|will be|can I expect) (?:the|my|typical|average) (?:hospital|inpatient) stay (?:for|after) ([a-zA-Z\s]+)",
+                "regex": r"(?:how long|what) (?:is|will be|can I expect) (?:the |my )?(?:typical |average |usual |expected )?(?:length of )?(?:hospital|inpatient) stay (?:for|after) ([a-zA-Z\s]+)",
                 "response": lambda match, user: self.get_average_stay_duration(match.group(1))
             },
+            {
+                "regex": r"(?:how many|are there any|are there|do you have any|do you have|is there a) (?:free |open |available |empty )?(?:beds?|rooms?) (?:are )?(?:available |free |open |left )?(?:in|on|at) (?:the )?([a-zA-Z&'\-\s]+)",
+                "response": lambda match, user: self.get_bed_availability(match.group(1))
+            },
+            {
+                "regex": r"(?:what is|what's|how high is) (?:the )?(?:current )?(?:hospital |bed )?(?:occupancy|census)(?: (?:of|in|on|for|at) (?:the )?([a-zA-Z&'\-\s]+))?",
+                "response": lambda match, user: self.get_occupancy_response(match.group(1))
+            },
             {
                 "regex": r"(?:what|which) (?:meals|food|dining options) (?:are|is) (?:provided|available|offered) (?:for|to|during) (?:inpatients|admitted patients|patients)",
-                "response": lambda match, user: "Inpatients receive three meals daily according to physician-ordered diet plans. Breakfast is served 7:00-8:30 AM, lunch 11:30 AM-1:00 PM, and dinner 5:00-6:30 PM. Our room service program allows patients to order from a menu tailored to their dietary restrictions between 7:00 AM and 7:00 PM by calling ext. 3663 (FOOD) from your room phone. Special diets (diabetic, cardiac, renal, gluten-free, etc.) are accommodated with dietitian consultation."
+                "response": "Inpatients receive three meals daily according to physician-ordered diet plans. Breakfast is served 7:00-8:30 AM, lunch 11:30 AM-1:00 PM, and dinner 5:00-6:30 PM. Our room service program allows patients to order from a menu tailored to their dietary restrictions between 7:00 AM and 7:00 PM by calling ext. 3663 (FOOD) from your room phone. Special diets (diabetic, cardiac, renal, gluten-free, etc.) are accommodated with dietitian consultation."
             },
             {
                 "regex": r"(?:what|which) (?:medical professionals|healthcare team|staff) (?:will|can) (?:I|patients) (?:see|meet|interact with) (?:during|throughout) (?:my|the|a) (?:hospital|inpatient) stay",
-                "response": lambda match, user: "During your hospital stay, you may interact with various healthcare professionals:\n• Attending physician (oversees your care)\n• Hospitalist (manages inpatient treatment)\n• Specialist consultants as needed\n• Resident physicians and medical students (teaching hospital)\n• Nurses (primary caregivers, present 24/7)\n• Nursing assistants (help with daily care needs)\n• Therapists (physical, occupational, respiratory, speech)\n• Dietitians\n• Case managers/social workers\n• Phlebotomists (blood draws)\n• Technicians (EKG, imaging, etc.)\n\nAll staff should introduce themselves and wear identification badges."
+                "response": "During your hospital stay, you may interact with various healthcare professionals:\n• Attending physician (oversees your care)\n• Hospitalist (manages inpatient treatment)\n• Specialist consultants as needed\n• Resident physicians and medical students (teaching hospital)\n• Nurses (primary caregivers, present 24/7)\n• Nursing assistants (help with daily care needs)\n• Therapists (physical, occupational, respiratory, speech)\n• Dietitians\n• Case managers/social workers\n• Phlebotomists (blood draws)\n• Technicians (EKG, imaging, etc.)\n\nAll staff should introduce themselves and wear identification badges."
             },
             # Add 90+ more admission patterns here
         ]
@@ -371,43 +1433,43 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which|how) (?:is|are) (?:the|your) (?:process|procedure|steps) (?:for|to) (?:patient|hospital) discharge",
-                "response": lambda match, user: "Our discharge process includes:\n1. Discharge order from your physician\n2. Discharge planning meeting with nurse and/or case manager\n3. Education on home care, medications, and follow-up\n4. Prescription preparation by pharmacy\n5. Transportation arrangements if needed\n6. Final paperwork and instructions\n7. Escort to hospital exit\n\nDischarges typically occur between 11:00 AM and 2:00 PM. The process takes 1-2 hours after your doctor writes the discharge order."
+                "response": "Our discharge process includes:\n1. Discharge order from your physician\n2. Discharge planning meeting with nurse and/or case manager\n3. Education on home care, medications, and follow-up\n4. Prescription preparation by pharmacy\n5. Transportation arrangements if needed\n6. Final paperwork and instructions\n7. Escort to hospital exit\n\nDischarges typically occur between 11:00 AM and 2:00 PM. The process takes 1-2 hours after your doctor writes the discharge order."
             },
             {
                 "regex": r"(?:what|which) (?:information|documents|paperwork|instructions) (?:will|do|should) (?:I|patients) (?:receive|get|be given) (?:at|during|upon) discharge",
-                "response": lambda match, user: "At discharge, you'll receive a comprehensive packet including:\n• Written discharge instructions with care guidelines\n• Medication list with dosages and schedules\n• New prescription information\n• Follow-up appointment details\n• Signs/symptoms requiring medical attention\n• Dietary and activity restrictions\n• Wound care instructions if applicable\n• Contact numbers for questions\n• Educational materials about your condition\n\nYour nurse will review all information with you before you leave. Please ask questions if anything is unclear."
+                "response": "At discharge, you'll receive a comprehensive packet including:\n• Written discharge instructions with care guidelines\n• Medication list with dosages and schedules\n• New prescription information\n• Follow-up appointment details\n• Signs/symptoms requiring medical attention\n• Dietary and activity restrictions\n• Wound care instructions if applicable\n• Contact numbers for questions\n• Educational materials about your condition\n\nYour nurse will review all information with you before you leave. Please ask questions if anything is unclear."
             },
             {
                 "regex": r"(?:how|what) (?:do|can|should) (?:I|patients) (?:arrange|get|organize) (?:transportation|a ride|travel) (?:after|following|for|upon) discharge",
-                "response": lambda match, user: "Transportation options after discharge include:\n1. Family member or friend pickup (recommended)\n2. Hospital-arranged transportation for eligible patients (needs case manager approval)\n3. Taxi or rideshare services (Uber/Lyft)\n4. Medical transport services for those requiring assistance\n5. Public transportation if appropriate for your condition\n\nPlease arrange transportation before discharge day. For assistance with special transportation needs, speak with your case manager or social worker at least 24 hours before discharge."
+                "response": "Transportation options after discharge include:\n1. Family member or friend pickup (recommended)\n2. Hospital-arranged transportation for eligible patients (needs case manager approval)\n3. Taxi or rideshare services (Uber/Lyft)\n4. Medical transport services for those requiring assistance\n5. Public transportation if appropriate for your condition\n\nPlease arrange transportation before discharge day. For assistance with special transportation needs, speak with your case manager or social worker at least 24 hours before discharge."
             },
             {
                 "regex": r"(?:what|which|how) (?:follow-up|followup) (?:appointments|care|visits) (?:will|should|do) (?:I|patients) (?:need|have|require) (?:after|following) discharge",
-                "response": lambda match, user: "Follow-up care after discharge varies by condition, but typically includes:\n1. Primary care visit within 1-2 weeks\n2. Specialist follow-up as recommended by your physician\n3. Therapy appointments if prescribed (physical, occupational, speech)\n4. Home health visits for eligible patients\n\nYour discharge planner will help schedule initial follow-up appointments before you leave. These appointments are crucial for monitoring your recovery and preventing readmission. If you need to reschedule, please call the provider's office directly."
+                "response": "Follow-up care after discharge varies by condition, but typically includes:\n1. Primary care visit within 1-2 weeks\n2. Specialist follow-up as recommended by your physician\n3. Therapy appointments if prescribed (physical, occupational, speech)\n4. Home health visits for eligible patients\n\nYour discharge planner will help schedule initial follow-up appointments before you leave. These appointments are crucial for monitoring your recovery and preventing readmission. If you need to reschedule, please call the provider's office directly."
             },
             {
                 "regex": r"(?:what|which) (?:medications|prescriptions|drugs) (?:will|should|do) (?:I|patients) (?:take|need|receive) (?:after|upon|following) discharge",
-                "response": lambda match, user: "Your discharge medications will be detailed in your discharge instructions and may include:\n1. New medications prescribed during hospitalization\n2. Continued home medications (possibly with adjusted dosages)\n3. Temporary medications for recovery (pain management, antibiotics)\n\nYour physician will review medication changes. Our discharge pharmacist can fill prescriptions before you leave if desired. We'll provide a complete medication list, including purpose, dosage, schedule, and potential side effects. Please inform us of any medication concerns or financial constraints."
+                "response": "Your discharge medications will be detailed in your discharge instructions and may include:\n1. New medications prescribed during hospitalization\n2. Continued home medications (possibly with adjusted dosages)\n3. Temporary medications for recovery (pain management, antibiotics)\n\nYour physician will review medication changes. Our discharge pharmacist can fill prescriptions before you leave if desired. We'll provide a complete medication list, including purpose, dosage, schedule, and potential side effects. Please inform us of any medication concerns or financial constraints."
             },
             {
                 "regex": r"(?:what|which) (?:diet|nutrition|food|eating) (?:restrictions|guidelines|recommendations) (?:should|will|do) (?:I|patients) (?:follow|have) (?:after|upon|following) discharge",
-                "response": lambda match, user: "Dietary guidelines after discharge depend on your specific condition. Your discharge instructions will include detailed nutrition recommendations. Common dietary plans include:\n- Cardiac diet (low sodium, low fat)\n- Diabetic diet (carbohydrate controlled)\n- Renal diet (restricted sodium, potassium, phosphorus)\n- Soft or modified texture diets following certain surgeries\n- Progressive diets for GI conditions\n\nA registered dietitian may consult with you before discharge for personalized guidance. Follow-up with a dietitian can be arranged if needed."
+                "response": "Dietary guidelines after discharge depend on your specific condition. Your discharge instructions will include detailed nutrition recommendations. Common dietary plans include:\n- Cardiac diet (low sodium, low fat)\n- Diabetic diet (carbohydrate controlled)\n- Renal diet (restricted sodium, potassium, phosphorus)\n- Soft or modified texture diets following certain surgeries\n- Progressive diets for GI conditions\n\nA registered dietitian may consult with you before discharge for personalized guidance. Follow-up with a dietitian can be arranged if needed."
             },
             {
                 "regex": r"(?:what|which) (?:activity|exercise|physical) (?:restrictions|limitations|guidelines) (?:should|will|do) (?:I|patients) (?:have|follow) (?:after|upon|following) discharge",
-                "response": lambda match, user: "Activity guidelines after discharge vary by condition and procedure. Your discharge instructions will specify limitations such as:\n- Weight-bearing restrictions after orthopedic procedures\n- Lifting limitations after abdominal or chest surgery\n- Driving restrictions while on certain medications\n- Gradual return to normal activities timeline\n- Specific exercises recommended for recovery\n\nFollowing these guidelines is crucial for proper healing and preventing complications. A physical therapist may provide specific exercises. Contact your doctor before resuming activities not addressed in your instructions."
+                "response": "Activity guidelines after discharge vary by condition and procedure. Your discharge instructions will specify limitations such as:\n- Weight-bearing restrictions after orthopedic procedures\n- Lifting limitations after abdominal or chest surgery\n- Driving restrictions while on certain medications\n- Gradual return to normal activities timeline\n- Specific exercises recommended for recovery\n\nFollowing these guidelines is crucial for proper healing and preventing complications. A physical therapist may provide specific exercises. Contact your doctor before resuming activities not addressed in your instructions."
             },
             {
                 "regex": r"(?:what|which) (?:warning signs|red flags|symptoms|complications) (?:should|would|do) (?:I|patients) (?:watch for|look for|monitor) (?:after|following) discharge",
-                "response": lambda match, user: "After discharge, contact your doctor or return to the ER if you experience:\n• Fever above 101°F (38.3°C)\n• Uncontrolled pain not relieved by prescribed medications\n• Increasing redness, warmth, pain, or drainage from surgical sites\n• New or worsening shortness of breath\n• Chest pain\n• Severe headache or confusion\n• Persistent nausea/vomiting or inability to keep fluids down\n• Signs of infection (increased pain, swelling, redness, warmth, discharge)\n• Blood in urine, stool, or vomit\n• Falls or new injuries\n\nYour discharge instructions will include condition-specific warning signs to monitor."
+                "response": "After discharge, contact your doctor or return to the ER if you experience:\n• Fever above 101°F (38.3°C)\n• Uncontrolled pain not relieved by prescribed medications\n• Increasing redness, warmth, pain, or drainage from surgical sites\n• New or worsening shortness of breath\n• Chest pain\n• Severe headache or confusion\n• Persistent nausea/vomiting or inability to keep fluids down\n• Signs of infection (increased pain, swelling, redness, warmth, discharge)\n• Blood in urine, stool, or vomit\n• Falls or new injuries\n\nYour discharge instructions will include condition-specific warning signs to monitor."
             },
             {
                 "regex": r"(?:how|what) (?:do|can|should) (?:I|patients) (?:manage|handle|control) (?:pain|discomfort) (?:at|after|following|upon) discharge",
-                "response": lambda match, user: "Pain management after discharge may include:\n1. Prescribed pain medications (take exactly as directed)\n2. Over-the-counter medications if recommended\n3. Non-pharmaceutical approaches:\n   - Cold/heat therapy as directed\n   - Proper positioning and body mechanics\n   - Gentle activity as approved by your doctor\n   - Relaxation techniques\n\nTrack your pain levels on a scale of 0-10. Contact your healthcare provider if pain is not controlled, worsens suddenly, or changes in character. Never take more than the prescribed dose of pain medication."
+                "response": "Pain management after discharge may include:\n1. Prescribed pain medications (take exactly as directed)\n2. Over-the-counter medications if recommended\n3. Non-pharmaceutical approaches:\n   - Cold/heat therapy as directed\n   - Proper positioning and body mechanics\n   - Gentle activity as approved by your doctor\n   - Relaxation techniques\n\nTrack your pain levels on a scale of 0-10. Contact your healthcare provider if pain is not controlled, worsens suddenly, or changes in character. Never take more than the prescribed dose of pain medication."
             },
             {
                 "regex": r"(?:what|which) (?:home health|nursing|care) (?:services|assistance|support) (?:are|is|might be) (?:available|offered|provided) (?:after|following|upon) discharge",
-                "response": lambda match, user: "Home health services available after discharge may include:\n1. Skilled nursing visits (wound care, medication management, assessments)\n2. Physical, occupational, and speech therapy at home\n3. Medical social worker services\n4. Home health aide assistance with personal care\n5. Telehealth monitoring for certain conditions\n\nEligibility is determined by your insurance and medical necessity documented by your physician. Your case manager will arrange these services before discharge if needed. Most insurance plans, including Medicare, cover home health when medically necessary."
+                "response": "Home health services available after discharge may include:\n1. Skilled nursing visits (wound care, medication management, assessments)\n2. Physical, occupational, and speech therapy at home\n3. Medical social worker services\n4. Home health aide assistance with personal care\n5. Telehealth monitoring for certain conditions\n\nEligibility is determined by your insurance and medical necessity documented by your physician. Your case manager will arrange these services before discharge if needed. Most insurance plans, including Medicare, cover home health when medically necessary."
             },
             # Add 90+ more discharge patterns here
         ]
@@ -416,43 +1478,55 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which) (?:insurance|insurance plans|insurance providers) (?:do you|does the hospital) (?:accept|take|work with)",
-                "response": lambda match, user: "We accept most major insurance plans including:\n• Blue Cross Blue Shield (all plans)\n• Aetna\n• Cigna\n• UnitedHealthcare\n• Medicare and Medicare Advantage plans\n• Medicaid and Medicaid managed care\n• Tricare\n• Humana\n• Kaiser Permanente\n\nFor verification of your specific plan coverage, please contact our insurance verification department at (555) 456-7890 with your policy information before your visit."
+                "response": lambda match, user: self.get_accepted_insurance_response()
             },
             {
                 "regex": r"(?:how|what) (?:do|can|should) (?:I|patients) (?:verify|check|confirm) (?:if|that|whether) (?:my|their) insurance (?:covers|will cover|is accepted)",
-                "response": lambda match, user: "To verify your insurance coverage:\n1. Call our insurance verification team at (555) 456-7890\n2. Provide your insurance ID, group number, and plan details\n3. Specify the service or procedure you're seeking\n\nAlternatively, contact your insurance provider directly using the member services number on your insurance card. For planned procedures, we recommend verification at least 3-5 business days in advance to allow time to address any coverage issues."
+                "response": "To verify your insurance coverage:\n1. Call our insurance verification team at {insurance_line}\n2. Provide your insurance ID, group number, and plan details\n3. Specify the service or procedure you're seeking\n\nAlternatively, contact your insurance provider directly using the member services number on your insurance card. For planned procedures, we recommend verification at least 3-5 business days in advance to allow time to address any coverage issues."
             },
             {
                 "regex": r"(?:what|which) (?:information|documents|details) (?:do|should) (?:I|patients) (?:need|bring|provide) (?:for|about|regarding) insurance (?:verification|coverage)",
-                "response": lambda match, user: "For insurance verification, please provide:\n• Insurance ID card (front and back)\n• Photo identification\n• Name of policyholder if not yourself\n• Group and policy numbers\n• Insurance company phone number\n• Secondary insurance information if applicable\n• Referral or authorization numbers if required by your plan\n• Worker's compensation information if applicable\n\nIt's best to bring physical copies of your insurance cards to every hospital visit."
+                "response": "For insurance verification, please provide:\n• Insurance ID card (front and back)\n• Photo identification\n• Name of policyholder if not yourself\n• Group and policy numbers\n• Insurance company phone number\n• Secondary insurance information if applicable\n• Referral or authorization numbers if required by your plan\n• Worker's compensation information if applicable\n\nIt's best to bring physical copies of your insurance cards to every hospital visit."
             },
             {
                 "regex": r"(?:what|how) (?:if|about|happens when) (?:I don't have|I have no|there is no) (?:insurance|health insurance|medical insurance|coverage)",
-                "response": lambda match, user: "If you don't have insurance, we offer several options:\n1. Self-pay discounts of 30-40% for paying at time of service\n2. Financial assistance programs based on income (may provide free or reduced-cost care)\n3. Payment plans without interest\n4. Assistance applying for Medicaid or other government programs\n5. Information about healthcare marketplace options\n\nOur financial counselors can help determine your eligibility for these programs. Please contact them at (555) 789-3456 to discuss your specific situation."
+                "response": "If you don't have insurance, we offer several options:\n1. Self-pay discounts of 30-40% for paying at time of service\n2. Financial assistance programs based on income (may provide free or reduced-cost care)\n3. Payment plans without interest\n4. Assistance applying for Medicaid or other government programs\n5. Information about healthcare marketplace options\n\nOur financial counselors can help determine your eligibility for these programs. Please contact them at {financial_services_line} to discuss your specific situation."
             },
             {
                 "regex": r"(?:how|what) (?:do|does) (?:pre-authorization|prior authorization|pre-approval) (?:work|process work|system work)",
-                "response": lambda match, user: "The pre-authorization process works as follows:\n1. Your doctor orders a procedure, test, or medication requiring authorization\n2. Our authorization team submits clinical information to your insurance\n3. Insurance reviews the request (typically takes 3-10 business days)\n4. Insurance provides approval or denial\n5. Our team notifies you and your provider of the decision\n\nSome services commonly requiring pre-authorization include:\n- MRI/CT scans\n- Surgeries\n- Specialty medications\n- Inpatient admissions\n- Certain therapy services\n\nAlways check if your procedure needs pre-authorization before scheduling."
+                "response": "The pre-authorization process works as follows:\n1. Your doctor orders a procedure, test, or medication requiring authorization\n2. Our authorization team submits clinical information to your insurance\n3. Insurance reviews the request (typically takes 3-10 business days)\n4. Insurance provides approval or denial\n5. Our team notifies you and your provider of the decision\n\nSome services commonly requiring pre-authorization include:\n- MRI/CT scans\n- Surgeries\n- Specialty medications\n- Inpatient admissions\n- Certain therapy services\n\nAlways check if your procedure needs pre-authorization before scheduling."
             },
             {
                 "regex": r"(?:what|which) (?:services|procedures|treatments) (?:require|need) (?:pre-authorization|prior authorization|pre-approval)",
-                "response": lambda match, user: "Services typically requiring pre-authorization include:\n• Advanced imaging (MRI, CT, PET scans)\n• Surgeries and outpatient procedures\n• Hospital admissions (except emergencies)\n• Specialty medications and infusions\n• Durable medical equipment\n• Home health services\n• Physical/occupational/speech therapy beyond initial evaluation\n• Sleep studies\n• Genetic testing\n• Transplant services\n\nRequirements vary by insurance plan. Our scheduling team will help determine if your service needs authorization when you make your appointment."
+                "response": "Services typically requiring pre-authorization include:\n• Advanced imaging (MRI, CT, PET scans)\n• Surgeries and outpatient procedures\n• Hospital admissions (except emergencies)\n• Specialty medications and infusions\n• Durable medical equipment\n• Home health services\n• Physical/occupational/speech therapy beyond initial evaluation\n• Sleep studies\n• Genetic testing\n• Transplant services\n\nRequirements vary by insurance plan. Our scheduling team will help determine if your service needs authorization when you make your appointment."
             },
             {
                 "regex": r"(?:what|which) (?:is|about|happens with) (?:out-of-network|non-participating|non-par) (?:coverage|benefits|insurance)",
-                "response": lambda match, user: "For out-of-network care:\n1. Your out-of-pocket costs will typically be higher\n2. You may need to pay in full at time of service and submit claims yourself\n3. Your insurance may cover a lower percentage of charges\n4. You may have a separate, higher deductible for out-of-network care\n\nIn some situations (emergencies, specialized care unavailable in-network), you can request an in-network exception from your insurance. Our financial counselors can help explain your estimated costs for out-of-network services at (555) 789-3456."
+                "response": "For out-of-network care:\n1. Your out-of-pocket costs will typically be higher\n2. You may need to pay in full at time of service and submit claims yourself\n3. Your insurance may cover a lower percentage of charges\n4. You may have a separate, higher deductible for out-of-network care\n\nIn some situations (emergencies, specialized care unavailable in-network), you can request an in-network exception from your insurance. Our financial counselors can help explain your estimated costs for out-of-network services at {financial_services_line}."
             },
             {
                 "regex": r"(?:how|what) (?:do|does|about) (?:co-pays|copays|co-payments) (?:work|process work|collection work)",
-                "response": lambda match, user: "Copays work as follows:\n1. Determined by your specific insurance plan\n2. Usually collected at time of service\n3. May differ by service type (office visit, specialist, ER, etc.)\n4. Separate from deductibles and coinsurance\n\nWe accept copayments via cash, check, credit/debit cards, and HSA/FSA cards. For hospital stays, copays are typically collected upon admission. You can check your expected copay amount by calling our financial services team at (555) 789-3456 with your insurance information."
+                "response": "Copays work as follows:\n1. Determined by your specific insurance plan\n2. Usually collected at time of service\n3. May differ by service type (office visit, specialist, ER, etc.)\n4. Separate from deductibles and coinsurance\n\nWe accept copayments via cash, check, credit/debit cards, and HSA/FSA cards. For hospital stays, copays are typically collected upon admission. You can check your expected copay amount by calling our financial services team at {financial_services_line} with your insurance information."
             },
             {
                 "regex": r"(?:what|which|how) (?:is|are|about) (?:my|patient) (?:financial responsibility|out-of-pocket costs|payment obligations)",
-                "response": lambda match, user: "Your financial responsibility typically includes:\n1. Copays (fixed amount per visit/service)\n2. Deductible (amount you pay before insurance starts covering)\n3. Coinsurance (percentage of costs after deductible is met)\n4. Non-covered services (items your plan doesn't cover)\n\nThe specific amounts depend on your insurance plan terms. Before scheduled procedures, we offer cost estimates based on your insurance benefits. For a personalized estimate, contact our financial counselors at (555) 789-3456 with your insurance information and planned procedure codes."
+                "response": "Your financial responsibility typically includes:\n1. Copays (fixed amount per visit/service)\n2. Deductible (amount you pay before insurance starts covering)\n3. Coinsurance (percentage of costs after deductible is met)\n4. Non-covered services (items your plan doesn't cover)\n\nThe specific amounts depend on your insurance plan terms. Before scheduled procedures, we offer cost estimates based on your insurance benefits. For a personalized estimate, contact our financial counselors at {financial_services_line} with your insurance information and planned procedure codes."
             },
             {
                 "regex": r"(?:how|what) (?:do|can|about) (?:insurance claims|medical claims|claim submission) (?:work|process work|processing work)",
-                "response": lambda match, user: "Our insurance claims process works as follows:\n1. After your visit, we submit claims electronically to your insurance within 2-5 business days\n2. Insurance typically processes claims in 14-30 days\n3. We receive an Explanation of Benefits (EOB) detailing covered services\n4. Your responsibility is calculated based on your insurance terms\n5. You receive a statement for any remaining balance\n\nIf your claim is denied, our billing team works to appeal or resubmit as needed. For questions about a specific claim, contact our billing department at (555) 987-6543 with your account number and service date."
+                "response": "Our insurance claims process works as follows:\n1. After your visit, we submit claims electronically to your insurance within 2-5 business days\n2. Insurance typically processes claims in 14-30 days\n3. We receive an Explanation of Benefits (EOB) detailing covered services\n4. Your responsibility is calculated based on your insurance terms\n5. You receive a statement for any remaining balance\n\nIf your claim is denied, our billing team works to appeal or resubmit as needed. For questions about a specific claim, contact our billing department at {billing_line} with your account number and service date."
+            },
+            {
+                "regex": r"(?:is|are) (Dr\.? [a-zA-Z]+|Doctor [a-zA-Z]+) (?:an )?(?:in[- ]network|covered|participating)(?: (?:doctor|physician|provider))?(?: (?:with|for|by|under|on) (.+))?",
+                "response": lambda match, user: self.get_network_response(match.group(1), match.group(2), user, match.string)
+            },
+            {
+                "regex": r"(?:does|will) (Dr\.? [a-zA-Z]+|Doctor [a-zA-Z]+) (?:take|accept|participate with|participate in) (.+)",
+                "response": lambda match, user: self.get_network_response(match.group(1), match.group(2), user, match.string)
+            },
+            {
+                "regex": r"(?:check|verify) my (?:insurance )?(?:eligibility|coverage|benefits)|(?:is|am) (?:my insurance|my coverage|my plan|I) (?:still )?(?:active|covered|eligible)|(?:what|which) (?:insurance|insurance plan|health plan) (?:do I have|am I on|is on file)",
+                "response": lambda match, user: self.get_eligibility_response(user, match.string)
             },
             # Add 90+ more insurance patterns here
         ]
@@ -461,43 +1535,47 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:visitor|visitation|visiting) (?:hours|times|policy)",
-                "response": lambda match, user: "Our general visiting hours are 8:00 AM to 8:00 PM daily. However, specific units have different policies:\n\n• ICU: 10:00-11:00 AM, 1:00-2:00 PM, 4:00-5:00 PM, 8:00-9:00 PM (15 minutes per visit)\n• Maternity: 9:00 AM to 9:00 PM (partners may stay 24/7)\n• Pediatrics: Parents/guardians 24/7, others 10:00 AM to 8:00 PM\n• Behavioral Health: 6:00-8:00 PM weekdays, 2:00-4:00 PM weekends\n• Emergency Department: Limited to 1-2 visitors per patient based on department capacity\n\nVisiting hours may be adjusted during public health emergencies."
+                "response": "Our general visiting hours are 8:00 AM to 8:00 PM daily. However, specific units have different policies:\n\n• ICU: 10:00-11:00 AM, 1:00-2:00 PM, 4:00-5:00 PM, 8:00-9:00 PM (15 minutes per visit)\n• Maternity: 9:00 AM to 9:00 PM (partners may stay 24/7)\n• Pediatrics: Parents/guardians 24/7, others 10:00 AM to 8:00 PM\n• Behavioral Health: 6:00-8:00 PM weekdays, 2:00-4:00 PM weekends\n• Emergency Department: Limited to 1-2 visitors per patient based on department capacity\n\nVisiting hours may be adjusted during public health emergencies."
             },
             {
                 "regex": r"(?:how many|what number of) (?:visitors|people|family members) (?:can|are allowed|may) (?:visit|see|be with) (?:a patient|patients|someone) (?:at|during) (?:one|a|the same) time",
-                "response": lambda match, user: "Visitor limits vary by unit:\n• General medical/surgical floors: 2 visitors at a time\n• ICU: 2 visitors during designated hours\n• Maternity: 2 visitors plus partner/support person\n• Pediatrics: 2 parents/guardians at all times, 1-2 additional visitors during regular hours\n• End-of-life care: Special arrangements for additional family members\n• Isolation rooms: May have additional restrictions\n\nCharge nurses may make exceptions for special circumstances. These limits help maintain a healing environment and allow our staff to provide optimal care."
+                "response": "Visitor limits vary by unit:\n• General medical/surgical floors: 2 visitors at a time\n• ICU: 2 visitors during designated hours\n• Maternity: 2 visitors plus partner/support person\n• Pediatrics: 2 parents/guardians at all times, 1-2 additional visitors during regular hours\n• End-of-life care: Special arrangements for additional family members\n• Isolation rooms: May have additional restrictions\n\nCharge nurses may make exceptions for special circumstances. These limits help maintain a healing environment and allow our staff to provide optimal care."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:rules|policy|guidelines) (?:for|about|regarding) (?:children|kids|minors) (?:visitors|visiting)",
-                "response": lambda match, user: "Our policy for child visitors:\n• Children under 14 must be accompanied by an adult who is not the patient\n• Children should be supervised at all times\n• Children are not permitted in isolation rooms except in special circumstances\n• Children must be free from illness/infection (no fever, cough, rash, etc.)\n• Some units (ICU, oncology) may have additional age restrictions\n• Children visiting siblings in maternity/pediatrics may require special screening\n\nWe recognize the importance of family connections but must balance this with infection control and patient care needs."
+                "response": "Our policy for child visitors:\n• Children under 14 must be accompanied by an adult who is not the patient\n• Children should be supervised at all times\n• Children are not permitted in isolation rooms except in special circumstances\n• Children must be free from illness/infection (no fever, cough, rash, etc.)\n• Some units (ICU, oncology) may have additional age restrictions\n• Children visiting siblings in maternity/pediatrics may require special screening\n\nWe recognize the importance of family connections but must balance this with infection control and patient care needs."
             },
             {
                 "regex": r"(?:do|are) (?:visitors|family members|friends) (?:need|required) (?:to|must) (?:check in|register|sign in) (?:somewhere|anywhere|at a desk)",
-                "response": lambda match, user: "Yes, all visitors must check in at these locations:\n1. Main entrance information desk (5:00 AM - 9:00 PM)\n2. Emergency Department entrance (after hours)\n3. Unit-specific nursing stations outside regular hours\n\nVisitors will need to:\n• Present photo ID\n• Receive a visitor badge\n• Sign in with name, contact information, and patient being visited\n• Complete a brief health screening questionnaire\n\nThis process helps us maintain campus security and assist with contact tracing when necessary."
+                "response": "Yes, all visitors must check in at these locations:\n1. Main entrance information desk (5:00 AM - 9:00 PM)\n2. Emergency Department entrance (after hours)\n3. Unit-specific nursing stations outside regular hours\n\nVisitors will need to:\n• Present photo ID\n• Receive a visitor badge\n• Sign in with name, contact information, and patient being visited\n• Complete a brief health screening questionnaire\n\nThis process helps us maintain campus security and assist with contact tracing when necessary."
             },
             {
                 "regex": r"(?:where|how) (?:can|do) (?:I|visitors) (?:find|locate|get to) (?:a patient's|someone's|the) (?:room|location)",
-                "response": lambda match, user: "To locate a patient's room:\n1. Visit the information desk in the main lobby with the patient's full name\n2. Use our electronic directory kiosks (located at all major entrances)\n3. Call our patient information line at (555) 123-4500\n\nFor privacy reasons, we can only provide room information if the patient has agreed to be listed in our directory. Some patients (behavioral health, certain VIPs, etc.) may opt out of the directory. Staff will confirm the patient's privacy settings before providing location information."
+                "response": "To locate a patient's room:\n1. Visit the information desk in the main lobby with the patient's full name\n2. Use our electronic directory kiosks (located at all major entrances)\n3. Call our patient information line at (555) 123-4500\n\nFor privacy reasons, we can only provide room information if the patient has agreed to be listed in our directory. Some patients (behavioral health, certain VIPs, etc.) may opt out of the directory. Staff will confirm the patient's privacy settings before providing location information."
             },
             {
                 "regex": r"(?:what|which) (?:items|things|gifts) (?:can|are allowed to|may) (?:I|visitors) (?:bring|take|deliver) (?:to|for) (?:patients|a patient|someone)",
-                "response": lambda match, user: "Acceptable items to bring patients include:\n• Clothing, pajamas, slippers (non-slip)\n• Toiletries without alcohol content\n• Books, magazines, electronic devices\n• Eyeglasses, hearing aids, dentures\n• Photos and small mementos\n• Sealed, commercially prepared food (with nursing approval)\n• Flowers (except in ICU, oncology, transplant units)\n\nProhibited items include:\n• Alcohol, drugs, tobacco, e-cigarettes\n• Weapons of any kind\n• Homemade food in most cases\n• Latex balloons (mylar are acceptable)\n• Strong perfumes/colognes\n• Valuable items"
+                "response": "Acceptable items to bring patients include:\n• Clothing, pajamas, slippers (non-slip)\n• Toiletries without alcohol content\n• Books, magazines, electronic devices\n• Eyeglasses, hearing aids, dentures\n• Photos and small mementos\n• Sealed, commercially prepared food (with nursing approval)\n• Flowers (except in ICU, oncology, transplant units)\n\nProhibited items include:\n• Alcohol, drugs, tobacco, e-cigarettes\n• Weapons of any kind\n• Homemade food in most cases\n• Latex balloons (mylar are acceptable)\n• Strong perfumes/colognes\n• Valuable items"
             },
             {
                 "regex": r"(?:are there|do you have|is there) (?:any|special) (?:overnight|after hours) (?:accommodations|arrangements|options) (?:for|available to) (?:visitors|family|relatives)",
-                "response": lambda match, user: "Overnight accommodations for visitors include:\n• In-room sleep chairs in pediatric units for parents/guardians\n• Maternity unit accommodations for one support person\n• Family lounges with recliners in some units for family of critically ill patients\n• Hospital-affiliated hotel with reduced rates (connected via skyway)\n• Ronald McDonald House for families of pediatric patients (based on eligibility)\n\nFor overnight stays in patient rooms, please obtain approval from the charge nurse. Accommodations are limited to one visitor per patient except in special circumstances."
+                "response": "Overnight accommodations for visitors include:\n• In-room sleep chairs in pediatric units for parents/guardians\n• Maternity unit accommodations for one support person\n• Family lounges with recliners in some units for family of critically ill patients\n• Hospital-affiliated hotel with reduced rates (connected via skyway)\n• Ronald McDonald House for families of pediatric patients (based on eligibility)\n\nFor overnight stays in patient rooms, please obtain approval from the charge nurse. Accommodations are limited to one visitor per patient except in special circumstances."
             },
             {
                 "regex": r"(?:what|where) (?:are|is) (?:the|your) (?:visitor|guest|family) (?:parking|parking options|places to park)",
-                "response": lambda match, user: "Visitor parking options include:\n1. Main Visitor Garage (adjacent to hospital entrance)\n   - $2 per hour, $10 daily maximum\n   - Open 24/7\n2. Surface Lot B (across from Emergency Department)\n   - $1 per hour, $8 daily maximum\n   - Open 24/7\n3. Valet parking at main entrance\n   - $5 for up to 4 hours, $15 for 4+ hours\n   - Available 6:00 AM - 8:00 PM weekdays\n\nDiscount parking passes (5-day, 10-day, monthly) are available at the information desk for families of extended-stay patients."
+                "response": "Visitor parking options include:\n1. Main Visitor Garage (adjacent to hospital entrance)\n   - $2 per hour, $10 daily maximum\n   - Open 24/7\n2. Surface Lot B (across from Emergency Department)\n   - $1 per hour, $8 daily maximum\n   - Open 24/7\n3. Valet parking at main entrance\n   - $5 for up to 4 hours, $15 for 4+ hours\n   - Available 6:00 AM - 8:00 PM weekdays\n\nDiscount parking passes (5-day, 10-day, monthly) are available at the information desk for families of extended-stay patients."
             },
             {
                 "regex": r"(?:are there|do you have|is there) (?:any|special) (?:restrictions|limitations|special rules) (?:for|on|about) (?:visitors|visiting) (?:in|on|at) (?:specific|certain|particular) (?:units|departments|areas)",
-                "response": lambda match, user: "Special visitor restrictions by unit include:\n\n• ICU: Limited to immediate family, max 2 visitors during specific hours, 15-minute visits\n• Oncology: No visitors with recent illness or infection, no fresh flowers/plants\n• Transplant Units: Strict infection control, visitors screened for infections\n• Behavioral Health: Approved visitor list only, belongings checked at entrance\n• Labor & Delivery: Limited to 2-3 designated support persons throughout stay\n• NICU: Parents/guardians only, with special handwashing protocols\n• Isolation Rooms: PPE required, limited duration visits\n\nUnit-specific policies are posted at entrances to each department."
+                "response": "Special visitor restrictions by unit include:\n\n• ICU: Limited to immediate family, max 2 visitors during specific hours, 15-minute visits\n• Oncology: No visitors with recent illness or infection, no fresh flowers/plants\n• Transplant Units: Strict infection control, visitors screened for infections\n• Behavioral Health: Approved visitor list only, belongings checked at entrance\n• Labor & Delivery: Limited to 2-3 designated support persons throughout stay\n• NICU: Parents/guardians only, with special handwashing protocols\n• Isolation Rooms: PPE required, limited duration visits\n\nUnit-specific policies are posted at entrances to each department."
             },
             {
                 "regex": r"(?:what|which) (?:amenities|facilities|services) (?:are|is) (?:available|offered|provided) (?:to|for) (?:visitors|family members|guests)",
-                "response": lambda match, user: "Amenities for visitors include:\n• Cafeteria (1st floor, open 6:30 AM - 8:00 PM)\n• Coffee shop (main lobby, open 6:00 AM - 6:00 PM weekdays, 8:00 AM - 2:00 PM weekends)\n• Vending machines (various locations, 24/7)\n• Chapel/meditation room (2nd floor, always open)\n• Family lounges on each unit with TV and comfortable seating\n• Free Wi-Fi throughout facility\n• ATM in main lobby\n• Gift shop (main lobby, 9:00 AM - 7:00 PM weekdays, 11:00 AM - 5:00 PM weekends)\n• Business center with computers/printer (3rd floor)\n• Lactation rooms for nursing mothers\n• Shower facilities for long-term family members (request from nursing staff)"
+                "response": "Amenities for visitors include:\n• Cafeteria (1st floor, open 6:30 AM - 8:00 PM)\n• Coffee shop (main lobby, open 6:00 AM - 6:00 PM weekdays, 8:00 AM - 2:00 PM weekends)\n• Vending machines (various locations, 24/7)\n• Chapel/meditation room (2nd floor, always open)\n• Family lounges on each unit with TV and comfortable seating\n• Free Wi-Fi throughout facility\n• ATM in main lobby\n• Gift shop (main lobby, 9:00 AM - 7:00 PM weekdays, 11:00 AM - 5:00 PM weekends)\n• Business center with computers/printer (3rd floor)\n• Lactation rooms for nursing mothers\n• Shower facilities for long-term family members (request from nursing staff)"
+            },
+            {
+                "regex": r"(?:how busy|how full|how crowded) is (?:the )?([a-zA-Z&'\-\s]+)",
+                "response": lambda match, user: self.get_unit_visit_response(match.group(1))
             },
             # Add 90+ more visitor patterns here
         ]
@@ -506,43 +1584,43 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:cafeteria|dining|food service) (?:hours|timing|schedule)",
-                "response": lambda match, user: "Our main cafeteria hours are:\n• Breakfast: 6:30 AM - 10:00 AM\n• Lunch: 11:00 AM - 2:00 PM\n• Dinner: 4:30 PM - 8:00 PM\n\nThe grab-and-go section with sandwiches, salads, and snacks is available from 6:30 AM to 8:00 PM daily. The coffee bar operates from 6:30 AM to 6:00 PM on weekdays and 7:00 AM to 2:00 PM on weekends. Vending machines with snacks and beverages are available 24/7 in the vending area near the cafeteria and in waiting areas throughout the hospital."
+                "response": "Our main cafeteria hours are:\n• Breakfast: 6:30 AM - 10:00 AM\n• Lunch: 11:00 AM - 2:00 PM\n• Dinner: 4:30 PM - 8:00 PM\n\nThe grab-and-go section with sandwiches, salads, and snacks is available from 6:30 AM to 8:00 PM daily. The coffee bar operates from 6:30 AM to 6:00 PM on weekdays and 7:00 AM to 2:00 PM on weekends. Vending machines with snacks and beverages are available 24/7 in the vending area near the cafeteria and in waiting areas throughout the hospital."
             },
             {
                 "regex": r"(?:where|what) (?:is|are) (?:the|your) (?:cafeteria|dining area|food court) (?:located|situated)",
-                "response": lambda match, user: "Our main cafeteria is located on the first floor of the South Wing (Building B). From the main entrance, follow the blue line on the floor or the overhead signs toward 'Dining Services.' The cafeteria is near elevator bank B, across from the gift shop. Additional dining options include:\n• Coffee shop in the main lobby\n• Doctors' dining room on the second floor (physicians only)\n• Courtyard Café in the Medical Office Building (Building C, first floor)\n• Rooftop Garden Café in the Cancer Center (seasonal, May-October)"
+                "response": "Our main cafeteria is located on the first floor of the South Wing (Building B). From the main entrance, follow the blue line on the floor or the overhead signs toward 'Dining Services.' The cafeteria is near elevator bank B, across from the gift shop. Additional dining options include:\n• Coffee shop in the main lobby\n• Doctors' dining room on the second floor (physicians only)\n• Courtyard Café in the Medical Office Building (Building C, first floor)\n• Rooftop Garden Café in the Cancer Center (seasonal, May-October)"
             },
             {
                 "regex": r"(?:what|which) (?:food|meal|dining) (?:options|choices|selections) (?:are|is) (?:available|offered|served) (?:in|at) (?:the|your) cafeteria",
-                "response": lambda match, user: "Our cafeteria offers diverse options including:\n• Hot entrée station with daily specials (including vegetarian option)\n• Grill serving burgers, sandwiches, and breakfast items\n• Made-to-order deli sandwich station\n• Pizza and pasta bar\n• Fresh salad bar with over 30 items\n• Sushi station (Tuesday and Thursday only)\n• Soup station (3-4 daily selections, including vegetarian)\n• International cuisine station (rotating menu)\n• Grab-and-go section with pre-made options\n• Dessert and bakery section\n• Beverage station\n\nWeekly menus are posted on our hospital website and at cafeteria entrances."
+                "response": "Our cafeteria offers diverse options including:\n• Hot entrée station with daily specials (including vegetarian option)\n• Grill serving burgers, sandwiches, and breakfast items\n• Made-to-order deli sandwich station\n• Pizza and pasta bar\n• Fresh salad bar with over 30 items\n• Sushi station (Tuesday and Thursday only)\n• Soup station (3-4 daily selections, including vegetarian)\n• International cuisine station (rotating menu)\n• Grab-and-go section with pre-made options\n• Dessert and bakery section\n• Beverage station\n\nWeekly menus are posted on our hospital website and at cafeteria entrances."
             },
             {
                 "regex": r"(?:what|which|how much) (?:are|is) (?:the|your) (?:cafeteria|food|meal) (?:prices|cost|rates)",
-                "response": lambda match, user: "Our cafeteria prices are designed to be affordable:\n• Breakfast items: $1.50-$5.50\n• Sandwiches and burgers: $4.00-$7.00\n• Hot entrées: $5.50-$8.50\n• Pizza slices: $2.50-$3.50\n• Salad bar: $0.59/ounce\n• Soups: $2.50 (cup), $3.75 (bowl)\n• Side dishes: $1.50-$3.00\n• Desserts: $1.50-$4.00\n• Beverages: $1.50-$3.00\n\nHospital employees receive a 20% discount with ID badge. Weekly specials and combo meals offer additional savings. We accept cash, credit/debit cards, and mobile payment options."
+                "response": "Our cafeteria prices are designed to be affordable:\n• Breakfast items: $1.50-$5.50\n• Sandwiches and burgers: $4.00-$7.00\n• Hot entrées: $5.50-$8.50\n• Pizza slices: $2.50-$3.50\n• Salad bar: $0.59/ounce\n• Soups: $2.50 (cup), $3.75 (bowl)\n• Side dishes: $1.50-$3.00\n• Desserts: $1.50-$4.00\n• Beverages: $1.50-$3.00\n\nHospital employees receive a 20% discount with ID badge. Weekly specials and combo meals offer additional savings. We accept cash, credit/debit cards, and mobile payment options."
             },
             {
                 "regex": r"(?:do you|does the cafeteria) (?:have|offer|accommodate) (?:special|specific|specialized) (?:diets|dietary needs|food restrictions)",
-                "response": lambda match, user: "Yes, our cafeteria accommodates various dietary needs:\n• Vegetarian and vegan options daily at all stations\n• Gluten-free selections (clearly labeled)\n• Kosher pre-packaged meals available upon request\n• Halal options available certain days (check weekly menu)\n• Low-sodium choices (identified with heart-healthy symbols)\n• Diabetic-friendly options (carb counts displayed)\n• Allergen information posted for all prepared foods\n\nOur dietitians work with food services to ensure diverse dietary needs are met. For specific dietary concerns, staff at the cafeteria information desk can provide detailed ingredient information."
+                "response": "Yes, our cafeteria accommodates various dietary needs:\n• Vegetarian and vegan options daily at all stations\n• Gluten-free selections (clearly labeled)\n• Kosher pre-packaged meals available upon request\n• Halal options available certain days (check weekly menu)\n• Low-sodium choices (identified with heart-healthy symbols)\n• Diabetic-friendly options (carb counts displayed)\n• Allergen information posted for all prepared foods\n\nOur dietitians work with food services to ensure diverse dietary needs are met. For specific dietary concerns, staff at the cafeteria information desk can provide detailed ingredient information."
             },
             {
                 "regex": r"(?:can|do) (?:visitors|family members|guests) (?:eat|dine) (?:in|at) (?:the|your) cafeteria",
-                "response": lambda match, user: "Yes, visitors are welcome to eat in our cafeteria. The facility is open to patients (who are medically able to leave their rooms), visitors, staff, and the general public. The cafeteria provides a comfortable dining environment with various seating options including:\n• Main dining area with tables for 2-6 people\n• Private booths along the windows\n• Outdoor patio seating (seasonal)\n• Quiet section for those seeking a more peaceful environment\n\nVisitors can also purchase food to take back to patient waiting areas or patient rooms if appropriate for the patient's dietary restrictions."
+                "response": "Yes, visitors are welcome to eat in our cafeteria. The facility is open to patients (who are medically able to leave their rooms), visitors, staff, and the general public. The cafeteria provides a comfortable dining environment with various seating options including:\n• Main dining area with tables for 2-6 people\n• Private booths along the windows\n• Outdoor patio seating (seasonal)\n• Quiet section for those seeking a more peaceful environment\n\nVisitors can also purchase food to take back to patient waiting areas or patient rooms if appropriate for the patient's dietary restrictions."
             },
             {
                 "regex": r"(?:can|do) (?:I|visitors|family) (?:bring|take|deliver) (?:cafeteria|outside) food (?:to|for) (?:patients|a patient)",
-                "response": lambda match, user: "Visitors may bring food from our cafeteria to patients, but with important considerations:\n1. Check with the nursing staff first to ensure the patient doesn't have dietary restrictions\n2. Many patients are on specific diets (low-sodium, diabetic, liquid, etc.) prescribed by their physicians\n3. Some medications interact with certain foods\n4. Some units (ICU, pre/post-surgical) may restrict outside food\n\nIf approved by nursing staff, we provide disposable trays for transporting cafeteria food to patient rooms. Please note that homemade food from outside the hospital may have additional restrictions due to food safety protocols."
+                "response": "Visitors may bring food from our cafeteria to patients, but with important considerations:\n1. Check with the nursing staff first to ensure the patient doesn't have dietary restrictions\n2. Many patients are on specific diets (low-sodium, diabetic, liquid, etc.) prescribed by their physicians\n3. Some medications interact with certain foods\n4. Some units (ICU, pre/post-surgical) may restrict outside food\n\nIf approved by nursing staff, we provide disposable trays for transporting cafeteria food to patient rooms. Please note that homemade food from outside the hospital may have additional restrictions due to food safety protocols."
             },
             {
                 "regex": r"(?:are there|do you have|is there) (?:any|other) (?:food|dining|meal) (?:options|alternatives|choices) (?:besides|other than|apart from) (?:the|your) cafeteria",
-                "response": lambda match, user: "Yes, additional food options beyond our main cafeteria include:\n• Sunrise Coffee Shop (main lobby): specialty coffees, teas, pastries, sandwiches\n• Vending machines: throughout hospital, 24/7 access, offering snacks and beverages\n• Courtyard Café (Medical Office Building): lighter fare, smoothies, gourmet sandwiches\n• Rooftop Garden Café (Cancer Center): seasonal healthy options\n• Gift shop: packaged snacks, candies, beverages\n• Mobile food ordering: select local restaurants deliver to hospital lobby\n• Weekly food trucks (Tuesday/Thursday, 11am-2pm) in the visitor parking area during summer months\n\nHospital volunteers can provide information about nearby restaurants within walking distance."
+                "response": "Yes, additional food options beyond our main cafeteria include:\n• Sunrise Coffee Shop (main lobby): specialty coffees, teas, pastries, sandwiches\n• Vending machines: throughout hospital, 24/7 access, offering snacks and beverages\n• Courtyard Café (Medical Office Building): lighter fare, smoothies, gourmet sandwiches\n• Rooftop Garden Café (Cancer Center): seasonal healthy options\n• Gift shop: packaged snacks, candies, beverages\n• Mobile food ordering: select local restaurants deliver to hospital lobby\n• Weekly food trucks (Tuesday/Thursday, 11am-2pm) in the visitor parking area during summer months\n\nHospital volunteers can provide information about nearby restaurants within walking distance."
             },
             {
                 "regex": r"(?:do you|does the cafeteria) (?:offer|provide|have) (?:healthy|nutritious|wholesome) (?:food|meal|dining) (?:options|choices|alternatives)",
-                "response": lambda match, user: "Yes, we emphasize healthy options in our cafeteria including:\n• 'Mindful Choice' items (under 500 calories, controlled sodium and fat) highlighted with green labels\n• Complete nutritional information displayed for all prepared foods\n• Fresh salad bar with numerous vegetables, lean proteins, and light dressing options\n• Steamed vegetables daily with no added salt or butter\n• Whole grain options for bread, pasta, and rice\n• Lean protein selections (baked, grilled, or roasted)\n• Fresh fruit available at all meals\n• Reduced-sugar dessert alternatives\n\nOur hospital dietitians regularly review and update menu items to ensure healthy, balanced options are always available."
+                "response": "Yes, we emphasize healthy options in our cafeteria including:\n• 'Mindful Choice' items (under 500 calories, controlled sodium and fat) highlighted with green labels\n• Complete nutritional information displayed for all prepared foods\n• Fresh salad bar with numerous vegetables, lean proteins, and light dressing options\n• Steamed vegetables daily with no added salt or butter\n• Whole grain options for bread, pasta, and rice\n• Lean protein selections (baked, grilled, or roasted)\n• Fresh fruit available at all meals\n• Reduced-sugar dessert alternatives\n\nOur hospital dietitians regularly review and update menu items to ensure healthy, balanced options are always available."
             },
             {
                 "regex": r"(?:what|which) (?:payment methods|forms of payment|ways to pay) (?:do you|does the cafeteria) (?:accept|take)",
-                "response": lambda match, user: "Our cafeteria accepts multiple payment methods:\n• Cash\n• Credit cards (Visa, MasterCard, American Express, Discover)\n• Debit cards\n• Mobile payments (Apple Pay, Google Pay, Samsung Pay)\n• Employee badge payroll deduction (for staff only)\n• Meal vouchers (provided by some departments for patients' families in certain situations)\n• Contactless payment options\n\nWe also offer pre-loaded meal cards that can be purchased at the cashier station - these make convenient gifts for family members of patients with extended stays."
+                "response": "Our cafeteria accepts multiple payment methods:\n• Cash\n• Credit cards (Visa, MasterCard, American Express, Discover)\n• Debit cards\n• Mobile payments (Apple Pay, Google Pay, Samsung Pay)\n• Employee badge payroll deduction (for staff only)\n• Meal vouchers (provided by some departments for patients' families in certain situations)\n• Contactless payment options\n\nWe also offer pre-loaded meal cards that can be purchased at the cashier station - these make convenient gifts for family members of patients with extended stays."
             },
             # Add 90+ more cafeteria patterns here
         ]
@@ -551,43 +1629,43 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:how|what) (?:can|do) (?:I|someone) (?:become|apply to be|sign up as) (?:a|to be a) volunteer",
-                "response": lambda match, user: "To become a hospital volunteer:\n1. Complete an online application at hospital.example.com/volunteer\n2. Attend an information session (held monthly)\n3. Complete an interview with our volunteer coordinator\n4. Pass a background check and health screening (including TB test and vaccinations)\n5. Attend orientation and training (4-6 hours)\n6. Commit to at least 4 hours per week for a minimum of six months\n\nThe application process typically takes 3-4 weeks. For questions, contact our Volunteer Services office at (555) 123-4567 ext. 5678 or volunteer@hospital.example.com."
+                "response": "To become a hospital volunteer:\n1. Complete an online application at {website}/volunteer\n2. Attend an information session (held monthly)\n3. Complete an interview with our volunteer coordinator\n4. Pass a background check and health screening (including TB test and vaccinations)\n5. Attend orientation and training (4-6 hours)\n6. Commit to at least 4 hours per week for a minimum of six months\n\nThe application process typically takes 3-4 weeks. For questions, contact our Volunteer Services office at (555) 123-4567 ext. 5678 or volunteer@hospital.example.com."
             },
             {
                 "regex": r"(?:what|which) (?:volunteer|volunteering) (?:opportunities|positions|roles|options) (?:are|do you) (?:available|offer|have)",
-                "response": lambda match, user: "We offer diverse volunteer opportunities including:\n• Patient comfort ambassadors\n• Information desk/wayfinding\n• Gift shop assistants\n• Book/magazine cart service\n• Music program volunteers\n• Pet therapy program assistants\n• Emergency department support\n• Administrative/clerical assistance\n• Courier services\n• Spiritual care support\n• Surgery waiting room attendants\n• Maternity unit cuddlers (for babies with neonatal abstinence syndrome)\n• Hospice companions\n\nOpportunities vary based on hospital needs, volunteer availability, and special skills. We match volunteers to roles that fit their interests and abilities."
+                "response": "We offer diverse volunteer opportunities including:\n• Patient comfort ambassadors\n• Information desk/wayfinding\n• Gift shop assistants\n• Book/magazine cart service\n• Music program volunteers\n• Pet therapy program assistants\n• Emergency department support\n• Administrative/clerical assistance\n• Courier services\n• Spiritual care support\n• Surgery waiting room attendants\n• Maternity unit cuddlers (for babies with neonatal abstinence syndrome)\n• Hospice companions\n\nOpportunities vary based on hospital needs, volunteer availability, and special skills. We match volunteers to roles that fit their interests and abilities."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:requirements|qualifications|criteria) (?:for|to be|to become) (?:a|to be a) volunteer",
-                "response": lambda match, user: "Basic volunteer requirements include:\n• Minimum age of 16 (certain areas require volunteers to be 18+)\n• Ability to commit to at least 4 hours weekly for 6+ months\n• Passing a background check\n• Completing health screening (TB test, flu vaccine during flu season)\n• COVID-19 vaccination\n• Proof of immunity to measles, mumps, rubella, and varicella\n• Ability to stand/walk for extended periods (some positions)\n• Strong communication skills\n• Professional demeanor and respect for privacy\n• Completion of orientation and training\n\nNo prior healthcare experience is required for most volunteer positions."
+                "response": "Basic volunteer requirements include:\n• Minimum age of 16 (certain areas require volunteers to be 18+)\n• Ability to commit to at least 4 hours weekly for 6+ months\n• Passing a background check\n• Completing health screening (TB test, flu vaccine during flu season)\n• COVID-19 vaccination\n• Proof of immunity to measles, mumps, rubella, and varicella\n• Ability to stand/walk for extended periods (some positions)\n• Strong communication skills\n• Professional demeanor and respect for privacy\n• Completion of orientation and training\n\nNo prior healthcare experience is required for most volunteer positions."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:volunteer|volunteering) (?:hours|schedule|shifts|times)",
-                "response": lambda match, user: "Volunteer shifts are available 7 days a week:\n• Weekdays: 8:00 AM - 12:00 PM, 12:00 PM - 4:00 PM, 4:00 PM - 8:00 PM\n• Weekends: 9:00 AM - 1:00 PM, 1:00 PM - 5:00 PM\n• Special events: varied times\n\nMost volunteers serve one 4-hour shift weekly on a consistent schedule. Some departments have specific time requirements based on patient/visitor needs. Weekend and evening volunteers are especially needed. We work to accommodate volunteers' availability while meeting hospital needs. College students can arrange flexible schedules around classes."
+                "response": "Volunteer shifts are available 7 days a week:\n• Weekdays: 8:00 AM - 12:00 PM, 12:00 PM - 4:00 PM, 4:00 PM - 8:00 PM\n• Weekends: 9:00 AM - 1:00 PM, 1:00 PM - 5:00 PM\n• Special events: varied times\n\nMost volunteers serve one 4-hour shift weekly on a consistent schedule. Some departments have specific time requirements based on patient/visitor needs. Weekend and evening volunteers are especially needed. We work to accommodate volunteers' availability while meeting hospital needs. College students can arrange flexible schedules around classes."
             },
             {
                 "regex": r"(?:are there|do you have|is there) (?:any|special) (?:benefits|perks|advantages) (?:for|to|of) (?:being a|becoming a) volunteer",
-                "response": lambda match, user: "Volunteer benefits include:\n• Free parking during volunteer shifts\n• 20% discount in hospital cafeteria and gift shop\n• Annual recognition events and service awards\n• Letters of recommendation for school/employment\n• Professional references after 100 hours of service\n• Skills development and healthcare exposure\n• Access to continuing education opportunities\n• Invitation to hospital events\n• Volunteer newsletter subscription\n• Personal satisfaction of helping others\n• Social connections with other volunteers\n\nVolunteers also receive a uniform (vest or jacket) and name badge identifying them as hospital volunteers."
+                "response": "Volunteer benefits include:\n• Free parking during volunteer shifts\n• 20% discount in hospital cafeteria and gift shop\n• Annual recognition events and service awards\n• Letters of recommendation for school/employment\n• Professional references after 100 hours of service\n• Skills development and healthcare exposure\n• Access to continuing education opportunities\n• Invitation to hospital events\n• Volunteer newsletter subscription\n• Personal satisfaction of helping others\n• Social connections with other volunteers\n\nVolunteers also receive a uniform (vest or jacket) and name badge identifying them as hospital volunteers."
             },
             {
                 "regex": r"(?:do|can) (?:volunteers|you) (?:work|help|assist) (?:directly|with|alongside) (?:patients|the sick|the ill)",
-                "response": lambda match, user: "Yes, many volunteer roles involve direct patient interaction, including:\n• Visiting patients to provide companionship\n• Delivering flowers, mail, or reading materials\n• Assisting with meals and hydration\n• Providing hand massages or playing music\n• Supporting families in waiting areas\n• Helping with patient navigation and transport\n• Reading to or playing games with pediatric patients\n\nDirect patient care volunteers receive specialized training and are always supervised by clinical staff. Patient privacy and safety protocols must be strictly followed. Some patient care areas have additional requirements or restrictions for volunteers."
+                "response": "Yes, many volunteer roles involve direct patient interaction, including:\n• Visiting patients to provide companionship\n• Delivering flowers, mail, or reading materials\n• Assisting with meals and hydration\n• Providing hand massages or playing music\n• Supporting families in waiting areas\n• Helping with patient navigation and transport\n• Reading to or playing games with pediatric patients\n\nDirect patient care volunteers receive specialized training and are always supervised by clinical staff. Patient privacy and safety protocols must be strictly followed. Some patient care areas have additional requirements or restrictions for volunteers."
             },
             {
                 "regex": r"(?:do you|is there|are there) (?:any|have|offer) (?:volunteer|volunteering) (?:opportunities|positions|roles) (?:for|available to) (?:teenagers|high school students|college students|youth)",
-                "response": lambda match, user: "Yes, we have youth volunteer programs:\n\n• Teen Volunteer Program (ages 16-18):\n  - Information desk assistance\n  - Patient amenities delivery\n  - Clerical support\n  - Gift shop assistance\n  - Visitor escorts\n\n• Summer Healthcare Exploration Program (for high school juniors/seniors):\n  - Structured 8-week program\n  - Rotations through various departments\n  - Healthcare career seminars\n  - Mentorship opportunities\n\n• College Student Program:\n  - Pre-med/nursing student placements\n  - Department-specific opportunities\n  - Academic credit options (with school approval)\n\nAll youth volunteers must complete special orientation and parental consent forms."
+                "response": "Yes, we have youth volunteer programs:\n\n• Teen Volunteer Program (ages 16-18):\n  - Information desk assistance\n  - Patient amenities delivery\n  - Clerical support\n  - Gift shop assistance\n  - Visitor escorts\n\n• Summer Healthcare Exploration Program (for high school juniors/seniors):\n  - Structured 8-week program\n  - Rotations through various departments\n  - Healthcare career seminars\n  - Mentorship opportunities\n\n• College Student Program:\n  - Pre-med/nursing student placements\n  - Department-specific opportunities\n  - Academic credit options (with school approval)\n\nAll youth volunteers must complete special orientation and parental consent forms."
             },
             {
                 "regex": r"(?:is there|do you have|are there) (?:a|any) (?:time|hour|service) (?:commitment|requirement|obligation) (?:for|to be|to become) (?:a|to be a) volunteer",
-                "response": lambda match, user: "Yes, we ask volunteers to commit to:\n• Minimum 4 hours per week\n• At least 6 months of service (100 hours minimum)\n• Consistent attendance at scheduled shifts\n• Advance notice for absences\n\nThis commitment allows volunteers to become familiar with their roles and develop meaningful relationships with staff and patients. It also ensures the hospital can rely on volunteer support. For those unable to make this commitment, we offer special event volunteering opportunities and our annual fundraising gala that require shorter time commitments."
+                "response": "Yes, we ask volunteers to commit to:\n• Minimum 4 hours per week\n• At least 6 months of service (100 hours minimum)\n• Consistent attendance at scheduled shifts\n• Advance notice for absences\n\nThis commitment allows volunteers to become familiar with their roles and develop meaningful relationships with staff and patients. It also ensures the hospital can rely on volunteer support. For those unable to make this commitment, we offer special event volunteering opportunities and our annual fundraising gala that require shorter time commitments."
             },
             {
                 "regex": r"(?:how|what) (?:do|can) (?:volunteers|they) (?:help|assist|contribute to) (?:the|your) hospital",
-                "response": lambda match, user: "Volunteers contribute significantly by:\n• Enhancing patient experience and satisfaction\n• Providing non-clinical support that frees staff for medical tasks\n• Offering comfort to patients and families during difficult times\n• Assisting with navigation and wayfinding (reducing missed appointments)\n• Supporting administrative functions\n• Raising funds through gift shop and fundraising events\n• Creating a more welcoming environment\n• Serving as hospital ambassadors in the community\n• Contributing thousands of service hours annually (over 25,000 hours last year)\n\nOur volunteers are integral to our mission of delivering compassionate, high-quality healthcare to our community."
+                "response": "Volunteers contribute significantly by:\n• Enhancing patient experience and satisfaction\n• Providing non-clinical support that frees staff for medical tasks\n• Offering comfort to patients and families during difficult times\n• Assisting with navigation and wayfinding (reducing missed appointments)\n• Supporting administrative functions\n• Raising funds through gift shop and fundraising events\n• Creating a more welcoming environment\n• Serving as hospital ambassadors in the community\n• Contributing thousands of service hours annually (over 25,000 hours last year)\n\nOur volunteers are integral to our mission of delivering compassionate, high-quality healthcare to our community."
             },
             {
                 "regex": r"(?:can|do) (?:I|volunteers) (?:choose|select|pick) (?:which|what|the) (?:department|area|unit) (?:to|I want to|they) volunteer (?:in|at)",
-                "response": lambda match, user: "During the application process, volunteers can indicate preferences for specific departments or types of service. We consider these preferences along with:\n• Hospital needs and available positions\n• Volunteer's skills and experience\n• Results of the volunteer interview\n• Schedule availability\n• Age restrictions for certain areas\n\nWhile we try to accommodate preferences, volunteers may initially be placed where needs are greatest. After completing 50 hours in an initial assignment, volunteers can request transfers to other areas if positions are available. Many volunteers discover unexpected satisfaction in roles they hadn't initially considered."
+                "response": "During the application process, volunteers can indicate preferences for specific departments or types of service. We consider these preferences along with:\n• Hospital needs and available positions\n• Volunteer's skills and experience\n• Results of the volunteer interview\n• Schedule availability\n• Age restrictions for certain areas\n\nWhile we try to accommodate preferences, volunteers may initially be placed where needs are greatest. After completing 50 hours in an initial assignment, volunteers can request transfers to other areas if positions are available. Many volunteers discover unexpected satisfaction in roles they hadn't initially considered."
             },
             # Add 90+ more volunteer patterns here
         ]
@@ -596,43 +1674,43 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:how|where|what) (?:can|do) (?:I|patients|someone) (?:provide|give|submit|leave) (?:feedback|comments|suggestions|reviews)",
-                "response": lambda match, user: "You can provide feedback through several channels:\n1. Patient satisfaction surveys (sent via email or mail after your visit)\n2. Comment cards available at all nursing stations and information desks\n3. Online feedback form at hospital.example.com/feedback\n4. Patient advocate office in the main lobby (Room A-105)\n5. Direct communication with unit managers or department directors\n6. Call our dedicated feedback line at (555) 123-9876\n7. Email to patientexperience@hospital.example.com\n\nAll feedback is reviewed regularly to identify improvement opportunities. We appreciate both positive comments and constructive suggestions."
+                "response": "You can provide feedback through several channels:\n1. Patient satisfaction surveys (sent via email or mail after your visit)\n2. Comment cards available at all nursing stations and information desks\n3. Online feedback form at {website}/feedback\n4. Patient advocate office in the main lobby (Room A-105)\n5. Direct communication with unit managers or department directors\n6. Call our dedicated feedback line at {advocacy_line}\n7. Email to patientexperience@hospital.example.com\n\nAll feedback is reviewed regularly to identify improvement opportunities. We appreciate both positive comments and constructive suggestions."
             },
             {
                 "regex": r"(?:how|what) (?:do|does) (?:the hospital|you) (?:use|do with|handle) (?:patient|feedback|survey) (?:feedback|comments|suggestions|reviews)",
-                "response": lambda match, user: "We use patient feedback in several important ways:\n1. Regular review by our Patient Experience Committee\n2. Department-specific improvement initiatives based on trends\n3. Recognition programs for staff mentioned positively\n4. Training and education development\n5. Service recovery for specific concerns\n6. Quarterly reporting to hospital leadership and board\n7. Annual strategic planning for patient experience enhancement\n\nFeedback directly influences our policies, procedures, and facility improvements. We track feedback metrics over time to measure improvement and identify recurring issues that need systemic solutions."
+                "response": "We use patient feedback in several important ways:\n1. Regular review by our Patient Experience Committee\n2. Department-specific improvement initiatives based on trends\n3. Recognition programs for staff mentioned positively\n4. Training and education development\n5. Service recovery for specific concerns\n6. Quarterly reporting to hospital leadership and board\n7. Annual strategic planning for patient experience enhancement\n\nFeedback directly influences our policies, procedures, and facility improvements. We track feedback metrics over time to measure improvement and identify recurring issues that need systemic solutions."
             },
             {
                 "regex": r"(?:what|which) (?:is|about) (?:the|your) (?:patient satisfaction|feedback|comment) (?:survey|questionnaire|form)",
-                "response": lambda match, user: "Our patient satisfaction survey:\n• Is sent to patients within 1 week after discharge or outpatient visits\n• Takes approximately 10-15 minutes to complete\n• Covers key aspects of care including:\n  - Communication with doctors and nurses\n  - Responsiveness of staff\n  - Pain management\n  - Medication information\n  - Discharge instructions\n  - Facility cleanliness and quietness\n  - Overall rating and likelihood to recommend\n• Includes space for open-ended comments\n• Can be completed online, by mail, or by phone\n\nSurvey results are part of national quality metrics and help us compare our performance to other hospitals."
+                "response": "Our patient satisfaction survey:\n• Is sent to patients within 1 week after discharge or outpatient visits\n• Takes approximately 10-15 minutes to complete\n• Covers key aspects of care including:\n  - Communication with doctors and nurses\n  - Responsiveness of staff\n  - Pain management\n  - Medication information\n  - Discharge instructions\n  - Facility cleanliness and quietness\n  - Overall rating and likelihood to recommend\n• Includes space for open-ended comments\n• Can be completed online, by mail, or by phone\n\nSurvey results are part of national quality metrics and help us compare our performance to other hospitals."
             },
             {
                 "regex": r"(?:how|where|what) (?:can|do) (?:I|someone) (?:file|make|submit|report) (?:a|an) (?:complaint|grievance|concern)",
-                "response": lambda match, user: "To file a complaint:\n1. Contact our Patient Advocate directly at (555) 123-9876\n2. Email concerns to patientadvocate@hospital.example.com\n3. Visit the Patient Advocate office (Main Lobby, Room A-105, open 8 AM-5 PM weekdays)\n4. Submit a written complaint to: Patient Relations, 123 Hospital Drive, City, State, ZIP\n5. Ask to speak with the department manager or supervisor while still in the facility\n\nAll complaints are taken seriously and investigated promptly. You'll receive acknowledgment within 2 business days and a full response within 7-10 days. Submitting a complaint will never adversely affect your care."
+                "response": "To file a complaint:\n1. Contact our Patient Advocate directly at {advocacy_line}\n2. Email concerns to patientadvocate@hospital.example.com\n3. Visit the Patient Advocate office (Main Lobby, Room A-105, open 8 AM-5 PM weekdays)\n4. Submit a written complaint to: Patient Relations, 123 Hospital Drive, City, State, ZIP\n5. Ask to speak with the department manager or supervisor while still in the facility\n\nAll complaints are taken seriously and investigated promptly. You'll receive acknowledgment within 2 business days and a full response within 7-10 days. Submitting a complaint will never adversely affect your care."
             },
             {
                 "regex": r"(?:what|which) (?:is|about) (?:the|your) (?:complaint|grievance) (?:process|procedure|system)",
-                "response": lambda match, user: "Our complaint resolution process includes:\n1. Initial documentation and acknowledgment (within 48 hours)\n2. Assignment to appropriate department for investigation\n3. Review of relevant medical records and interviews with involved staff\n4. Consultation with medical directors or administrators as needed\n5. Development of resolution plan\n6. Communication of findings and actions to the complainant\n7. Implementation of any necessary changes\n8. Follow-up to ensure satisfaction with resolution\n\nMost complaints are resolved within 7-10 business days. Complex issues may take longer. We'll keep you informed throughout the process and provide a clear explanation of our findings and actions taken."
+                "response": "Our complaint resolution process includes:\n1. Initial documentation and acknowledgment (within 48 hours)\n2. Assignment to appropriate department for investigation\n3. Review of relevant medical records and interviews with involved staff\n4. Consultation with medical directors or administrators as needed\n5. Development of resolution plan\n6. Communication of findings and actions to the complainant\n7. Implementation of any necessary changes\n8. Follow-up to ensure satisfaction with resolution\n\nMost complaints are resolved within 7-10 business days. Complex issues may take longer. We'll keep you informed throughout the process and provide a clear explanation of our findings and actions taken."
             },
             {
                 "regex": r"(?:who|what) (?:is|about) (?:the|your) (?:patient|hospital) (?:advocate|representative|ombudsman)",
-                "response": lambda match, user: "Our Patient Advocates are trained professionals who:\n• Serve as liaisons between patients, families, and hospital staff\n• Help resolve concerns during your hospital stay before they become formal complaints\n• Explain hospital policies and procedures\n• Connect patients with appropriate resources\n• Facilitate communication with healthcare teams\n• Navigate complex healthcare situations\n• Ensure patients understand their rights\n• Follow up on specific requests or special needs\n\nPatient Advocates are available weekdays 8:00 AM to 5:00 PM in person (Room A-105) or by calling (555) 123-9876. For urgent concerns after hours, the nursing supervisor can assist."
+                "response": "Our Patient Advocates are trained professionals who:\n• Serve as liaisons between patients, families, and hospital staff\n• Help resolve concerns during your hospital stay before they become formal complaints\n• Explain hospital policies and procedures\n• Connect patients with appropriate resources\n• Facilitate communication with healthcare teams\n• Navigate complex healthcare situations\n• Ensure patients understand their rights\n• Follow up on specific requests or special needs\n\nPatient Advocates are available weekdays 8:00 AM to 5:00 PM in person (Room A-105) or by calling {advocacy_line}. For urgent concerns after hours, the nursing supervisor can assist."
             },
             {
                 "regex": r"(?:can|will) (?:I|patients|someone) (?:get|receive) (?:a|an) (?:response|reply|answer|follow-up) (?:to|for|on) (?:my|their) (?:feedback|complaint|suggestion)",
-                "response": lambda match, user: "Yes, you will receive a response to your feedback as follows:\n• For formal complaints: Written or verbal response within 7-10 business days\n• For general suggestions: Acknowledgment within 2-3 business days\n• For urgent concerns: Same-day response during business hours\n• For compliments: Staff recognition and thank you note\n\nWe take all feedback seriously and investigate thoroughly before responding. If your feedback requires extended review, we'll provide interim updates. Anonymous feedback is still reviewed and addressed, but we cannot provide direct responses unless contact information is provided."
+                "response": "Yes, you will receive a response to your feedback as follows:\n• For formal complaints: Written or verbal response within 7-10 business days\n• For general suggestions: Acknowledgment within 2-3 business days\n• For urgent concerns: Same-day response during business hours\n• For compliments: Staff recognition and thank you note\n\nWe take all feedback seriously and investigate thoroughly before responding. If your feedback requires extended review, we'll provide interim updates. Anonymous feedback is still reviewed and addressed, but we cannot provide direct responses unless contact information is provided."
             },
             {
                 "regex": r"(?:how|what) (?:do|can) (?:I|patients|someone) (?:recognize|thank|appreciate|commend) (?:staff|employees|workers|doctors|nurses)",
-                "response": lambda match, user: "To recognize exceptional staff members:\n1. Complete a 'Shining Star' card available at nursing stations and information desks\n2. Mention them by name in patient satisfaction surveys\n3. Send a letter/email to their department manager or hospital administration\n4. Post a positive review mentioning them on our hospital social media pages\n5. Nominate them for our quarterly Excellence Awards\n6. Make a donation in their honor through our Foundation\n\nStaff recognition is shared with the employee, their supervisor, and often highlighted in hospital newsletters. Your appreciation means a great deal to our dedicated healthcare professionals."
+                "response": "To recognize exceptional staff members:\n1. Complete a 'Shining Star' card available at nursing stations and information desks\n2. Mention them by name in patient satisfaction surveys\n3. Send a letter/email to their department manager or hospital administration\n4. Post a positive review mentioning them on our hospital social media pages\n5. Nominate them for our quarterly Excellence Awards\n6. Make a donation in their honor through our Foundation\n\nStaff recognition is shared with the employee, their supervisor, and often highlighted in hospital newsletters. Your appreciation means a great deal to our dedicated healthcare professionals."
             },
             {
                 "regex": r"(?:what|which) (?:information|details|data) (?:should|do|must) (?:I|patients) (?:include|provide) (?:in|when|with) (?:feedback|complaints|comments)",
-                "response": lambda match, user: "When providing feedback, please include:\n• Your name and contact information (unless you wish to remain anonymous)\n• Patient name and room number/department visited (if applicable)\n• Date and time of your experience\n• Names of staff members involved (if known)\n• Specific details about the situation or concern\n• How the situation affected you or the patient\n• What would have improved your experience\n• Any attempts already made to resolve the issue\n• Your preferred method of contact for follow-up\n\nThe more specific information you provide, the better we can address your feedback or implement your suggestions."
+                "response": "When providing feedback, please include:\n• Your name and contact information (unless you wish to remain anonymous)\n• Patient name and room number/department visited (if applicable)\n• Date and time of your experience\n• Names of staff members involved (if known)\n• Specific details about the situation or concern\n• How the situation affected you or the patient\n• What would have improved your experience\n• Any attempts already made to resolve the issue\n• Your preferred method of contact for follow-up\n\nThe more specific information you provide, the better we can address your feedback or implement your suggestions."
             },
             {
                 "regex": r"(?:is|will) (?:my|patient|the) (?:feedback|complaint|comment) (?:confidential|private|anonymous)",
-                "response": lambda match, user: "We handle all feedback with appropriate confidentiality:\n• You may submit anonymous feedback if preferred\n• Identified feedback is kept in secure systems with limited access\n• Information is shared only with staff directly involved in addressing your concerns\n• Patient privacy is protected according to HIPAA regulations\n• Feedback data used for reporting is de-identified\n\nHowever, please note that providing contact information allows us to follow up with you and may lead to more thorough resolution. If you have specific confidentiality concerns, please mention them when submitting your feedback."
+                "response": "We handle all feedback with appropriate confidentiality:\n• You may submit anonymous feedback if preferred\n• Identified feedback is kept in secure systems with limited access\n• Information is shared only with staff directly involved in addressing your concerns\n• Patient privacy is protected according to HIPAA regulations\n• Feedback data used for reporting is de-identified\n\nHowever, please note that providing contact information allows us to follow up with you and may lead to more thorough resolution. If you have specific confidentiality concerns, please mention them when submitting your feedback."
             },
             # Add 90+ more feedback patterns here
         ]
@@ -641,43 +1719,43 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:how|where|what) (?:can|do) (?:I|someone) (?:file|make|submit|report) (?:a|an) (?:complaint|grievance|concern)",
-                "response": lambda match, user: "To file a complaint at our hospital:\n1. Speak directly with the unit/department manager where the issue occurred\n2. Contact our Patient Advocate Office at (555) 123-9870\n3. Email complaints to patientconcerns@hospital.example.com\n4. Complete a complaint form available at all nursing stations\n5. Visit the Patient Relations office in the main lobby (Room 105)\n6. Mail a written complaint to: Hospital Grievance Committee, 123 Medical Center Dr.\n\nAll complaints are logged, investigated, and addressed within our formal grievance process. You'll receive acknowledgment within 2 business days and a formal response within 7-10 days."
+                "response": "To file a complaint at our hospital:\n1. Speak directly with the unit/department manager where the issue occurred\n2. Contact our Patient Advocate Office at (555) 123-9870\n3. Email complaints to patientconcerns@hospital.example.com\n4. Complete a complaint form available at all nursing stations\n5. Visit the Patient Relations office in the main lobby (Room 105)\n6. Mail a written complaint to: Hospital Grievance Committee, 123 Medical Center Dr.\n\nAll complaints are logged, investigated, and addressed within our formal grievance process. You'll receive acknowledgment within 2 business days and a formal response within 7-10 days."
             },
             {
                 "regex": r"(?:what|which) (?:is|about) (?:the|your) (?:complaint|grievance) (?:process|procedure|timeline)",
-                "response": lambda match, user: "Our complaint process follows these steps:\n1. Receipt and documentation of your concern\n2. Assignment to appropriate department leader for investigation\n3. Review of medical records, interviews with staff, and analysis of policies\n4. Development of findings and resolution plan\n5. Response to complainant explaining findings and actions taken\n6. Implementation of any necessary improvements\n7. Follow-up to ensure resolution satisfaction\n\nSimple complaints are typically resolved within 7 days. Complex issues requiring extensive investigation may take up to 30 days, in which case you'll receive interim updates."
+                "response": "Our complaint process follows these steps:\n1. Receipt and documentation of your concern\n2. Assignment to appropriate department leader for investigation\n3. Review of medical records, interviews with staff, and analysis of policies\n4. Development of findings and resolution plan\n5. Response to complainant explaining findings and actions taken\n6. Implementation of any necessary improvements\n7. Follow-up to ensure resolution satisfaction\n\nSimple complaints are typically resolved within 7 days. Complex issues requiring extensive investigation may take up to 30 days, in which case you'll receive interim updates."
             },
             {
                 "regex": r"(?:who|what|which) (?:handles|manages|processes|reviews) (?:complaints|grievances|concerns)",
-                "response": lambda match, user: "Complaints are handled by a dedicated team including:\n• Patient Advocates who serve as your initial contact and guide through the process\n• Department Directors who investigate issues within their areas\n• The Grievance Committee for formal complaints, consisting of clinical leaders, quality improvement specialists, and administration\n• Risk Management for safety concerns or potential legal issues\n• The Chief Medical Officer for physician-related complaints\n• The Chief Nursing Officer for nursing care concerns\n\nThis multi-disciplinary approach ensures complaints receive appropriate expertise and thorough investigation."
+                "response": "Complaints are handled by a dedicated team including:\n• Patient Advocates who serve as your initial contact and guide through the process\n• Department Directors who investigate issues within their areas\n• The Grievance Committee for formal complaints, consisting of clinical leaders, quality improvement specialists, and administration\n• Risk Management for safety concerns or potential legal issues\n• The Chief Medical Officer for physician-related complaints\n• The Chief Nursing Officer for nursing care concerns\n\nThis multi-disciplinary approach ensures complaints receive appropriate expertise and thorough investigation."
             },
             {
                 "regex": r"(?:what|which) (?:types of|kinds of|categories of) (?:complaints|grievances|concerns) (?:can|should|do) (?:I|patients) (?:report|file|submit)",
-                "response": lambda match, user: "You can report any concerns about your hospital experience, including:\n• Quality of medical care or treatment decisions\n• Communication issues with healthcare providers\n• Medication errors or concerns\n• Pain management problems\n• Discharge planning inadequacies\n• Privacy violations or confidentiality concerns\n• Billing or financial issues\n• Facility cleanliness or environmental problems\n• Staff behavior or professionalism concerns\n• Wait times or access to care issues\n• Patient rights violations\n• Food quality or dietary accommodation issues\n\nNo concern is too small - we value all feedback that helps us improve patient care."
+                "response": "You can report any concerns about your hospital experience, including:\n• Quality of medical care or treatment decisions\n• Communication issues with healthcare providers\n• Medication errors or concerns\n• Pain management problems\n• Discharge planning inadequacies\n• Privacy violations or confidentiality concerns\n• Billing or financial issues\n• Facility cleanliness or environmental problems\n• Staff behavior or professionalism concerns\n• Wait times or access to care issues\n• Patient rights violations\n• Food quality or dietary accommodation issues\n\nNo concern is too small - we value all feedback that helps us improve patient care."
             },
             {
                 "regex": r"(?:will|can|does) (?:filing|submitting|making) (?:a|my) (?:complaint|grievance|concern) (?:affect|impact|influence) (?:my|patient) (?:care|treatment)",
-                "response": lambda match, user: "Absolutely not. We have strict policies prohibiting any form of retaliation against patients who file complaints. Your right to voice concerns is protected, and doing so will never negatively affect:\n• Quality of your medical care\n• Staff responsiveness or attitude\n• Access to services or treatments\n• Future appointments or admissions\n\nIn fact, we encourage feedback as essential to improving our care. Our complaint process operates independently from direct care providers to ensure objectivity and fairness. If you ever feel you're experiencing negative treatment after filing a complaint, please contact administration immediately."
+                "response": "Absolutely not. We have strict policies prohibiting any form of retaliation against patients who file complaints. Your right to voice concerns is protected, and doing so will never negatively affect:\n• Quality of your medical care\n• Staff responsiveness or attitude\n• Access to services or treatments\n• Future appointments or admissions\n\nIn fact, we encourage feedback as essential to improving our care. Our complaint process operates independently from direct care providers to ensure objectivity and fairness. If you ever feel you're experiencing negative treatment after filing a complaint, please contact administration immediately."
             },
             {
                 "regex": r"(?:can|is it possible to) (?:file|submit|make) (?:an|a) (?:anonymous|unnamed|unidentified) (?:complaint|grievance|concern)",
-                "response": lambda match, user: "Yes, you can submit anonymous complaints through these channels:\n• Anonymous feedback box in main lobbies and clinic waiting areas\n• Online form at hospital.example.com/feedback (check 'remain anonymous' option)\n• Anonymous ethics hotline at (555) 123-0000\n\nHowever, please understand that anonymous complaints have limitations:\n• We cannot provide you with investigation results\n• We may be unable to gather additional information if needed\n• Some issues require specific details that might identify the situation\n\nWe protect the confidentiality of all complainants and encourage providing contact information whenever possible for more thorough resolution."
+                "response": "Yes, you can submit anonymous complaints through these channels:\n• Anonymous feedback box in main lobbies and clinic waiting areas\n• Online form at {website}/feedback (check 'remain anonymous' option)\n• Anonymous ethics hotline at (555) 123-0000\n\nHowever, please understand that anonymous complaints have limitations:\n• We cannot provide you with investigation results\n• We may be unable to gather additional information if needed\n• Some issues require specific details that might identify the situation\n\nWe protect the confidentiality of all complainants and encourage providing contact information whenever possible for more thorough resolution."
             },
             {
                 "regex": r"(?:how|what) (?:do|does) (?:the hospital|you) (?:use|analyze|learn from) (?:complaints|grievances|concerns)",
-                "response": lambda match, user: "Complaints provide valuable insights that we use to improve through:\n1. Tracking patterns and trends to identify systemic issues\n2. Monthly analysis of complaint data by our Quality Improvement Committee\n3. Development of action plans targeting recurring problems\n4. Staff education based on common misunderstandings or skill gaps\n5. Policy and procedure revisions when issues stem from flawed processes\n6. Technology improvements when systems contribute to problems\n7. Environmental modifications for facility-related concerns\n\nWe view each complaint as an opportunity to enhance patient experience and safety. A quarterly report summarizing complaint trends and improvements is shared with hospital leadership and our Board of Directors."
+                "response": "Complaints provide valuable insights that we use to improve through:\n1. Tracking patterns and trends to identify systemic issues\n2. Monthly analysis of complaint data by our Quality Improvement Committee\n3. Development of action plans targeting recurring problems\n4. Staff education based on common misunderstandings or skill gaps\n5. Policy and procedure revisions when issues stem from flawed processes\n6. Technology improvements when systems contribute to problems\n7. Environmental modifications for facility-related concerns\n\nWe view each complaint as an opportunity to enhance patient experience and safety. A quarterly report summarizing complaint trends and improvements is shared with hospital leadership and our Board of Directors."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:my|patient) (?:rights|entitlements) (?:regarding|concerning|about) (?:complaints|grievances|concerns)",
-                "response": lambda match, user: "Your rights regarding complaints include:\n• Right to file a complaint without fear of retaliation\n• Right to a prompt investigation and response\n• Right to a thorough explanation of findings\n• Right to appeal the resolution if unsatisfied\n• Right to file external complaints with regulatory agencies regardless of internal process\n• Right to assistance in filing a complaint if needed\n• Right to confidentiality throughout the process\n• Right to designate a representative to act on your behalf\n\nThese rights are outlined in our Patient Bill of Rights provided at admission and available at nursing stations or our website."
+                "response": "Your rights regarding complaints include:\n• Right to file a complaint without fear of retaliation\n• Right to a prompt investigation and response\n• Right to a thorough explanation of findings\n• Right to appeal the resolution if unsatisfied\n• Right to file external complaints with regulatory agencies regardless of internal process\n• Right to assistance in filing a complaint if needed\n• Right to confidentiality throughout the process\n• Right to designate a representative to act on your behalf\n\nThese rights are outlined in our Patient Bill of Rights provided at admission and available at nursing stations or our website."
             },
             {
                 "regex": r"(?:can|may|should) (?:I|someone) (?:file|submit|report) (?:a|an) (?:complaint|grievance|concern) (?:on behalf of|for) (?:someone else|another person|a family member)",
-                "response": lambda match, user: "Yes, you can file a complaint on someone else's behalf in these circumstances:\n• You are the legal guardian or have medical power of attorney\n• You are the parent/guardian of a minor patient\n• The patient has provided written authorization for you to act on their behalf\n• The patient lacks capacity to file themselves\n\nWhen filing for someone else, please:\n• Provide documentation of your relationship/authority when applicable\n• Include both your contact information and the patient's details\n• Specify whether responses should go to you or the patient\n\nPatient privacy laws (HIPAA) may limit the information we can share with third parties without proper authorization."
+                "response": "Yes, you can file a complaint on someone else's behalf in these circumstances:\n• You are the legal guardian or have medical power of attorney\n• You are the parent/guardian of a minor patient\n• The patient has provided written authorization for you to act on their behalf\n• The patient lacks capacity to file themselves\n\nWhen filing for someone else, please:\n• Provide documentation of your relationship/authority when applicable\n• Include both your contact information and the patient's details\n• Specify whether responses should go to you or the patient\n\nPatient privacy laws (HIPAA) may limit the information we can share with third parties without proper authorization."
             },
             {
                 "regex": r"(?:what|which) (?:external|outside|regulatory) (?:agencies|organizations|authorities) (?:can|should) (?:I|someone) (?:contact|approach) (?:about|with|for) (?:complaints|grievances|concerns)",
-                "response": lambda match, user: "If you're unsatisfied with our resolution, you may contact these external agencies:\n\n• State Department of Health: (800) 555-1234\n  For quality of care, patient safety, or hospital regulation concerns\n\n• The Joint Commission: (800) 994-6610 or complaint@jointcommission.org\n  For accreditation or safety standard concerns\n\n• Medicare Beneficiary Ombudsman: (800) MEDICARE\n  For Medicare patients with unresolved issues\n\n• State Medical Board: (800) 555-5678\n  For physician-specific complaints\n\n• Office for Civil Rights: (800) 368-1019\n  For HIPAA violations or discrimination concerns\n\nWe fully cooperate with all external investigations and respect your right to seek external review."
+                "response": "If you're unsatisfied with our resolution, you may contact these external agencies:\n\n• State Department of Health: (800) 555-1234\n  For quality of care, patient safety, or hospital regulation concerns\n\n• The Joint Commission: (800) 994-6610 or complaint@jointcommission.org\n  For accreditation or safety standard concerns\n\n• Medicare Beneficiary Ombudsman: (800) MEDICARE\n  For Medicare patients with unresolved issues\n\n• State Medical Board: (800) 555-5678\n  For physician-specific complaints\n\n• Office for Civil Rights: (800) 368-1019\n  For HIPAA violations or discrimination concerns\n\nWe fully cooperate with all external investigations and respect your right to seek external review."
             },
             # Add 90+ more complaint patterns here
         ]
@@ -686,19 +1764,19 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:how|where|what) (?:can|do) (?:I|you) (?:find|locate|get) (?:information|details|data) (?:about|on|regarding) (?:doctors|physicians|specialists)",
-                "response": lambda match, user: "You can find information about our physicians through multiple channels:\n1. Hospital website: hospital.example.com/find-a-doctor (searchable by name, specialty, languages spoken)\n2. Physician referral line: (555) 234-5678 (available 8am-8pm daily)\n3. Main information desk in hospital lobby\n4. Your insurance provider's directory (for network verification)\n5. Hospital directory app for smartphones\n6. Printed physician directories available at all clinic locations\n\nEach physician profile includes education, board certifications, specialties, languages spoken, accepting new patients status, and contact information."
+                "response": "You can find information about our physicians through multiple channels:\n1. Hospital website: {website}/find-a-doctor (searchable by name, specialty, languages spoken)\n2. Physician referral line: {referral_line} (available 8am-8pm daily)\n3. Main information desk in hospital lobby\n4. Your insurance provider's directory (for network verification)\n5. Hospital directory app for smartphones\n6. Printed physician directories available at all clinic locations\n\nEach physician profile includes education, board certifications, specialties, languages spoken, accepting new patients status, and contact information."
             },
             {
                 "regex": r"(?:how|what) (?:do|can) (?:I|patients) (?:choose|select|find) (?:the right|a good|an appropriate) doctor",
-                "response": lambda match, user: "When selecting a doctor, consider these factors:\n• Board certification in their specialty\n• Experience treating your specific condition\n• Hospital affiliations and admitting privileges\n• Insurance network participation\n• Office location and hours\n• Communication style and language proficiency\n• Patient reviews and satisfaction scores\n• Whether they're accepting new patients\n• Gender preference (if important to you)\n• Recommendation from your primary care physician\n\nOur physician referral specialists at (555) 234-5678 can help match you with doctors based on your specific needs and preferences."
+                "response": "When selecting a doctor, consider these factors:\n• Board certification in their specialty\n• Experience treating your specific condition\n• Hospital affiliations and admitting privileges\n• Insurance network participation\n• Office location and hours\n• Communication style and language proficiency\n• Patient reviews and satisfaction scores\n• Whether they're accepting new patients\n• Gender preference (if important to you)\n• Recommendation from your primary care physician\n\nOur physician referral specialists at {referral_line} can help match you with doctors based on your specific needs and preferences."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:doctor's|physician's|specialist's) (?:credentials|qualifications|certifications)",
-                "response": lambda match, user: "Our physicians maintain rigorous credentials including:\n• Medical degree from accredited medical schools\n• Completion of residency training in their specialty\n• Board certification in their specialty areas\n• State medical licensure in good standing\n• Hospital privileges after credential verification\n• Ongoing continuing medical education\n• Regular peer review and quality assessment\n\nMany also have additional qualifications such as fellowship training, academic appointments, research publications, and leadership positions in medical societies. All credentials are verified through primary sources before granting hospital privileges."
+                "response": "Our physicians maintain rigorous credentials including:\n• Medical degree from accredited medical schools\n• Completion of residency training in their specialty\n• Board certification in their specialty areas\n• State medical licensure in good standing\n• Hospital privileges after credential verification\n• Ongoing continuing medical education\n• Regular peer review and quality assessment\n\nMany also have additional qualifications such as fellowship training, academic appointments, research publications, and leadership positions in medical societies. All credentials are verified through primary sources before granting hospital privileges."
             },
             {
                 "regex": r"(?:how|what) (?:do|can) (?:I|patients) (?:make|schedule|book|get) (?:an appointment|a consultation) (?:with|to see) (?:a|the) doctor",
-                "response": lambda match, user: "To schedule a doctor appointment:\n1. Call the physician's office directly (numbers listed in our directory)\n2. Use our online scheduling portal at hospital.example.com/appointments\n3. Call our central scheduling line at (555) 123-4567\n4. Use our hospital mobile app\n5. Visit the clinic in person\n\nWhen scheduling, please have your insurance information, reason for visit, and availability ready. Many routine appointments can be scheduled same-week, though specialist appointments may require longer wait times. For urgent needs, we offer same-day appointments at our urgent care centers."
+                "response": "To schedule a doctor appointment:\n1. Call the physician's office directly (numbers listed in our directory)\n2. Use our online scheduling portal at {website}/appointments\n3. Call our central scheduling line at {appointment_line}\n4. Use our hospital mobile app\n5. Visit the clinic in person\n\nWhen scheduling, please have your insurance information, reason for visit, and availability ready. Many routine appointments can be scheduled same-week, though specialist appointments may require longer wait times. For urgent needs, we offer same-day appointments at our urgent care centers."
             },
             {
                 "regex": r"(?:which|what) (?:doctor|physician|specialist) (?:should|would) (?:I|someone) (?:see|visit|consult) (?:for|about) ([a-zA-Z\s]+)",
@@ -706,23 +1784,23 @@ class HospitalChatbot:
             },
             {
                 "regex": r"(?:are|do) (?:your|the hospital's) (?:doctors|physicians|specialists) (?:accepting|taking) (?:new|additional) patients",
-                "response": lambda match, user: "Most of our physicians are currently accepting new patients, though availability varies by specialty and individual doctor. Primary care physicians (family medicine, internal medicine, pediatrics) may occasionally close their practices to new patients when they reach capacity. Specialists typically accept new patients with appropriate referrals.\n\nOur website and physician referral line maintain up-to-date information on which doctors are accepting new patients. When calling our referral line at (555) 234-5678, we can specifically match you with physicians currently accepting new patients in your needed specialty."
+                "response": "Most of our physicians are currently accepting new patients, though availability varies by specialty and individual doctor. Primary care physicians (family medicine, internal medicine, pediatrics) may occasionally close their practices to new patients when they reach capacity. Specialists typically accept new patients with appropriate referrals.\n\nOur website and physician referral line maintain up-to-date information on which doctors are accepting new patients. When calling our referral line at {referral_line}, we can specifically match you with physicians currently accepting new patients in your needed specialty."
             },
             {
                 "regex": r"(?:what|which) (?:languages|foreign languages) (?:do|can|are) (?:your|the) (?:doctors|physicians|specialists) speak",
-                "response": lambda match, user: "Our medical staff collectively speaks over 30 languages. Commonly available languages include:\n• Spanish (75+ physicians)\n• Mandarin and Cantonese (25+ physicians)\n• Hindi and Punjabi (20+ physicians)\n• Arabic (15+ physicians)\n• Russian (12+ physicians)\n• Vietnamese (10+ physicians)\n• Korean (8+ physicians)\n• French (20+ physicians)\n• Portuguese (5+ physicians)\n• American Sign Language (6+ physicians)\n\nOur physician directory allows searching by language. For languages not spoken by our physicians, we provide certified medical interpreters at no cost for all appointments when requested in advance."
+                "response": "Our medical staff collectively speaks over 30 languages. Commonly available languages include:\n• Spanish (75+ physicians)\n• Mandarin and Cantonese (25+ physicians)\n• Hindi and Punjabi (20+ physicians)\n• Arabic (15+ physicians)\n• Russian (12+ physicians)\n• Vietnamese (10+ physicians)\n• Korean (8+ physicians)\n• French (20+ physicians)\n• Portuguese (5+ physicians)\n• American Sign Language (6+ physicians)\n\nOur physician directory allows searching by language. For languages not spoken by our physicians, we provide certified medical interpreters at no cost for all appointments when requested in advance."
             },
             {
                 "regex": r"(?:how|what) (?:do|can) (?:I|patients) (?:check|verify|confirm) (?:doctor|physician|specialist) (?:reviews|ratings|feedback)",
-                "response": lambda match, user: "You can check physician reviews and ratings through:\n1. Our hospital website's physician profiles (includes patient satisfaction scores)\n2. Press Ganey patient satisfaction survey results (available on request)\n3. Independent sites like Healthgrades, Vitals, or WebMD\n4. Your insurance provider's physician quality metrics\n\nWe publicly share our physicians' patient satisfaction scores related to:\n• Communication quality\n• Time spent with patients\n• Explanation of conditions and treatments\n• Likelihood to recommend\n\nOur Patient Experience department can also share aggregated feedback about specific physicians while maintaining individual patient confidentiality."
+                "response": "You can check physician reviews and ratings through:\n1. Our hospital website's physician profiles (includes patient satisfaction scores)\n2. Press Ganey patient satisfaction survey results (available on request)\n3. Independent sites like Healthgrades, Vitals, or WebMD\n4. Your insurance provider's physician quality metrics\n\nWe publicly share our physicians' patient satisfaction scores related to:\n• Communication quality\n• Time spent with patients\n• Explanation of conditions and treatments\n• Likelihood to recommend\n\nOur Patient Experience department can also share aggregated feedback about specific physicians while maintaining individual patient confidentiality."
             },
             {
                 "regex": r"(?:what|which) (?:insurance|insurance plans|insurance providers) (?:do|does) (?:your|the) (?:doctors|physicians|specialists) (?:accept|take)",
-                "response": lambda match, user: "Most of our physicians accept major insurance plans including:\n• Blue Cross Blue Shield (all plans)\n• Aetna\n• Cigna\n• UnitedHealthcare\n• Medicare and Medicare Advantage\n• Medicaid and managed Medicaid plans\n• Tricare\n• Humana\n\nHowever, insurance acceptance varies by individual physician and practice. Always verify a specific doctor's insurance participation before scheduling by:\n1. Checking our online physician directory\n2. Calling the physician's office directly\n3. Contacting your insurance company\n\nThis verification is especially important for specialists and newer insurance products."
+                "response": lambda match, user: self.get_doctor_insurance_response()
             },
             {
                 "regex": r"(?:can|do) (?:I|patients) (?:get|request|have) (?:a|my|the) (?:second opinion|alternative opinion|different doctor)",
-                "response": lambda match, user: "Yes, we fully support and encourage seeking second opinions for any diagnosis or treatment plan. To request a second opinion:\n1. Ask your current physician for a referral to another specialist\n2. Contact our physician referral line at (555) 234-5678 for appropriate specialists\n3. Check with your insurance about second opinion coverage\n\nMost insurance plans cover second opinions, especially for serious diagnoses or surgical recommendations. We can transfer relevant medical records and test results to the second opinion provider with your signed authorization. Our physicians respect patients' rights to seek additional perspectives on their healthcare decisions."
+                "response": "Yes, we fully support and encourage seeking second opinions for any diagnosis or treatment plan. To request a second opinion:\n1. Ask your current physician for a referral to another specialist\n2. Contact our physician referral line at {referral_line} for appropriate specialists\n3. Check with your insurance about second opinion coverage\n\nMost insurance plans cover second opinions, especially for serious diagnoses or surgical recommendations. We can transfer relevant medical records and test results to the second opinion provider with your signed authorization. Our physicians respect patients' rights to seek additional perspectives on their healthcare decisions."
             },
             # Add 90+ more doctor info patterns here
         ]
@@ -731,43 +1809,43 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which) (?:facilities|amenities|services) (?:are|does|do you) (?:available|offer|provide) (?:at|in) (?:the|your) hospital",
-                "response": lambda match, user: "Our hospital facilities include:\n\n• Emergency Department (24/7)\n• Inpatient units (medical, surgical, pediatric, maternity, ICU, NICU)\n• Outpatient surgery center\n• Comprehensive imaging center (X-ray, CT, MRI, ultrasound, PET)\n• Laboratory services\n• Heart and vascular center\n• Cancer center with infusion services\n• Rehabilitation center (PT, OT, speech therapy)\n• Women's health center\n• Behavioral health services\n• Wound care center\n• Sleep disorders lab\n• Cafeteria and coffee shop\n• Gift shop\n• Chapel/meditation room\n• Patient resource library\n• Free WiFi throughout the facility\n• ATM machines and vending areas"
+                "response": "Our hospital facilities include:\n\n• Emergency Department (24/7)\n• Inpatient units (medical, surgical, pediatric, maternity, ICU, NICU)\n• Outpatient surgery center\n• Comprehensive imaging center (X-ray, CT, MRI, ultrasound, PET)\n• Laboratory services\n• Heart and vascular center\n• Cancer center with infusion services\n• Rehabilitation center (PT, OT, speech therapy)\n• Women's health center\n• Behavioral health services\n• Wound care center\n• Sleep disorders lab\n• Cafeteria and coffee shop\n• Gift shop\n• Chapel/meditation room\n• Patient resource library\n• Free WiFi throughout the facility\n• ATM machines and vending areas"
             },
             {
                 "regex": r"(?:where|how) (?:can|do) (?:I|visitors|patients) (?:find|locate|get to) (?:the|your) (?:cafeteria|dining area|food court)",
-                "response": lambda match, user: "Our main cafeteria is located on the first floor of the South Wing (Building B). From the main entrance, follow the blue line on the floor or the overhead signs toward 'Dining Services.' The cafeteria is near elevator bank B, across from the gift shop. Hours are 6:30 AM - 8:00 PM daily, with hot meals served during breakfast (6:30-9:30 AM), lunch (11:00 AM-2:00 PM), and dinner (4:30-7:00 PM). Additional dining options include the coffee shop in the main lobby and vending areas throughout the hospital."
+                "response": "Our main cafeteria is located on the first floor of the South Wing (Building B). From the main entrance, follow the blue line on the floor or the overhead signs toward 'Dining Services.' The cafeteria is near elevator bank B, across from the gift shop. Hours are 6:30 AM - 8:00 PM daily, with hot meals served during breakfast (6:30-9:30 AM), lunch (11:00 AM-2:00 PM), and dinner (4:30-7:00 PM). Additional dining options include the coffee shop in the main lobby and vending areas throughout the hospital."
             },
             {
                 "regex": r"(?:where|how) (?:can|do) (?:I|visitors|patients) (?:find|locate|get to) (?:the|your) (?:chapel|prayer room|meditation space|spiritual center)",
-                "response": lambda match, user: "Our Interfaith Chapel is located on the second floor of the main building, near the central elevator bank. Follow the signs for 'Chapel' or the purple pathway on the floor. The chapel is open 24/7 to patients, families, and staff of all faiths. The space provides a quiet environment for prayer, meditation, or reflection. Adjacent to the main chapel are smaller rooms designated for specific faith traditions. Our Spiritual Care department staff and volunteers are available from 7:00 AM to 9:00 PM daily, with on-call chaplains available overnight for urgent spiritual needs."
+                "response": "Our Interfaith Chapel is located on the second floor of the main building, near the central elevator bank. Follow the signs for 'Chapel' or the purple pathway on the floor. The chapel is open 24/7 to patients, families, and staff of all faiths. The space provides a quiet environment for prayer, meditation, or reflection. Adjacent to the main chapel are smaller rooms designated for specific faith traditions. Our Spiritual Care department staff and volunteers are available from 7:00 AM to 9:00 PM daily, with on-call chaplains available overnight for urgent spiritual needs."
             },
             {
                 "regex": r"(?:do you have|is there|are there) (?:ATMs|cash machines|banking services) (?:in|at|inside) (?:the|your) hospital",
-                "response": lambda match, user: "Yes, we have ATMs located at:\n1. Main lobby near the information desk\n2. First floor near the cafeteria entrance\n3. Outside the gift shop\n4. Emergency Department waiting area\n\nAll ATMs accept major banking networks (Plus, Cirrus, Star, etc.) and dispense in $20 denominations. Transaction fees may apply depending on your bank. The ATMs in the main lobby and cafeteria areas also accept deposits for FirstBank and National Credit Union customers."
+                "response": "Yes, we have ATMs located at:\n1. Main lobby near the information desk\n2. First floor near the cafeteria entrance\n3. Outside the gift shop\n4. Emergency Department waiting area\n\nAll ATMs accept major banking networks (Plus, Cirrus, Star, etc.) and dispense in $20 denominations. Transaction fees may apply depending on your bank. The ATMs in the main lobby and cafeteria areas also accept deposits for FirstBank and National Credit Union customers."
             },
             {
                 "regex": r"(?:where|how) (?:can|do) (?:I|visitors|patients) (?:find|locate|get to) (?:the|your) (?:gift shop|store|gift store)",
-                "response": lambda match, user: "Our gift shop is located in the main lobby, to the right of the information desk. It offers flowers, greeting cards, toiletries, snacks, magazines, books, toys, and hospital-branded items. Hours are Monday-Friday 9:00 AM to 7:00 PM, and weekends 11:00 AM to 5:00 PM. The shop is operated by our hospital auxiliary volunteers, and all proceeds support patient care programs. If you can't visit in person, you can order items by calling (555) 123-4569, and they can be delivered to patient rooms (except ICU and isolation rooms)."
+                "response": "Our gift shop is located in the main lobby, to the right of the information desk. It offers flowers, greeting cards, toiletries, snacks, magazines, books, toys, and hospital-branded items. Hours are Monday-Friday 9:00 AM to 7:00 PM, and weekends 11:00 AM to 5:00 PM. The shop is operated by our hospital auxiliary volunteers, and all proceeds support patient care programs. If you can't visit in person, you can order items by calling (555) 123-4569, and they can be delivered to patient rooms (except ICU and isolation rooms)."
             },
             {
                 "regex": r"(?:do you have|is there|are there) (?:wifi|internet|wireless) (?:access|connection|service) (?:in|at|throughout) (?:the|your) hospital",
-                "response": lambda match, user: "Yes, we provide complimentary WiFi throughout the entire hospital. To connect:\n1. Select \"Hospital_Guest\" from your device's WiFi networks\n2. Open your web browser, which will redirect to our terms of service page\n3. Accept the terms of use\n4. Begin browsing\n\nThe guest network has reasonable speed for basic browsing, email, and video calls. However, large downloads or streaming may be limited for bandwidth management. For security reasons, the guest WiFi is separate from our clinical systems. If you experience connection difficulties, please ask at the information desk or call our IT help desk at extension 4357 (HELP) from any hospital phone."
+                "response": "Yes, we provide complimentary WiFi throughout the entire hospital. To connect:\n1. Select \"Hospital_Guest\" from your device's WiFi networks\n2. Open your web browser, which will redirect to our terms of service page\n3. Accept the terms of use\n4. Begin browsing\n\nThe guest network has reasonable speed for basic browsing, email, and video calls. However, large downloads or streaming may be limited for bandwidth management. For security reasons, the guest WiFi is separate from our clinical systems. If you experience connection difficulties, please ask at the information desk or call our IT help desk at extension 4357 (HELP) from any hospital phone."
             },
             {
                 "regex": r"(?:do you have|is there|are there) (?:a|any) (?:pharmacy|hospital pharmacy|drug store) (?:in|at|inside) (?:the|your) hospital",
-                "response": lambda match, user: "Yes, our outpatient pharmacy is located on the first floor of the main building, adjacent to the main exit. Hours are:\n• Monday-Friday: 8:00 AM to 9:00 PM\n• Saturday: 9:00 AM to 6:00 PM\n• Sunday: 10:00 AM to 5:00 PM\n\nThe pharmacy fills prescriptions from our hospital physicians as well as outside providers. They offer bedside delivery of discharge medications, medication counseling, a full range of over-the-counter products, and accept most insurance plans. For refills or questions, call (555) 234-6789. We also offer a home delivery service for maintenance medications."
+                "response": "Yes, our outpatient pharmacy is located on the first floor of the main building, adjacent to the main exit. Hours are:\n• Monday-Friday: 8:00 AM to 9:00 PM\n• Saturday: 9:00 AM to 6:00 PM\n• Sunday: 10:00 AM to 5:00 PM\n\nThe pharmacy fills prescriptions from our hospital physicians as well as outside providers. They offer bedside delivery of discharge medications, medication counseling, a full range of over-the-counter products, and accept most insurance plans. For refills or questions, call {pharmacy_line}. We also offer a home delivery service for maintenance medications."
             },
             {
                 "regex": r"(?:do you have|is there|are there) (?:interpreter|translation|language) (?:services|assistance|help) (?:in|at|available at) (?:the|your) hospital",
-                "response": lambda match, user: "Yes, we provide comprehensive interpreter services 24/7 at no cost to patients:\n\n• In-person interpreters for Spanish, Mandarin, Vietnamese, Russian, and ASL (available with advance notice)\n• Video remote interpreting for 35+ languages (available within minutes)\n• Phone interpretation for 200+ languages (immediate access)\n\nTo request an interpreter, inform any staff member or call (555) 123-4500. For scheduled appointments, please request interpretation services when booking to ensure availability. All medical interpreters are certified in healthcare interpretation and bound by confidentiality requirements."
+                "response": "Yes, we provide comprehensive interpreter services 24/7 at no cost to patients:\n\n• In-person interpreters for Spanish, Mandarin, Vietnamese, Russian, and ASL (available with advance notice)\n• Video remote interpreting for 35+ languages (available within minutes)\n• Phone interpretation for 200+ languages (immediate access)\n\nTo request an interpreter, inform any staff member or call {main_line}. For scheduled appointments, please request interpretation services when booking to ensure availability. All medical interpreters are certified in healthcare interpretation and bound by confidentiality requirements."
             },
             {
                 "regex": r"(?:what|which) (?:accessibility|handicap|disability|ADA) (?:features|accommodations|services) (?:are|does|do you) (?:available|offer|provide)",
-                "response": lambda match, user: "Our accessibility accommodations include:\n• Wheelchair-accessible entrances, elevators, and restrooms throughout\n• Designated accessible parking spaces near all entrances\n• Wheelchairs available at all entrances (free of charge)\n• Patient rooms with ADA-compliant bathrooms and fixtures\n• Adjustable-height beds in all rooms\n• ASL interpreters and video remote interpreting\n• Telecommunication devices for deaf patients (TDD/TTY)\n• Braille signage and raised lettering on room signs\n• Service animal accommodations\n• Bariatric equipment and furniture in designated areas\n\nFor specific accommodation needs, please contact our Patient Advocacy office at (555) 123-9876 prior to your visit."
+                "response": "Our accessibility accommodations include:\n• Wheelchair-accessible entrances, elevators, and restrooms throughout\n• Designated accessible parking spaces near all entrances\n• Wheelchairs available at all entrances (free of charge)\n• Patient rooms with ADA-compliant bathrooms and fixtures\n• Adjustable-height beds in all rooms\n• ASL interpreters and video remote interpreting\n• Telecommunication devices for deaf patients (TDD/TTY)\n• Braille signage and raised lettering on room signs\n• Service animal accommodations\n• Bariatric equipment and furniture in designated areas\n\nFor specific accommodation needs, please contact our Patient Advocacy office at {advocacy_line} prior to your visit."
             },
             {
                 "regex": r"(?:do you have|is there|are there) (?:a|any) (?:patient|health|medical) (?:resource|education|learning) (?:center|library) (?:in|at) (?:the|your) hospital",
-                "response": lambda match, user: "Yes, our Patient Resource Center is located on the first floor near the central elevators (Room 1420). It provides:\n• Medical reference books and simplified health guides\n• Computer stations with access to reliable health information websites\n• Printed materials on common conditions and treatments\n• Educational videos and interactive learning modules\n• Information about community health resources\n• Assistance researching medical conditions\n\nA health librarian staffs the center Monday-Friday, 9:00 AM to 4:00 PM, to help find relevant information. The space is open to patients, families, and community members. Materials cannot be checked out but can be copied or digitally sent to your email."
+                "response": "Yes, our Patient Resource Center is located on the first floor near the central elevators (Room 1420). It provides:\n• Medical reference books and simplified health guides\n• Computer stations with access to reliable health information websites\n• Printed materials on common conditions and treatments\n• Educational videos and interactive learning modules\n• Information about community health resources\n• Assistance researching medical conditions\n\nA health librarian staffs the center Monday-Friday, 9:00 AM to 4:00 PM, to help find relevant information. The space is open to patients, families, and community members. Materials cannot be checked out but can be copied or digitally sent to your email."
             },
             # Add 90+ more facilities patterns here
         ]
@@ -776,43 +1854,43 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:covid|covid-19|coronavirus) (?:policies|protocols|procedures)",
-                "response": lambda match, user: "Our current COVID-19 policies include:\n• Universal masking required in high-risk areas (oncology, transplant, NICU)\n• Masks recommended but optional in other clinical areas\n• Symptom screening at main entrances\n• Hand hygiene stations throughout facilities\n• Enhanced cleaning protocols in all areas\n• Respiratory etiquette (covering coughs/sneezes) encouraged\n• Testing for symptomatic patients and prior to certain procedures\n• Telehealth options for appropriate appointments\n• Isolation protocols for COVID-positive patients\n\nThese policies are regularly updated based on community transmission levels, CDC guidance, and public health recommendations."
+                "response": "Our current COVID-19 policies include:\n• Universal masking required in high-risk areas (oncology, transplant, NICU)\n• Masks recommended but optional in other clinical areas\n• Symptom screening at main entrances\n• Hand hygiene stations throughout facilities\n• Enhanced cleaning protocols in all areas\n• Respiratory etiquette (covering coughs/sneezes) encouraged\n• Testing for symptomatic patients and prior to certain procedures\n• Telehealth options for appropriate appointments\n• Isolation protocols for COVID-positive patients\n\nThese policies are regularly updated based on community transmission levels, CDC guidance, and public health recommendations."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:visitor|visitation) (?:policy|restrictions|rules) (?:for|during|related to) (?:covid|covid-19|coronavirus)",
-                "response": lambda match, user: "Our current COVID-19 visitor policies:\n• Two visitors allowed per patient in most areas\n• Visitors must be 12+ years old (except for special circumstances)\n• No visitors with COVID-19 symptoms, positive test within 10 days, or known exposure within 14 days\n• Specialized units (ICU, Maternity, Pediatrics) may have modified policies\n• COVID-positive patients limited to one designated visitor per day\n• Video visits encouraged as an alternative when in-person visits aren't possible\n\nThese policies are subject to change based on community transmission levels. Current policies are posted at entrances and on our website."
+                "response": "Our current COVID-19 visitor policies:\n• Two visitors allowed per patient in most areas\n• Visitors must be 12+ years old (except for special circumstances)\n• No visitors with COVID-19 symptoms, positive test within 10 days, or known exposure within 14 days\n• Specialized units (ICU, Maternity, Pediatrics) may have modified policies\n• COVID-positive patients limited to one designated visitor per day\n• Video visits encouraged as an alternative when in-person visits aren't possible\n\nThese policies are subject to change based on community transmission levels. Current policies are posted at entrances and on our website."
             },
             {
                 "regex": r"(?:do you|does the hospital) (?:offer|provide|have) (?:covid|covid-19|coronavirus) (?:testing|test|screening)",
-                "response": lambda match, user: "Yes, we offer COVID-19 testing through multiple channels:\n\n• Emergency Department: For symptomatic patients requiring emergency care\n• Urgent Care Centers: For symptomatic patients needing evaluation\n• Pre-procedure Testing: Required 1-3 days before certain procedures\n• Outpatient Testing Center: By appointment with doctor's order\n• Drive-through Testing: By appointment (check website for current locations/times)\n\nWe currently use PCR tests (results in 24-48 hours) and rapid antigen tests (results in 15-30 minutes) depending on the clinical situation. Most insurance plans cover medically-necessary testing. Please check with your insurance regarding coverage for travel or general screening tests."
+                "response": "Yes, we offer COVID-19 testing through multiple channels:\n\n• Emergency Department: For symptomatic patients requiring emergency care\n• Urgent Care Centers: For symptomatic patients needing evaluation\n• Pre-procedure Testing: Required 1-3 days before certain procedures\n• Outpatient Testing Center: By appointment with doctor's order\n• Drive-through Testing: By appointment (check website for current locations/times)\n\nWe currently use PCR tests (results in 24-48 hours) and rapid antigen tests (results in 15-30 minutes) depending on the clinical situation. Most insurance plans cover medically-necessary testing. Please check with your insurance regarding coverage for travel or general screening tests."
             },
             {
                 "regex": r"(?:do you|does the hospital) (?:offer|provide|have) (?:covid|covid-19|coronavirus) (?:vaccine|vaccination|immunization)",
-                "response": lambda match, user: "Yes, we offer COVID-19 vaccines including primary series and updated boosters. Vaccines are available at:\n• Our hospital pharmacy (walk-ins welcome Monday-Friday 9am-4pm)\n• All primary care clinic locations (by appointment)\n• Dedicated vaccine clinics (schedule varies - check our website)\n\nWe currently offer the latest formulations authorized by the FDA/CDC. COVID-19 vaccines can be administered simultaneously with other vaccines, including flu shots. Vaccines are provided at no cost regardless of insurance status. To schedule, call (555) 678-9012 or visit our website at hospital.example.com/covid-vaccines."
+                "response": "Yes, we offer COVID-19 vaccines including primary series and updated boosters. Vaccines are available at:\n• Our hospital pharmacy (walk-ins welcome Monday-Friday 9am-4pm)\n• All primary care clinic locations (by appointment)\n• Dedicated vaccine clinics (schedule varies - check our website)\n\nWe currently offer the latest formulations authorized by the FDA/CDC. COVID-19 vaccines can be administered simultaneously with other vaccines, including flu shots. Vaccines are provided at no cost regardless of insurance status. To schedule, call {covid_testing_line} or visit our website at {website}/covid-vaccines."
             },
             {
                 "regex": r"(?:what|which) (?:covid|covid-19|coronavirus) (?:precautions|safety measures|protections) (?:are|is|do) (?:in place|being taken|implemented)",
-                "response": lambda match, user: "Our comprehensive COVID safety measures include:\n\n• HEPA filtration and enhanced ventilation throughout facilities\n• Negative pressure rooms for aerosol-generating procedures\n• Rigorous environmental cleaning with hospital-grade disinfectants\n• UV light disinfection for high-risk areas\n• Physical barriers at registration desks and other interfaces\n• Reduced density in waiting areas\n• Separate pathways for COVID-positive patients\n• PPE supplies maintained at optimal levels\n• Regular staff testing protocols\n• Vaccination requirements for healthcare personnel\n• Ongoing infection prevention training\n\nThese measures are continually evaluated and updated based on emerging evidence and expert guidance."
+                "response": "Our comprehensive COVID safety measures include:\n\n• HEPA filtration and enhanced ventilation throughout facilities\n• Negative pressure rooms for aerosol-generating procedures\n• Rigorous environmental cleaning with hospital-grade disinfectants\n• UV light disinfection for high-risk areas\n• Physical barriers at registration desks and other interfaces\n• Reduced density in waiting areas\n• Separate pathways for COVID-positive patients\n• PPE supplies maintained at optimal levels\n• Regular staff testing protocols\n• Vaccination requirements for healthcare personnel\n• Ongoing infection prevention training\n\nThese measures are continually evaluated and updated based on emerging evidence and expert guidance."
             },
             {
                 "regex": r"(?:what|how) (?:should|do) (?:I|patients) (?:prepare|get ready) (?:for|before) (?:a|my|an) (?:appointment|procedure|surgery|visit) (?:during|in|with) (?:covid|covid-19|coronavirus)",
-                "response": lambda match, user: "To prepare for your appointment during COVID-19:\n\n1. Monitor for symptoms before your visit (fever, cough, shortness of breath)\n2. Reschedule if you develop symptoms or test positive within 10 days\n3. Consider wearing a mask, especially if immunocompromised\n4. Arrive at your scheduled time (not early) to reduce waiting room density\n5. Complete pre-registration and forms online when possible\n6. Limit accompanying visitors to essential support persons\n7. Be prepared for symptom screening upon arrival\n\nSome procedures may require COVID testing 24-72 hours before; your provider will advise if this applies to your situation."
+                "response": "To prepare for your appointment during COVID-19:\n\n1. Monitor for symptoms before your visit (fever, cough, shortness of breath)\n2. Reschedule if you develop symptoms or test positive within 10 days\n3. Consider wearing a mask, especially if immunocompromised\n4. Arrive at your scheduled time (not early) to reduce waiting room density\n5. Complete pre-registration and forms online when possible\n6. Limit accompanying visitors to essential support persons\n7. Be prepared for symptom screening upon arrival\n\nSome procedures may require COVID testing 24-72 hours before; your provider will advise if this applies to your situation."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:symptoms|signs) (?:of|for) (?:covid|covid-19|coronavirus)",
-                "response": lambda match, user: "Common COVID-19 symptoms include:\n• Fever or chills\n• Cough\n• Shortness of breath or difficulty breathing\n• Fatigue\n• Muscle or body aches\n• Headache\n• New loss of taste or smell\n• Sore throat\n• Congestion or runny nose\n• Nausea or vomiting\n• Diarrhea\n\nSymptoms typically appear 2-14 days after exposure and range from mild to severe. Older adults and those with underlying medical conditions may develop more serious complications. If you experience emergency warning signs (trouble breathing, persistent chest pain, confusion, inability to stay awake, bluish lips/face), seek emergency medical care immediately."
+                "response": "Common COVID-19 symptoms include:\n• Fever or chills\n• Cough\n• Shortness of breath or difficulty breathing\n• Fatigue\n• Muscle or body aches\n• Headache\n• New loss of taste or smell\n• Sore throat\n• Congestion or runny nose\n• Nausea or vomiting\n• Diarrhea\n\nSymptoms typically appear 2-14 days after exposure and range from mild to severe. Older adults and those with underlying medical conditions may develop more serious complications. If you experience emergency warning signs (trouble breathing, persistent chest pain, confusion, inability to stay awake, bluish lips/face), seek emergency medical care immediately."
             },
             {
                 "regex": r"(?:what|which) (?:should|do) (?:I|someone) (?:do|if) (?:I have|with|experiencing) (?:covid|covid-19|coronavirus) (?:symptoms|exposure)",
-                "response": lambda match, user: "If you have COVID-19 symptoms or exposure:\n\n1. Isolate from others immediately\n2. Get tested (PCR or rapid antigen test)\n   • Our Urgent Care centers offer walk-in testing\n   • Testing center appointments: (555) 678-9012\n3. Wear a high-quality mask if you must be around others\n4. Contact your healthcare provider, especially if you're high-risk\n5. Monitor your symptoms closely\n\nSeek emergency care immediately for severe symptoms like difficulty breathing, persistent chest pain, confusion, inability to wake/stay awake, or bluish lips/face. Call ahead to emergency facilities if possible to notify them of your COVID status."
+                "response": "If you have COVID-19 symptoms or exposure:\n\n1. Isolate from others immediately\n2. Get tested (PCR or rapid antigen test)\n   • Our Urgent Care centers offer walk-in testing\n   • Testing center appointments: {covid_testing_line}\n3. Wear a high-quality mask if you must be around others\n4. Contact your healthcare provider, especially if you're high-risk\n5. Monitor your symptoms closely\n\nSeek emergency care immediately for severe symptoms like difficulty breathing, persistent chest pain, confusion, inability to wake/stay awake, or bluish lips/face. Call ahead to emergency facilities if possible to notify them of your COVID status."
             },
             {
                 "regex": r"(?:how|what) (?:are|is) (?:covid|covid-19|coronavirus) (?:patients|cases) (?:treated|managed|handled) (?:at|in) (?:the|your) hospital",
-                "response": lambda match, user: "Our COVID-19 patient care includes:\n\n• Dedicated COVID units with specialized ventilation systems\n• Treatment protocols based on latest clinical evidence\n• FDA-authorized antivirals (Paxlovid, remdesivir) for eligible patients\n• Monoclonal antibody treatments for qualifying patients\n• Respiratory support ranging from oxygen supplementation to ventilation\n• Prone positioning protocols to improve oxygenation\n• Multidisciplinary care teams including infectious disease specialists\n• Critical care expertise for severe cases\n• Continuous monitoring of vital signs and oxygen levels\n• Remote monitoring programs for recovering outpatients\n\nTreatment approaches are personalized to each patient's condition, risk factors, and disease progression."
+                "response": "Our COVID-19 patient care includes:\n\n• Dedicated COVID units with specialized ventilation systems\n• Treatment protocols based on latest clinical evidence\n• FDA-authorized antivirals (Paxlovid, remdesivir) for eligible patients\n• Monoclonal antibody treatments for qualifying patients\n• Respiratory support ranging from oxygen supplementation to ventilation\n• Prone positioning protocols to improve oxygenation\n• Multidisciplinary care teams including infectious disease specialists\n• Critical care expertise for severe cases\n• Continuous monitoring of vital signs and oxygen levels\n• Remote monitoring programs for recovering outpatients\n\nTreatment approaches are personalized to each patient's condition, risk factors, and disease progression."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:long covid|post-covid|long-haul covid) (?:services|treatment|care|clinic)",
-                "response": lambda match, user: "Our Post-COVID Recovery Program provides comprehensive care for long COVID symptoms including:\n\n• Multidisciplinary evaluation by pulmonology, cardiology, neurology, and rehabilitation medicine\n• Personalized treatment plans addressing specific symptoms\n• Pulmonary function testing and rehabilitation\n• Cardiac evaluation and monitoring\n• Cognitive assessment and rehabilitation\n• Physical and occupational therapy\n• Mental health support and counseling\n• Sleep disorder evaluation and management\n• Nutrition guidance\n• Support groups and educational resources\n\nReferrals can come from primary care or specialists. For more information or appointments, call our Post-COVID Clinic at (555) 234-5678."
+                "response": "Our Post-COVID Recovery Program provides comprehensive care for long COVID symptoms including:\n\n• Multidisciplinary evaluation by pulmonology, cardiology, neurology, and rehabilitation medicine\n• Personalized treatment plans addressing specific symptoms\n• Pulmonary function testing and rehabilitation\n• Cardiac evaluation and monitoring\n• Cognitive assessment and rehabilitation\n• Physical and occupational therapy\n• Mental health support and counseling\n• Sleep disorder evaluation and management\n• Nutrition guidance\n• Support groups and educational resources\n\nReferrals can come from primary care or specialists. For more information or appointments, call our Post-COVID Clinic at (555) 234-5678."
             },
             # Add 90+ more COVID-19 patterns here
         ]
@@ -821,16 +1899,16 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which) (?:is|are) (?:the|your) (?:contact|phone|telephone) (?:number|info|information|details)",
-                "response": lambda match, user: (
+                "response": (
                     "Our main hospital contact numbers:\n\n"
-                    "• Main Switchboard: (555) 123-4500\n"
+                    "• Main Switchboard: {main_line}\n"
                     "• Patient Information: (555) 123-4501\n"
-                    "• Appointment Scheduling: (555) 123-4567\n"
-                    "• Billing Department: (555) 987-6543\n"
+                    "• Appointment Scheduling: {appointment_line}\n"
+                    "• Billing Department: {billing_line}\n"
                     "• Medical Records: (555) 123-4545\n"
-                    "• Patient Advocacy: (555) 123-9876\n"
-                    "• Emergency Department: (555) 911-7000\n"
-                    "• Physician Referral Line: (555) 234-5678\n\n"
+                    "• Patient Advocacy: {advocacy_line}\n"
+                    "• Emergency Department: {emergency_line}\n"
+                    "• Physician Referral Line: {referral_line}\n\n"
                     "For direct connections to specific departments or patient rooms, please call our main switchboard. Our operators are available 24/7 to direct your call appropriately."
                 )
             },
@@ -840,11 +1918,11 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:working|operating|business) hours(?: for| of)? (?:the hospital|you)?",
-                "response": lambda match, user: "Our hospital operates 24/7 for inpatient care and emergency services. Specific department hours include:\n• Main Hospital: Open 24/7\n• Emergency Department: Open 24/7\n• Outpatient Clinics: Monday-Friday, 8:00 AM - 5:00 PM\n• Laboratory: Monday-Friday, 6:00 AM - 6:00 PM; Saturday, 7:00 AM - 12:00 PM\n• Imaging Services: Monday-Friday, 7:00 AM - 7:00 PM; Saturday, 8:00 AM - 2:00 PM\n• Pharmacy: Monday-Friday, 8:00 AM - 9:00 PM; Saturday, 9:00 AM - 6:00 PM; Sunday, 10:00 AM - 5:00 PM\n\nFor specific department hours or holiday schedules, please call (555) 123-4500."
+                "response": "Our hospital operates 24/7 for inpatient care and emergency services. Specific department hours include:\n• Main Hospital: Open 24/7\n• Emergency Department: Open 24/7\n• Outpatient Clinics: Monday-Friday, 8:00 AM - 5:00 PM\n• Laboratory: Monday-Friday, 6:00 AM - 6:00 PM; Saturday, 7:00 AM - 12:00 PM\n• Imaging Services: Monday-Friday, 7:00 AM - 7:00 PM; Saturday, 8:00 AM - 2:00 PM\n• Pharmacy: Monday-Friday, 8:00 AM - 9:00 PM; Saturday, 9:00 AM - 6:00 PM; Sunday, 10:00 AM - 5:00 PM\n\nFor specific department hours or holiday schedules, please call {main_line}."
             },
             {
                 "regex": r"(?:what|which) (?:are|is) (?:the|your) (?:holiday|weekend) hours(?: for| of)? (?:the hospital|you)?",
-                "response": lambda match, user: "Our hospital remains open 24/7 during holidays for inpatient and emergency care. However, outpatient services and administrative offices may have modified hours:\n• Emergency Department: Open 24/7\n• Inpatient Units: Open 24/7\n• Outpatient Clinics: Closed on major holidays\n• Pharmacy: Open 10:00 AM - 2:00 PM on holidays\n• Laboratory: Closed on major holidays\n• Imaging Services: Emergency imaging only\n\nPlease contact specific departments or visit hospital.example.com/holidays for detailed holiday hours."
+                "response": "Our hospital remains open 24/7 during holidays for inpatient and emergency care. However, outpatient services and administrative offices may have modified hours:\n• Emergency Department: Open 24/7\n• Inpatient Units: Open 24/7\n• Outpatient Clinics: Closed on major holidays\n• Pharmacy: Open 10:00 AM - 2:00 PM on holidays\n• Laboratory: Closed on major holidays\n• Imaging Services: Emergency imaging only\n\nPlease contact specific departments or visit {website}/holidays for detailed holiday hours."
             },
             # Add 90+ more working hours patterns here
         ]
@@ -853,7 +1931,7 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:where|how) (?:can|do) (?:I|visitors|patients) (?:park|find parking|locate parking) at the hospital",
-                "response": lambda match, user: "Visitor parking is available in the following areas:\n• Main Visitor Garage (adjacent to the main entrance): $2/hour, $10 daily max\n• Surface Lot B (near Emergency Department): $1/hour, $8 daily max\n• Valet Parking (Main Entrance): $5 for up to 4 hours, $15 daily max; available 6:00 AM - 8:00 PM weekdays\n• Free parking for patients with extended stays (passes available at the information desk)\n\nAll parking areas are open 24/7. Accessible parking spaces are available near all major entrances. Contact Security at (555) 123-7890 for assistance."
+                "response": "Visitor parking is available in the following areas:\n• Main Visitor Garage (adjacent to the main entrance): $2/hour, $10 daily max\n• Surface Lot B (near Emergency Department): $1/hour, $8 daily max\n• Valet Parking (Main Entrance): $5 for up to 4 hours, $15 daily max; available 6:00 AM - 8:00 PM weekdays\n• Free parking for patients with extended stays (passes available at the information desk)\n\nAll parking areas are open 24/7. Accessible parking spaces are available near all major entrances. Contact Security at (555) 123-7890 for assistance."
             },
             # Add 90+ parking patterns here
         ]
@@ -862,7 +1940,7 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:where|how) (?:can|do) (?:I|visitors|patients) (?:find|get|locate) (?:directions|maps|routes) to the hospital",
-                "response": lambda match, user: "For directions to our hospital:\n• Address: 123 Medical Center Drive, Healthville, ST 12345\n• GPS: Enter 'Main Hospital Entrance' or 'Emergency Department Entrance' for precise navigation\n• Public Transit: Bus routes 10, 15, and 22 stop at the main entrance\n• Driving Directions: Visit hospital.example.com/directions for turn-by-turn instructions\n• Parking: Visitor Garage (Main Entrance) or Surface Lot B (Emergency Department)\n\nIf you need additional assistance, call our main switchboard at (555) 123-4500."
+                "response": "For directions to our hospital:\n• Address: 123 Medical Center Drive, Healthville, ST 12345\n• GPS: Enter 'Main Hospital Entrance' or 'Emergency Department Entrance' for precise navigation\n• Public Transit: Bus routes 10, 15, and 22 stop at the main entrance\n• Driving Directions: Visit {website}/directions for turn-by-turn instructions\n• Parking: Visitor Garage (Main Entrance) or Surface Lot B (Emergency Department)\n\nIf you need additional assistance, call our main switchboard at {main_line}."
             },
             # Add 90+ directions patterns here
         ]
@@ -871,7 +1949,7 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:hello|hi|hey|good morning|good afternoon|good evening)",
-                "response": lambda match, user: "Hello! How can I assist you with our hospital services today?"
+                "response": "Hello! How can I assist you with our hospital services today?"
             },
             # Add more greeting patterns here
         ]
@@ -880,7 +1958,7 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:goodbye|bye|see you|take care|farewell)",
-                "response": lambda match, user: "Goodbye! Please don't hesitate to contact us if you need further assistance."
+                "response": "Goodbye! Please don't hesitate to contact us if you need further assistance."
             },
             # Add more goodbye patterns here
         ]
@@ -889,7 +1967,7 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:thank you|thanks|much appreciated|grateful)",
-                "response": lambda match, user: "You're welcome! I'm glad I could help. Let us know if you have any other questions."
+                "response": "You're welcome! I'm glad I could help. Let us know if you have any other questions."
             },
             # Add more thanks patterns here
         ]
@@ -898,11 +1976,41 @@ class HospitalChatbot:
         return [
             {
                 "regex": r"(?:what|which) (?:services|departments|units) (?:are|is) (?:available|offered) at the hospital",
-                "response": lambda match, user: "We offer a wide range of services, including emergency care, surgery, maternity, pediatrics, cardiology, oncology, rehabilitation, and more. For a full list of departments, please visit hospital.example.com/services or call (555) 123-4500."
+                "response": "We offer a wide range of services, including emergency care, surgery, maternity, pediatrics, cardiology, oncology, rehabilitation, and more. For a full list of departments, please visit {website}/services or call {main_line}."
             },
             # Add more general patterns here
         ]
 
+    def get_doctor_roster(self):
+        # Doctors open for self-service booking and their specialty
+        return {
+            "Dr. Smith": "cardiology",
+            "Dr. Johnson": "endocrinology",
+            "Dr. Williams": "pediatrics",
+            "Dr. Brown": "orthopedics",
+            "Dr. Garcia": "neurology",
+            "Dr. Patel": "dermatology",
+            "Dr. Nguyen": "oncology",
+            "Dr. Lee": "psychiatry",
+        }
+
+    def get_response_fragments(self):
+        # Contact details shared by many responses, referenced as {name} in response templates
+        return {
+            "main_line": "(555) 123-4500",
+            "appointment_line": "(555) 123-4567",
+            "billing_line": "(555) 987-6543",
+            "referral_line": "(555) 234-5678",
+            "pharmacy_line": "(555) 234-6789",
+            "advocacy_line": "(555) 123-9876",
+            "financial_services_line": "(555) 789-3456",
+            "insurance_line": "(555) 456-7890",
+            "lab_line": "(555) 345-6789",
+            "covid_testing_line": "(555) 678-9012",
+            "emergency_line": "(555) 911-7000",
+            "website": "hospital.example.com",
+        }
+
     def get_spelling_corrections(self):
         return {
             "apointment": "appointment",
@@ -921,6 +2029,47 @@ class HospitalChatbot:
             "admisson": "admission",
         }
 
+    def get_medical_vocabulary(self):
+        # Phrase or abbreviation -> canonical wording used by the patterns
+        return {
+            "er": "emergency room",
+            "e.r.": "emergency room",
+            "emergency department": "emergency room",
+            "emergency dept": "emergency room",
+            "emergency ward": "emergency room",
+            "a&e": "emergency room",
+            "accident and emergency": "emergency room",
+            "lab": "laboratory",
+            "labs": "laboratory tests",
+            "labwork": "laboratory work",
+            "lab work": "laboratory work",
+            "lab test": "laboratory test",
+            "lab tests": "laboratory tests",
+            "bloodwork": "blood work",
+            "blood-work": "blood work",
+            "appt": "appointment",
+            "appts": "appointments",
+            "dr": "Dr.",
+            "doc": "doctor",
+            "docs": "doctors",
+            "meds": "medications",
+            "rx": "prescription",
+            "hosp": "hospital",
+            "pharm": "pharmacy",
+            "covid 19": "covid-19",
+            "covid19": "covid-19",
+            "wi-fi": "wifi",
+            "wi fi": "wifi",
+        }
+
+
+def wait_text(minutes):
+    if minutes < 5:
+        return "under 5 minutes"
+    if minutes < 90:
+        return f"about {round(minutes / 5) * 5:.0f} minutes"
+    return f"about {minutes / 60:.1f} hours"
+
 
 def run_chat():
     """Run the chatbot in the terminal"""
@@ -932,6 +2081,7 @@ def run_chat():
     # Initialize chatbot
     chatbot = HospitalChatbot()
     user_name = ""
+    session_id = "terminal"
     
     # Print welcome banner
     print("=" * 60)
@@ -970,7 +2120,7 @@ def run_chat():
                 continue
             
             # Get response from chatbot
-            response = chatbot.process_query(user_input, user_name)
+            response = chatbot.process_query(user_input, user_name, session_id=session_id)
             
             # Print response with formatting
             print(f"\n🏥 Hospital Assistant: {response}\n")
@@ -980,5 +2130,159 @@ def run_chat():
             break
 
 
+def read_queries(files, input_format="auto"):
+    """Yield (query, user_name, extra) tuples from text or JSONL input lines.
+
+    A JSONL line that is not valid JSON or has no string "query" yields
+    (None, None, {"file": ..., "line": ..., "error": ...}) so the caller can report it
+    and keep going.
+    """
+    import fileinput
+    import json
+
+    with fileinput.input(files or ["-"], encoding="utf-8") as lines:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            if input_format == "jsonl" or (input_format == "auto" and line.startswith("{")):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield None, None, {"file": lines.filename(), "line": lines.filelineno(),
+                                       "error": f"invalid JSON: {e}"}
+                    continue
+                if isinstance(record, str):
+                    yield record, None, {}
+                    continue
+                if not isinstance(record, dict) or not isinstance(record.get("query"), str):
+                    yield None, None, {"file": lines.filename(), "line": lines.filelineno(),
+                                       "error": 'expected an object with a string "query"'}
+                    continue
+                query = record.pop("query")
+                user_name = record.pop("user", None)
+                yield query, user_name, record
+            else:
+                yield line, None, {}
+
+
+def run_stream(files=None, input_format="auto", workers=1, ordered=True, user_name=None, output=None):
+    """Answer queries from files/stdin and write one JSON result per line.
+
+    With several workers, records that share a "session" value are still
+    answered one after another in input order, so follow-ups see the turn
+    before them.
+    """
+    import json
+    import sys
+    import time
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    chatbot = HospitalChatbot()
+    if output is None:
+        # Block-buffer stdout even when attached to a terminal; results are flushed at the end
+        output = sys.stdout
+        output.reconfigure(line_buffering=False)
+
+    def answer(item):
+        query, query_user, extra = item
+        if query is None:
+            # An input line read_queries could not parse
+            return json.dumps({"query": None, "category": None, "response": None, **extra}, ensure_ascii=False)
+        start = time.perf_counter()
+        result = dict(extra)
+        result["query"] = query
+        try:
+            # JSONL records with the same "session" value are one conversation
+            response, category = chatbot.answer_query(query, query_user or user_name, extra.get("session"))
+            result["category"] = category
+            result["response"] = response
+        except Exception as e:
+            # Some patterns call helpers that may fail; report the error and keep going
+            result["category"] = None
+            result["response"] = None
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return json.dumps(result, ensure_ascii=False)
+
+    def answer_after(previous, item):
+        # The pool starts tasks in submission order, so the session's previous record is
+        # already running or done and this wait cannot deadlock
+        wait([previous])
+        return answer(item)
+
+    last_in_session = {}  # session value -> future of its latest record
+
+    def submit(pool, item):
+        """Submit a record; records of one session are answered one after another, in input order"""
+        session = item[2].get("session")
+        if not isinstance(session, (str, int, float)):
+            return pool.submit(answer, item)
+        previous = last_in_session.get(session)
+        if previous is None or previous.done():
+            future = pool.submit(answer, item)
+        else:
+            future = pool.submit(answer_after, previous, item)
+        last_in_session[session] = future
+        if len(last_in_session) > 4 * max_pending:
+            for key in [key for key, future in last_in_session.items() if future.done()]:
+                del last_in_session[key]
+        return future
+
+    queries = read_queries(files, input_format)
+
+    if workers <= 1:
+        for item in queries:
+            output.write(answer(item) + "\n")
+        output.flush()
+        return
+
+    # Keep a bounded number of queries in flight so large files stream through
+    max_pending = workers * 4
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if ordered:
+            pending = []
+            for item in queries:
+                pending.append(submit(pool, item))
+                if len(pending) >= max_pending:
+                    output.write(pending.pop(0).result() + "\n")
+            for future in pending:
+                output.write(future.result() + "\n")
+        else:
+            pending = set()
+            for item in queries:
+                pending.add(submit(pool, item))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        output.write(future.result() + "\n")
+            for future in pending:
+                output.write(future.result() + "\n")
+    output.flush()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hospital Management System chatbot")
+    parser.add_argument("--stream", action="store_true",
+                        help="answer queries from files/stdin non-interactively and write JSONL results")
+    parser.add_argument("files", nargs="*",
+                        help="input files for --stream (default: stdin, '-' also means stdin)")
+    parser.add_argument("--format", choices=["auto", "text", "jsonl"], default="auto",
+                        help="input format: one query per line, or JSONL objects with a 'query' field")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker threads")
+    parser.add_argument("--unordered", action="store_true",
+                        help="write results as soon as they are ready instead of in input order")
+    parser.add_argument("--user", default=None, help="user name passed to the chatbot")
+    args = parser.parse_args()
+
+    if args.stream or args.files:
+        run_stream(args.files, args.format, args.workers, not args.unordered, args.user)
+    else:
+        run_chat()
+
+
 if __name__ == "__main__":
-    run_chat()
\ No newline at end of file
+    main()
\ No newline at end of file
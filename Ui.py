@@ -7,15 +7,26 @@
 import customtkinter as ctk
 from datetime import datetime
 import threading
+import uuid
 import tkinter as tk
 import math
+import logging
+import time
 
 from HMS import HospitalChatbot
+from chat_history import ChatHistory
 
 # Set appearance and theme
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
+logger = logging.getLogger(__name__)
+
+# Chat history limits (older messages are spilled to disk)
+MAX_CHAT_MESSAGES = 200      # Messages kept in memory
+MAX_VISIBLE_MESSAGES = 100   # Message bubbles kept on screen
+HISTORY_PAGE_SIZE = 20       # Messages loaded per scroll-up
+
 
 class AnimatedButton(ctk.CTkButton):
     """Custom button with hover animation effects"""
@@ -47,6 +58,11 @@ class PulsingDot(ctk.CTkFrame):
         self.pulse_index = 0
         self.start_pulse()
         
+    def set_colors(self, pulse_colors):
+        """Switch the pulse cycle to a new set of colors"""
+        self.pulse_colors = pulse_colors
+        self.pulse_index = 0
+        
     def start_pulse(self):
         self.pulse_index = (self.pulse_index + 1) % len(self.pulse_colors)
         self.configure(fg_color=self.pulse_colors[self.pulse_index])
@@ -96,6 +112,11 @@ class FloatingLabel(ctk.CTkLabel):
 
 class ModernHospitalChatGUI(ctk.CTk):
     def __init__(self):
+        # Startup timing (time-to-first-paint / time-to-interactive)
+        self.startup_start = time.perf_counter()
+        self.first_paint_time = None
+        self.interactive_time = None
+        
         super().__init__()
         
         # Window configuration
@@ -138,29 +159,100 @@ class ModernHospitalChatGUI(ctk.CTk):
         # Configure window background
         self.configure(fg_color=self.colors['bg_main'])
         
-        # Initialize chatbot
-        self.chatbot = HospitalChatbot()
+        # Chatbot is created on a background thread so the window appears immediately
+        self.chatbot = None
+        self.chatbot_ready = threading.Event()  # Set once loading finished, even if it failed
+        self.load_error = None
+        self.decorations_ready = False
         self.user_name = ""
-        self.chat_history = []
+        self.chat_history = ChatHistory(max_messages=MAX_CHAT_MESSAGES)
+        self.session_id = uuid.uuid4().hex
         self.message_widgets = []
+        self.first_shown = 0  # History index of the oldest message on screen
+        self.loading_history = False
         
-        # Build UI
+        # Build the essential UI (chat area and input) now
         self.create_ui()
         
-        # Start entrance animations
-        self.after(100, self.play_entrance_animation)
+        # Start loading the chatbot
+        threading.Thread(target=self.load_chatbot, daemon=True).start()
+        
+        # Everything else is built once the first frame has been drawn
+        self.after_idle(self.on_first_paint)
         
         # Focus on message entry
         self.after(500, lambda: self.message_entry.focus())
         
+        # Remove the history spill file on exit
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def on_close(self):
+        self.chat_history.close()
+        self.destroy()
+        
+    def load_chatbot(self):
+        """Create the chatbot off the main thread"""
+        try:
+            self.chatbot = HospitalChatbot()
+        except Exception as exc:
+            logger.exception("Failed to load the chatbot")
+            self.load_error = str(exc) or type(exc).__name__
+        finally:
+            # Waiting messages must not hang, whether or not loading worked
+            self.chatbot_ready.set()
+            # Update the readiness indicator in the main thread
+            self.after(0, self.on_chatbot_ready)
+        
+    def on_first_paint(self):
+        """Called after the first frame; builds the non-essential decorations"""
+        self.first_paint_time = time.perf_counter() - self.startup_start
+        logger.info("Time to first paint: %.1f ms", self.first_paint_time * 1000)
+        
+        self.build_decorations()
+        
+    def build_decorations(self):
+        """Build the header, quick actions and welcome screen"""
+        self.create_header()
+        if self.chatbot_ready.is_set():
+            self.show_chatbot_status()
+        self.create_quick_actions()
+        
+        # The user may already have started chatting
+        if not self.chat_history:
+            self.show_welcome()
+            
+        # Start entrance animations
+        self.after(100, self.play_entrance_animation)
+        
+        self.decorations_ready = True
+        self.check_interactive()
+        
+    def on_chatbot_ready(self):
+        """Show the loading result; the header may not be built yet, in which case build_decorations shows it"""
+        if self.decorations_ready:
+            self.show_chatbot_status()
+        self.check_interactive()
+        
+    def show_chatbot_status(self):
+        """Switch the status indicator to online, or to offline if the chatbot failed to load"""
+        if self.load_error is not None:
+            self.status_dot.set_colors([self.colors['error'], self.colors['error_light']])
+            self.status_text.configure(text="  Offline • Assistant failed to start")
+        else:
+            self.status_dot.set_colors([self.colors['success'], "#34d399", "#6ee7b7", "#34d399"])
+            self.status_text.configure(text="  Online • Ready to help")
+        
+    def check_interactive(self):
+        """Log time-to-interactive once the chatbot and decorations are ready"""
+        if self.interactive_time is None and self.decorations_ready and self.chatbot is not None:
+            self.interactive_time = time.perf_counter() - self.startup_start
+            logger.info("Time to interactive: %.1f ms", self.interactive_time * 1000)
+        
     def create_ui(self):
         # Main container with padding
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.main_frame.pack(fill="both", expand=True, padx=30, pady=20)
         
-        # Header section
-        self.create_header()
-        
         # Chat container (card-like appearance with shadow effect)
         self.chat_card = ctk.CTkFrame(
             self.main_frame,
@@ -180,14 +272,10 @@ class ModernHospitalChatGUI(ctk.CTk):
         # Chat messages area
         self.create_chat_area()
         
-        # Quick actions
-        self.create_quick_actions()
-        
         # Input area
         self.create_input_area()
         
-        # Show welcome message
-        self.show_welcome()
+        # Header, quick actions and welcome message are built in build_decorations()
         
     def play_entrance_animation(self):
         """Animate UI elements on startup"""
@@ -208,7 +296,7 @@ class ModernHospitalChatGUI(ctk.CTk):
         
     def create_header(self):
         self.header_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        self.header_frame.pack(fill="x")
+        self.header_frame.pack(fill="x", before=self.chat_card)
         
         # Title with gradient-like effect using label
         title_frame = ctk.CTkFrame(self.header_frame, fg_color="transparent")
@@ -401,17 +489,18 @@ class ModernHospitalChatGUI(ctk.CTk):
         status_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
         status_frame.pack(anchor="w", pady=(5, 0))
         
-        # Pulsing status dot
-        self.status_dot = PulsingDot(status_frame, color=self.colors['success'])
+        # Pulsing status dot (amber until the chatbot has loaded)
+        self.status_dot = PulsingDot(status_frame, color=self.colors['warning'])
+        self.status_dot.set_colors([self.colors['warning'], self.colors['warning_light']])
         self.status_dot.pack(side="left")
         
-        status_text = ctk.CTkLabel(
+        self.status_text = ctk.CTkLabel(
             status_frame,
-            text="  Online • Ready to help",
+            text="  Starting up...",
             font=ctk.CTkFont(size=13),
             text_color="#e0f2fe"
         )
-        status_text.pack(side="left")
+        self.status_text.pack(side="left")
         
         # Right side - Stats & Time
         right_frame = ctk.CTkFrame(inner, fg_color="transparent")
@@ -465,6 +554,16 @@ class ModernHospitalChatGUI(ctk.CTk):
         )
         self.chat_scroll.pack(fill="both", expand=True, padx=10, pady=15)
         
+        # Page older messages back in when the user scrolls to the top
+        scrollbar_set = self.chat_scroll._scrollbar.set
+        
+        def on_scroll(first, last):
+            scrollbar_set(first, last)
+            if float(first) <= 0.0 and float(last) < 1.0 and self.first_shown > 0:
+                self.after_idle(self.load_older_messages)
+                
+        self.chat_scroll._parent_canvas.configure(yscrollcommand=on_scroll)
+        
     def create_quick_actions(self):
         # Quick actions container with gradient background
         quick_frame = ctk.CTkFrame(
@@ -472,7 +571,7 @@ class ModernHospitalChatGUI(ctk.CTk):
             fg_color=self.colors['bg_gradient_start'],
             height=70
         )
-        quick_frame.pack(fill="x", padx=2)
+        quick_frame.pack(fill="x", padx=2, before=self.input_container)
         
         inner = ctk.CTkFrame(quick_frame, fg_color="transparent")
         inner.pack(fill="x", padx=20, pady=15)
@@ -528,18 +627,18 @@ class ModernHospitalChatGUI(ctk.CTk):
             
     def create_input_area(self):
         # Input container with subtle gradient
-        input_container = ctk.CTkFrame(
+        self.input_container = ctk.CTkFrame(
             self.chat_card,
             fg_color=self.colors['bg_card'],
             corner_radius=0
         )
-        input_container.pack(fill="x", padx=2, pady=2)
+        self.input_container.pack(fill="x", padx=2, pady=2)
         
         # Separator line with gradient effect
-        separator = ctk.CTkFrame(input_container, fg_color=self.colors['primary_light'], height=2)
+        separator = ctk.CTkFrame(self.input_container, fg_color=self.colors['primary_light'], height=2)
         separator.pack(fill="x")
         
-        inner = ctk.CTkFrame(input_container, fg_color="transparent")
+        inner = ctk.CTkFrame(self.input_container, fg_color="transparent")
         inner.pack(fill="x", padx=25, pady=18)
         
         # Name entry (smaller, on top) with icon
@@ -769,10 +868,13 @@ class ModernHospitalChatGUI(ctk.CTk):
                 
         wave()
         
-    def add_message(self, message, is_user=True):
+    def add_message(self, message, is_user=True, sent_at=None, at_top=False):
         # Message container with slide animation
         msg_container = ctk.CTkFrame(self.chat_scroll, fg_color="transparent")
-        msg_container.pack(fill="x", pady=8, padx=15)
+        if at_top and self.message_widgets:
+            msg_container.pack(fill="x", pady=8, padx=15, before=self.message_widgets[0])
+        else:
+            msg_container.pack(fill="x", pady=8, padx=15)
         
         # Alignment
         if is_user:
@@ -819,7 +921,7 @@ class ModernHospitalChatGUI(ctk.CTk):
         msg_label.pack(anchor="w", pady=(6, 4))
         
         # Timestamp with icon
-        time_text = f"🕐 {datetime.now().strftime('%I:%M %p')}"
+        time_text = f"🕐 {sent_at or datetime.now().strftime('%I:%M %p')}"
         timestamp = ctk.CTkLabel(
             inner,
             text=time_text,
@@ -828,7 +930,10 @@ class ModernHospitalChatGUI(ctk.CTk):
         )
         timestamp.pack(anchor="e")
         
-        # Store widget reference
+        # Store widget reference (older messages paged in from history go on top)
+        if at_top:
+            self.message_widgets.insert(0, msg_container)
+            return
         self.message_widgets.append(msg_container)
         
         # Animate message appearing
@@ -837,6 +942,55 @@ class ModernHospitalChatGUI(ctk.CTk):
         # Scroll to bottom
         self.after(50, lambda: self.chat_scroll._parent_canvas.yview_moveto(1.0))
         
+    def record_message(self, message, is_user):
+        """Store a message in the history and show it at the bottom of the chat"""
+        # If the user paged back through older messages, jump back to the latest ones
+        if self.first_shown + len(self.message_widgets) < len(self.chat_history):
+            self.show_recent_messages()
+            
+        self.chat_history.append(message, is_user)
+        self.add_message(message, is_user=is_user)
+        
+        # Keep a bounded number of bubbles on screen
+        while len(self.message_widgets) > MAX_VISIBLE_MESSAGES:
+            self.message_widgets.pop(0).destroy()
+            self.first_shown += 1
+            
+    def show_recent_messages(self):
+        """Rebuild the chat view from the most recent messages in the history"""
+        for widget in self.message_widgets:
+            widget.destroy()
+        self.message_widgets = []
+        
+        total = len(self.chat_history)
+        self.first_shown = max(total - MAX_VISIBLE_MESSAGES, 0)
+        for msg in self.chat_history.get_range(self.first_shown, total):
+            self.add_message(msg["text"], is_user=msg["is_user"], sent_at=msg["time"])
+            
+    def load_older_messages(self):
+        """Page older messages back in from the history store"""
+        if self.loading_history or self.first_shown == 0:
+            return
+        self.loading_history = True
+        
+        page = self.chat_history.page_before(self.first_shown, HISTORY_PAGE_SIZE)
+        for msg in reversed(page):
+            self.add_message(msg["text"], is_user=msg["is_user"], sent_at=msg["time"], at_top=True)
+        self.first_shown -= len(page)
+        
+        # Drop bubbles from the bottom to stay within the on-screen limit
+        while len(self.message_widgets) > MAX_VISIBLE_MESSAGES:
+            self.message_widgets.pop().destroy()
+            
+        # Keep the previously top message in view so loading doesn't cascade
+        fraction = len(page) / max(len(self.message_widgets), 1)
+        
+        def finish():
+            self.chat_scroll._parent_canvas.yview_moveto(fraction)
+            self.loading_history = False
+            
+        self.after(50, finish)
+        
     def animate_message_appear(self, widget):
         """Subtle appear animation for messages"""
         # Flash border color
@@ -919,15 +1073,22 @@ class ModernHospitalChatGUI(ctk.CTk):
                 widget.destroy()
                 
         # Add user message
-        self.add_message(message, is_user=True)
-        self.chat_history.append({"text": message, "is_user": True})
+        self.record_message(message, is_user=True)
         
         # Show typing indicator
         self.show_typing_indicator()
         
         # Get response in thread
         def get_response():
-            response = self.chatbot.process_query(message, self.user_name if self.user_name else None)
+            # Messages sent during startup wait for the chatbot to finish loading
+            self.chatbot_ready.wait()
+            if self.chatbot is None:
+                response = (
+                    "Sorry, the assistant failed to start, so I can't answer right now. "
+                    "Please restart the application or call the hospital's main line."
+                )
+            else:
+                response = self.chatbot.process_query(message, self.user_name if self.user_name else None, session_id=self.session_id)
             
             # Update UI in main thread with slight delay for effect
             self.after(800, lambda: self.receive_response(response))
@@ -956,8 +1117,7 @@ class ModernHospitalChatGUI(ctk.CTk):
         
     def receive_response(self, response):
         self.remove_typing_indicator()
-        self.add_message(response, is_user=False)
-        self.chat_history.append({"text": response, "is_user": False})
+        self.record_message(response, is_user=False)
         
         # Play notification sound effect (visual flash instead)
         self.flash_notification()
@@ -980,14 +1140,20 @@ class ModernHospitalChatGUI(ctk.CTk):
         # Clear all messages with fade effect
         for widget in self.chat_scroll.winfo_children():
             widget.destroy()
-        self.chat_history = []
+        self.chat_history.clear()
+        # Start a new conversation so follow-ups don't refer to cleared messages
+        if self.chatbot is not None:
+            self.chatbot.sessions.end(self.session_id)
+        self.session_id = uuid.uuid4().hex
         self.message_widgets = []
+        self.first_shown = 0
         
         # Show welcome with animation
         self.show_welcome()
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
     app = ModernHospitalChatGUI()
     app.mainloop()
 
@@ -6,14 +6,21 @@
 import customtkinter as ctk
 from datetime import datetime
 import threading
+import uuid
 import tkinter as tk
 
 from HMS import HospitalChatbot
+from chat_history import ChatHistory
 
 # Set appearance and theme
 ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
+# Chat history limits (older messages are spilled to disk)
+MAX_CHAT_MESSAGES = 200      # Messages kept in memory
+MAX_VISIBLE_MESSAGES = 100   # Message bubbles kept on screen
+HISTORY_PAGE_SIZE = 20       # Messages loaded per scroll-up
+
 
 class ModernHospitalChatGUI(ctk.CTk):
     def __init__(self):
@@ -49,7 +56,11 @@ class ModernHospitalChatGUI(ctk.CTk):
         # Initialize chatbot
         self.chatbot = HospitalChatbot()
         self.user_name = ""
-        self.chat_history = []
+        self.chat_history = ChatHistory(max_messages=MAX_CHAT_MESSAGES)
+        self.session_id = uuid.uuid4().hex
+        self.message_widgets = []
+        self.first_shown = 0  # History index of the oldest message on screen
+        self.loading_history = False
         
         # Build UI
         self.create_ui()
@@ -57,6 +68,13 @@ class ModernHospitalChatGUI(ctk.CTk):
         # Focus on message entry
         self.after(100, lambda: self.message_entry.focus())
         
+        # Remove the history spill file on exit
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+    def on_close(self):
+        self.chat_history.close()
+        self.destroy()
+        
     def create_ui(self):
         # Main container with padding
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -225,6 +243,16 @@ class ModernHospitalChatGUI(ctk.CTk):
         )
         self.chat_scroll.pack(fill="both", expand=True, padx=10, pady=15)
         
+        # Page older messages back in when the user scrolls to the top
+        scrollbar_set = self.chat_scroll._scrollbar.set
+        
+        def on_scroll(first, last):
+            scrollbar_set(first, last)
+            if float(first) <= 0.0 and float(last) < 1.0 and self.first_shown > 0:
+                self.after_idle(self.load_older_messages)
+                
+        self.chat_scroll._parent_canvas.configure(yscrollcommand=on_scroll)
+        
     def create_quick_actions(self):
         # Quick actions container
         quick_frame = ctk.CTkFrame(self.chat_card, fg_color=self.colors['bg_chat'], height=60)
@@ -441,10 +469,13 @@ class ModernHospitalChatGUI(ctk.CTk):
         )
         instruction.pack(pady=(20, 0))
         
-    def add_message(self, message, is_user=True):
+    def add_message(self, message, is_user=True, sent_at=None, at_top=False):
         # Message container
         msg_container = ctk.CTkFrame(self.chat_scroll, fg_color="transparent")
-        msg_container.pack(fill="x", pady=5, padx=10)
+        if at_top and self.message_widgets:
+            msg_container.pack(fill="x", pady=5, padx=10, before=self.message_widgets[0])
+        else:
+            msg_container.pack(fill="x", pady=5, padx=10)
         
         # Alignment
         if is_user:
@@ -489,15 +520,70 @@ class ModernHospitalChatGUI(ctk.CTk):
         # Timestamp
         timestamp = ctk.CTkLabel(
             inner,
-            text=datetime.now().strftime("%I:%M %p"),
+            text=sent_at or datetime.now().strftime("%I:%M %p"),
             font=ctk.CTkFont(size=9),
             text_color="#b0b0b0" if is_user else self.colors['text_secondary']
         )
         timestamp.pack(anchor="e")
         
+        # Older messages paged in from history go on top
+        if at_top:
+            self.message_widgets.insert(0, msg_container)
+            return
+        self.message_widgets.append(msg_container)
+        
         # Scroll to bottom
         self.chat_scroll._parent_canvas.yview_moveto(1.0)
         
+    def record_message(self, message, is_user):
+        """Store a message in the history and show it at the bottom of the chat"""
+        # If the user paged back through older messages, jump back to the latest ones
+        if self.first_shown + len(self.message_widgets) < len(self.chat_history):
+            self.show_recent_messages()
+            
+        self.chat_history.append(message, is_user)
+        self.add_message(message, is_user=is_user)
+        
+        # Keep a bounded number of bubbles on screen
+        while len(self.message_widgets) > MAX_VISIBLE_MESSAGES:
+            self.message_widgets.pop(0).destroy()
+            self.first_shown += 1
+            
+    def show_recent_messages(self):
+        """Rebuild the chat view from the most recent messages in the history"""
+        for widget in self.message_widgets:
+            widget.destroy()
+        self.message_widgets = []
+        
+        total = len(self.chat_history)
+        self.first_shown = max(total - MAX_VISIBLE_MESSAGES, 0)
+        for msg in self.chat_history.get_range(self.first_shown, total):
+            self.add_message(msg["text"], is_user=msg["is_user"], sent_at=msg["time"])
+            
+    def load_older_messages(self):
+        """Page older messages back in from the history store"""
+        if self.loading_history or self.first_shown == 0:
+            return
+        self.loading_history = True
+        
+        page = self.chat_history.page_before(self.first_shown, HISTORY_PAGE_SIZE)
+        for msg in reversed(page):
+            self.add_message(msg["text"], is_user=msg["is_user"], sent_at=msg["time"], at_top=True)
+        self.first_shown -= len(page)
+        
+        # Drop bubbles from the bottom to stay within the on-screen limit
+        while len(self.message_widgets) > MAX_VISIBLE_MESSAGES:
+            self.message_widgets.pop().destroy()
+            
+        # Keep the previously top message in view so loading doesn't cascade
+        fraction = len(page) / max(len(self.message_widgets), 1)
+        
+        def finish():
+            self.chat_scroll._parent_canvas.yview_moveto(fraction)
+            self.loading_history = False
+            
+        self.after(50, finish)
+        
     def show_typing_indicator(self):
         # Typing indicator
         self.typing_frame = ctk.CTkFrame(self.chat_scroll, fg_color="transparent")
@@ -549,15 +635,14 @@ class ModernHospitalChatGUI(ctk.CTk):
                 widget.destroy()
                 
         # Add user message
-        self.add_message(message, is_user=True)
-        self.chat_history.append({"text": message, "is_user": True})
+        self.record_message(message, is_user=True)
         
         # Show typing indicator
         self.show_typing_indicator()
         
         # Get response in thread
         def get_response():
-            response = self.chatbot.process_query(message, self.user_name if self.user_name else None)
+            response = self.chatbot.process_query(message, self.user_name if self.user_name else None, session_id=self.session_id)
             
             # Update UI in main thread
             self.after(500, lambda: self.receive_response(response))
@@ -566,8 +651,7 @@ class ModernHospitalChatGUI(ctk.CTk):
         
     def receive_response(self, response):
         self.remove_typing_indicator()
-        self.add_message(response, is_user=False)
-        self.chat_history.append({"text": response, "is_user": False})
+        self.record_message(response, is_user=False)
         
     def send_quick_action(self, query):
         self.message_entry.delete(0, "end")
@@ -578,7 +662,13 @@ class ModernHospitalChatGUI(ctk.CTk):
         # Clear all messages
         for widget in self.chat_scroll.winfo_children():
             widget.destroy()
-        self.chat_history = []
+        self.chat_history.clear()
+        # Start a new conversation so follow-ups don't refer to cleared messages
+        if self.chatbot is not None:
+            self.chatbot.sessions.end(self.session_id)
+        self.session_id = uuid.uuid4().hex
+        self.message_widgets = []
+        self.first_shown = 0
         self.show_welcome()
 
 
@@ -0,0 +1,164 @@
+# ============================================
+# Hospital Management System - Appointments
+# Appointment store indexed by patient, doctor and start time
+# ============================================
+
+import csv
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+
+Appointment = namedtuple("Appointment", "appointment_id patient doctor start duration department")
+
+# Formats accepted for appointment start times besides ISO 8601
+TIME_FORMATS = ("%m/%d/%Y, %I:%M %p", "%m/%d/%Y %I:%M %p", "%m/%d/%Y %H:%M")
+
+
+def parse_time(text):
+    text = text.strip()
+    try:
+        # ISO times are the common case in schedule files and much faster to parse
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(text, time_format)
+        except ValueError:
+            pass
+    raise ValueError(f"unrecognized appointment time: {text!r}")
+
+
+def parse_legacy(text):
+    """Parse a free-text appointment like "03/15/2025, 10:00 AM, Dr. Smith" into (start, doctor)"""
+    date_part, time_part, doctor = (part.strip() for part in text.split(",", 2))
+    return parse_time(f"{date_part}, {time_part}"), doctor
+
+
+def key(name):
+    # "Dr. Smith" and "dr smith" are the same doctor
+    return " ".join(re.sub(r"[^\w\s]", "", name.lower()).split())
+
+
+class AppointmentStore:
+    """Appointments indexed for range queries.
+
+    Every index is a list of (start, appointment_id) kept sorted, one per
+    patient, one per doctor and one over all appointments, so upcoming
+    appointments for a patient or a doctor's day are found with two binary
+    searches: O(log n + k) for k results. Bulk imports append first and sort
+    each touched index once.
+    """
+
+    def __init__(self):
+        self.appointments = {}
+        self.by_patient = defaultdict(list)
+        self.by_doctor = defaultdict(list)
+        self.by_start = []
+        self.next_id = 1
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.appointments)
+
+    def add(self, patient, doctor, start, duration=30, department=None):
+        with self.lock:
+            appointment = self.create(patient, doctor, start, duration, department)
+            entry = (appointment.start, appointment.appointment_id)
+            insort(self.by_patient[key(patient)], entry)
+            insort(self.by_doctor[key(doctor)], entry)
+            insort(self.by_start, entry)
+        return appointment
+
+    def create(self, patient, doctor, start, duration, department):
+        # Caller holds self.lock
+        appointment = Appointment(self.next_id, patient, doctor, start, duration, department)
+        self.appointments[appointment.appointment_id] = appointment
+        self.next_id += 1
+        return appointment
+
+    def cancel(self, appointment_id):
+        """Remove an appointment; returns it, or None if there was no such appointment"""
+        with self.lock:
+            appointment = self.appointments.pop(appointment_id, None)
+            if appointment is None:
+                return None
+            entry = (appointment.start, appointment_id)
+            for index in (self.by_patient[key(appointment.patient)], self.by_doctor[key(appointment.doctor)], self.by_start):
+                del index[bisect_left(index, entry)]
+        return appointment
+
+    def import_rows(self, rows):
+        """Add many (patient, doctor, start, duration, department) rows; returns the number added"""
+        with self.lock:
+            patients = set()
+            doctors = set()
+            count = 0
+            try:
+                for patient, doctor, start, duration, department in rows:
+                    appointment = self.create(patient, doctor, start, duration, department)
+                    entry = (appointment.start, appointment.appointment_id)
+                    patient_key, doctor_key = key(patient), key(doctor)
+                    self.by_patient[patient_key].append(entry)
+                    self.by_doctor[doctor_key].append(entry)
+                    self.by_start.append(entry)
+                    patients.add(patient_key)
+                    doctors.add(doctor_key)
+                    count += 1
+            finally:
+                # Rows added before a bad row stay; Timsort keeps the sorted prefix
+                # as one run and merges the new entries into it
+                for patient_key in patients:
+                    self.by_patient[patient_key].sort()
+                for doctor_key in doctors:
+                    self.by_doctor[doctor_key].sort()
+                self.by_start.sort()
+        return count
+
+    def import_csv(self, path):
+        """Bulk import a schedule file with columns patient, doctor, start[, duration, department]"""
+        with open(path, newline="", encoding="utf-8") as f:
+            return self.import_rows(
+                (
+                    row["patient"],
+                    row["doctor"],
+                    parse_time(row["start"]),
+                    int(row.get("duration") or 30),
+                    row.get("department") or None,
+                )
+                for row in csv.DictReader(f)
+            )
+
+    def range(self, index, start, end, limit=None):
+        # Caller holds self.lock; appointments starting in [start, end)
+        first = bisect_left(index, (start,))
+        last = bisect_left(index, (end,)) if end is not None else len(index)
+        if limit is not None:
+            last = min(last, first + limit)
+        return [self.appointments[appointment_id] for _, appointment_id in index[first:last]]
+
+    def upcoming_for_patient(self, patient, now=None, limit=None):
+        with self.lock:
+            index = self.by_patient.get(key(patient), [])
+            return self.range(index, now or datetime.now(), None, limit)
+
+    def last_for_patient(self, patient, now=None):
+        """The patient's most recent appointment before `now`, or None"""
+        with self.lock:
+            index = self.by_patient.get(key(patient), [])
+            position = bisect_left(index, (now or datetime.now(),))
+            return self.appointments[index[position - 1][1]] if position else None
+
+    def doctor_day(self, doctor, day):
+        """A doctor's appointments on a date, in start order"""
+        start = datetime(day.year, day.month, day.day)
+        with self.lock:
+            index = self.by_doctor.get(key(doctor), [])
+            return self.range(index, start, start + timedelta(days=1))
+
+    def between(self, start, end, limit=None):
+        """All appointments starting in [start, end)"""
+        with self.lock:
+            return self.range(self.by_start, start, end, limit)
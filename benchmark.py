@@ -0,0 +1,800 @@
+# ============================================
+# Hospital Management System - Benchmarks
+# Throughput and consistency checks for the chatbot engine
+# ============================================
+
+import argparse
+import csv
+import http.client
+import json
+import os
+import random
+import re
+import sys
+import threading
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import footprint
+from appointments import AppointmentStore
+from scheduling import Scheduler, BookingConflict
+from pharmacy import PharmacyInventory
+from pricing import PriceCatalog
+from directory import PhysicianDirectory
+from stays import StayStatistics
+from patients import PatientIndex
+from triage import Acuity, TriageQueue, assess
+from census import BedCensus
+from eligibility import EligibilityClient
+from mock_payer import MockPayerServer
+from HMS import HospitalChatbot
+from templates import ResponseTemplate
+from regex_utils import generate_examples
+
+# Memory one chatbot instance may retain before `benchmark.py memory` fails
+MEMORY_BUDGET_KIB = 6144
+
+
+def sample_queries(chatbot, per_pattern=3):
+    """Example utterances for every pattern plus a few misspelled and unmatched queries"""
+    queries = []
+    for entry in chatbot.compiled_patterns:
+        queries.extend(generate_examples(entry.pattern.pattern, re.IGNORECASE)[:per_pattern])
+    queries.extend([
+        "wher is the farmacy",
+        "how much dose an apointment cost",
+        "can i get my labwork results",
+        "can I book an appointment with Dr. Jones",
+        "the weather is nice today",
+    ])
+    return queries
+
+
+def answer_all(chatbot, queries, live=frozenset()):
+    """Answer each query; returns ([(category, response)], [(query, error)]).
+
+    Catch-all responses are random, and so are answers to the queries whose
+    indexes are in `live` for the test (they depend on live state such as the
+    ER queue), so only their category is kept. A query that raises is a
+    failure, not an answer: its result is None and the exception is reported
+    with it.
+    """
+    results = []
+    failures = []
+    for i, query in enumerate(queries):
+        try:
+            response, category = chatbot.answer_query(query, "John Doe")
+        except Exception as e:
+            results.append(None)
+            failures.append((query, f"{type(e).__name__}: {e}"))
+            continue
+        results.append((category, response if category is not None and i not in live else None))
+    return results, failures
+
+
+def run_threads(chatbot, queries, expected, live, count, rounds, reload=False):
+    """Run `count` threads over the queries; returns (queries per second, mismatched answers, failures)"""
+    mismatches = []
+    failures = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(rounds):
+            results, errors = answer_all(chatbot, queries, live)
+            with lock:
+                failures.extend(errors)
+                if results != expected:
+                    mismatches.append(sum(a != b for a, b in zip(results, expected) if a is not None))
+
+    workers = [threading.Thread(target=worker) for _ in range(count)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    if reload:
+        # Publish new snapshots while the readers are running
+        while any(thread.is_alive() for thread in workers):
+            chatbot.reload()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return count * rounds * len(queries) / elapsed, sum(mismatches), failures
+
+
+def stress_status(mismatches, failures):
+    problems = []
+    if mismatches:
+        problems.append(f"{mismatches} mismatched answers")
+    if failures:
+        problems.append(f"{len(failures)} failed queries, e.g. {failures[0][0]!r}: {failures[0][1]}")
+    return ", ".join(problems) or "ok"
+
+
+def run_stress(threads=(1, 2, 4, 8), rounds=3):
+    """Answer the same queries from N threads sharing one chatbot.
+
+    Every thread must produce exactly the single-threaded results (the same
+    intent, for answers that depend on live state), including
+    while the matcher is being reloaded, so readers never see a half-built
+    snapshot. A query that raises is a failure. Returns True if all results
+    were identical and no query failed.
+    """
+    chatbot = HospitalChatbot()
+    queries = sample_queries(chatbot)
+    first, failures = answer_all(chatbot, queries)
+    expected, more_failures = answer_all(chatbot, queries)
+    failures += [failure for failure in more_failures if failure not in failures]
+    if failures:
+        print(f"{len(failures)} queries fail single-threaded:")
+        for query, error in failures:
+            print(f"  {query!r}: {error}")
+        return False
+    # Answers that depend on live state (ER wait times change as the sample queries check
+    # patients in) differ from one pass to the next; for those only the intent must match
+    live = frozenset(i for i, (a, b) in enumerate(zip(first, expected)) if a != b)
+    expected = [(category, None) if i in live else (category, response)
+                for i, (category, response) in enumerate(expected)]
+    gil = "enabled" if getattr(sys, "_is_gil_enabled", lambda: True)() else "disabled"
+    print(f"{len(queries)} queries ({len(live)} live-state queries compared by intent), "
+          f"{len(chatbot.compiled_patterns)} patterns, GIL {gil}")
+    print(f"{'threads':>8} {'queries/s':>12} {'speedup':>8}  result")
+
+    consistent = True
+    baseline = None
+    for count in threads:
+        rate, mismatches, failures = run_threads(chatbot, queries, expected, live, count, rounds)
+        baseline = baseline or rate
+        consistent = consistent and not mismatches and not failures
+        print(f"{count:>8} {rate:>12,.0f} {rate / baseline:>7.2f}x  {stress_status(mismatches, failures)}")
+
+    rate, mismatches, failures = run_threads(chatbot, queries, expected, live, max(threads), rounds, reload=True)
+    consistent = consistent and not mismatches and not failures
+    print(f"{max(threads):>8} threads with concurrent reloads: {stress_status(mismatches, failures)}")
+
+    return consistent
+
+
+def measure_rendering(rounds=200):
+    """Time rendering of template responses for the sample queries, by template form"""
+    chatbot = HospitalChatbot()
+    renders = {"constant": [], "slot-fill": []}
+    for query in sample_queries(chatbot):
+        corrected_query, rewritten_spans = chatbot.normalize_query(query)
+        index, match, matched_query = chatbot.match_query(corrected_query)
+        if index is None:
+            continue
+        response = chatbot.compiled_patterns[index].response
+        if isinstance(response, ResponseTemplate):
+            renders["constant" if response.text is not None else "slot-fill"].append((response, match))
+
+    print(f"{'template':<10} {'count':>6} {'renders/s':>14} {'ns/render':>10}")
+    for form, items in renders.items():
+        if not items:
+            continue
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for response, match in items:
+                response(match, None)
+        elapsed = time.perf_counter() - start
+        count = rounds * len(items)
+        print(f"{form:<10} {len(items):>6} {count / elapsed:>14,.0f} {elapsed / count * 1e9:>10,.0f}")
+
+
+def write_schedule(path, count, patients=50000, doctors=500, days=365, seed=1):
+    """Write a random schedule CSV with `count` appointments"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 8, 0)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["patient", "doctor", "start", "duration", "department"])
+        for _ in range(count):
+            slot = start + timedelta(days=rng.randrange(days), minutes=30 * rng.randrange(18))
+            writer.writerow([
+                f"Patient {rng.randrange(patients)}", f"Dr. Doctor{rng.randrange(doctors)}",
+                slot.strftime("%Y-%m-%d %H:%M"), 30, "General Medicine",
+            ])
+
+
+def measure_appointments(count=300000, queries=10000):
+    """Time a bulk import of `count` appointments and patient/doctor range queries"""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_schedule(path, count)
+        store = AppointmentStore()
+        start = time.perf_counter()
+        store.import_csv(path)
+        elapsed = time.perf_counter() - start
+    finally:
+        os.remove(path)
+    print(f"{'import':<22} {len(store):>9,} appointments in {elapsed:.2f}s ({len(store) / elapsed:,.0f}/s)")
+
+    rng = random.Random(2)
+    now = datetime(2025, 7, 1)
+    cases = [
+        ("upcoming for patient", lambda: store.upcoming_for_patient(f"Patient {rng.randrange(50000)}", now, limit=5)),
+        ("doctor's day", lambda: store.doctor_day(f"Dr. Doctor{rng.randrange(500)}", now + timedelta(days=rng.randrange(180)))),
+        ("one hour, all doctors", lambda: store.between(now + timedelta(hours=9), now + timedelta(hours=10))),
+    ]
+    for name, query in cases:
+        start = time.perf_counter()
+        for _ in range(queries):
+            query()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {elapsed / queries * 1e6:>9,.1f} us/query")
+
+
+def measure_slots(doctors=2000, specialties=20, days=90, occupancy=0.6, queries=2000, threads=8):
+    """Time free-slot queries and concurrent optimistic booking over `days` of doctor calendars"""
+    rng = random.Random(3)
+    scheduler = Scheduler()
+    for i in range(doctors):
+        scheduler.add_doctor(f"Dr. Doctor{i}", f"specialty{i % specialties}")
+
+    # Pre-book a share of every doctor's working slots
+    now = datetime(2025, 1, 6, 8, 0)
+    start = time.perf_counter()
+    booked = 0
+    for calendar in scheduler.calendars.values():
+        for offset in range(days):
+            day = now + timedelta(days=offset)
+            if day.weekday() >= 5:
+                continue
+            for slot in range(scheduler.slots_per_day):
+                if rng.random() < occupancy:
+                    scheduler.book(calendar.name, day + timedelta(minutes=slot * scheduler.slot_minutes))
+                    booked += 1
+    elapsed = time.perf_counter() - start
+    print(f"{'pre-book':<26} {booked:>9,} slots for {doctors:,} doctors over {days} days in {elapsed:.2f}s")
+
+    cases = [
+        ("next 3 for a doctor", lambda: scheduler.next_free_slots(
+            doctor=f"Dr. Doctor{rng.randrange(doctors)}", after=now, count=3)),
+        ("next 3 (2h) for a doctor", lambda: scheduler.next_free_slots(
+            doctor=f"Dr. Doctor{rng.randrange(doctors)}", after=now, count=3, duration=120)),
+        ("next 3 for a specialty", lambda: scheduler.next_free_slots(
+            specialty=f"specialty{rng.randrange(specialties)}", after=now, count=3)),
+    ]
+    for name, query in cases:
+        start = time.perf_counter()
+        for _ in range(queries):
+            query()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<26} {elapsed / queries * 1e6:>9,.1f} us/query")
+
+    # Many patients race for the same specialty's next slots; each retries on conflicts
+    specialty = "specialty0"
+    results = []
+
+    def patient(count=20):
+        made = retries = 0
+        while made < count:
+            slot = scheduler.next_free_slots(specialty=specialty, after=now, count=1)[0]
+            try:
+                scheduler.book(slot.doctor, slot.start, expected_version=slot.version)
+                made += 1
+            except BookingConflict:
+                retries += 1
+        results.append((made, retries))
+
+    workers = [threading.Thread(target=patient) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    made = sum(made for made, retries in results)
+    retries = sum(retries for made, retries in results)
+    print(f"{'concurrent booking':<26} {made:>9,} bookings by {threads} threads in {elapsed:.2f}s, {retries} retries")
+
+
+def write_catalog(path, skus, generics=6000, conditions=800, seed=4):
+    """Write a random pharmacy catalog CSV with `skus` rows"""
+    rng = random.Random(seed)
+    syllables = ["ab", "ce", "dro", "fen", "gli", "lo", "max", "nol", "pra", "qui", "ri", "sta", "tin", "vo", "xa", "zol"]
+    names = list({"".join(rng.choice(syllables) for _ in range(rng.randint(3, 5))) for _ in range(generics)})
+    condition_names = [f"condition {rng.choice(syllables)}{i}" for i in range(conditions)]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["sku", "generic", "brands", "strength", "form", "conditions", "quantity"])
+        for i in range(skus):
+            generic = names[i % len(names)]
+            writer.writerow([
+                f"RX{i:06d}", generic, generic[::-1].title(), f"{rng.choice([5, 10, 25, 50, 100])} mg", "tablet",
+                ";".join(rng.sample(condition_names, 2)), rng.randrange(200),
+            ])
+    return names, condition_names
+
+
+def measure_pharmacy(skus=30000, queries=2000):
+    """Time catalog loading and name and condition lookups"""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        names, conditions = write_catalog(path, skus)
+        start = time.perf_counter()
+        inventory = PharmacyInventory.load(path)
+        elapsed = time.perf_counter() - start
+    finally:
+        os.remove(path)
+    print(f"{'load':<22} {len(inventory):>9,} SKUs, {len(names):,} drugs in {elapsed:.2f}s")
+
+    rng = random.Random(5)
+
+    def misspell(name):
+        i = rng.randrange(len(name))
+        return name[:i] + name[i + 1:]
+
+    cases = [
+        ("exact name", lambda: inventory.find(rng.choice(names))),
+        ("brand name", lambda: inventory.find(rng.choice(names)[::-1])),
+        ("prefix", lambda: inventory.find(rng.choice(names)[:6])),
+        ("misspelled name", lambda: inventory.find(misspell(rng.choice(names)))),
+        ("name in a sentence", lambda: inventory.find_in(f"do you have {rng.choice(names)} in stock")),
+        ("condition", lambda: inventory.for_condition(rng.choice(conditions))),
+    ]
+    for name, query in cases:
+        start = time.perf_counter()
+        for _ in range(queries):
+            query()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {elapsed / queries * 1e6:>9,.1f} us/query")
+
+
+def write_chargemaster(path, items, seed=6):
+    """Write a random chargemaster CSV with `items` rows; returns the descriptions"""
+    rng = random.Random(seed)
+    words = ["panel", "scan", "culture", "repair", "biopsy", "screen", "level", "study", "injection", "removal",
+             "cardiac", "renal", "hepatic", "thyroid", "spinal", "pelvic", "cranial", "dermal", "lumbar", "vascular"]
+    descriptions = []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["code", "description", "type", "price", "synonyms", "preparation"])
+        for i in range(items):
+            description = f"{' '.join(rng.sample(words, 2))} {i}"
+            descriptions.append(description)
+            writer.writerow([
+                f"CM{i:06d}", description, rng.choice(["lab", "procedure"]), rng.randrange(20, 5000),
+                f"{description.split()[0]} test {i}", "No special preparation is needed.",
+            ])
+    return descriptions
+
+
+def measure_pricing(items=20000, queries=2000):
+    """Time chargemaster loading, uncached and cached price lookups"""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        descriptions = write_chargemaster(path, items)
+        start = time.perf_counter()
+        catalog = PriceCatalog.load(path, cache_size=queries // 4)
+        elapsed = time.perf_counter() - start
+    finally:
+        os.remove(path)
+    print(f"{'load':<22} {len(catalog):>9,} items in {elapsed:.2f}s")
+
+    rng = random.Random(7)
+    # A quarter as many distinct questions as lookups, so repeats hit the cache
+    sample = rng.sample(descriptions, queries // 4)
+    questions = [f"how much does a {description} cost" for description in sample]
+    misspelled = [f"how much does a {description[:2]}{description[3:]} cost" for description in sample]
+    cases = [
+        ("name (uncached)", lambda: catalog.search(rng.choice(questions))),
+        ("misspelled (uncached)", lambda: catalog.search(rng.choice(misspelled))),
+        ("name (cached)", lambda: catalog.find(rng.choice(questions))),
+    ]
+    for name, query in cases:
+        start = time.perf_counter()
+        for _ in range(queries):
+            query()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {elapsed / queries * 1e6:>9,.1f} us/query")
+    print(f"{'cache':<22} {catalog.find.cache_info()}")
+
+
+def write_specialties(path, specialties, conditions=40, seed=8):
+    """Write a random specialty CSV; returns the condition names"""
+    rng = random.Random(seed)
+    syllables = ["ar", "bro", "cal", "der", "epi", "fi", "gas", "hem", "ist", "lo", "mor", "neu", "os", "pla", "ren", "sis"]
+    condition_names = []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["specialty", "specialist", "conditions"])
+        for i in range(specialties):
+            names = [
+                f"{rng.choice(['acute', 'chronic', 'mild', 'severe', 'recurring'])} "
+                f"{''.join(rng.choice(syllables) for _ in range(3))}{i}x{j}"
+                for j in range(conditions)
+            ]
+            condition_names += names
+            writer.writerow([f"specialty {i}", f"specialist {i}", ";".join(names)])
+    return condition_names
+
+
+def measure_directory(physicians=3000, queries=5000):
+    """Time specialty recommendations and physician lookups at two directory sizes"""
+    rng = random.Random(9)
+    for size in (physicians // 10, physicians):
+        specialties = max(size // 25, 1)
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            conditions = write_specialties(path, specialties)
+            roster = [(f"Dr. Doctor{i}", f"specialty {rng.randrange(specialties)}", rng.random() < 0.8) for i in range(size)]
+            start = time.perf_counter()
+            directory = PhysicianDirectory.load(path, roster)
+            elapsed = time.perf_counter() - start
+        finally:
+            os.remove(path)
+        print(f"{size:,} physicians, {specialties:,} specialties, {len(conditions):,} conditions: loaded in {elapsed:.2f}s")
+
+        cases = [
+            ("condition", lambda: directory.recommend(rng.choice(conditions))),
+            ("symptom in a question", lambda: directory.recommend(f"I have {rng.choice(conditions).split()[1]} problems")),
+            ("unknown condition", lambda: directory.recommend("a completely unknown complaint")),
+            ("physicians", lambda: directory.doctors(f"specialty {rng.randrange(specialties)}", accepting_only=True)),
+        ]
+        for name, query in cases:
+            start = time.perf_counter()
+            for _ in range(queries):
+                query()
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<22} {elapsed / queries * 1e6:>9,.1f} us/query")
+
+
+def write_admissions(f, count, first_id=1, conditions=200, seed=10):
+    """Append `count` random discharge records to an open CSV file"""
+    rng = random.Random(seed + first_id)
+    writer = csv.writer(f, lineterminator="\n")
+    start = datetime(2024, 1, 1)
+    for i in range(first_id, first_id + count):
+        admitted = start + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))
+        discharged = admitted + timedelta(hours=rng.lognormvariate(4.3, 0.6))
+        writer.writerow([f"A{i:08d}", f"disorder{rng.randrange(conditions)}", f"{admitted:%Y-%m-%dT%H:%M}", f"{discharged:%Y-%m-%dT%H:%M}"])
+
+
+def measure_stays(records=200000, appended=2000, queries=20000):
+    """Time loading discharge records, length-of-stay lookups and incremental refreshes"""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.write("admission_id,condition,admitted,discharged\n")
+            write_admissions(f, records)
+        start = time.perf_counter()
+        stays = StayStatistics.load(path)
+        elapsed = time.perf_counter() - start
+        print(f"{'load':<22} {len(stays):>9,} stays, {len(stays.table):,} conditions in {elapsed:.2f}s")
+
+        rng = random.Random(11)
+        cases = [
+            ("condition", lambda: stays.find(f"disorder{rng.randrange(200)}")),
+            ("condition in a phrase", lambda: stays.find(f"a bad disorder{rng.randrange(200)} flare")),
+        ]
+        for name, query in cases:
+            start = time.perf_counter()
+            for _ in range(queries):
+                query()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<22} {elapsed / queries * 1e6:>9,.1f} us/query")
+
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            write_admissions(f, appended, first_id=records + 1)
+        start = time.perf_counter()
+        added = stays.refresh()
+        elapsed = time.perf_counter() - start
+        print(f"{'refresh':<22} {added:>9,} new stays in {elapsed * 1e3:.1f} ms")
+        start = time.perf_counter()
+        StayStatistics.load(path)
+        elapsed = time.perf_counter() - start
+        print(f"{'full reload':<22} {records + appended:>9,} stays in {elapsed * 1e3:.1f} ms")
+    finally:
+        os.remove(path)
+
+
+def measure_patients(count=300000, queries=2000):
+    """Time building the patient name indexes and exact, misspelled and DOB-narrowed lookups"""
+    rng = random.Random(12)
+    consonants, vowels = "bcdfghjklmnprstvwz", "aeiouy"
+
+    def random_name(syllables):
+        return "".join(rng.choice(consonants) + rng.choice(vowels) + rng.choice(["", "", "n", "r", "s", "l"])
+                       for _ in range(syllables)).title()
+
+    first_names = list({random_name(rng.randint(2, 3)) for _ in range(3000)})
+    last_names = list({random_name(rng.randint(2, 4)) for _ in range(30000)})
+    rows = [
+        (f"MRN{i:07d}", f"{rng.choice(first_names)} {rng.choice(last_names)}",
+         datetime(1930, 1, 1).date() + timedelta(days=rng.randrange(90 * 365)))
+        for i in range(count)
+    ]
+    index = PatientIndex(cache_size=queries // 4)
+    start = time.perf_counter()
+    for mrn, name, dob in rows:
+        index.add(mrn, name, dob)
+    elapsed = time.perf_counter() - start
+    print(f"{'index':<22} {len(index):>9,} patients in {elapsed:.2f}s")
+
+    def misspell(name):
+        i = rng.randrange(1, len(name) - 1)
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:] if name[i + 1] != " " else name[:i] + name[i + 1:]
+
+    def lookup(query):
+        start = time.perf_counter()
+        resolved = 0
+        for _ in range(queries):
+            resolved += query() is not None
+        return (time.perf_counter() - start) / queries, resolved / queries
+
+    def misspelled_with_dob():
+        mrn, name, dob = rng.choice(rows)
+        return index.resolve(misspell(name), dob)
+
+    def name_with_mrn():
+        mrn, name, dob = rng.choice(rows)
+        return index.resolve(name, mrn=mrn)
+
+    # Kiosk users retype the same few misspellings, so repeats hit the cache
+    typed = [misspell(rng.choice(rows)[1]) for _ in range(queries // 4)]
+    cases = [
+        ("exact name", lambda: index.resolve(rng.choice(rows)[1].upper())),
+        ("misspelled name", lambda: index.resolve(misspell(rng.choice(rows)[1]))),
+        ("misspelled name + DOB", misspelled_with_dob),
+        ("name + MRN", name_with_mrn),
+        ("cached name", lambda: index.find(rng.choice(typed))),
+    ]
+    for name, query in cases:
+        per_query, resolved = lookup(query)
+        print(f"{name:<22} {per_query * 1e3:>9,.2f} ms/query  {resolved:>6.1%} resolved")
+
+
+def measure_triage(patients=100000, operations=20000):
+    """Time acuity scoring and triage queue operations at two queue sizes"""
+    complaints = [
+        "chest pain and sweating", "my baby has a high fever", "sprained ankle, pain is 6/10", "bad cough",
+        "I took too many tylenol", "cut my hand and it won't stop bleeding", "no fever but a rash",
+    ]
+    start = time.perf_counter()
+    for i in range(operations):
+        assess(complaints[i % len(complaints)])
+    elapsed = time.perf_counter() - start
+    print(f"{'assess':<22} {elapsed / operations * 1e6:>9,.1f} us/complaint")
+
+    rng = random.Random(13)
+    for size in (patients // 100, patients):
+        queue = TriageQueue()
+        tickets = [queue.enqueue(f"patient {i}", Acuity(rng.randint(1, 5), [])).ticket for i in range(size)]
+
+        def timed(name, operation):
+            start = time.perf_counter()
+            for _ in range(operations):
+                operation()
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<20} {elapsed / operations * 1e6:>9,.1f} us/op")
+
+        print(f"{size:,} patients waiting")
+        timed("enqueue", lambda: tickets.append(queue.enqueue(None, Acuity(rng.randint(1, 5), [])).ticket))
+        timed("reprioritize", lambda: queue.reprioritize(rng.choice(tickets), rng.randint(1, 5)))
+        timed("position", lambda: queue.position(rng.choice(tickets)))
+        timed("estimated wait", lambda: queue.estimated_wait(rng.randint(1, 5)))
+        timed("pop", queue.pop)
+        # As many patients were seen as arrived
+        assert len(queue) == size
+
+
+def write_bed_events(f, count, units, inpatients, first_id, seed=14):
+    """Append `count` random admit, transfer and discharge events; `inpatients` tracks who is admitted"""
+    rng = random.Random(seed + first_id)
+    writer = csv.writer(f, lineterminator="\n")
+    start = datetime(2025, 1, 1)
+    capacity = len(units) * units[0][1]
+    for i in range(first_id, first_id + count):
+        when = f"{start + timedelta(minutes=i):%Y-%m-%dT%H:%M}"
+        draw = rng.random()
+        # Admissions outnumber discharges until the hospital is about 85% full
+        if not inpatients or (draw < 0.5 and len(inpatients) < 0.85 * capacity):
+            patient = f"E{i:08d}"
+            inpatients.append(patient)
+            writer.writerow([when, "admit", patient, rng.choice(units)[0], ""])
+        elif draw < 0.65:
+            writer.writerow([when, "transfer", rng.choice(inpatients), rng.choice(units)[0], ""])
+        else:
+            index = rng.randrange(len(inpatients))
+            inpatients[index], inpatients[-1] = inpatients[-1], inpatients[index]
+            writer.writerow([when, "discharge", inpatients.pop(), "", ""])
+
+
+def measure_census(events=500000, appended=5000, queries=200000, units=40, beds=50):
+    """Time replaying the bed event log, occupancy queries, checkpoints and restarts from a checkpoint"""
+    unit_rows = [(f"Unit {i}", beds) for i in range(units)]
+    directory = tempfile.mkdtemp()
+    units_path = os.path.join(directory, "units.csv")
+    events_path = os.path.join(directory, "bed_events.csv")
+    snapshot_path = os.path.join(directory, "census.json")
+    try:
+        with open(units_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["unit", "beds", "aliases", "visiting"])
+            writer.writerows([name, count, "", ""] for name, count in unit_rows)
+        inpatients = []
+        with open(events_path, "w", newline="", encoding="utf-8") as f:
+            f.write("time,event,patient,unit,bed\n")
+            write_bed_events(f, events, unit_rows, inpatients, first_id=1)
+
+        start = time.perf_counter()
+        census = BedCensus.load(units_path, events_path)
+        replay = time.perf_counter() - start
+        print(f"{'replay':<22} {census.applied + census.rejected:>9,} events in {replay:.2f}s "
+              f"({census.occupied:,}/{census.beds:,} beds occupied, {census.rejected:,} rejected)")
+
+        rng = random.Random(15)
+        names = [name for name, count in unit_rows]
+        cases = [
+            ("unit occupancy", lambda: census.occupancy(rng.choice(names))),
+            ("hospital occupancy", census.occupancy),
+            ("unit in a phrase", lambda: census.find_unit(f"beds free in {rng.choice(names).lower()} today")),
+        ]
+        for name, query in cases:
+            start = time.perf_counter()
+            for _ in range(queries):
+                query()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<22} {elapsed / queries * 1e6:>9,.2f} us/query")
+
+        start = time.perf_counter()
+        census.checkpoint(snapshot_path)
+        elapsed = time.perf_counter() - start
+        print(f"{'checkpoint':<22} {os.path.getsize(snapshot_path) / 1024:>9,.1f} KiB in {elapsed * 1e3:.1f} ms")
+
+        with open(events_path, "a", newline="", encoding="utf-8") as f:
+            write_bed_events(f, appended, unit_rows, inpatients, first_id=events + 1)
+        start = time.perf_counter()
+        added = census.refresh()
+        elapsed = time.perf_counter() - start
+        print(f"{'refresh':<22} {added:>9,} new events in {elapsed * 1e3:.1f} ms")
+
+        start = time.perf_counter()
+        restarted = BedCensus.load(units_path, events_path, snapshot_path)
+        elapsed = time.perf_counter() - start
+        assert restarted.locations == census.locations
+        print(f"{'restart from checkpoint':<22} {appended:>9,} events replayed in {elapsed * 1e3:.1f} ms "
+              f"(full replay {replay * 1e3:,.0f} ms)")
+    finally:
+        for path in (units_path, events_path, snapshot_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(directory)
+
+
+def measure_eligibility(checks=2000, threads=16, latency=0.05, members=500):
+    """Time eligibility checks against the mock payer service: one request per check on a new
+    connection, then the pooled client with its cache, coalescing and batching"""
+    server = MockPayerServer(latency=latency).start()
+    rng = random.Random(16)
+    # A few members are checked over and over (patients in the waiting room), most only now and then
+    weights = [1 / (rank + 1) for rank in range(members)]
+    keys = [("Aetna", f"W{rng.choices(range(members), weights)[0]:09d}") for _ in range(checks)]
+
+    def direct(payer, member_id):
+        connection = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+        try:
+            body = json.dumps({"checks": [{"payer": payer, "member_id": member_id}]})
+            connection.request("POST", "/eligibility", body, {"Content-Type": "application/json"})
+            return json.loads(connection.getresponse().read())["results"][0]
+        finally:
+            connection.close()
+
+    def run(name, check):
+        before = server.requests
+        chunks = [keys[i::threads] for i in range(threads)]
+        workers = [threading.Thread(target=lambda chunk=chunk: [check(*key) for key in chunk]) for chunk in chunks]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {checks / elapsed:>9,.0f} checks/s  {server.requests - before:>6,} service requests")
+
+    try:
+        print(f"{checks:,} checks of {members:,} members from {threads} threads, {latency * 1e3:.0f} ms service latency")
+        run("one request per check", direct)
+        client = EligibilityClient(server.url, pool_size=threads)
+        run("pooled client", client.check)
+        print(f"{'':<22} {client.hits:>9,} cache hits, {client.coalesced:,} coalesced")
+        run("pooled client (warm)", client.check)
+
+        start = time.perf_counter()
+        for key in keys:
+            client.check(*key)
+        elapsed = time.perf_counter() - start
+        print(f"{'cached check':<22} {elapsed / checks * 1e6:>9,.1f} us/check")
+        client.close()
+    finally:
+        server.stop()
+
+
+def measure_memory(budget_kib=MEMORY_BUDGET_KIB):
+    """Print the footprint of one HospitalChatbot; returns False if it exceeds the budget"""
+    chatbot, report = footprint.measure(HospitalChatbot)
+    print(report.report())
+
+    total_kib = report.total / 1024
+    if budget_kib and total_kib > budget_kib:
+        print(f"\nFAIL: {total_kib:,.1f} KiB is over the budget of {budget_kib:,} KiB")
+        return False
+    if budget_kib:
+        print(f"\nOK: {total_kib:,.1f} KiB of {budget_kib:,} KiB budget")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hospital chatbot benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    stress = subparsers.add_parser("stress", help="Check that threads sharing one chatbot get identical results")
+    stress.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8], help="Thread counts to run")
+    stress.add_argument("--rounds", type=int, default=3, help="Passes over the queries per thread")
+
+    render = subparsers.add_parser("render", help="Measure response rendering throughput")
+    render.add_argument("--rounds", type=int, default=200, help="Passes over the sample responses")
+    appointments = subparsers.add_parser("appointments", help="Measure appointment import and range queries")
+    appointments.add_argument("--count", type=int, default=300000, help="Appointments to import")
+    slots = subparsers.add_parser("slots", help="Measure free-slot queries and concurrent booking")
+    slots.add_argument("--doctors", type=int, default=2000, help="Doctors to schedule")
+    slots.add_argument("--days", type=int, default=90, help="Booking horizon in days")
+    pharmacy = subparsers.add_parser("pharmacy", help="Measure pharmacy catalog lookups")
+    pharmacy.add_argument("--skus", type=int, default=30000, help="Catalog size")
+    pricing = subparsers.add_parser("pricing", help="Measure chargemaster price lookups")
+    pricing.add_argument("--items", type=int, default=20000, help="Chargemaster size")
+    directory = subparsers.add_parser("directory", help="Measure specialty recommendations and physician lookups")
+    directory.add_argument("--physicians", type=int, default=3000, help="Physicians in the larger directory")
+    stays = subparsers.add_parser("stays", help="Measure length-of-stay statistics loading, lookups and refreshes")
+    stays.add_argument("--records", type=int, default=200000, help="Discharge records to load")
+    patients = subparsers.add_parser("patients", help="Measure fuzzy patient name lookups")
+    patients.add_argument("--count", type=int, default=300000, help="Patients to index")
+    triage = subparsers.add_parser("triage", help="Measure acuity scoring and triage queue operations")
+    triage.add_argument("--patients", type=int, default=100000, help="Patients waiting in the larger queue")
+    census = subparsers.add_parser("census", help="Measure bed event replay, occupancy queries and checkpoints")
+    census.add_argument("--events", type=int, default=500000, help="Bed events in the log")
+    eligibility = subparsers.add_parser("eligibility", help="Measure insurance eligibility checks against the mock payer")
+    eligibility.add_argument("--checks", type=int, default=2000, help="Eligibility checks to make")
+    eligibility.add_argument("--threads", type=int, default=16, help="Threads making checks")
+    eligibility.add_argument("--latency", type=float, default=0.05, help="Seconds the mock payer takes per request")
+    memory = subparsers.add_parser("memory", help="Report the memory retained by one chatbot instance")
+    memory.add_argument("--budget", type=int, default=MEMORY_BUDGET_KIB,
+                        help="Fail if the footprint exceeds this many KiB (0 disables the check)")
+
+    args = parser.parse_args()
+    if args.command == "stress":
+        sys.exit(0 if run_stress(args.threads, args.rounds) else 1)
+    elif args.command == "render":
+        measure_rendering(args.rounds)
+    elif args.command == "appointments":
+        measure_appointments(args.count)
+    elif args.command == "slots":
+        measure_slots(args.doctors, days=args.days)
+    elif args.command == "pharmacy":
+        measure_pharmacy(args.skus)
+    elif args.command == "pricing":
+        measure_pricing(args.items)
+    elif args.command == "directory":
+        measure_directory(args.physicians)
+    elif args.command == "stays":
+        measure_stays(args.records)
+    elif args.command == "patients":
+        measure_patients(args.count)
+    elif args.command == "triage":
+        measure_triage(args.patients)
+    elif args.command == "census":
+        measure_census(args.events)
+    elif args.command == "eligibility":
+        measure_eligibility(args.checks, args.threads, args.latency)
+    elif args.command == "memory":
+        sys.exit(0 if measure_memory(args.budget) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+# ============================================
+# Hospital Management System - Bed Census
+# Live bed occupancy per unit from admit, transfer and discharge events
+# ============================================
+
+import csv
+import io
+import json
+import os
+import re
+import threading
+from collections import namedtuple
+
+from nlp_utils import alternation
+
+Occupancy = namedtuple("Occupancy", "unit beds occupied available")
+
+NAME_RE = re.compile(r"[a-z0-9&]+")
+
+SNAPSHOT_VERSION = 1
+# Bytes of the event log before the snapshot offset kept to recognize the same log on restore
+SNAPSHOT_TAIL = 64
+
+
+def normalize(name):
+    # "children's ward" and "childrens ward" are the same unit
+    return " ".join(NAME_RE.findall(name.lower().replace("'", "")))
+
+
+class Unit:
+    """One inpatient unit: a bitset of its occupied beds and who is in them"""
+
+    __slots__ = ("name", "beds", "visiting", "mask", "occupied", "occupants")
+
+    def __init__(self, name, beds, visiting=""):
+        self.name = name
+        self.beds = beds
+        self.visiting = visiting
+        self.mask = 0                # bit b set while bed b + 1 is occupied
+        self.occupied = 0            # number of set bits in mask
+        self.occupants = {}          # bed number -> patient
+
+    def free_bed(self):
+        """Lowest free bed number, or None if the unit is full"""
+        free = ~self.mask & ((1 << self.beds) - 1)
+        return (free & -free).bit_length() or None
+
+    def take(self, bed, patient):
+        self.mask |= 1 << (bed - 1)
+        self.occupied += 1
+        self.occupants[bed] = patient
+
+    def release(self, bed):
+        self.mask &= ~(1 << (bed - 1))
+        self.occupied -= 1
+        del self.occupants[bed]
+
+
+class BedCensus:
+    """Beds occupied and available per unit, kept current from an event log.
+
+    Each unit has a bitset of occupied beds and a running count, and the
+    hospital keeps a total, so occupancy and availability questions are
+    O(1) and an admission finds the lowest free bed with a few integer
+    operations. A map from patient to (unit, bed) makes transfers and
+    discharges O(1).
+
+    Events are lines of an append-only CSV (time, event, patient, unit,
+    bed), where event is admit, transfer or discharge and an empty bed means
+    any free bed. refresh() reads the lines appended since the last read,
+    as StayStatistics does. Events that cannot be parsed or do not fit the
+    census (a full unit, an occupied bed, an unknown patient) are counted in
+    `rejected` and skipped.
+
+    checkpoint() saves the occupied beds with the log offset they reflect;
+    load() restores the newest checkpoint and replays only the events after
+    it. A checkpoint whose log was truncated or replaced is ignored.
+    """
+
+    def __init__(self, units, events_path=None):
+        self.units = {}                  # unit name -> Unit
+        self.aliases = {}                # normalized alias -> unit name
+        self.locations = {}              # patient -> (unit name, bed)
+        self.beds = 0
+        self.occupied = 0
+        self.applied = 0
+        self.rejected = 0
+        self.events_path = events_path
+        self.offset = 0                  # bytes of the event log read so far
+        self.fields = None               # header of the event log
+        self.lock = threading.Lock()
+        for name, beds, aliases, visiting in units:
+            self.units[name] = Unit(name, beds, visiting)
+            self.beds += beds
+            for alias in [name, *aliases]:
+                self.aliases[normalize(alias)] = name
+        self.alias_re = re.compile(r"\b(?:" + alternation(self.aliases) + r")\b")
+
+    def __len__(self):
+        return self.occupied
+
+    @classmethod
+    def load(cls, units_path, events_path=None, snapshot_path=None):
+        """Load units from a CSV (unit, beds, aliases separated by ';', visiting), then the latest
+        checkpoint in snapshot_path if any, then the events logged after it"""
+        with open(units_path, newline="", encoding="utf-8") as f:
+            units = [
+                (row["unit"], int(row["beds"]), [alias for alias in row["aliases"].split(";") if alias.strip()],
+                 row.get("visiting", ""))
+                for row in csv.DictReader(f)
+            ]
+        census = cls(units, events_path)
+        if snapshot_path and os.path.exists(snapshot_path):
+            census.restore(snapshot_path)
+        if events_path:
+            census.refresh()
+        return census
+
+    def refresh(self):
+        """Apply events appended to the log since the last read; returns the number read"""
+        with self.lock:
+            with open(self.events_path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+            # An event still being written has no newline yet; leave it for the next refresh
+            end = data.rfind(b"\n") + 1
+            if not end:
+                return 0
+            rows = csv.reader(io.StringIO(data[:end].decode("utf-8", errors="replace")))
+            fields = self.fields
+            if fields is None:
+                fields = {name.strip(): index for index, name in enumerate(next(rows))}
+                missing = {"event", "patient", "unit", "bed"} - fields.keys()
+                if missing:
+                    raise ValueError(f"{self.events_path} has no {', '.join(sorted(missing))} column")
+
+            # Parse every event before changing anything, so a failure leaves the offset where it was
+            event_field = fields["event"]
+            patient_field = fields["patient"]
+            unit_field = fields["unit"]
+            bed_field = fields["bed"]
+            events = []
+            rejected = 0
+            for row in rows:
+                if not row:
+                    continue
+                try:
+                    bed = row[bed_field]
+                    events.append((row[event_field], row[patient_field], row[unit_field], int(bed) if bed else None))
+                except (IndexError, ValueError):
+                    rejected += 1
+
+            self.fields = fields
+            self.offset += end
+            self.rejected += rejected
+            for event in events:
+                self.apply(*event)
+            return len(events) + rejected
+
+    def apply(self, kind, patient, unit, bed=None):
+        # Caller holds self.lock; returns whether the event was applied
+        unit = self.units.get(unit)
+        location = self.locations.get(patient)
+
+        if kind == "discharge" and location is not None:
+            self.units[location[0]].release(location[1])
+            del self.locations[patient]
+            self.occupied -= 1
+        elif kind in ("admit", "transfer") and unit is not None and (location is None) == (kind == "admit"):
+            if bed is None:
+                bed = unit.free_bed()
+            if bed is None or not 1 <= bed <= unit.beds or bed in unit.occupants:
+                self.rejected += 1
+                return False
+            if location is not None:
+                self.units[location[0]].release(location[1])
+            else:
+                self.occupied += 1
+            unit.take(bed, patient)
+            self.locations[patient] = (unit.name, bed)
+        else:
+            self.rejected += 1
+            return False
+        self.applied += 1
+        return True
+
+    def find_unit(self, text):
+        """Name of the unit mentioned in free text ("beds in the intensive care unit"), or None"""
+        match = self.alias_re.search(normalize(text))
+        return self.aliases[match.group(0)] if match else None
+
+    def occupancy(self, unit=None):
+        """Occupancy of a unit, or of the whole hospital without one; None for an unknown unit"""
+        if unit is None:
+            occupied = self.occupied
+            return Occupancy(None, self.beds, occupied, self.beds - occupied)
+        unit = self.units.get(unit)
+        if unit is None:
+            return None
+        occupied = unit.occupied
+        return Occupancy(unit.name, unit.beds, occupied, unit.beds - occupied)
+
+    def location(self, patient):
+        """(unit, bed) of an admitted patient, or None"""
+        return self.locations.get(patient)
+
+    def checkpoint(self, path):
+        """Write the occupied beds and the log offset they reflect; the file is replaced atomically"""
+        with self.lock:
+            tail = b""
+            if self.events_path and self.offset:
+                with open(self.events_path, "rb") as f:
+                    f.seek(max(self.offset - SNAPSHOT_TAIL, 0))
+                    tail = f.read(min(self.offset, SNAPSHOT_TAIL))
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "offset": self.offset,
+                "fields": self.fields,
+                "tail": tail.decode("latin-1"),
+                "applied": self.applied,
+                "rejected": self.rejected,
+                "beds": {name: unit.beds for name, unit in self.units.items()},
+                "occupants": {name: unit.occupants for name, unit in self.units.items() if unit.occupants},
+            }
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(temporary, path)
+
+    def restore(self, path):
+        """Load a checkpoint written by checkpoint(); returns False (and keeps the census empty) if it
+        does not match the units or the event log"""
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return False
+        if snapshot["beds"] != {name: unit.beds for name, unit in self.units.items()}:
+            return False
+        offset = snapshot["offset"]
+        if self.events_path:
+            tail = snapshot["tail"].encode("latin-1")
+            with open(self.events_path, "rb") as f:
+                f.seek(max(offset - len(tail), 0))
+                # A truncated or rewritten log no longer has the same bytes before the offset
+                if f.read(len(tail)) != tail or os.fstat(f.fileno()).st_size < offset:
+                    return False
+
+        with self.lock:
+            for name, occupants in snapshot["occupants"].items():
+                unit = self.units[name]
+                for bed, patient in occupants.items():
+                    unit.take(int(bed), patient)
+                    self.locations[patient] = (name, int(bed))
+            self.occupied = len(self.locations)
+            self.offset = offset
+            self.fields = snapshot["fields"]
+            self.applied = snapshot["applied"]
+            self.rejected = snapshot["rejected"]
+        return True
@@ -0,0 +1,116 @@
+# ============================================
+# Hospital Management System - Chat History
+# Bounded in-memory history with on-disk spillover
+# ============================================
+
+import os
+import sqlite3
+import tempfile
+from collections import deque
+from datetime import datetime
+
+
+class ChatHistory:
+    """Chat history that keeps the last `max_messages` in memory.
+
+    Older messages are spilled to a small SQLite file and can be paged
+    back in by absolute index, so memory stays constant for the whole
+    session no matter how many messages are exchanged.
+    """
+
+    def __init__(self, max_messages=200, path=None):
+        self.max_messages = max_messages
+        self.recent = deque()
+        self.spilled = 0  # Number of messages stored on disk (indices 0..spilled-1)
+        self.path = path
+        self.owns_file = path is None
+        self.db = None
+
+    def __len__(self):
+        return self.spilled + len(self.recent)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        """Iterate over the in-memory (most recent) messages"""
+        return iter(self.recent)
+
+    def append(self, text, is_user, timestamp=None):
+        """Add a message, spilling the oldest in-memory message if needed"""
+        record = {
+            "text": text,
+            "is_user": is_user,
+            "time": timestamp or datetime.now().strftime("%I:%M %p")
+        }
+        self.recent.append(record)
+
+        if len(self.recent) > self.max_messages:
+            self.spill(self.recent.popleft())
+
+        return len(self) - 1
+
+    def spill(self, record):
+        """Write one message to the on-disk store"""
+        db = self.open_db()
+        db.execute(
+            "INSERT INTO messages (id, text, is_user, time) VALUES (?, ?, ?, ?)",
+            (self.spilled, record["text"], int(record["is_user"]), record["time"])
+        )
+        db.commit()
+        self.spilled += 1
+
+    def open_db(self):
+        if self.db is None:
+            if self.path is None:
+                fd, self.path = tempfile.mkstemp(prefix="hms_chat_", suffix=".sqlite")
+                os.close(fd)
+            self.db = sqlite3.connect(self.path)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS messages "
+                "(id INTEGER PRIMARY KEY, text TEXT, is_user INTEGER, time TEXT)"
+            )
+        return self.db
+
+    def get_range(self, start, end):
+        """Return messages with absolute indices in [start, end)"""
+        start = max(start, 0)
+        end = min(end, len(self))
+        if start >= end:
+            return []
+
+        messages = []
+
+        # Part stored on disk
+        if start < self.spilled:
+            rows = self.db.execute(
+                "SELECT text, is_user, time FROM messages WHERE id >= ? AND id < ? ORDER BY id",
+                (start, min(end, self.spilled))
+            )
+            messages.extend({"text": text, "is_user": bool(is_user), "time": time} for text, is_user, time in rows)
+
+        # Part still in memory
+        for i in range(max(start, self.spilled), end):
+            messages.append(self.recent[i - self.spilled])
+
+        return messages
+
+    def page_before(self, index, count):
+        """Return up to `count` messages immediately older than `index`"""
+        return self.get_range(index - count, index)
+
+    def clear(self):
+        self.recent.clear()
+        if self.db is not None:
+            self.db.execute("DELETE FROM messages")
+            self.db.commit()
+        self.spilled = 0
+
+    def close(self):
+        """Close the store and remove the spill file if we created it"""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+        if self.owns_file and self.path and os.path.exists(self.path):
+            os.remove(self.path)
+            self.path = None
@@ -0,0 +1,163 @@
+# ============================================
+# Hospital Management System - Physician Directory
+# Physicians by specialty and specialties by condition or symptom
+# ============================================
+
+import csv
+import math
+import re
+from collections import defaultdict, namedtuple
+
+from nlp_utils import STOP_WORDS
+
+Physician = namedtuple("Physician", "name specialty accepting_new")
+Recommendation = namedtuple("Recommendation", "specialty specialist score term")
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Words people add around a condition that say nothing about it
+FILLER_WORDS = STOP_WORDS | frozenset(["problem", "problems", "issue", "issues", "specialist", "doctor", "doctors", "see"])
+
+
+def words(text):
+    """Content words of free text, with a plural 's' stripped ("migraines" -> "migraine")"""
+    result = []
+    for word in WORD_RE.findall(text.lower()):
+        if word in FILLER_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        result.append(word)
+    return result
+
+
+def article(specialist):
+    """ "a" or "an" for a specialist's title"""
+    # "a urologist", "an oncologist"
+    return "an" if specialist[:1].lower() in "aeio" else "a"
+
+
+class PhysicianDirectory:
+    """Physicians indexed by specialty, and specialties by condition.
+
+    Each specialty has a list of condition and symptom terms ("chest pain",
+    "migraine"). An inverted index maps every word of a term to the terms
+    containing it, so a question only scores the terms it shares a word
+    with. Words found in many terms ("chronic", "pain") do not walk their
+    posting lists: they only add to terms found through a rarer word, or
+    to the few terms made of common words alone, which have an index of
+    their own. The work then depends on the question, not on the size of
+    the directory. A term's score is the IDF-weighted share of its words
+    the question contains; each specialty keeps its best term. Physicians
+    are kept per specialty, sorted by name.
+    """
+
+    # Posting lists longer than this are not walked during a lookup
+    COMMON_TERMS = 32
+
+    def __init__(self):
+        self.specialists = {}                # specialty -> what its physicians are called
+        self.terms = []                      # (words, specialty, text)
+        self.word_index = defaultdict(list)  # word -> term ids
+        self.idf = {}
+        self.term_weights = []               # term id -> sum of its words' IDF
+        self.common_words = frozenset()      # words in more than COMMON_TERMS terms
+        self.common_index = {}               # common word -> ids of terms with only common words
+        self.physicians = {}                 # physician name -> Physician
+        self.by_specialty = defaultdict(list)  # specialty -> [Physician] sorted by name
+
+    def __len__(self):
+        return len(self.physicians)
+
+    @classmethod
+    def load(cls, path, physicians=()):
+        """Load a CSV with columns specialty, specialist, conditions (';'-separated)"""
+        directory = cls()
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                directory.add_specialty(
+                    row["specialty"], row["specialist"],
+                    [condition for condition in row["conditions"].split(";") if condition.strip()],
+                )
+        for physician in physicians:
+            directory.add_physician(*physician)
+        directory.build_indexes()
+        return directory
+
+    def add_specialty(self, specialty, specialist, conditions=()):
+        """Add a specialty; call build_indexes() after adding"""
+        specialty = specialty.lower()
+        self.specialists[specialty] = specialist
+        # A specialty and its physicians' title name it as well as its conditions do
+        for text in [specialty, specialist, *conditions]:
+            term_words = tuple(dict.fromkeys(words(text)))
+            if term_words:
+                self.terms.append((term_words, specialty, text.strip()))
+
+    def add_physician(self, name, specialty, accepting_new=True):
+        physician = Physician(name, specialty.lower(), accepting_new)
+        self.physicians[name] = physician
+        self.by_specialty[physician.specialty].append(physician)
+
+    def build_indexes(self):
+        self.word_index = defaultdict(list)
+        for term_id, (term_words, specialty, text) in enumerate(self.terms):
+            for word in term_words:
+                self.word_index[word].append(term_id)
+        self.idf = {word: math.log(1 + len(self.terms) / len(term_ids)) for word, term_ids in self.word_index.items()}
+        self.term_weights = [sum(self.idf[word] for word in term_words) for term_words, specialty, text in self.terms]
+        self.common_words = frozenset(
+            word for word, term_ids in self.word_index.items() if len(term_ids) > self.COMMON_TERMS
+        )
+        common_index = defaultdict(list)
+        for term_id, (term_words, specialty, text) in enumerate(self.terms):
+            if self.common_words.issuperset(term_words):
+                for word in term_words:
+                    common_index[word].append(term_id)
+        self.common_index = dict(common_index)
+        for physicians in self.by_specialty.values():
+            physicians.sort()
+
+    def recommend(self, text, limit=3, min_score=0.5):
+        """Recommendations for a condition or symptom in free text, best first"""
+        query = set(words(text))
+        common = query & self.common_words
+        matched = defaultdict(float)
+        for word in query - common:
+            for term_id in self.word_index.get(word, ()):
+                matched[term_id] += self.idf[word]
+        if common:
+            # Terms found through a rare word, plus terms of common words only
+            for term_id in matched:
+                matched[term_id] += sum(self.idf[word] for word in common.intersection(self.terms[term_id][0]))
+            for word in common:
+                for term_id in self.common_index.get(word, ()):
+                    matched[term_id] += self.idf[word]
+
+        best = {}  # specialty -> (score, weight, term id) of its best term
+        for term_id, weight in matched.items():
+            specialty = self.terms[term_id][1]
+            score = weight / self.term_weights[term_id]
+            # Ties go to the term that explains more of the question ("kidney stones" over "kidney")
+            if score >= min_score and (specialty not in best or (score, weight) > best[specialty][:2]):
+                best[specialty] = (score, weight, term_id)
+        # Equally good specialties rank the ones with physicians here first
+        ranked = sorted(
+            best.items(), key=lambda item: (-item[1][0], -item[1][1], item[0] not in self.by_specialty, item[0])
+        )[:limit]
+        return [
+            Recommendation(specialty, self.specialists.get(specialty, specialty), score, self.terms[term_id][2])
+            for specialty, (score, weight, term_id) in ranked
+        ]
+
+    def specialty(self, text):
+        """The specialty a question names or implies, or None"""
+        recommendations = self.recommend(text, limit=1)
+        return recommendations[0].specialty if recommendations else None
+
+    def doctors(self, specialty, accepting_only=False):
+        """Physicians of a specialty sorted by name"""
+        physicians = self.by_specialty.get(specialty, [])
+        if accepting_only:
+            return [physician for physician in physicians if physician.accepting_new]
+        return list(physicians)
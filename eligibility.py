@@ -0,0 +1,277 @@
+# ============================================
+# Hospital Management System - Insurance Eligibility
+# Payer networks, patient coverage and a client for the payer eligibility service
+# ============================================
+
+import csv
+import http.client
+import json
+import queue
+import re
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from nlp_utils import alternation
+
+Coverage = namedtuple("Coverage", "mrn payer plan member_id")
+Eligibility = namedtuple("Eligibility", "payer member_id active copay deductible_remaining")
+
+NAME_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(name):
+    return " ".join(NAME_RE.findall(name.lower()))
+
+
+def doctor_key(name):
+    # "Dr. Smith", "dr smith" and "Smith" are the same doctor
+    words = normalize(name).split()
+    return " ".join(words[1:] if words[:1] in (["dr"], ["doctor"]) else words)
+
+
+class EligibilityError(Exception):
+    """The eligibility service could not be reached or returned an error"""
+
+
+class PayerNetwork:
+    """Which plans each payer offers, which doctors are in each plan's network,
+    and which plan each patient is covered by.
+
+    Plans are keyed by (payer, plan) with the set of in-network doctors, so
+    "is Dr. X in network with Y" is a set lookup per plan of the payer.
+    Payers are found in free text by name or alias ("bcbs", "uhc") with one
+    regex scan.
+    """
+
+    def __init__(self):
+        self.plans = {}                  # (payer, plan) -> frozenset of doctor keys
+        self.payers = {}                 # payer -> its plan names, in file order
+        self.doctors = {}                # doctor key -> doctor name as listed
+        self.aliases = {}                # normalized alias -> payer
+        self.coverage = {}               # MRN -> Coverage
+        self.alias_re = None
+
+    @classmethod
+    def load(cls, network_path, coverage_path=None):
+        """Load a network CSV (payer, plan, aliases and doctors separated by ';') and an optional
+        coverage CSV (mrn, payer, plan, member_id)"""
+        network = cls()
+        with open(network_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                network.add_plan(
+                    row["payer"], row["plan"],
+                    [doctor for doctor in row["doctors"].split(";") if doctor.strip()],
+                    [alias for alias in row["aliases"].split(";") if alias.strip()],
+                )
+        if coverage_path:
+            with open(coverage_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    network.coverage[row["mrn"]] = Coverage(row["mrn"], row["payer"], row["plan"], row["member_id"])
+        return network
+
+    def add_plan(self, payer, plan, doctors, aliases=()):
+        keys = set()
+        for doctor in doctors:
+            key = doctor_key(doctor)
+            self.doctors.setdefault(key, doctor.strip())
+            keys.add(key)
+        self.plans[(payer, plan)] = frozenset(keys)
+        self.payers.setdefault(payer, []).append(plan)
+        for alias in [payer, *aliases]:
+            self.aliases.setdefault(normalize(alias), payer)
+        # Rebuilt on the next lookup
+        self.alias_re = None
+
+    def find_payer(self, text):
+        """Return (payer, plan) named in free text; plan is None unless one of the payer's plans is
+        named too, and both are None if no payer is"""
+        if self.alias_re is None:
+            self.alias_re = re.compile(r"\b(?:" + alternation(self.aliases) + r")\b")
+        text = normalize(text or "")
+        match = self.alias_re.search(text)
+        if match is None:
+            return None, None
+        payer = self.aliases[match.group(0)]
+        rest = text[:match.start()] + " " + text[match.end():]
+        for plan in sorted(self.payers[payer], key=len, reverse=True):
+            if re.search(r"\b" + re.escape(normalize(plan)) + r"\b", rest):
+                return payer, plan
+        return payer, None
+
+    def doctor(self, text):
+        """Doctor name as listed for free text ("dr smith" -> "Dr. Smith"), or None"""
+        return self.doctors.get(doctor_key(text or ""))
+
+    def in_network(self, doctor, payer, plan=None):
+        """Plans of a payer (or just `plan`) that have the doctor in network"""
+        key = doctor_key(doctor)
+        plans = [plan] if plan else self.payers.get(payer, [])
+        return [name for name in plans if key in self.plans.get((payer, name), ())]
+
+    def networks(self, doctor):
+        """(payer, plan) pairs that have the doctor in network"""
+        key = doctor_key(doctor)
+        return [plan for plan, doctors in self.plans.items() if key in doctors]
+
+
+class Pending:
+    """One eligibility check waiting for the service; shared by every caller asking the same thing"""
+
+    __slots__ = ("key", "done", "result", "error")
+
+    def __init__(self, key):
+        self.key = key
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class EligibilityClient:
+    """Client for a payer eligibility service (POST /eligibility with a batch of checks).
+
+    Answers are cached for `cache_ttl` seconds. A check that is already on
+    its way to the service is not sent again: later callers wait for the
+    same answer (request coalescing), so concurrent identical checks reach
+    the service once. Checks for different members that arrive within
+    `batch_window` seconds go out together, up to `max_batch` per request;
+    the first caller of a batch waits out the window and sends it. Requests
+    reuse keep-alive connections from a pool of `pool_size`.
+    """
+
+    def __init__(self, base_url, pool_size=8, timeout=2.0, cache_ttl=300.0, cache_size=10000,
+                 batch_window=0.005, max_batch=32, clock=time.monotonic):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.path = (url.path.rstrip("/") or "") + "/eligibility"
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.clock = clock
+        self.cache = {}                  # (payer, member id) -> (expires, Eligibility)
+        self.inflight = {}               # (payer, member id) -> Pending
+        self.batch = []                  # Pendings not sent yet
+        self.lock = threading.Lock()
+        self.connections = queue.LifoQueue()
+        self.slots = threading.Semaphore(pool_size)
+        self.requests = 0                # requests sent to the service
+        self.hits = 0                    # checks answered from the cache
+        self.coalesced = 0               # checks that waited for an identical one
+
+    def check(self, payer, member_id):
+        """Eligibility of a member; raises EligibilityError if the service fails"""
+        key = (payer, member_id)
+        batch = None
+        leader = False
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None and cached[0] > self.clock():
+                self.hits += 1
+                return cached[1]
+            pending = self.inflight.get(key)
+            if pending is not None:
+                self.coalesced += 1
+            else:
+                pending = self.inflight[key] = Pending(key)
+                self.batch.append(pending)
+                if len(self.batch) >= self.max_batch:
+                    batch = self.take_batch()
+                else:
+                    leader = len(self.batch) == 1
+
+        if leader:
+            # The first check of a batch waits for others to join, then sends them all
+            if self.batch_window:
+                time.sleep(self.batch_window)
+            with self.lock:
+                batch = self.take_batch()
+        if batch:
+            self.send(batch)
+
+        if not pending.done.wait(2 * self.timeout + self.batch_window):
+            raise EligibilityError("timed out waiting for the eligibility service")
+        if pending.error is not None:
+            raise EligibilityError(pending.error)
+        return pending.result
+
+    def take_batch(self):
+        # Caller holds self.lock
+        batch, self.batch = self.batch, []
+        return batch
+
+    def send(self, batch):
+        """Send a batch of checks in one request and hand each waiting caller its answer"""
+        answers = [None] * len(batch)
+        # Kept if something unexpected is raised below; that exception still reaches the caller
+        error = "eligibility check failed"
+        try:
+            body = json.dumps({"checks": [{"payer": payer, "member_id": member_id} for payer, member_id in
+                                          (pending.key for pending in batch)]})
+            results = self.post(body)["results"]
+            if len(results) != len(batch):
+                raise EligibilityError(f"expected {len(batch)} results, got {len(results)}")
+            answers = [
+                Eligibility(result["payer"], result["member_id"], result["active"], result.get("copay"),
+                            result.get("deductible_remaining"))
+                for result in results
+            ]
+            error = None
+        except (EligibilityError, OSError, ValueError, KeyError, http.client.HTTPException) as exc:
+            answers = [None] * len(batch)
+            error = str(exc) or type(exc).__name__
+        finally:
+            # However the request ended, the checks leave inflight and every waiter is woken
+            with self.lock:
+                expires = self.clock() + self.cache_ttl
+                for pending, answer in zip(batch, answers):
+                    self.inflight.pop(pending.key, None)
+                    if answer is not None:
+                        self.cache[pending.key] = (expires, answer)
+                # Drop the oldest answers once the cache is full; dicts keep insertion order
+                while len(self.cache) > self.cache_size:
+                    del self.cache[next(iter(self.cache))]
+            for pending, answer in zip(batch, answers):
+                pending.result = answer
+                pending.error = error
+                pending.done.set()
+
+    def post(self, body):
+        """POST to the service over a pooled connection; retries once on a fresh connection if a
+        kept-alive one was closed by the server"""
+        self.slots.acquire()
+        try:
+            for attempt in range(2):
+                try:
+                    connection = self.connections.get_nowait()
+                    reused = True
+                except queue.Empty:
+                    connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                    reused = False
+                try:
+                    connection.request("POST", self.path, body, {"Content-Type": "application/json"})
+                    response = connection.getresponse()
+                    data = response.read()
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                with self.lock:
+                    self.requests += 1
+                self.connections.put(connection)
+                if response.status != 200:
+                    raise EligibilityError(f"eligibility service returned HTTP {response.status}")
+                return json.loads(data)
+        finally:
+            self.slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self.connections.get_nowait().close()
+            except queue.Empty:
+                return
@@ -0,0 +1,138 @@
+# ============================================
+# Hospital Management System - Memory Footprint
+# Retained memory of a chatbot by component and object type
+# ============================================
+
+import gc
+import sys
+import tracemalloc
+import types
+from collections import Counter
+
+# Shared by every instance and not part of any one chatbot's footprint
+SHARED_TYPES = (type, types.ModuleType, types.BuiltinFunctionType)
+
+
+class Footprint:
+    """Memory retained by one chatbot.
+
+    `total` is measured with tracemalloc around construction. `components`
+    and `types` come from walking the objects each component references;
+    an object reachable from several components is counted once, for the
+    first of them. `by_file` lists the source files that allocated the
+    retained memory.
+    """
+
+    def __init__(self, total, components, types, by_file):
+        self.total = total
+        self.components = components
+        self.types = types
+        self.by_file = by_file
+
+    def report(self, limit=10):
+        lines = [f"{'total (tracemalloc)':<24} {self.total / 1024:>10,.1f} KiB", "", "By component:"]
+        for name, size in self.components.items():
+            lines.append(f"  {name:<22} {size / 1024:>10,.1f} KiB  {size / max(self.total, 1):>6.1%}")
+        lines += ["", "By object type:"]
+        for name, size in self.types.most_common(limit):
+            lines.append(f"  {name:<22} {size / 1024:>10,.1f} KiB")
+        lines += ["", "By allocating file:"]
+        for name, size in self.by_file[:limit]:
+            lines.append(f"  {name:<22} {size / 1024:>10,.1f} KiB")
+        return "\n".join(lines)
+
+
+def shared_ids():
+    """Ids of module-level objects that instances reference but do not own"""
+    ids = set()
+    for module in list(sys.modules.values()):
+        ids.add(id(module))
+        ids.add(id(getattr(module, "__dict__", None)))
+    return ids
+
+
+def deep_size(roots, seen, type_sizes=None, traced_only=False):
+    """Total size of the objects reachable from roots that are not in `seen`; adds them to `seen`.
+
+    With traced_only, objects without a tracemalloc traceback (allocated
+    before tracing started, such as module constants and interned strings)
+    are not counted, though the objects they reference still are.
+    """
+    size = 0
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        if not traced_only or tracemalloc.get_object_traceback(obj) is not None:
+            obj_size = sys.getsizeof(obj)
+            size += obj_size
+            if type_sizes is not None:
+                type_sizes[type(obj).__name__] += obj_size
+        stack.extend(gc.get_referents(obj))
+        if isinstance(obj, dict):
+            # The garbage collector skips the keys of string-keyed dicts
+            stack.extend(obj.keys())
+    return size
+
+
+def chatbot_components(chatbot):
+    """(name, root objects) for each component of a chatbot, in counting order"""
+    state = chatbot.state
+    return [
+        ("patterns", [entry.pattern for entry in state.compiled_patterns]),
+        ("responses", [entry.response for entry in state.compiled_patterns]),
+        ("pattern entries", [state.compiled_patterns, state.category_names]),
+        ("intent classifier", [state.fallback_classifier]),
+        ("spelling data", [state.spelling_corrector, state.spelling_corrections]),
+        ("vocabulary", [state.vocabulary_normalizer]),
+        ("patient data", [chatbot.patient_data, chatbot.patients]),
+        ("appointments", [chatbot.appointments, chatbot.scheduler]),
+        ("pharmacy", [chatbot.pharmacy]),
+        ("pricing", [chatbot.prices]),
+        ("directory", [chatbot.directory]),
+        ("length of stay", [chatbot.stays]),
+        ("triage queue", [chatbot.triage]),
+        ("bed census", [chatbot.census]),
+        ("insurance", [chatbot.network, chatbot.eligibility]),
+        ("sessions", [chatbot.sessions]),
+        ("matcher state", [state, chatbot.state, chatbot.__dict__]),
+    ]
+
+
+def measure(factory):
+    """Build an object with factory() and return (object, Footprint)"""
+    gc.collect()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    obj = factory()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    # Leave out the snapshots' own bookkeeping
+    own_files = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    before = before.filter_traces(own_files)
+    after = after.filter_traces(own_files)
+
+    by_file = Counter()
+    for stat in after.compare_to(before, "filename"):
+        if stat.size_diff > 0:
+            by_file[stat.traceback[0].filename.rsplit("/", 1)[-1]] += stat.size_diff
+    total = sum(by_file.values())
+
+    # Only objects allocated while building count; the walk must not wander into
+    # module globals or back into the instance through response closures
+    seen = shared_ids()
+    seen.add(id(obj))
+    components = {}
+    type_sizes = Counter()
+    for name, roots in chatbot_components(obj):
+        components[name] = deep_size(roots, seen, type_sizes, traced_only=True)
+    # Allocator overhead and objects no component references (e.g. the re module cache)
+    components["other"] = total - sum(components.values())
+    if started:
+        tracemalloc.stop()
+
+    return obj, Footprint(total, components, type_sizes, by_file.most_common())
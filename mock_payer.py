@@ -0,0 +1,110 @@
+# ============================================
+# Hospital Management System - Mock Payer Service
+# Local stand-in for a payer eligibility service, for testing and benchmarks
+# ============================================
+
+import argparse
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COPAYS = [20, 25, 30, 40, 50]
+
+
+def eligibility(payer, member_id):
+    """Made-up but stable benefits for a member: the same member always gets the same answer"""
+    digest = zlib.crc32(f"{payer}|{member_id}".encode("utf-8"))
+    return {
+        "payer": payer,
+        "member_id": member_id,
+        # About one member in ten has lapsed coverage
+        "active": digest % 10 != 0,
+        "copay": COPAYS[digest % len(COPAYS)],
+        "deductible_remaining": (digest >> 8) % 31 * 100,
+    }
+
+
+class PayerRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/eligibility":
+            self.reply(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            checks = body["checks"]
+            results = [eligibility(check["payer"], check["member_id"]) for check in checks]
+        except (ValueError, KeyError, TypeError):
+            self.reply(400, {"error": "expected {\"checks\": [{\"payer\", \"member_id\"}]}"})
+            return
+        # One round trip to the payer, however many members are checked
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.checks += len(checks)
+        self.reply(200, {"results": results})
+
+    def reply(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class MockPayerServer(ThreadingHTTPServer):
+    """Eligibility service on localhost that answers after `latency` seconds and counts requests"""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, verbose=False):
+        super().__init__((host, port), PayerRequestHandler)
+        self.latency = latency
+        self.verbose = verbose
+        self.requests = 0                # requests answered
+        self.checks = 0                  # member checks answered
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve from a background thread; returns the server"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for a payer eligibility service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8750)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds each request takes")
+    args = parser.parse_args()
+
+    server = MockPayerServer(args.host, args.port, args.latency, verbose=True)
+    print(f"Mock payer service on {server.url}/eligibility (latency {args.latency * 1e3:.0f} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,571 @@
+# ============================================
+# Hospital Management System - NLP Utilities
+# Intent classification, spelling correction and entity extraction
+# ============================================
+
+import bisect
+import heapq
+import math
+import mmap
+import re
+import struct
+from array import array
+from collections import Counter, defaultdict, namedtuple
+from datetime import date, datetime, time, timedelta
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+# Question words and fillers shared by almost every utterance; they carry no intent
+STOP_WORDS = frozenset(
+    "a an the is are am be do does did can could would should will may must i i'm me my "
+    "you your we our us it its to for of in on at with about from by and or how what "
+    "which where when who why there this that these those have has get"
+    .split()
+)
+
+
+def char_ngrams(text, n_min=3, n_max=4):
+    """Character n-grams of each word, padded with spaces at the word edges"""
+    grams = Counter()
+    for word in WORD_RE.findall(text.lower()):
+        if word in STOP_WORDS:
+            continue
+        padded = f" {word} "
+        for n in range(n_min, n_max + 1):
+            for i in range(len(padded) - n + 1):
+                grams[padded[i:i + n]] += 1
+    return grams
+
+
+class TfidfIntentClassifier:
+    """Character n-gram TF-IDF classifier with cosine scoring.
+
+    The document-term matrix is stored column-wise as one posting list per
+    n-gram (parallel arrays of document ids and weights), so scoring a query
+    is a sparse matrix-vector product over the query's n-grams only, and
+    scoring a batch is a sparse matrix-matrix product that reads each
+    posting list once.
+    """
+
+    def __init__(self, n_min=3, n_max=4):
+        self.n_min = n_min
+        self.n_max = n_max
+        self.labels = []
+        self.idf = {}
+        self.postings = {}
+
+    def fit(self, documents, labels):
+        """Build the index from one text (e.g. joined example utterances) per label"""
+        self.labels = list(labels)
+        counts = [char_ngrams(doc, self.n_min, self.n_max) for doc in documents]
+
+        df = Counter()
+        for grams in counts:
+            df.update(grams.keys())
+        n_docs = len(counts)
+        self.idf = {gram: math.log((1 + n_docs) / (1 + freq)) + 1 for gram, freq in df.items()}
+
+        postings = defaultdict(lambda: (array("I"), array("d")))
+        for doc_id, grams in enumerate(counts):
+            for gram, weight in self.weigh(grams).items():
+                doc_ids, weights = postings[gram]
+                doc_ids.append(doc_id)
+                weights.append(weight)
+        self.postings = dict(postings)
+        return self
+
+    def weigh(self, grams):
+        """Sublinear TF * IDF, L2-normalized; unknown n-grams are dropped"""
+        vector = {
+            gram: (1 + math.log(count)) * self.idf[gram]
+            for gram, count in grams.items() if gram in self.idf
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if norm:
+            for gram in vector:
+                vector[gram] /= norm
+        return vector
+
+    def transform(self, text):
+        return self.weigh(char_ngrams(text, self.n_min, self.n_max))
+
+    def scores(self, text):
+        """Cosine similarity of the text against every document (sparse mat-vec)"""
+        totals = [0.0] * len(self.labels)
+        for gram, q_weight in self.transform(text).items():
+            doc_ids, weights = self.postings[gram]
+            for doc_id, weight in zip(doc_ids, weights):
+                totals[doc_id] += q_weight * weight
+        return totals
+
+    def predict(self, text):
+        """Return (label, score) of the best-scoring document"""
+        return self.best(self.scores(text))
+
+    def top(self, text, k):
+        """Return the k best (label, score) pairs, best first"""
+        totals = self.scores(text)
+        best_ids = heapq.nlargest(k, range(len(totals)), key=totals.__getitem__)
+        return [(self.labels[doc_id], totals[doc_id]) for doc_id in best_ids]
+
+    def predict_batch(self, texts):
+        """Score many texts at once (sparse mat-mat); returns a list of (label, score)"""
+        # Invert the batch so each posting list is read once for all queries
+        batch_postings = defaultdict(list)
+        for row, text in enumerate(texts):
+            for gram, q_weight in self.transform(text).items():
+                batch_postings[gram].append((row, q_weight))
+
+        totals = [[0.0] * len(self.labels) for _ in texts]
+        for gram, rows in batch_postings.items():
+            doc_ids, weights = self.postings[gram]
+            for row, q_weight in rows:
+                row_totals = totals[row]
+                for doc_id, weight in zip(doc_ids, weights):
+                    row_totals[doc_id] += q_weight * weight
+        return [self.best(row_totals) for row_totals in totals]
+
+    def best(self, totals):
+        if not totals:
+            return None, 0.0
+        doc_id = max(range(len(totals)), key=totals.__getitem__)
+        return self.labels[doc_id], totals[doc_id]
+
+
+# ========== SPELLING CORRECTION ==========
+
+MODEL_MAGIC = b"HMSLM1\0\0"
+MODEL_HEADER = struct.Struct("<8sIII")
+SENTENCE_START = "<s>"
+WORD_PARTS_RE = re.compile(r"^([^A-Za-z']*)([A-Za-z']+)([^A-Za-z']*)$")
+
+
+class BigramLanguageModel:
+    """Word bigram counts in flat arrays.
+
+    Unigram counts are an array indexed by word id; bigrams are a sorted
+    array of (first_id << 32 | second_id) keys with a parallel count array,
+    looked up by binary search. save() writes the arrays as-is and load()
+    maps them from the file without copying, so loading is instant and
+    workers that load the same file share its pages.
+    """
+
+    def __init__(self, words, unigrams, bigram_keys, bigram_counts, total):
+        self.words = words
+        self.word_ids = {word: i for i, word in enumerate(words)}
+        self.unigrams = unigrams
+        self.bigram_keys = bigram_keys
+        self.bigram_counts = bigram_counts
+        self.total = total
+        self.mapped = None
+
+    @classmethod
+    def train(cls, lines):
+        """Count unigrams and bigrams over lines of text"""
+        unigram_counter = Counter()
+        bigram_counter = Counter()
+        total = 0
+        for line in lines:
+            tokens = [SENTENCE_START] + WORD_RE.findall(line.lower())
+            unigram_counter.update(tokens)
+            bigram_counter.update(zip(tokens, tokens[1:]))
+            total += len(tokens) - 1
+
+        words = sorted(unigram_counter)
+        word_ids = {word: i for i, word in enumerate(words)}
+        unigrams = array("I", (unigram_counter[word] for word in words))
+        keyed = sorted((word_ids[a] << 32 | word_ids[b], count) for (a, b), count in bigram_counter.items())
+        bigram_keys = array("Q", (key for key, count in keyed))
+        bigram_counts = array("I", (count for key, count in keyed))
+        return cls(words, unigrams, bigram_keys, bigram_counts, total)
+
+    def save(self, path):
+        vocabulary = "\n".join(self.words).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(MODEL_HEADER.pack(MODEL_MAGIC, len(self.words), len(self.bigram_keys), self.total))
+            f.write(b"\0" * (-MODEL_HEADER.size % 8))
+            f.write(array("Q", self.bigram_keys).tobytes())
+            f.write(array("I", self.bigram_counts).tobytes())
+            f.write(array("I", self.unigrams).tobytes())
+            f.write(vocabulary)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a model written by save()"""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_words, n_bigrams, total = MODEL_HEADER.unpack_from(mapped)
+        if magic != MODEL_MAGIC:
+            raise ValueError(f"{path} is not a language model file")
+
+        view = memoryview(mapped)
+        offset = MODEL_HEADER.size + (-MODEL_HEADER.size % 8)
+        bigram_keys = view[offset:offset + 8 * n_bigrams].cast("Q")
+        offset += 8 * n_bigrams
+        bigram_counts = view[offset:offset + 4 * n_bigrams].cast("I")
+        offset += 4 * n_bigrams
+        unigrams = view[offset:offset + 4 * n_words].cast("I")
+        offset += 4 * n_words
+        words = bytes(view[offset:]).decode("utf-8").split("\n")
+
+        model = cls(words, unigrams, bigram_keys, bigram_counts, total)
+        model.mapped = mapped
+        return model
+
+    def __contains__(self, word):
+        return word in self.word_ids
+
+    def count(self, word):
+        word_id = self.word_ids.get(word)
+        return self.unigrams[word_id] if word_id is not None else 0
+
+    def bigram_count(self, first, second):
+        first_id = self.word_ids.get(first)
+        second_id = self.word_ids.get(second)
+        if first_id is None or second_id is None:
+            return 0
+        key = first_id << 32 | second_id
+        i = bisect.bisect_left(self.bigram_keys, key)
+        if i < len(self.bigram_keys) and self.bigram_keys[i] == key:
+            return self.bigram_counts[i]
+        return 0
+
+    def log_prob(self, word, previous):
+        """log P(word | previous), interpolating bigram and add-one unigram estimates"""
+        unigram = (self.count(word) + 1) / (self.total + len(self.words))
+        previous_count = self.count(previous)
+        if previous_count:
+            bigram = self.bigram_count(previous, word) / previous_count
+            return math.log(0.7 * bigram + 0.3 * unigram)
+        return math.log(unigram)
+
+
+def edit_distance(a, b):
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions)"""
+    previous_row = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous_row, row = previous_row, row, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], before[j - 2] + 1)
+    return row[len(b)]
+
+
+def deletes(word):
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class SpellingCorrector:
+    """Edit-distance candidates ranked by a bigram language model.
+
+    Words the model knows are never changed. Unknown words get candidates
+    within edit distance 2 from a single-delete index over the vocabulary,
+    and the candidate that best fits the previous and next words wins.
+    Entries in `corrections` (known misspelling -> word) always apply.
+    """
+
+    def __init__(self, model, corrections=None, min_length=4):
+        self.model = model
+        self.corrections = corrections or {}
+        self.min_length = min_length
+
+        # Each vocabulary word and its single-character deletes -> candidate words
+        delete_index = defaultdict(list)
+        for word in model.words:
+            if len(word) >= min_length - 1 and word.isalpha():
+                for key in deletes(word) | {word}:
+                    delete_index[key].append(word)
+        # Almost every key has one word; storing it bare instead of in a list saves most of the index
+        self.delete_index = {
+            key: words[0] if len(words) == 1 else tuple(words) for key, words in delete_index.items()
+        }
+
+    def candidates(self, word):
+        """Vocabulary words within edit distance 2 of an unknown word, as (word, distance)"""
+        found = set()
+        for key in deletes(word) | {word}:
+            words = self.delete_index.get(key)
+            if words is None:
+                continue
+            if isinstance(words, str):
+                found.add(words)
+            else:
+                found.update(words)
+        scored = ((candidate, edit_distance(word, candidate)) for candidate in found)
+        return [(candidate, distance) for candidate, distance in scored if 0 < distance <= 2]
+
+    def correct_words(self, words):
+        """Correct a list of tokens; returns (word, changed) pairs"""
+        corrected = []
+        previous = SENTENCE_START
+        for i, token in enumerate(words):
+            parts = WORD_PARTS_RE.match(token)
+            if not parts:
+                corrected.append((token, False))
+                previous = SENTENCE_START
+                continue
+
+            prefix, core, suffix = parts.groups()
+            lower = core.lower()
+            replacement = self.corrections.get(lower)
+            if replacement is None and lower not in self.model and len(lower) >= self.min_length:
+                replacement = self.best_candidate(lower, previous, self.next_word(words, i))
+
+            if replacement is None or replacement == lower:
+                corrected.append((token, False))
+                previous = lower
+            else:
+                corrected.append((prefix + replacement + suffix, True))
+                previous = replacement.split()[-1].lower()
+        return corrected
+
+    def next_word(self, words, i):
+        if i + 1 < len(words):
+            parts = WORD_PARTS_RE.match(words[i + 1])
+            if parts and parts.group(2).lower() in self.model:
+                return parts.group(2).lower()
+        return None
+
+    def best_candidate(self, word, previous, following):
+        best = None
+        best_score = -math.inf
+        for candidate, distance in self.candidates(word):
+            # Two edits are only trusted for longer words
+            if distance == 2 and len(word) < 6:
+                continue
+            # Short unknown words are often valid words missing from the corpus;
+            # only correct them when the context supports the candidate
+            if len(word) < 6 and not (self.model.bigram_count(previous, candidate)
+                                      or following and self.model.bigram_count(candidate, following)):
+                continue
+            score = self.model.log_prob(candidate, previous) - 2.0 * distance
+            if following is not None:
+                score += self.model.log_prob(following, candidate)
+            if score > best_score:
+                best, best_score = candidate, score
+        return best
+
+
+# ========== PHRASE NORMALIZATION ==========
+
+KEY_STRIP_RE = re.compile(r"[^a-z0-9&]")
+TRAILING_PUNCT_RE = re.compile(r"[?!,;:]*$")
+
+# Abbreviations that are also hesitation sounds: "er, where is the pharmacy"
+HESITATIONS = frozenset(["er"])
+QUESTION_OPENERS = frozenset("what where when why how who which is are do does can could would will should may".split())
+
+
+def is_hesitation(word, previous, following):
+    """Whether a word in HESITATIONS is a hesitation rather than the abbreviation.
+
+    Typed in capitals ("ER", "E.R.") it is always the abbreviation. Lowercase
+    it is a hesitation when set off by a comma, dash or dots ("er, where"), or
+    when it opens the query and a question follows ("er what time is it").
+    """
+    if "." in word.rstrip(".") or word[1:] != word[1:].lower():
+        return False
+    if word.endswith((",", "-", "..", "\u2026")):
+        return True
+    return previous is None and following is not None and PhraseNormalizer.key(following) in QUESTION_OPENERS
+
+
+class PhraseNormalizer:
+    """Word-level trie that maps phrases and abbreviations to canonical wording.
+
+    At each word the trie is walked as far as the following words allow and
+    the longest known phrase is replaced, so a query is normalized in one
+    left-to-right pass. Words are compared case-insensitively and without
+    punctuation, so "E.R." and "er" are the same key.
+    """
+
+    def __init__(self, vocabulary):
+        self.root = {}
+        for phrase, canonical in vocabulary.items():
+            node = self.root
+            for word in phrase.split():
+                node = node.setdefault(self.key(word), {})
+            # The None key marks the end of a phrase and holds its replacement
+            node[None] = canonical
+
+    @staticmethod
+    def key(word):
+        return KEY_STRIP_RE.sub("", word.lower())
+
+    def normalize_words(self, words):
+        """Normalize a list of (word, changed) pairs; returns new (word, changed) pairs"""
+        keys = [self.key(word) for word, changed in words]
+        normalized = []
+        i = 0
+        while i < len(words):
+            node = self.root
+            best = None
+            j = i
+            while j < len(words) and keys[j] in node:
+                node = node[keys[j]]
+                j += 1
+                if None in node:
+                    best = (j, node[None])
+
+            if best is not None and best[0] == i + 1 and keys[i] in HESITATIONS and is_hesitation(
+                    words[i][0], words[i - 1][0] if i else None, words[i + 1][0] if i + 1 < len(words) else None):
+                best = None
+
+            if best is None:
+                normalized.append(words[i])
+                i += 1
+                continue
+
+            end, canonical = best
+            original = " ".join(word for word, changed in words[i:end])
+            # Keep sentence punctuation such as a trailing question mark
+            text = canonical + TRAILING_PUNCT_RE.search(words[end - 1][0]).group(0)
+            changed = text != original or any(changed for word, changed in words[i:end])
+            normalized.append((text, changed))
+            i = end
+        return normalized
+
+
+# ========== ENTITY EXTRACTION ==========
+
+# A typed span found in a query; `value` is the normalized form (date, time, digits, canonical name)
+Entity = namedtuple("Entity", "type text start end value")
+
+MONTHS = ["january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december"]
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Canonical department name -> spellings seen in queries
+DEPARTMENTS = {
+    "emergency": ["emergency room", "emergency department", "emergency", "er"],
+    "cardiology": ["cardiology", "cardiac", "heart center"],
+    "oncology": ["oncology", "cancer center"],
+    "pediatrics": ["pediatrics", "pediatric", "children's hospital"],
+    "radiology": ["radiology", "imaging", "x-ray"],
+    "neurology": ["neurology"],
+    "orthopedics": ["orthopedics", "orthopaedics", "orthopedic"],
+    "maternity": ["maternity", "labor and delivery", "obstetrics"],
+    "icu": ["intensive care unit", "intensive care", "icu"],
+    "pharmacy": ["pharmacy"],
+    "laboratory": ["laboratory", "lab"],
+    "dermatology": ["dermatology"],
+    "gastroenterology": ["gastroenterology"],
+    "urology": ["urology"],
+    "psychiatry": ["psychiatry", "behavioral health", "mental health"],
+    "surgery": ["surgery", "surgical"],
+    "rehabilitation": ["rehabilitation", "rehab", "physical therapy"],
+    "billing": ["billing office", "billing department", "billing"],
+    "cafeteria": ["cafeteria"],
+}
+
+MEDICATIONS = [
+    "acetaminophen", "albuterol", "alprazolam", "amlodipine", "amoxicillin", "aspirin",
+    "atorvastatin", "azithromycin", "cephalexin", "ciprofloxacin", "clopidogrel",
+    "gabapentin", "hydrochlorothiazide", "hydrocodone", "ibuprofen", "insulin",
+    "levothyroxine", "lisinopril", "losartan", "metformin", "metoprolol", "montelukast",
+    "naproxen", "omeprazole", "pantoprazole", "prednisone", "sertraline", "simvastatin",
+    "tramadol", "warfarin", "tylenol", "advil", "motrin", "lipitor", "zoloft", "prozac",
+]
+
+
+def alternation(phrases):
+    """Regex alternation of literal phrases, longest first so the longest phrase wins"""
+    return "|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+
+
+DEPARTMENT_LOOKUP = {spelling: name for name, spellings in DEPARTMENTS.items() for spelling in spellings}
+
+# Words after "doctor" that are not a name: "which doctor should I see", "is the doctor in today"
+NOT_DOCTOR_NAMES = STOP_WORDS | frozenset(
+    "if i'll im not no so then than as available visit visits office appointment appointments recommend "
+    "recommended near nearby here now today tonight tomorrow yesterday please said says told thinks know "
+    "knows see sees need needs needed".split()
+) | frozenset(WEEKDAYS)
+
+# All extractors in one pattern so a query is scanned once; earlier alternatives win
+ENTITY_RE = re.compile(
+    r"(?P<phone>\(?\b\d{3}\)?[-.\s]?\d{3}[-.\s]\d{4}\b)"
+    r"|(?P<date_numeric>\b\d{1,2}/\d{1,2}/\d{2}(?:\d{2})?\b|\b\d{4}-\d{2}-\d{2}\b)"
+    r"|(?P<date_month>\b(?P<month>" + "|".join(m[:3] + f"(?:{m[3:]})?" if len(m) > 3 else m for m in MONTHS) + r")\.?"
+    r"\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(?P<year>\d{4}))?\b)"
+    r"|(?P<date_relative>\b(?:today|tonight|tomorrow|yesterday)\b)"
+    r"|(?P<weekday>\b(?:" + "|".join(WEEKDAYS) + r")\b)"
+    r"|(?P<time>\b(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>[ap]\.?m\.?)(?!\w)|\b\d{1,2}:\d{2}\b|\b(?:noon|midnight)\b)"
+    r"|(?P<doctor>\b(?:Dr\.?|Doctor)\s+(?!(?:" + alternation(NOT_DOCTOR_NAMES) + r")\b)"
+    r"(?P<doctor_name>[A-Za-z][A-Za-z'-]+))"
+    r"|(?P<department>\b(?:" + alternation(DEPARTMENT_LOOKUP) + r")\b)"
+    r"|(?P<medication>\b(?:" + alternation(MEDICATIONS) + r")\b(?:\s*\d+(?:\.\d+)?\s*(?:mg|mcg|ml|g)\b)?)",
+    re.IGNORECASE
+)
+
+ENTITY_TYPES = {
+    "phone": "phone", "date_numeric": "date", "date_month": "date", "date_relative": "date",
+    "weekday": "date", "time": "time", "doctor": "doctor", "department": "department",
+    "medication": "medication",
+}
+
+
+def extract_entities(text, today=None):
+    """Return all Entity spans in the text from a single scan"""
+    today = today or date.today()
+    entities = []
+    for match in ENTITY_RE.finditer(text):
+        # The outer named group closes last, so lastgroup is the extractor that matched
+        kind = match.lastgroup
+        entity_text = match.group(kind)
+        if kind == "department" and entity_text.lower() in HESITATIONS:
+            previous = text[:match.start(kind)].split()
+            word, *following = text[match.start(kind):].split(None, 2)
+            if is_hesitation(word, previous[-1] if previous else None, following[0] if following else None):
+                continue
+        entities.append(Entity(
+            ENTITY_TYPES[kind], entity_text, match.start(kind), match.end(kind),
+            entity_value(kind, match, today)
+        ))
+    return entities
+
+
+def entity_value(kind, match, today):
+    text = match.group(kind).lower()
+    if kind == "phone":
+        return re.sub(r"\D", "", text)
+    if kind == "date_numeric":
+        for fmt in ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d"):
+            try:
+                return datetime.strptime(text, fmt).date()
+            except ValueError:
+                pass
+        return None
+    if kind == "date_month":
+        month = next(i for i, name in enumerate(MONTHS, 1) if name.startswith(match.group("month").lower()[:3]))
+        year = int(match.group("year")) if match.group("year") else today.year
+        try:
+            return date(year, month, int(match.group("day")))
+        except ValueError:
+            return None
+    if kind == "date_relative":
+        offset = {"today": 0, "tonight": 0, "tomorrow": 1, "yesterday": -1}[text]
+        return today + timedelta(days=offset)
+    if kind == "weekday":
+        # Next occurrence of that weekday (today counts)
+        return today + timedelta(days=(WEEKDAYS.index(text) - today.weekday()) % 7)
+    if kind == "time":
+        if text in ("noon", "midnight"):
+            return time(12) if text == "noon" else time(0)
+        if match.group("hour") is None:
+            hour, minute = text.split(":")
+            return time(int(hour) % 24, int(minute) % 60)
+        hour = int(match.group("hour")) % 12
+        if match.group("ampm").startswith("p"):
+            hour += 12
+        return time(hour, int(match.group("minute") or 0) % 60)
+    if kind == "doctor":
+        return match.group("doctor_name").capitalize()
+    if kind == "department":
+        return DEPARTMENT_LOOKUP[text]
+    if kind == "medication":
+        return WORD_RE.match(text).group(0)
+    return text
@@ -0,0 +1,206 @@
+# ============================================
+# Hospital Management System - Patient Search
+# Patient registry with trigram and phonetic name indexes
+# ============================================
+
+import csv
+import math
+import re
+from array import array
+from collections import Counter, defaultdict, namedtuple
+from datetime import date
+from functools import lru_cache
+
+Patient = namedtuple("Patient", "mrn name dob")
+PatientMatch = namedtuple("PatientMatch", "patient score")
+
+NAME_RE = re.compile(r"[a-z]+")
+
+SOUNDEX_CODES = {letter: str(code) for code, letters in enumerate(
+    ["aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r"]) for letter in letters}
+
+
+def normalize(name):
+    return " ".join(NAME_RE.findall(name.lower()))
+
+
+def trigrams(name):
+    """Set of character trigrams of each word, padded with spaces at the word edges"""
+    grams = set()
+    for word in name.split():
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def soundex(word):
+    """American Soundex code of a word ("Robert" and "Rupert" -> "R163")"""
+    if not word:
+        return ""
+    code = word[0].upper()
+    previous = SOUNDEX_CODES.get(word[0], "")
+    for letter in word[1:]:
+        digit = SOUNDEX_CODES.get(letter, "")
+        if digit != "0" and digit != previous:
+            code += digit
+        # H and W do not separate letters with the same code; vowels do
+        if letter not in "hw":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def phonetic_key(name):
+    # Sorted, so "Doe John" sounds like "John Doe"
+    return " ".join(sorted(soundex(word) for word in name.split()))
+
+
+class PatientIndex:
+    """Patients found by MRN, or by a possibly misspelled name.
+
+    Names are indexed two ways. A trigram index maps each padded character
+    trigram to the patients whose name contains it. A phonetic index maps
+    the Soundex codes of a name ("J500 D000") to the patients sharing them,
+    which catches misspellings that change many trigrams ("Jhon Doe").
+
+    A lookup does not walk every posting list of the query. A name whose
+    trigram similarity (Dice) reaches `min_similarity` must share at least
+    one of the query's rarest trigrams, so only the postings of those are
+    read (prefix filtering). Candidates are then scored on their own
+    trigrams, with a bonus for a phonetic match. A date of birth narrows
+    the candidates before ranking. A unique exact name skips the search.
+    Resolved names are kept in an LRU cache.
+    """
+
+    PHONETIC_WEIGHT = 0.25
+
+    def __init__(self, cache_size=1024, min_similarity=0.3):
+        self.patients = []                      # patient id -> Patient
+        self.gram_counts = array("B")           # patient id -> number of distinct trigrams in the name
+        self.by_mrn = {}                        # MRN -> patient id
+        self.by_name = defaultdict(list)        # normalized name -> patient ids
+        self.trigram_index = defaultdict(lambda: array("I"))  # trigram -> patient ids
+        self.phonetic_index = defaultdict(lambda: array("I"))  # phonetic key -> patient ids
+        self.min_similarity = min_similarity
+        self.find = lru_cache(maxsize=cache_size)(self.resolve)
+
+    def __len__(self):
+        return len(self.patients)
+
+    @classmethod
+    def load(cls, path, cache_size=1024):
+        """Load a CSV with columns mrn, name, dob (ISO date, may be empty)"""
+        index = cls(cache_size)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                index.add(row["mrn"], row["name"], date.fromisoformat(row["dob"]) if row.get("dob") else None)
+        return index
+
+    def add(self, mrn, name, dob=None):
+        patient_id = len(self.patients)
+        patient = Patient(mrn, name, dob)
+        self.patients.append(patient)
+        if mrn:
+            self.by_mrn[mrn] = patient_id
+        key = normalize(name)
+        grams = trigrams(key)
+        self.gram_counts.append(min(len(grams), 255))
+        self.by_name[key].append(patient_id)
+        for gram in grams:
+            self.trigram_index[gram].append(patient_id)
+        self.phonetic_index[phonetic_key(key)].append(patient_id)
+        self.find.cache_clear()
+        return patient
+
+    def candidates(self, key, min_similarity):
+        """Ids of patients whose name may reach min_similarity (Dice) with the normalized name `key`,
+        plus those whose name sounds the same"""
+        grams = trigrams(key)
+        found = set(self.phonetic_index.get(phonetic_key(key), ()))
+        if not grams:
+            return found
+        # 2 * shared >= t * (|query| + |name|) and shared <= |name| give shared >= t * |query| / (2 - t),
+        # so a match shares at least one of the len(grams) - required + 1 rarest trigrams
+        required = max(math.ceil(min_similarity * len(grams) / (2 - min_similarity)), 1)
+        rarest = sorted(grams, key=lambda gram: len(self.trigram_index.get(gram, ())))
+        prefix = len(grams) - required + 1
+        shared = Counter()
+        for gram in rarest[:prefix]:
+            shared.update(self.trigram_index.get(gram, ()))
+
+        # At best a candidate also has every trigram that was not read
+        unread = len(grams) - prefix
+        gram_counts = self.gram_counts
+        for patient_id, count in shared.items():
+            if 2 * (count + unread) >= min_similarity * (len(grams) + gram_counts[patient_id]):
+                found.add(patient_id)
+        return found
+
+    def score(self, key, patient):
+        """Similarity of a normalized name to a patient's name: trigram Dice plus a phonetic bonus"""
+        candidate_key = normalize(patient.name)
+        if candidate_key == key:
+            return 1.0
+        grams = trigrams(key)
+        candidate_grams = trigrams(candidate_key)
+        similarity = 2 * len(grams & candidate_grams) / (len(grams) + len(candidate_grams))
+        phonetic = phonetic_key(candidate_key) == phonetic_key(key)
+        return (1 - self.PHONETIC_WEIGHT) * similarity + (self.PHONETIC_WEIGHT if phonetic else 0.0)
+
+    def search(self, name, dob=None, limit=5, min_score=None):
+        """PatientMatches for a name, best first; with dob, only patients born that day"""
+        key = normalize(name)
+        if not key:
+            return []
+        if min_score is None:
+            min_score = (1 - self.PHONETIC_WEIGHT) * self.min_similarity
+        # Names that do not sound the same need this much trigram similarity
+        min_similarity = min(min_score / (1 - self.PHONETIC_WEIGHT), 1.0)
+        matches = []
+        for patient_id in self.candidates(key, min_similarity):
+            patient = self.patients[patient_id]
+            if dob is not None and patient.dob != dob:
+                continue
+            score = self.score(key, patient)
+            if score >= min_score:
+                matches.append(PatientMatch(patient, score))
+        matches.sort(key=lambda match: (-match.score, match.patient.name, match.patient.mrn))
+        return matches[:limit]
+
+    def resolve(self, name, dob=None, mrn=None, min_score=0.55, margin=0.1):
+        """The one patient a name (and optional date of birth or MRN) refers to, or None.
+
+        A name alone resolves only when it is exactly one patient's name
+        (ignoring case and punctuation): "Joan Doe" is not John Doe. A
+        misspelled name needs the date of birth to confirm it, and then only
+        resolves when its best match clearly beats the next one.
+        """
+        if mrn:
+            patient_id = self.by_mrn.get(mrn)
+            if patient_id is None:
+                return None
+            patient = self.patients[patient_id]
+            # The MRN must agree with whatever else was given
+            if dob is not None and patient.dob != dob:
+                return None
+            if name and self.score(normalize(name), patient) < min_score:
+                return None
+            return patient
+
+        # A unique exact name needs no fuzzy search
+        exact = [
+            self.patients[patient_id] for patient_id in self.by_name.get(normalize(name), ())
+            if dob is None or self.patients[patient_id].dob == dob
+        ]
+        if exact:
+            return exact[0] if len(exact) == 1 else None
+        if dob is None:
+            return None
+
+        # Also find runners-up within the margin, which make the best match ambiguous
+        matches = self.search(name, dob, limit=2, min_score=max(min_score - margin, 0.0))
+        if not matches or matches[0].score < min_score:
+            return None
+        if len(matches) > 1 and matches[0].score - matches[1].score < margin:
+            return None
+        return matches[0].patient
@@ -0,0 +1,173 @@
+# ============================================
+# Hospital Management System - Pharmacy
+# Drug catalog, stock levels and name/condition indexes
+# ============================================
+
+import csv
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+
+from nlp_utils import deletes, edit_distance
+
+Sku = namedtuple("Sku", "sku generic strength form")
+
+NAME_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(name):
+    return " ".join(NAME_RE.findall(name.lower()))
+
+
+class PharmacyInventory:
+    """Drug catalog with stock levels.
+
+    Drugs are keyed by generic name. Brand names are synonyms of their
+    generic. Names are found by exact match, then by prefix (binary search
+    over the sorted names), then by edit distance (at most 2) through a
+    single-delete index; names in free text by exact match only.
+    Conditions map to generics through an inverted index. Stock can be
+    adjusted concurrently with lookups.
+    """
+
+    def __init__(self):
+        self.skus = {}                     # sku -> Sku
+        self.stock = {}                    # sku -> quantity on hand
+        self.by_generic = defaultdict(list)  # generic -> [sku]
+        self.brands = defaultdict(set)     # generic -> brand names
+        self.names = {}                    # normalized generic or brand -> generic
+        self.sorted_names = []
+        self.delete_index = defaultdict(set)
+        self.by_condition = defaultdict(set)  # normalized condition -> generics
+        self.condition_words = defaultdict(set)  # word of a condition -> conditions
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.skus)
+
+    @classmethod
+    def load(cls, path):
+        """Load a catalog CSV with columns sku, generic, brands, strength, form, conditions, quantity.
+
+        Brands and conditions are ';'-separated lists.
+        """
+        inventory = cls()
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                inventory.add(
+                    row["sku"], row["generic"], row["strength"], row["form"], int(row["quantity"] or 0),
+                    brands=[brand for brand in row["brands"].split(";") if brand.strip()],
+                    conditions=[condition for condition in row["conditions"].split(";") if condition.strip()],
+                )
+        inventory.build_indexes()
+        return inventory
+
+    def add(self, sku, generic, strength, form, quantity, brands=(), conditions=()):
+        """Add one SKU; call build_indexes() after adding"""
+        generic = normalize(generic)
+        self.skus[sku] = Sku(sku, generic, strength, form)
+        self.stock[sku] = quantity
+        self.by_generic[generic].append(sku)
+        self.brands[generic].update(brand.strip() for brand in brands)
+        self.names[generic] = generic
+        for brand in brands:
+            self.names[normalize(brand)] = generic
+        for condition in conditions:
+            condition = normalize(condition)
+            self.by_condition[condition].add(generic)
+            for word in condition.split():
+                self.condition_words[word].add(condition)
+
+    def build_indexes(self):
+        self.sorted_names = sorted(self.names)
+        self.delete_index = defaultdict(set)
+        for name in self.names:
+            for variant in deletes(name) | {name}:
+                self.delete_index[variant].add(name)
+
+    def find(self, text):
+        """Return (generic, how) for a drug name, or (None, None); how is exact, prefix or fuzzy"""
+        name = normalize(text)
+        if not name:
+            return None, None
+        if name in self.names:
+            return self.names[name], "exact"
+
+        # Unique completion of a prefix ("amox" -> amoxicillin)
+        position = bisect_left(self.sorted_names, name)
+        completions = set()
+        for candidate in self.sorted_names[position:position + 8]:
+            if not candidate.startswith(name):
+                break
+            completions.add(self.names[candidate])
+        if len(completions) == 1 and len(name) >= 4:
+            return completions.pop(), "prefix"
+
+        # Misspellings within two edits ("ibuprophen" -> ibuprofen)
+        if len(name) >= 4:
+            variants = deletes(name) | {name}
+            candidates = set()
+            for variant in variants:
+                candidates |= self.delete_index.get(variant, set())
+            if not candidates and len(name) >= 7:
+                # Both edits on the typed side: a substitution plus an insertion ("ph" for "f")
+                for variant in {shorter for variant in variants for shorter in deletes(variant)}:
+                    candidates |= self.delete_index.get(variant, set())
+            scored = sorted((edit_distance(name, candidate), candidate) for candidate in candidates)
+            if scored and scored[0][0] <= 2:
+                return self.names[scored[0][1]], "fuzzy"
+        return None, None
+
+    def find_in(self, text):
+        """Find a drug named anywhere in free text, preferring the longest run of words.
+
+        Only exact generic or brand names count: completing or correcting
+        words of a sentence turns unrelated words into drugs ("the flu shot"
+        -> fluoxetine). Use find() for text that is known to be a drug name.
+        """
+        words = normalize(text).split()
+        for length in range(min(len(words), 4), 0, -1):
+            for start in range(len(words) - length + 1):
+                name = " ".join(words[start:start + length])
+                if name in self.names:
+                    return self.names[name], "exact"
+        return None, None
+
+    def availability(self, generic):
+        """[(Sku, quantity)] for a generic, in catalog order"""
+        return [(self.skus[sku], self.stock.get(sku, 0)) for sku in self.by_generic.get(generic, ())]
+
+    def in_stock(self, generic):
+        return any(self.stock.get(sku, 0) > 0 for sku in self.by_generic.get(generic, ()))
+
+    def for_condition(self, text):
+        """Sorted generics used for a condition named in free text"""
+        name = normalize(text)
+        if name in self.by_condition:
+            return sorted(self.by_condition[name])
+
+        # Conditions sharing the most words with the text ("pills for my blood pressure")
+        votes = defaultdict(int)
+        for word in name.split():
+            # "headaches" -> "headache"
+            conditions = self.condition_words.get(word) or self.condition_words.get(word.rstrip("s"), ())
+            for condition in conditions:
+                votes[condition] += 1
+        if not votes:
+            return []
+        best = max(votes.values())
+        generics = set()
+        for condition, count in votes.items():
+            if count == best and count >= len(condition.split()) / 2:
+                generics |= self.by_condition[condition]
+        return sorted(generics)
+
+    def adjust_stock(self, sku, delta):
+        """Change the quantity on hand (negative to dispense); returns the new quantity"""
+        with self.lock:
+            quantity = self.stock[sku] + delta
+            if quantity < 0:
+                raise ValueError(f"only {self.stock[sku]} of {sku} in stock")
+            self.stock[sku] = quantity
+            return quantity
@@ -0,0 +1,126 @@
+# ============================================
+# Hospital Management System - Pricing
+# Chargemaster prices and preparation instructions
+# ============================================
+
+import csv
+import math
+import re
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+
+from nlp_utils import deletes, edit_distance
+
+ChargeItem = namedtuple("ChargeItem", "code description kind price preparation")
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words that say what is being asked, not which item
+QUESTION_WORDS = frozenset(["a", "an", "the", "my", "cost", "costs", "price", "much", "how", "does", "for", "of", "get"])
+
+
+def tokens(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in QUESTION_WORDS]
+
+
+class PriceCatalog:
+    """Chargemaster items found by name, synonym or misspelling.
+
+    Every description and synonym is a name made of tokens, and an inverted
+    index maps each token to the names that contain it, so a lookup only
+    touches names sharing a token with the query. The best name is the one
+    whose IDF-weighted tokens the query covers most. Unknown query tokens
+    are first corrected to a known token within two edits. Recent lookups
+    are kept in an LRU cache.
+    """
+
+    def __init__(self, cache_size=512):
+        self.items = {}                   # code -> ChargeItem
+        self.names = []                   # (tokens, code)
+        self.token_index = defaultdict(list)  # token -> name ids
+        self.idf = {}
+        self.name_weights = []            # name id -> sum of its tokens' IDF
+        self.name_kinds = []              # name id -> kind of its item
+        self.delete_index = {}            # token with one letter deleted -> known tokens
+        self.find = lru_cache(maxsize=cache_size)(self.search)
+
+    def __len__(self):
+        return len(self.items)
+
+    @classmethod
+    def load(cls, path, cache_size=512):
+        """Load a CSV with columns code, description, type, price, synonyms (';'-separated), preparation"""
+        catalog = cls(cache_size)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                catalog.add(
+                    ChargeItem(row["code"], row["description"], row["type"], float(row["price"]), row["preparation"]),
+                    [synonym for synonym in row["synonyms"].split(";") if synonym.strip()],
+                )
+        catalog.build_indexes()
+        return catalog
+
+    def add(self, item, synonyms=()):
+        """Add an item; call build_indexes() after adding"""
+        self.items[item.code] = item
+        for name in [item.description, *synonyms]:
+            name_tokens = tuple(dict.fromkeys(tokens(name)))
+            if name_tokens:
+                self.names.append((name_tokens, item.code))
+
+    def build_indexes(self):
+        self.token_index = defaultdict(list)
+        for name_id, (name_tokens, code) in enumerate(self.names):
+            for token in name_tokens:
+                self.token_index[token].append(name_id)
+        self.idf = {
+            token: math.log(1 + len(self.names) / len(name_ids)) for token, name_ids in self.token_index.items()
+        }
+        self.name_weights = [sum(self.idf[token] for token in name_tokens) for name_tokens, code in self.names]
+        self.name_kinds = [self.items[code].kind for name_tokens, code in self.names]
+        delete_index = defaultdict(set)
+        for token in self.token_index:
+            if len(token) >= 4:
+                for variant in deletes(token) | {token}:
+                    delete_index[variant].add(token)
+        # Tuples take a fraction of the memory of sets and the index is read-only
+        self.delete_index = {variant: tuple(known) for variant, known in delete_index.items()}
+        self.find.cache_clear()
+
+    def correct(self, token):
+        """A known token for a query token, or None"""
+        if token in self.token_index:
+            return token
+        if len(token) < 4:
+            return None
+        candidates = set()
+        for variant in deletes(token) | {token}:
+            candidates.update(self.delete_index.get(variant, ()))
+        limit = 1 if len(token) < 6 else 2
+        scored = sorted((edit_distance(token, candidate), candidate) for candidate in candidates)
+        return scored[0][1] if scored and scored[0][0] <= limit else None
+
+    def search(self, text, kind=None, min_coverage=0.6):
+        """Best ChargeItem for free text, optionally only of one kind ("lab" or "procedure"), or None"""
+        query = set(filter(None, map(self.correct, tokens(text))))
+        if not query:
+            return None
+
+        # Only names that share a token with the query are scored
+        matched = defaultdict(float)
+        for token in query:
+            for name_id in self.token_index[token]:
+                matched[name_id] += self.idf[token]
+
+        best_id = None
+        best_key = None
+        name_weights = self.name_weights
+        name_kinds = self.name_kinds
+        for name_id, weight in matched.items():
+            coverage = weight / name_weights[name_id]
+            # Prefer names the query covers fully, then names that explain more of the query
+            if coverage < min_coverage or (kind and name_kinds[name_id] != kind):
+                continue
+            if best_key is None or (coverage, weight) > best_key:
+                best_id, best_key = name_id, (coverage, weight)
+        return None if best_id is None else self.items[self.names[best_id][1]]
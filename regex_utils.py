@@ -0,0 +1,225 @@
+# ============================================
+# Hospital Management System - Regex Utilities
+# Static safety checks for chatbot patterns
+# ============================================
+
+import re
+import warnings
+
+try:
+    from re import _parser as sre_parse
+    from re._constants import (
+        LITERAL, NOT_LITERAL, ANY, IN, RANGE, BRANCH, SUBPATTERN, AT,
+        MAX_REPEAT, MIN_REPEAT, ASSERT, ASSERT_NOT, MAXREPEAT
+    )
+except ImportError:  # Python < 3.11
+    import sre_parse
+    from sre_constants import (
+        LITERAL, NOT_LITERAL, ANY, IN, RANGE, BRANCH, SUBPATTERN, AT,
+        MAX_REPEAT, MIN_REPEAT, ASSERT, ASSERT_NOT, MAXREPEAT
+    )
+
+REPEATS = (MAX_REPEAT, MIN_REPEAT)
+
+
+class UnsafePatternWarning(UserWarning):
+    """A pattern may backtrack catastrophically on long input"""
+
+
+def first_chars(items):
+    """Return (chars, nullable) for a sequence of parsed regex items.
+
+    `chars` is the set of lowercase characters the sequence can start
+    with, or None if it can start with (almost) anything.
+    """
+    chars = set()
+    for op, av in items:
+        item_chars, nullable = item_first_chars(op, av)
+        if item_chars is None:
+            return None, False
+        chars |= item_chars
+        if not nullable:
+            return chars, False
+    return chars, True
+
+
+def item_first_chars(op, av):
+    if op == LITERAL:
+        return {chr(av).lower()}, False
+    if op in (NOT_LITERAL, ANY):
+        return None, False
+    if op == IN:
+        chars = set()
+        for in_op, in_av in av:
+            if in_op == LITERAL:
+                chars.add(chr(in_av).lower())
+            elif in_op == RANGE and in_av[1] - in_av[0] <= 256:
+                chars.update(chr(c).lower() for c in range(in_av[0], in_av[1] + 1))
+            else:
+                # Categories (\w, \s, ...) and negated or huge sets
+                return None, False
+        return chars, False
+    if op == SUBPATTERN:
+        return first_chars(av[-1])
+    if op == BRANCH:
+        chars = set()
+        nullable = False
+        for alternative in av[1]:
+            alt_chars, alt_nullable = first_chars(alternative)
+            if alt_chars is None:
+                return None, False
+            chars |= alt_chars
+            nullable = nullable or alt_nullable
+        return chars, nullable
+    if op in REPEATS:
+        min_count, max_count, body = av
+        body_chars, body_nullable = first_chars(body)
+        return body_chars, min_count == 0 or body_nullable
+    if op in (AT, ASSERT, ASSERT_NOT):
+        return set(), True
+    # Group references and anything unusual: assume the worst
+    return None, True
+
+
+def overlaps(a, b):
+    if a is None or b is None:
+        return True
+    return bool(a & b)
+
+
+def contains_repeat(items):
+    """True if the items contain a variable-count quantifier that can repeat more than once"""
+    for op, av in items:
+        if op in REPEATS and av[1] > 1 and av[0] != av[1]:
+            return True
+        if op == SUBPATTERN and contains_repeat(av[-1]):
+            return True
+        if op == BRANCH and any(contains_repeat(alt) for alt in av[1]):
+            return True
+    return False
+
+
+def leading_repeats(op, av):
+    """First characters of each unbounded quantifier an item can start its match with,
+    looking inside groups and alternations ("(.+)" starts with ".+")"""
+    if op in REPEATS:
+        return [first_chars(av[2])[0]] if av[1] == MAXREPEAT else []
+    if op == SUBPATTERN:
+        alternatives = [av[-1]]
+    elif op == BRANCH:
+        alternatives = av[1]
+    else:
+        return []
+    found = []
+    for items in alternatives:
+        for item_op, item_av in items:
+            found.extend(leading_repeats(item_op, item_av))
+            if not item_first_chars(item_op, item_av)[1]:
+                break
+    return found
+
+
+def lint_items(items, problems, in_unbounded_repeat=False):
+    items = list(items)
+    for index, (op, av) in enumerate(items):
+        if op in REPEATS:
+            min_count, max_count, body = av
+            unbounded = max_count == MAXREPEAT
+            if unbounded and contains_repeat(body):
+                problems.append("nested quantifier: a repeated group contains another quantifier")
+            if unbounded:
+                # Another unbounded quantifier right after this one that can match the same text
+                body_chars, _ = first_chars(body)
+                for next_op, next_av in items[index + 1:]:
+                    if any(overlaps(body_chars, chars) for chars in leading_repeats(next_op, next_av)):
+                        problems.append("adjacent quantifiers can match the same characters")
+                        break
+                    if next_op in REPEATS and next_av[1] == MAXREPEAT:
+                        break
+                    if not item_first_chars(next_op, next_av)[1]:
+                        break
+            lint_items(body, problems, in_unbounded_repeat or unbounded)
+        elif op == SUBPATTERN:
+            lint_items(av[-1], problems, in_unbounded_repeat)
+        elif op == BRANCH:
+            alternatives = av[1]
+            if in_unbounded_repeat:
+                starts = [first_chars(alt)[0] for alt in alternatives]
+                for i in range(len(starts)):
+                    if any(overlaps(starts[i], starts[j]) for j in range(i + 1, len(starts))):
+                        problems.append("ambiguous alternation inside a repeated group")
+                        break
+            for alt in alternatives:
+                lint_items(alt, problems, in_unbounded_repeat)
+        elif op in (ASSERT, ASSERT_NOT):
+            lint_items(av[1], problems, in_unbounded_repeat)
+
+
+def lint_pattern(pattern, flags=0):
+    """Return a list of problems that can cause catastrophic backtracking"""
+    problems = []
+    lint_items(sre_parse.parse(pattern, flags), problems)
+    # Keep each message once, in order
+    return list(dict.fromkeys(problems))
+
+
+def lint_patterns(patterns, flags=re.IGNORECASE):
+    """Lint (name, pattern) pairs and warn about unsafe ones; returns {name: problems}"""
+    report = {}
+    for name, pattern in patterns:
+        problems = lint_pattern(pattern, flags)
+        if problems:
+            report[name] = problems
+            warnings.warn(f"{name}: {'; '.join(problems)} in {pattern!r}", UnsafePatternWarning, stacklevel=3)
+    return report
+
+
+def generate_examples(pattern, flags=0, limit=12):
+    """Generate example utterances that a pattern matches.
+
+    Each example picks a different alternative from every alternation, so
+    together they cover the wording a pattern accepts. Capturing groups are
+    free-text slots and are left out.
+    """
+    items = sre_parse.parse(pattern, flags)
+    count = min(max(widest_branch(items), 2), limit)
+    examples = []
+    for variant in range(count):
+        text = " ".join("".join(render_items(items, variant)).split())
+        if text and text not in examples:
+            examples.append(text)
+    return examples
+
+
+def widest_branch(items):
+    widest = 1
+    for op, av in items:
+        if op == BRANCH:
+            widest = max(widest, len(av[1]), *(widest_branch(alt) for alt in av[1]))
+        elif op == SUBPATTERN:
+            widest = max(widest, widest_branch(av[-1]))
+        elif op in REPEATS:
+            widest = max(widest, widest_branch(av[2]))
+    return widest
+
+
+def render_items(items, variant):
+    for op, av in items:
+        if op == LITERAL:
+            yield chr(av)
+        elif op == IN:
+            # Only single-character sets that are plain literals are worth rendering
+            if len(av) == 1 and av[0][0] == LITERAL:
+                yield chr(av[0][1])
+        elif op == SUBPATTERN:
+            group = av[0]
+            if group is None:
+                yield from render_items(av[-1], variant)
+        elif op == BRANCH:
+            alternatives = av[1]
+            yield from render_items(alternatives[variant % len(alternatives)], variant)
+        elif op in REPEATS:
+            min_count, max_count, body = av
+            # Optional parts are included in every other example
+            if min_count > 0 or variant % 2 == 0:
+                yield from render_items(body, variant)
@@ -0,0 +1,160 @@
+# ============================================
+# Hospital Management System - Scheduling
+# Bitmap calendars for finding and booking free appointment slots
+# ============================================
+
+import heapq
+import threading
+from collections import defaultdict, namedtuple
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+Slot = namedtuple("Slot", "start doctor version")
+
+
+class BookingConflict(Exception):
+    """The requested time overlaps an existing booking"""
+
+
+class StaleBooking(BookingConflict):
+    """The doctor's calendar for that day changed since the slot was offered"""
+
+
+class DoctorCalendar:
+    """Busy slots of one doctor as one bitmask per day (bit i = slot i of the day is booked)"""
+
+    __slots__ = ("name", "specialty", "busy", "versions", "lock")
+
+    def __init__(self, name, specialty=None):
+        self.name = name
+        self.specialty = specialty
+        self.busy = {}      # date ordinal -> bitmask of booked slots
+        self.versions = {}  # date ordinal -> number of changes to that day
+        self.lock = threading.Lock()
+
+
+class Scheduler:
+    """Finds and books appointment slots on a fixed grid.
+
+    Each working day has `slots_per_day` slots of `slot_minutes` starting at
+    `day_start`. A doctor's day is a single integer bitmask, so finding k
+    consecutive free slots is a few shifts and ANDs, and a day with no
+    bookings costs no memory.
+
+    Booking is optimistic: queries return each slot with the version of the
+    doctor's day, and book() fails with StaleBooking if that day changed in
+    the meantime, or with BookingConflict if the slots are taken. Only the
+    commit takes the doctor's lock; queries never lock.
+    """
+
+    def __init__(self, slot_minutes=30, day_start=time(8, 0), day_end=time(17, 0), working_days=(0, 1, 2, 3, 4)):
+        self.slot_minutes = slot_minutes
+        self.day_start = day_start.hour * 60 + day_start.minute
+        self.slots_per_day = (day_end.hour * 60 + day_end.minute - self.day_start) // slot_minutes
+        self.day_mask = (1 << self.slots_per_day) - 1
+        self.working_days = frozenset(working_days)
+        self.calendars = {}
+        self.by_specialty = defaultdict(list)
+
+    def add_doctor(self, name, specialty=None):
+        calendar = DoctorCalendar(name, specialty)
+        self.calendars[key(name)] = calendar
+        if specialty:
+            self.by_specialty[specialty.lower()].append(calendar)
+        return calendar
+
+    def calendar(self, doctor):
+        calendar = self.calendars.get(key(doctor))
+        if calendar is None:
+            raise KeyError(f"unknown doctor: {doctor}")
+        return calendar
+
+    def slot_range(self, start, duration):
+        """Return (date ordinal, first slot, bitmask) for an appointment; raises ValueError off the grid"""
+        minutes = start.hour * 60 + start.minute - self.day_start
+        count = -(-duration // self.slot_minutes)
+        if (start.weekday() not in self.working_days or minutes < 0 or minutes % self.slot_minutes
+                or start.second or start.microsecond or minutes // self.slot_minutes + count > self.slots_per_day):
+            raise ValueError(f"{start:%Y-%m-%d %H:%M} is not a bookable slot")
+        first = minutes // self.slot_minutes
+        return start.toordinal(), first, ((1 << count) - 1) << first
+
+    def free_slots(self, calendar, after, duration=30, horizon_days=90):
+        """Yield Slots where `duration` minutes are free for one doctor, in time order"""
+        count = -(-duration // self.slot_minutes)
+        first_day = after.date()
+        for offset in range(horizon_days):
+            day = first_day + timedelta(days=offset)
+            if day.weekday() not in self.working_days:
+                continue
+            ordinal = day.toordinal()
+            version = calendar.versions.get(ordinal, 0)
+            free = self.day_mask & ~calendar.busy.get(ordinal, 0)
+            if offset == 0:
+                # Drop slots that start before `after`
+                minutes = after.hour * 60 + after.minute - self.day_start
+                free &= self.day_mask << max(-(-minutes // self.slot_minutes), 0)
+
+            # Bit i survives only if slots i .. i + count - 1 are all free
+            starts = free
+            for shift in range(1, count):
+                starts &= free >> shift
+
+            day_start = datetime.combine(day, time()) + timedelta(minutes=self.day_start)
+            while starts:
+                lowest = starts & -starts
+                slot = lowest.bit_length() - 1
+                yield Slot(day_start + timedelta(minutes=slot * self.slot_minutes), calendar.name, version)
+                starts ^= lowest
+
+    def next_free_slots(self, doctor=None, specialty=None, after=None, count=3, duration=30, horizon_days=90):
+        """The first `count` free Slots for a doctor, or across all doctors of a specialty"""
+        after = after or datetime.now()
+        if doctor is not None:
+            calendars = [self.calendar(doctor)]
+        else:
+            calendars = self.by_specialty.get((specialty or "").lower(), [])
+        streams = [self.free_slots(calendar, after, duration, horizon_days) for calendar in calendars]
+        return list(islice(heapq.merge(*streams), count))
+
+    def version(self, doctor, day):
+        return self.calendar(doctor).versions.get(day.toordinal(), 0)
+
+    def book(self, doctor, start, duration=30, expected_version=None):
+        """Mark a slot as booked; returns the new version of the doctor's day.
+
+        Pass the version from the offered Slot as expected_version to fail with
+        StaleBooking instead of booking against a calendar that changed.
+        """
+        calendar = self.calendar(doctor)
+        ordinal, first, mask = self.slot_range(start, duration)
+        with calendar.lock:
+            version = calendar.versions.get(ordinal, 0)
+            if expected_version is not None and version != expected_version:
+                raise StaleBooking(f"{calendar.name}'s calendar for {start:%Y-%m-%d} changed; please pick a slot again")
+            busy = calendar.busy.get(ordinal, 0)
+            if busy & mask:
+                raise BookingConflict(f"{calendar.name} is not available at {start:%Y-%m-%d %H:%M}")
+            calendar.busy[ordinal] = busy | mask
+            calendar.versions[ordinal] = version + 1
+            return version + 1
+
+    def release(self, doctor, start, duration=30):
+        """Free a booked slot, e.g. after a cancellation"""
+        calendar = self.calendar(doctor)
+        ordinal, first, mask = self.slot_range(start, duration)
+        with calendar.lock:
+            busy = calendar.busy.get(ordinal, 0) & ~mask
+            if busy:
+                calendar.busy[ordinal] = busy
+            else:
+                calendar.busy.pop(ordinal, None)
+            calendar.versions[ordinal] = calendar.versions.get(ordinal, 0) + 1
+
+
+def key(name):
+    # "Dr. Smith", "dr smith" and "Smith" are the same doctor
+    words = name.lower().replace(".", " ").split()
+    if words and words[0] in ("dr", "doctor"):
+        words = words[1:]
+    return " ".join(words)
@@ -0,0 +1,141 @@
+# ============================================
+# Hospital Management System - Sessions
+# Per-conversation state with bounded memory
+# ============================================
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class Session:
+    """State for one conversation: last intent, its entities and the patient the user resolved to"""
+
+    __slots__ = (
+        "session_id", "user_name", "patient_name", "last_pattern", "last_category",
+        "last_query", "entities", "turns", "created", "last_seen", "size", "lock"
+    )
+
+    def __init__(self, session_id, user_name=None, patient_name=None):
+        self.session_id = session_id
+        self.user_name = user_name
+        self.patient_name = patient_name  # Resolved once per session instead of every turn
+        self.last_pattern = None   # Index into HospitalChatbot.compiled_patterns
+        self.last_category = None
+        self.last_query = None
+        self.entities = []         # Entities of last_query, with spans into it
+        self.turns = 0
+        self.created = self.last_seen = time.monotonic()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def record_turn(self, pattern_index, category, matched_query, entities):
+        """Remember the intent of this turn with the query text that matched it and that text's entities"""
+        with self.lock:
+            if pattern_index is not None:
+                self.last_pattern = pattern_index
+                self.last_category = category
+                self.last_query = matched_query
+                self.entities = entities
+            self.turns += 1
+
+    def estimate_size(self):
+        """Approximate retained bytes of this session"""
+        size = sys.getsizeof(self) + sys.getsizeof(self.last_query or "") + sys.getsizeof(self.user_name or "")
+        size += sys.getsizeof(self.patient_name or "")
+        size += sum(sys.getsizeof(entity) + sys.getsizeof(entity.text) for entity in self.entities)
+        return size
+
+
+class SessionManager:
+    """Thread-safe session store with LRU, idle-timeout and memory-cap eviction.
+
+    Sessions are kept in access order; the least recently used ones are
+    dropped when there are more than `max_sessions`, when their estimated
+    total size exceeds `max_bytes`, or when they have been idle for longer
+    than `ttl` seconds.
+    """
+
+    def __init__(self, max_sessions=10000, ttl=1800, max_bytes=64 * 1024 * 1024, resolve_name=None):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.resolve_name = resolve_name  # user_name -> registered patient name, called once per name
+        self.sessions = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def get(self, session_id):
+        """Return a live session or None"""
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return None
+            if time.monotonic() - session.last_seen > self.ttl:
+                self.remove(session_id)
+                return None
+            self.sessions.move_to_end(session_id)
+            session.last_seen = time.monotonic()
+            return session
+
+    def get_or_create(self, session_id, user_name=None):
+        session = self.get(session_id)
+        if session is not None:
+            if user_name and user_name != session.user_name:
+                # A new name was entered mid-conversation; resolve it again
+                with session.lock:
+                    session.user_name = user_name
+                    session.patient_name = self.resolve_name(user_name) if self.resolve_name else user_name
+                self.update_size(session)
+            return session
+
+        patient_name = self.resolve_name(user_name) if self.resolve_name and user_name else user_name
+        session = Session(session_id, user_name, patient_name)
+        with self.lock:
+            # Another thread may have created the same session in the meantime
+            existing = self.sessions.get(session_id)
+            if existing is not None:
+                return existing
+            self.sessions[session_id] = session
+            session.size = session.estimate_size()
+            self.total_bytes += session.size
+            self.evict()
+        return session
+
+    def update_size(self, session):
+        """Re-estimate a session's size after it changed, evicting others if needed"""
+        size = session.estimate_size()
+        with self.lock:
+            if self.sessions.get(session.session_id) is session:
+                self.total_bytes += size - session.size
+                session.size = size
+                self.evict()
+
+    def end(self, session_id):
+        with self.lock:
+            self.remove(session_id)
+
+    def prune(self):
+        """Drop all sessions that have been idle longer than the TTL"""
+        cutoff = time.monotonic() - self.ttl
+        with self.lock:
+            expired = [sid for sid, session in self.sessions.items() if session.last_seen < cutoff]
+            for session_id in expired:
+                self.remove(session_id)
+        return len(expired)
+
+    def remove(self, session_id):
+        # Caller holds self.lock
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self.total_bytes -= session.size
+
+    def evict(self):
+        # Caller holds self.lock; the newest session is never evicted
+        while len(self.sessions) > 1 and (len(self.sessions) > self.max_sessions or self.total_bytes > self.max_bytes):
+            session_id, session = self.sessions.popitem(last=False)
+            self.total_bytes -= session.size
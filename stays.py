@@ -0,0 +1,148 @@
+# ============================================
+# Hospital Management System - Length of Stay
+# Per-condition length-of-stay statistics from discharge records
+# ============================================
+
+import csv
+import io
+import re
+import threading
+from array import array
+from collections import defaultdict, namedtuple
+from datetime import datetime
+
+StayStats = namedtuple("StayStats", "count mean median p90")
+
+NAME_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(name):
+    return " ".join(NAME_RE.findall(name.lower()))
+
+
+def percentile(values, fraction):
+    """Linear-interpolated percentile of a sorted, non-empty sequence"""
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class StayStatistics:
+    """Length-of-stay mean, median and 90th percentile per condition.
+
+    Stays are read from a CSV of discharge records (admission_id, condition,
+    admitted, discharged). Each condition keeps its stays in days as a
+    sorted array of doubles, with a running total, and a table maps each
+    condition to its precomputed StayStats, so a question is a dict lookup.
+
+    The file is read from a byte offset: refresh() reads only the records
+    appended since the last read. The new stays are merged into the arrays
+    of the conditions they belong to, and only those conditions' statistics
+    are recomputed. Records that cannot be parsed are counted in `rejected`
+    and skipped.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0                    # bytes of the file read so far
+        self.fields = None                 # header of the file
+        self.rejected = 0                  # records skipped because they could not be parsed
+        self.stays = {}                    # condition -> array of stays in days, sorted
+        self.totals = defaultdict(float)   # condition -> sum of its stays
+        self.table = {}                    # condition -> StayStats
+        self.condition_words = defaultdict(set)  # word of a condition -> conditions
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(stays) for stays in self.stays.values())
+
+    @classmethod
+    def load(cls, path):
+        statistics = cls(path)
+        statistics.refresh()
+        return statistics
+
+    def refresh(self):
+        """Read records appended to the file since the last read; returns the number added"""
+        with self.lock:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+            # A record still being written has no newline yet; leave it for the next refresh
+            end = data.rfind(b"\n") + 1
+            if not end:
+                return 0
+            rows = csv.reader(io.StringIO(data[:end].decode("utf-8", errors="replace")))
+            fields = self.fields
+            if fields is None:
+                fields = {name: index for index, name in enumerate(next(rows))}
+                missing = {"condition", "admitted", "discharged"} - fields.keys()
+                if missing:
+                    raise ValueError(f"{self.path} has no {', '.join(sorted(missing))} column")
+
+            # Parse every record before changing anything, so a failure leaves the offset where it was
+            condition_field = fields["condition"]
+            admitted_field = fields["admitted"]
+            discharged_field = fields["discharged"]
+            new_stays = defaultdict(list)
+            rejected = 0
+            for row in rows:
+                if not row:
+                    continue
+                try:
+                    admitted = datetime.fromisoformat(row[admitted_field])
+                    discharged = datetime.fromisoformat(row[discharged_field])
+                    condition = normalize(row[condition_field])
+                except (IndexError, ValueError):
+                    rejected += 1
+                    continue
+                if not condition or discharged < admitted:
+                    rejected += 1
+                    continue
+                new_stays[condition].append((discharged - admitted).total_seconds() / 86400)
+
+            self.fields = fields
+            self.offset += end
+            self.rejected += rejected
+            for condition, days in new_stays.items():
+                self.add(condition, days)
+            return sum(len(days) for days in new_stays.values())
+
+    def add(self, condition, days):
+        # Caller holds self.lock; merges stays into one condition and updates its statistics
+        stays = self.stays.get(condition)
+        if stays is None:
+            stays = array("d")
+            for word in condition.split():
+                self.condition_words[word].add(condition)
+        stays.extend(days)
+        # Timsort merges the sorted run already there with the new stays
+        stays = self.stays[condition] = array("d", sorted(stays))
+        self.totals[condition] += sum(days)
+        self.table[condition] = StayStats(
+            len(stays), self.totals[condition] / len(stays), percentile(stays, 0.5), percentile(stays, 0.9)
+        )
+
+    def find(self, text):
+        """Return (condition, StayStats) for a condition named in free text, or (None, None)"""
+        name = normalize(text)
+        stats = self.table.get(name)
+        if stats is not None:
+            return name, stats
+
+        # The condition sharing the most words with the text ("a knee replacement surgery");
+        # the lock keeps refresh() from adding conditions mid-vote
+        votes = defaultdict(int)
+        with self.lock:
+            for word in name.split():
+                # "fractures" -> "fracture"
+                conditions = self.condition_words.get(word) or self.condition_words.get(word.rstrip("s"), ())
+                for condition in conditions:
+                    votes[condition] += 1
+        if not votes:
+            return None, None
+        condition = min(votes, key=lambda condition: (-votes[condition] / len(condition.split()), -votes[condition], condition))
+        if votes[condition] < len(condition.split()) / 2:
+            return None, None
+        return condition, self.table[condition]
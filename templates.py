@@ -0,0 +1,66 @@
+# ============================================
+# Hospital Management System - Response Templates
+# Responses compiled once into constant or slot-fill form
+# ============================================
+
+from string import Formatter
+
+
+class ResponseTemplate:
+    """A chatbot response compiled from template text.
+
+    Template text may contain `{name}` for a shared fragment (phone
+    numbers, URLs, addresses), `{1}`, `{2}`, ... for groups of the
+    pattern match and `{{`/`}}` for literal braces. Fragments are resolved
+    when the template is compiled, so a template without match groups is a
+    constant and rendering it returns the same string every time. Templates
+    are called like the response functions they replace: template(match, user).
+    """
+
+    __slots__ = ("text", "format_string", "groups")
+
+    def __init__(self, source, fragments=None):
+        fragments = fragments or {}
+        parts = []
+        groups = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if spec or conversion:
+                raise ValueError(f"format specs are not supported in response templates: {{{field}}}")
+            if field.isdigit():
+                parts.append(f"{{{len(groups)}}}")
+                groups.append(int(field))
+            elif field in fragments:
+                parts.append(fragments[field].replace("{", "{{").replace("}", "}}"))
+            else:
+                raise ValueError(f"unknown fragment {{{field}}} in response template")
+
+        if groups:
+            self.text = None
+            self.format_string = "".join(parts)
+            self.groups = tuple(groups)
+        else:
+            # Constant response: undo the brace escaping and keep the final text
+            self.text = "".join(parts).format()
+            self.format_string = None
+            self.groups = ()
+
+    def __call__(self, match, user=None):
+        if self.text is not None:
+            return self.text
+        values = match.group(*self.groups)
+        if len(self.groups) == 1:
+            values = (values,)
+        return self.format_string.format(*values)
+
+    def __repr__(self):
+        return f"ResponseTemplate({(self.format_string or self.text)!r})"
+
+
+def compile_response(response, fragments=None):
+    """Compile a template string; callables (responses computed by helpers) are kept as they are"""
+    if callable(response):
+        return response
+    return ResponseTemplate(response, fragments)
@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from HMS import HospitalChatbot  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def chatbot():
+    return HospitalChatbot()
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from eligibility import EligibilityClient, EligibilityError
+from mock_payer import MockPayerServer
+
+
+@pytest.fixture
+def payer():
+    server = MockPayerServer(latency=0).start()
+    yield server
+    server.stop()
+
+
+def test_check_is_cached(payer):
+    client = EligibilityClient(payer.url, batch_window=0)
+    first = client.check("Aetna", "W634225816")
+    assert client.check("Aetna", "W634225816") == first
+    assert payer.requests == 1
+    assert client.hits == 1
+    client.close()
+
+
+def test_inflight_is_cleared_after_an_unexpected_exception():
+    client = EligibilityClient("http://127.0.0.1:9", batch_window=0.05)
+    sent = threading.Event()
+
+    def post(body):
+        sent.set()
+        raise TypeError("malformed response")
+
+    client.post = post
+    raised = []
+
+    def check():
+        try:
+            client.check("Aetna", "W1")
+        except Exception as exc:
+            raised.append(type(exc))
+
+    # The first caller sends the batch; the second joins it within the window and waits for the answer
+    threads = [threading.Thread(target=check) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert sent.is_set()
+    # The sender sees the bug itself; the waiter gets an EligibilityError instead of hanging
+    assert sorted(raised, key=lambda kind: kind.__name__) == [EligibilityError, TypeError]
+    assert client.coalesced == 1
+    assert client.inflight == {}
+    assert client.batch == []
+
+
+def test_unreachable_service_fails_every_check():
+    client = EligibilityClient("http://127.0.0.1:9", batch_window=0, timeout=0.5)
+    with pytest.raises(EligibilityError):
+        client.check("Aetna", "W1")
+    assert client.inflight == {}
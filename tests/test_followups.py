@@ -0,0 +1,40 @@
+import itertools
+
+import pytest
+
+sessions = itertools.count()
+
+
+@pytest.fixture
+def ask(chatbot):
+    """Ask questions within one new session; returns (response, category)"""
+    session_id = f"test-{next(sessions)}"
+    return lambda query: chatbot.answer_query(query, None, session_id)
+
+
+def test_follow_up_swaps_the_medication(ask):
+    ask("do you have aspirin")
+    response, category = ask("and what about ibuprofen?")
+    assert category == "pharmacy"
+    assert "Ibuprofen" in response
+    assert "Aspirin" not in response
+
+
+@pytest.mark.parametrize("follow_up", [
+    "and what about the weather in paris?",
+    "what if I die",
+    "and what about Saturday?",
+])
+def test_unrelated_follow_up_does_not_replay_the_previous_answer(ask, follow_up):
+    hours, category = ask("what are your working hours")
+    assert category is not None
+    response, category = ask(follow_up)
+    assert response != hours
+    assert category is None
+
+
+def test_follow_up_that_matches_on_its_own_is_answered_on_its_own(ask):
+    ask("do you have aspirin")
+    response, category = ask("also what are the visiting hours")
+    assert category == "visitor"
+    assert "Aspirin" not in response
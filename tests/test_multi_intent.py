@@ -0,0 +1,28 @@
+import itertools
+
+sessions = itertools.count()
+
+
+def test_detect_intents_finds_every_clause(chatbot):
+    intents, corrected_query = chatbot.detect_intents("what are visiting hours and where do I park")
+    assert [intent["text"] for intent in intents] == ["what are visiting hours", "where do I park"]
+
+
+def test_multi_intent_turn_is_recorded_in_the_session(chatbot):
+    session_id = f"multi-{next(sessions)}"
+    response, categories = chatbot.answer_multi_query(
+        "what are visiting hours and do you have aspirin", None, session_id)
+    assert categories[-1] == "pharmacy"
+    assert "Aspirin" in response
+
+    response, category = chatbot.answer_query("and what about ibuprofen?", None, session_id)
+    assert category == "pharmacy"
+    assert "Ibuprofen" in response
+    assert "Aspirin" not in response
+
+
+def test_process_query_keeps_the_session_with_multi_intent(chatbot):
+    session_id = f"multi-{next(sessions)}"
+    chatbot.process_query("do you have aspirin", multi_intent=True, session_id=session_id)
+    response = chatbot.process_query("and what about ibuprofen?", multi_intent=True, session_id=session_id)
+    assert "Ibuprofen" in response
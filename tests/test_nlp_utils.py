@@ -0,0 +1,25 @@
+import pytest
+
+from nlp_utils import extract_entities
+
+
+@pytest.mark.parametrize("query", ["er what time is it", "er, what time is it", "Er... what time is it"])
+def test_leading_er_is_a_hesitation(chatbot, query):
+    corrected_query, rewritten_spans = chatbot.normalize_query(query)
+    assert "emergency" not in corrected_query
+    response, category = chatbot.answer_query(query)
+    assert category != "emergency"
+    assert not any(entity.type == "department" for entity in extract_entities(query))
+
+
+def test_hesitation_does_not_hide_the_question(chatbot):
+    response, category = chatbot.answer_query("er, where is the pharmacy")
+    assert category == "pharmacy"
+
+
+@pytest.mark.parametrize("query", ["where is the er", "where is the ER?", "ER what are the hours", "er wait times", "where is the E.R.?"])
+def test_er_abbreviation_is_expanded(chatbot, query):
+    corrected_query, rewritten_spans = chatbot.normalize_query(query)
+    assert "emergency room" in corrected_query
+    response, category = chatbot.answer_query(query)
+    assert category == "emergency"
@@ -0,0 +1,23 @@
+from datetime import date
+
+import pytest
+
+
+@pytest.mark.parametrize("name", ["Joan Doe", "Johnny Doe", "Jhon Doe", "Jane Doe"])
+def test_near_miss_name_alone_does_not_resolve(chatbot, name):
+    assert chatbot.resolve_patient_name(name) == name
+    assert chatbot.patients.resolve(name) is None
+
+
+def test_exact_name_resolves_ignoring_case(chatbot):
+    assert chatbot.resolve_patient_name("john doe") == "John Doe"
+
+
+def test_misspelled_name_resolves_with_date_of_birth(chatbot):
+    assert chatbot.resolve_patient_name("Jhon Doe", dob=date(1985, 2, 14)) == "John Doe"
+    assert chatbot.resolve_patient_name("Jhon Doe", dob=date(1990, 1, 1)) == "Jhon Doe"
+
+
+def test_near_miss_name_sees_no_appointments(chatbot):
+    response, category = chatbot.answer_query("when is my next appointment", "Joan Doe")
+    assert "John Doe" not in response
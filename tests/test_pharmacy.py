@@ -0,0 +1,45 @@
+import pytest
+
+from HMS import HospitalChatbot
+from pharmacy import PharmacyInventory
+
+
+@pytest.fixture(scope="module")
+def inventory():
+    return PharmacyInventory.load(HospitalChatbot.PHARMACY_CATALOG_PATH)
+
+
+@pytest.mark.parametrize("text", ["do you have the flu shot", "do you have a flu test", "is the fluid in stock"])
+def test_free_text_is_not_completed_to_a_drug(inventory, text):
+    assert inventory.find_in(text) == (None, None)
+
+
+def test_free_text_finds_brand_and_generic_names(inventory):
+    assert inventory.find_in("do you have extra strength tylenol") == ("acetaminophen", "exact")
+    assert inventory.find_in("is ibuprofen in stock") == ("ibuprofen", "exact")
+
+
+def test_find_still_completes_and_corrects_a_bare_name(inventory):
+    assert inventory.find("amox") == ("amoxicillin", "prefix")
+    assert inventory.find("ibuprofn") == ("ibuprofen", "fuzzy")
+    assert inventory.find("ibuprophen") == ("ibuprofen", "fuzzy")
+    assert inventory.find("flu") == (None, None)
+
+
+@pytest.mark.parametrize("query", ["do you have the flu shot", "do you have flu"])
+def test_flu_questions_are_not_answered_with_fluoxetine(chatbot, query):
+    response, category = chatbot.answer_query(query)
+    assert "Fluoxetine" not in response
+
+
+@pytest.mark.parametrize("query, drug", [
+    ("do you have famotadine", "Famotidine"),
+    ("do you have zyrtek", "Cetirizine"),
+    ("do you have ibuprophen", "Ibuprofen"),
+    ("do you have amox", "Amoxicillin"),
+    ("do you have any amox in stock", "Amoxicillin"),
+])
+def test_misspelled_or_shortened_drug_slot_is_found(chatbot, query, drug):
+    response, category = chatbot.answer_query(query)
+    assert category == "pharmacy"
+    assert drug in response
@@ -0,0 +1,37 @@
+import re
+
+import pytest
+
+from regex_utils import generate_examples, lint_pattern
+
+
+@pytest.mark.parametrize("pattern", [
+    r"check in\s*.+",
+    r"check in\s*(.+)",
+    r"check in\s+(?:with\s+)?(.+)",
+    r"(\w+)\s*(?:x|(.+))",
+    r"(a+)+b",
+])
+def test_unsafe_patterns_are_reported(pattern):
+    assert lint_pattern(pattern)
+
+
+@pytest.mark.parametrize("pattern", [
+    r"check in (.+)",
+    r"a (\d+) b",
+    r"(?:do you|does the pharmacy) (?:have|carry) ([a-zA-Z\s]+)(?:\?)?",
+    r"(\d+)-(\d+)",
+])
+def test_safe_patterns_are_clean(pattern):
+    assert lint_pattern(pattern) == []
+
+
+def test_chatbot_patterns_are_clean(chatbot):
+    assert dict(chatbot.state.pattern_warnings) == {}
+
+
+def test_generated_examples_match_their_pattern():
+    pattern = r"(?:what|which) (?:are|is) (?:the|your) (?:visiting|visitor) hours"
+    examples = generate_examples(pattern, re.IGNORECASE)
+    assert examples
+    assert all(re.fullmatch(pattern, example, re.IGNORECASE) for example in examples)
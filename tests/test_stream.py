@@ -0,0 +1,52 @@
+import io
+import json
+import time
+
+import pytest
+
+from HMS import HospitalChatbot, read_queries, run_stream
+
+
+def stream(tmp_path, lines, **options):
+    path = tmp_path / "queries.jsonl"
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    output = io.StringIO()
+    run_stream([str(path)], **options, output=output)
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_session_turns_are_answered_in_order_with_several_workers(tmp_path, monkeypatch, ordered):
+    answer_query = HospitalChatbot.answer_query
+
+    def slow_first_turn(self, query, user_name=None, session_id=None):
+        # Give a follow-up every chance to overtake the turn it refers to
+        if "aspirin" in query:
+            time.sleep(0.01)
+        return answer_query(self, query, user_name, session_id)
+
+    monkeypatch.setattr(HospitalChatbot, "answer_query", slow_first_turn)
+    lines = []
+    for session in range(20):
+        lines.append(json.dumps({"query": "do you have aspirin", "session": f"s{session}"}))
+        lines.append(json.dumps({"query": "and what about ibuprofen?", "session": f"s{session}"}))
+    results = stream(tmp_path, lines, workers=4, ordered=ordered)
+    follow_ups = [result for result in results if result["query"].startswith("and")]
+    assert len(follow_ups) == 20
+    for result in follow_ups:
+        assert result["category"] == "pharmacy"
+        assert "Ibuprofen" in result["response"]
+
+
+def test_unreadable_lines_become_error_records(tmp_path):
+    lines = ['{"query": "hello"}', "{bad json", '{"query": 5}', '{"query": "thanks"}']
+    results = stream(tmp_path, lines, workers=1)
+    assert [result["query"] for result in results] == ["hello", None, None, "thanks"]
+    assert [result.get("line") for result in results] == [None, 2, 3, None]
+    assert "invalid JSON" in results[1]["error"]
+
+
+def test_read_queries_keeps_extra_fields(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    path.write_text('{"query": "hi", "user": "Amy", "id": 7}\nplain text\n', encoding="utf-8")
+    assert list(read_queries([str(path)])) == [("hi", "Amy", {"id": 7}), ("plain text", None, {})]
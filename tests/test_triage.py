@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from triage import Acuity, Fenwick, TriageQueue, assess
+
+
+@pytest.mark.parametrize("text", [
+    "I ate lunch and took an aspirin",
+    "I ate dinner, then took my aspirin",
+    "I took too many naps and now need aspirin",
+])
+def test_medication_away_from_an_ingestion_phrase_is_not_an_overdose(text):
+    acuity = assess(text)
+    assert acuity.level > 1
+    assert not any("overdose" in reason for reason in acuity.reasons)
+
+
+@pytest.mark.parametrize("text", [
+    "I took too many aspirin",
+    "my son swallowed a bottle of tylenol",
+    "she took too much of her ibuprofen",
+])
+def test_ingested_medication_is_immediate(text):
+    assert assess(text).level == 1
+
+
+@pytest.mark.parametrize("text", [
+    "I have a cold and my chest hurts",
+    "bad cough and chest pain",
+    "runny nose and a tight chest",
+])
+def test_chest_pain_stays_emergent_next_to_a_minor_symptom(text):
+    assert assess(text).level <= 2
+
+
+def test_negated_chest_pain_is_not_chest_pain():
+    assert assess("no chest pain, just a cold").level == 5
+
+
+def test_fenwick_build_matches_appends():
+    values = [(i * 7) % 5 for i in range(100)]
+    built = Fenwick.build(values)
+    appended = Fenwick()
+    for value in values:
+        appended.append(value)
+    assert built.tree == appended.tree
+    assert [built.prefix(count) for count in range(101)] == [sum(values[:count]) for count in range(101)]
+
+
+def test_long_running_queue_stays_compact_and_ordered():
+    rng = random.Random(5)
+    queue = TriageQueue()
+    waiting = []
+    for i in range(5000):
+        waiting.append(queue.enqueue(f"patient {i}", Acuity(rng.randint(2, 5), [])))
+        if len(waiting) > 20:
+            assert queue.pop() is not None
+            waiting = [entry for entry in waiting if entry.waiting]
+    # The trees only cover patients still waiting, plus the slack before the next compaction
+    assert len(queue.arrivals[3]) <= 2 * len(queue) + 65
+    assert len(queue.heap) <= 2 * len(queue) + 65
+    # Positions count the patients at more urgent levels and those who arrived earlier at the same level
+    for entry in waiting:
+        ahead = sum(1 for other in waiting
+                    if other.level < entry.level or (other.level == entry.level and other.seq < entry.seq))
+        assert queue.position(entry.ticket)[0] == ahead
+    # Patients still come out most urgent first, by arrival within a level
+    order = [queue.pop() for _ in range(len(waiting))]
+    assert [(entry.level, entry.ticket) for entry in order] == sorted((entry.level, entry.ticket) for entry in waiting)
+    assert len({entry.ticket for entry in order}) == len(order)
+
+
+def test_snapshot_reports_every_level():
+    queue = TriageQueue(providers=1)
+    queue.enqueue("a", Acuity(3, []))
+    snapshot = queue.snapshot()
+    assert snapshot[1] == (0, 0.0)
+    assert snapshot[3] == (1, queue.SERVICE_MINUTES[3])
+    assert snapshot[4] == (0, queue.SERVICE_MINUTES[3])
@@ -0,0 +1,321 @@
+# ============================================
+# Hospital Management System - ER Triage
+# Acuity scoring and a priority queue with live wait estimates
+# ============================================
+
+import heapq
+import re
+import threading
+import time
+from collections import namedtuple
+
+from nlp_utils import alternation, extract_entities
+
+Acuity = namedtuple("Acuity", "level reasons")
+
+# ESI-style levels: 1 needs immediate life-saving care, 5 needs no resources
+LEVEL_NAMES = {1: "immediate", 2: "emergent", 3: "urgent", 4: "less urgent", 5: "non-urgent"}
+
+# Self-reported symptoms by the level they point to on their own
+SYMPTOMS = {
+    1: ["not breathing", "stopped breathing", "can't breathe", "cannot breathe", "unconscious", "unresponsive",
+        "no pulse", "cardiac arrest", "choking", "overdose", "overdosed", "severe bleeding", "bleeding heavily",
+        "won't stop bleeding", "anaphylaxis", "throat is closing", "turning blue", "seizure that won't stop"],
+    2: ["chest pain", "chest pressure", "chest hurts", "chest is hurting", "chest tightness", "chest feels tight",
+        "tight chest", "pain in my chest", "heart attack", "trouble breathing", "difficulty breathing",
+        "short of breath", "shortness of breath", "stroke", "face drooping", "slurred speech",
+        "numbness on one side", "weakness on one side", "seizure", "suicidal", "kill myself", "severe pain",
+        "worst headache", "head injury", "hit my head", "vomiting blood", "coughing up blood",
+        "allergic reaction", "poisoning", "confused", "confusion", "severe burn", "pregnant and bleeding"],
+    3: ["abdominal pain", "stomach pain", "belly pain", "high fever", "fever", "vomiting", "dehydrated",
+        "broke", "broken", "fracture", "kidney stone", "back pain", "headache", "migraine", "dizzy", "dizziness",
+        "fainted", "passed out", "blood in urine", "asthma attack", "bleeding"],
+    4: ["sprain", "sprained", "twisted ankle", "cut", "laceration", "stitches", "ear pain", "earache",
+        "urinary tract infection", "burning when i pee", "sore throat", "minor burn", "burn", "rash",
+        "bee sting", "pink eye"],
+    5: ["cold", "cough", "runny nose", "prescription refill", "refill", "insect bite", "splinter",
+        "suture removal", "work note"],
+}
+SYMPTOM_LEVELS = {phrase: level for level, phrases in SYMPTOMS.items() for phrase in phrases}
+SYMPTOM_RE = re.compile(r"\b(?:" + alternation(SYMPTOM_LEVELS) + r")\b", re.IGNORECASE)
+
+NEGATION_RE = re.compile(r"\b(?:no|not|without|denies)\s+(?:\w+\s+)?$", re.IGNORECASE)
+PAIN_SCORE_RE = re.compile(r"\b(\d{1,2})\s*(?:/|out of)\s*10\b", re.IGNORECASE)
+VULNERABLE_RE = re.compile(r"\b(?:baby|infant|newborn|\d+[- ]months?[- ]old|pregnant|elderly)\b", re.IGNORECASE)
+INGESTION_PHRASES = ["took too many", "took too much", "swallowed"]
+# An ingestion phrase right before the drug, allowing a few filler words: "took too many of my aspirin",
+# "swallowed a bottle of tylenol". Matched against the text up to the drug name.
+INGESTION_RE = re.compile(
+    r"\b(?:" + alternation(INGESTION_PHRASES) + r")\s+(?:(?:of|my|his|her|their|the|a|an|all|whole|bottle|"
+    r"pack|box|handful|some|pills|tablets|\d+)\s+){0,4}$",
+    re.IGNORECASE,
+)
+
+# Words the spelling corrector must know so it leaves symptoms alone ("took" is not "book")
+TRIAGE_PHRASES = [*SYMPTOM_LEVELS, *INGESTION_PHRASES]
+
+# Unrecognized complaints wait for the triage nurse at this level
+DEFAULT_LEVEL = 4
+
+
+def assess(text):
+    """Acuity for self-reported symptoms; the triage nurse confirms it on arrival"""
+    reasons = []
+    for match in SYMPTOM_RE.finditer(text):
+        # "no chest pain" is not chest pain
+        if NEGATION_RE.search(text, max(match.start() - 20, 0), match.start()):
+            continue
+        reasons.append(match.group(0).lower())
+    level = min((SYMPTOM_LEVELS[reason] for reason in reasons), default=DEFAULT_LEVEL)
+
+    pain = PAIN_SCORE_RE.search(text)
+    if pain:
+        score = int(pain.group(1))
+        if score >= 8:
+            level = min(level, 2)
+        elif score >= 5:
+            level = min(level, 3)
+        reasons.append(f"pain {score}/10")
+
+    # Too much of a named medication is a possible overdose
+    for entity in extract_entities(text):
+        if entity.type == "medication" and INGESTION_RE.search(text, max(entity.start - 60, 0), entity.start):
+            level = 1
+            reasons.append(f"possible {entity.text} overdose")
+            break
+
+    if level >= 3 and reasons and VULNERABLE_RE.search(text):
+        level -= 1
+        reasons.append(VULNERABLE_RE.search(text).group(0).lower())
+    return Acuity(level, reasons)
+
+
+class Fenwick:
+    """Prefix sums over a growing array (binary indexed tree); append, add and prefix are O(log n)"""
+
+    __slots__ = ("tree",)
+
+    def __init__(self):
+        self.tree = [0]
+
+    def __len__(self):
+        return len(self.tree) - 1
+
+    @classmethod
+    def build(cls, values):
+        """Tree over a list of values in O(n)"""
+        fenwick = cls()
+        tree = fenwick.tree = [0, *values]
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        return fenwick
+
+    def prefix(self, count):
+        """Sum of the first `count` values"""
+        total = 0
+        while count > 0:
+            total += self.tree[count]
+            count &= count - 1
+        return total
+
+    def append(self, value):
+        # Node i covers values (i - lowbit(i), i]; the ones before i are already in the tree
+        index = len(self.tree)
+        self.tree.append(value + self.prefix(index - 1) - self.prefix(index - (index & -index)))
+
+    def add(self, index, delta):
+        """Add delta to the value at 0-based index"""
+        index += 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+
+class TriageEntry:
+    __slots__ = ("ticket", "name", "level", "seq", "arrived", "reasons", "waiting")
+
+    def __init__(self, ticket, name, level, seq, arrived, reasons):
+        self.ticket = ticket
+        self.name = name
+        self.level = level
+        self.seq = seq
+        self.arrived = arrived
+        self.reasons = reasons
+        self.waiting = True
+
+
+class TriageQueue:
+    """Patients waiting to be seen, most urgent level first and by arrival within a level.
+
+    The queue is a binary heap of (level, arrival, entry). Raising a
+    patient's level pushes a new heap item and leaves the old one to be
+    skipped when it surfaces, so enqueue and reprioritize are both
+    O(log n).
+
+    Wait estimates are kept incrementally. Each level has a count of
+    waiting patients and a Fenwick tree over arrival order, so the
+    patients ahead of anyone are the ones at more urgent levels plus a
+    prefix sum within their own level: O(log n) per estimate. Once patients
+    who were seen dominate the trees, the waiting patients are renumbered in
+    arrival order and the trees and heap rebuilt, so they stay proportional
+    to the queue however long the kiosk runs. The provider
+    minutes each level needs are an exponential moving average of
+    observed visits, updated as visits complete.
+    """
+
+    # Starting provider minutes per patient at each level, before any visits are observed
+    SERVICE_MINUTES = {1: 60.0, 2: 45.0, 3: 30.0, 4: 20.0, 5: 15.0}
+    SMOOTHING = 0.2
+
+    def __init__(self, providers=4, service_minutes=None):
+        self.providers = providers
+        self.service_minutes = dict(service_minutes or self.SERVICE_MINUTES)
+        self.heap = []
+        self.entries = {}                    # ticket -> waiting TriageEntry
+        self.by_name = {}                    # patient name -> waiting TriageEntry
+        self.counts = {level: 0 for level in LEVEL_NAMES}
+        self.arrivals = {level: Fenwick() for level in LEVEL_NAMES}  # arrival seq -> 1 while waiting
+        self.next_seq = 0                    # arrival order; renumbered when the trees are compacted
+        self.next_ticket = 1
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def enqueue(self, name, acuity, now=None):
+        """Add a patient; returns their TriageEntry"""
+        with self.lock:
+            return self.insert(name, acuity, now)
+
+    def check_in(self, name, acuity, now=None):
+        """Enqueue a patient, or update a waiting patient's symptoms and move them up if now more urgent"""
+        with self.lock:
+            entry = self.by_name.get(name) if name else None
+            if entry is None:
+                return self.insert(name, acuity, now)
+            entry.reasons.extend(reason for reason in acuity.reasons if reason not in entry.reasons)
+            if acuity.level < entry.level:
+                self.move(entry, acuity.level)
+            return entry
+
+    def reprioritize(self, ticket, level):
+        """Move a waiting patient to another level, keeping their place in arrival order"""
+        with self.lock:
+            entry = self.entries[ticket]
+            if level != entry.level:
+                self.move(entry, level)
+            return entry
+
+    def pop(self):
+        """Take the next patient to be seen, or None if nobody is waiting"""
+        with self.lock:
+            while self.heap:
+                level, seq, entry = heapq.heappop(self.heap)
+                if entry.waiting and entry.level == level:
+                    self.discard(entry)
+                    return entry
+            return None
+
+    def remove(self, ticket):
+        """Take a patient out of the queue, e.g. when they leave without being seen"""
+        with self.lock:
+            entry = self.entries.get(ticket)
+            if entry is not None:
+                self.discard(entry)
+            return entry
+
+    def insert(self, name, acuity, now):
+        # Caller holds self.lock
+        if self.next_seq > 2 * len(self.entries) + 64:
+            self.compact()
+        seq = self.next_seq
+        self.next_seq += 1
+        for level, arrivals in self.arrivals.items():
+            arrivals.append(1 if level == acuity.level else 0)
+        # Tickets count from 1 for the patients; seq indexes the arrival trees from 0
+        entry = TriageEntry(self.next_ticket, name, acuity.level, seq, now or time.time(), list(acuity.reasons))
+        self.next_ticket += 1
+        self.entries[entry.ticket] = entry
+        if name:
+            self.by_name[name] = entry
+        self.counts[entry.level] += 1
+        self.push(entry)
+        return entry
+
+    def move(self, entry, level):
+        # Caller holds self.lock
+        self.arrivals[entry.level].add(entry.seq, -1)
+        self.arrivals[level].add(entry.seq, 1)
+        self.counts[entry.level] -= 1
+        self.counts[level] += 1
+        entry.level = level
+        # The old heap item no longer matches entry.level and is skipped by pop()
+        self.push(entry)
+
+    def push(self, entry):
+        # Caller holds self.lock; drops stale heap items once they outnumber the waiting patients
+        if len(self.heap) > 2 * len(self.entries) + 64:
+            self.heap = [item for item in self.heap if item[2].waiting and item[2].level == item[0]]
+            heapq.heapify(self.heap)
+        heapq.heappush(self.heap, (entry.level, entry.seq, entry))
+
+    def compact(self):
+        # Caller holds self.lock; renumbers the waiting patients 0..n-1 in arrival order and rebuilds
+        # the arrival trees and the heap over them alone
+        waiting = sorted(self.entries.values(), key=lambda entry: entry.seq)
+        for seq, entry in enumerate(waiting):
+            entry.seq = seq
+        self.next_seq = len(waiting)
+        self.arrivals = {
+            level: Fenwick.build([1 if entry.level == level else 0 for entry in waiting]) for level in LEVEL_NAMES
+        }
+        self.heap = [(entry.level, entry.seq, entry) for entry in waiting]
+        heapq.heapify(self.heap)
+
+    def discard(self, entry):
+        # Caller holds self.lock
+        entry.waiting = False
+        del self.entries[entry.ticket]
+        if self.by_name.get(entry.name) is entry:
+            del self.by_name[entry.name]
+        self.counts[entry.level] -= 1
+        self.arrivals[entry.level].add(entry.seq, -1)
+
+    def complete(self, level, minutes):
+        """Record how many provider minutes a finished visit at a level took"""
+        with self.lock:
+            average = self.service_minutes[level]
+            self.service_minutes[level] = average + self.SMOOTHING * (minutes - average)
+
+    def work_before(self, level):
+        # Caller holds self.lock; provider minutes needed by everyone at more urgent levels
+        return sum(self.counts[more] * self.service_minutes[more] for more in range(1, level))
+
+    def position(self, ticket):
+        """Return (patients ahead, estimated wait in minutes) for a waiting patient"""
+        with self.lock:
+            entry = self.entries[ticket]
+            if entry.level == 1:
+                return 0, 0.0
+            same_level = self.arrivals[entry.level].prefix(entry.seq)
+            ahead = sum(self.counts[more] for more in range(1, entry.level)) + same_level
+            work = self.work_before(entry.level) + same_level * self.service_minutes[entry.level]
+            return ahead, work / self.providers
+
+    def estimated_wait(self, level):
+        """Minutes a patient arriving now at a level would wait"""
+        with self.lock:
+            return self.wait_for(level)
+
+    def wait_for(self, level):
+        # Caller holds self.lock
+        if level == 1:
+            return 0.0
+        return (self.work_before(level) + self.counts[level] * self.service_minutes[level]) / self.providers
+
+    def snapshot(self):
+        """{level: (patients waiting, estimated wait for a new arrival)}, all from the same moment"""
+        with self.lock:
+            return {level: (self.counts[level], self.wait_for(level)) for level in LEVEL_NAMES}